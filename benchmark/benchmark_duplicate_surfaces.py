@@ -0,0 +1,77 @@
+import pickle
+import sys
+import time
+
+import numpy as np
+
+import montepy
+from montepy.surfaces.surface_builder import parse_surface
+
+FAIL_THRESHOLD = 60
+"""The most seconds allowed per million surfaces."""
+SIZES = [10_000, 100_000, 1_000_000]
+DUPLICATE_FRACTION = 0.1
+TOLERANCE = 1e-6
+CELLS = 100
+
+if len(sys.argv) > 1:
+    SIZES = [int(size) for size in sys.argv[1:]]
+
+TEMPLATES = {
+    "C/Z": pickle.dumps(parse_surface("1 C/Z 0.0 0.0 1.0")),
+    "PZ": pickle.dumps(parse_surface("1 PZ 0.0")),
+    "S": pickle.dumps(parse_surface("1 S 0.0 0.0 0.0 1.0")),
+}
+
+
+def build_problem(size, rng):
+    """Builds a pin-like model with a fraction of slightly perturbed duplicate surfaces."""
+    unique = int(size * (1 - DUPLICATE_FRACTION))
+    kinds = rng.choice(list(TEMPLATES), size=unique, p=[0.8, 0.1, 0.1])
+    constants = []
+    for kind in kinds:
+        if kind == "C/Z":
+            x, y = rng.integers(-1000, 1000, size=2) * 1.26
+            constants.append([x, y, rng.choice([0.39, 0.41, 0.475])])
+        elif kind == "PZ":
+            constants.append([rng.uniform(-500.0, 500.0)])
+        else:
+            constants.append(list(rng.uniform(-500.0, 500.0, size=3)) + [1.0])
+    copies = rng.integers(0, unique, size=size - unique)
+    kinds = list(kinds) + [kinds[idx] for idx in copies]
+    constants += [
+        list(np.array(constants[idx]) * (1 + rng.uniform(-0.1, 0.1) * TOLERANCE))
+        for idx in copies
+    ]
+    surfaces = []
+    for number, (kind, values) in enumerate(zip(kinds, constants), start=1):
+        surf = pickle.loads(TEMPLATES[kind])
+        surf.number = number
+        surf.surface_constants = values
+        surfaces.append(surf)
+    problem = montepy.MCNP_Problem("benchmark")
+    problem.surfaces.extend(surfaces)
+    # make some cells use the duplicates so they must be rewritten
+    for number, idx in enumerate(rng.choice(copies, size=CELLS), start=1):
+        cell = montepy.Cell()
+        cell.number = number
+        cell.geometry = -surfaces[idx] & +surfaces[unique + number]
+        problem.cells.append(cell)
+    return problem
+
+
+rng = np.random.default_rng(42)
+for size in SIZES:
+    problem = build_problem(size, rng)
+    start = time.time()
+    problem.remove_duplicate_surfaces(TOLERANCE)
+    run_time = time.time() - start
+    print(
+        f"remove_duplicate_surfaces: {size} surfaces took {run_time:.3f} s. "
+        f"{size - len(problem.surfaces)} duplicates were removed."
+    )
+    if run_time > FAIL_THRESHOLD * size / 1e6:
+        raise RuntimeError(
+            f"Benchmark took too long to complete. It must be faster than: "
+            f"{FAIL_THRESHOLD} s per million surfaces."
+        )
@@ -0,0 +1,62 @@
+import io
+import os
+import sys
+import tempfile
+import time
+
+import montepy
+
+FAIL_THRESHOLD = 20
+"""The most seconds allowed per thousand pins."""
+SIZES = [20, 50, 224]
+"""The number of pins along each side of the assembly."""
+PITCH = 1.26
+
+if len(sys.argv) > 1:
+    SIZES = [int(size) for size in sys.argv[1:]]
+
+
+def build_problem(size):
+    """Builds a square assembly of pins in a lattice filled by a single universe."""
+    half = PITCH / 2
+    end = size * PITCH - half
+    return montepy.read_input(io.StringIO(f"""pin assembly
+1 1 -10.0 -1 u=1 imp:n=1
+2 2 -6.5 1 -2 u=1 imp:n=1
+3 3 -1.0 2 u=1 imp:n=1
+4 0 -3 4 -5 6 lat=1 u=2 fill=1 imp:n=1
+10 0 -10 fill=2 imp:n=1
+11 0 10 imp:n=0
+
+1 CZ 0.41
+2 CZ 0.475
+3 PX {half}
+4 PX {-half}
+5 PY {half}
+6 PY {-half}
+10 RPP {-half} {end} {-half} {end} -100 100
+
+m1 92235.80c 1
+m2 40000.80c 1
+m3 1001.80c 2 8016.80c 1
+"""))
+
+
+for size in SIZES:
+    problem = build_problem(size)
+    pins = size * size
+    with tempfile.TemporaryDirectory() as directory:
+        out = os.path.join(directory, "flat.imcnp")
+        start = time.time()
+        replaced = problem.flatten_universes(destination=out)
+        run_time = time.time() - start
+        print(
+            f"flatten_universes: {pins} pins took {run_time:.3f} s. "
+            f"{len(replaced[10])} cells were written, "
+            f"in {os.path.getsize(out) / 1e6:.1f} MB."
+        )
+    if run_time > FAIL_THRESHOLD * pins / 1e3:
+        raise RuntimeError(
+            f"Benchmark took too long to complete. It must be faster than: "
+            f"{FAIL_THRESHOLD} s per thousand pins."
+        )
@@ -0,0 +1,64 @@
+import time
+
+import montepy
+
+FAIL_THRESHOLD = 5
+QUERIES = 1000
+
+problem = montepy.read_input("benchmark/big_model.imcnp")
+cells = problem.cells
+materials = problem.materials
+material_numbers = list(materials.numbers)
+
+
+def scan_cells(material):
+    return [
+        cell
+        for cell in cells
+        if cell.universe.number == 0
+        and cell.material is not None
+        and cell.material.number == material
+    ]
+
+
+def query_cells(material):
+    return list(cells.where(universe=0, material=material))
+
+
+def scan_materials(_):
+    return [
+        material
+        for material in materials
+        if material.contains_any("O-16", threshold=1e-3)
+    ]
+
+
+def query_materials(_):
+    return list(materials.containing("O-16", threshold=1e-3))
+
+
+for name, scan, query, queries in [
+    ("cells.where", scan_cells, query_cells, QUERIES),
+    ("materials.containing", scan_materials, query_materials, QUERIES),
+]:
+    # scanning is much slower so only time a sample of it
+    scans = max(queries // 100, 1)
+    start = time.time()
+    for i in range(scans):
+        expected = scan(material_numbers[i % len(material_numbers)])
+    scan_time = (time.time() - start) / scans
+
+    start = time.time()
+    for i in range(queries):
+        actual = query(material_numbers[i % len(material_numbers)])
+    query_time = time.time() - start
+
+    assert actual == scan(material_numbers[(queries - 1) % len(material_numbers)])
+    print(
+        f"{name}: {queries} queries took {query_time:.3f} s with indexes. "
+        f"Scanning takes {scan_time:.3f} s per query."
+    )
+    if query_time > FAIL_THRESHOLD:
+        raise RuntimeError(
+            f"Benchmark took too long to complete. It must be faster than: {FAIL_THRESHOLD} s."
+        )
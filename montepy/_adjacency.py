@@ -0,0 +1,160 @@
+# Copyright 2026, Battelle Energy Alliance, LLC All Rights Reserved.
+from __future__ import annotations
+from numbers import Integral
+
+import numpy as np
+
+from montepy.exceptions import IllegalState
+from montepy.geometry_operators import Operator
+from montepy.surfaces.half_space import UnitHalfSpace
+
+
+def _surface_senses(cell):
+    """Finds the surfaces that bound a cell, and which of their sides the cell uses.
+
+    Complemented cells are inlined, and the side of every surface is flipped
+    once for every complement above it.
+
+    Returns
+    -------
+    frozenset[tuple[int, bool]]
+        The id of each surface, and whether the cell uses its positive side.
+        A surface may be used with both of its sides.
+    """
+    if cell.geometry is None:
+        raise IllegalState(f"Cell {cell.number} has no geometry defined.")
+    senses = set()
+    stack = [(cell.geometry, False, frozenset({id(cell)}))]
+    while stack:
+        node, flipped, cells = stack.pop()
+        if isinstance(node, UnitHalfSpace):
+            divider = node.divider
+            if isinstance(divider, Integral):
+                raise IllegalState(
+                    f"Geometry cannot be evaluated while not linked to surfaces. Run Cell.update_pointers"
+                )
+            if node.is_cell:
+                if id(divider) in cells:
+                    raise IllegalState(
+                        f"Cell {divider.number} is complemented by its own geometry."
+                    )
+                if divider.geometry is None:
+                    raise IllegalState(
+                        f"Cell {divider.number} has no geometry defined."
+                    )
+                stack.append((divider.geometry, flipped, cells | {id(divider)}))
+            else:
+                senses.add((id(divider), node.side != flipped))
+            continue
+        flipped ^= node.operator == Operator.COMPLEMENT
+        stack.append((node.left, flipped, cells))
+        if node.right is not None:
+            stack.append((node.right, flipped, cells))
+    return frozenset(senses)
+
+
+class _CellAdjacency:
+    """The cells that are on opposite sides of the same surface, kept up to date as cells change.
+
+    Cells are grouped by each side of each surface they use, within their universe,
+    so the neighbors of a cell are found by looking up the other side of its surfaces,
+    instead of comparing it to every other cell.
+    When the geometry changes only the cells whose surfaces changed are regrouped.
+
+    .. versionadded:: 1.4.0
+    """
+
+    def __init__(self):
+        self._cells = {}
+        """The id of each cell, to the cell, the compiled region and universe it was read with, and its senses."""
+        self._sides = {}
+        """Each (universe, surface id, side) to the ids of the cells using it."""
+        self._pairs = {}
+        """Each pair of cell ids, to the number of surfaces they are on opposite sides of."""
+        self._csr = None
+
+    def __reduce__(self):
+        # the cache is keyed by object ids, which are not kept by copies
+        return (type(self), ())
+
+    def __call__(self, cells):
+        """Finds the adjacency of the cells, updating only what has changed since the last call.
+
+        Parameters
+        ----------
+        cells : Iterable[Cell]
+            all of the cells in the problem.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            The sorted cell numbers, and the ``indptr`` and ``indices`` of the CSR adjacency.
+        """
+        present = set()
+        for cell in cells:
+            cell_id = id(cell)
+            present.add(cell_id)
+            universe = cell.universe.number if cell.universe is not None else 0
+            cached = self._cells.get(cell_id)
+            # the compiled region is rebuilt whenever the geometry of the cell changes
+            compiled = cell._compiled_region()
+            if cached is not None and cached[1] is compiled and cached[2] == universe:
+                continue
+            senses = _surface_senses(cell)
+            if cached is None or cached[2] != universe or cached[3] != senses:
+                if cached is not None:
+                    self._remove(cell_id, cached[2], cached[3])
+                self._add(cell_id, universe, senses)
+            self._cells[cell_id] = (cell, compiled, universe, senses)
+        for cell_id in set(self._cells) - present:
+            _, _, universe, senses = self._cells.pop(cell_id)
+            self._remove(cell_id, universe, senses)
+        numbers = tuple(
+            sorted(
+                (cached[0].number, cell_id) for cell_id, cached in self._cells.items()
+            )
+        )
+        if self._csr is None or self._csr[0] != numbers:
+            self._csr = (numbers, self._build(numbers))
+        return tuple(array.copy() for array in self._csr[1])
+
+    def _add(self, cell_id, universe, senses):
+        for surface, side in senses:
+            for other in self._sides.get((universe, surface, not side), ()):
+                if other != cell_id:
+                    pair = (min(cell_id, other), max(cell_id, other))
+                    self._pairs[pair] = self._pairs.get(pair, 0) + 1
+            self._sides.setdefault((universe, surface, side), set()).add(cell_id)
+        self._csr = None
+
+    def _remove(self, cell_id, universe, senses):
+        for surface, side in senses:
+            key = (universe, surface, side)
+            self._sides[key].discard(cell_id)
+            if not self._sides[key]:
+                del self._sides[key]
+            for other in self._sides.get((universe, surface, not side), ()):
+                if other != cell_id:
+                    pair = (min(cell_id, other), max(cell_id, other))
+                    self._pairs[pair] -= 1
+                    if self._pairs[pair] == 0:
+                        del self._pairs[pair]
+        self._csr = None
+
+    def _build(self, numbers):
+        """Builds the CSR arrays from the pairs of adjacent cells."""
+        positions = {cell_id: idx for idx, (_, cell_id) in enumerate(numbers)}
+        pairs = np.array(
+            [(positions[first], positions[second]) for first, second in self._pairs],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        rows = np.concatenate([pairs[:, 0], pairs[:, 1]])
+        columns = np.concatenate([pairs[:, 1], pairs[:, 0]])
+        order = np.lexsort((columns, rows))
+        indptr = np.zeros(len(numbers) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(numbers)), out=indptr[1:])
+        return (
+            np.array([number for number, _ in numbers], dtype=np.int64),
+            indptr,
+            columns[order],
+        )
@@ -0,0 +1,70 @@
+# Copyright 2026, Battelle Energy Alliance, LLC All Rights Reserved.
+from __future__ import annotations
+import itertools
+import numpy as np
+
+_BUCKET_SPAN = 64
+"""The width of the buckets used to find values within a tolerance, in multiples of the tolerance."""
+
+
+def _tolerance_buckets(values, width):
+    """Quantizes values into buckets that are much wider than a tolerance.
+
+    Values within ``width`` of each other are always in the same or neighbouring buckets.
+    The neighbouring buckets are only searched when a value is near their edge,
+    so most values only need one bucket searched.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        An (N, M) array of the values to quantize.
+    width : float
+        The tolerance between values.
+
+    Returns
+    -------
+    Generator[list[tuple[int, ...]]]
+        The buckets to search for each row of values, starting with the bucket the row is in.
+    """
+    scaled = values / (width * _BUCKET_SPAN)
+    homes = np.floor(scaled)
+    offsets = (scaled - homes) * _BUCKET_SPAN
+    sides = np.where(offsets <= 1, -1, np.where(offsets >= _BUCKET_SPAN - 1, 1, 0))
+    for home, side in zip(homes.astype(np.int64).tolist(), sides.tolist()):
+        home = tuple(home)
+        if any(side):
+            choices = [(h,) if s == 0 else (h, h + s) for h, s in zip(home, side)]
+            yield [home] + [key for key in itertools.product(*choices) if key != home]
+        else:
+            yield [home]
+
+
+def _first_matches(values, width, is_match):
+    """Finds the first earlier kept row that each row of values matches.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        An (N, M) array of values, which are only compared when within ``width`` of each other.
+    width : float
+        The tolerance between values.
+    is_match : Callable[[int, int], bool]
+        Whether the kept row, and a later row match.
+
+    Returns
+    -------
+    list[int]
+        The index of the row each row matches, which is its own index if it is kept.
+    """
+    buckets = {}
+    leaders = []
+    for idx, keys in enumerate(_tolerance_buckets(values, width)):
+        leader = idx
+        for key in keys:
+            for other in buckets.get(key, ()):
+                if other < leader and is_match(other, idx):
+                    leader = other
+        if leader == idx:
+            buckets.setdefault(keys[0], []).append(idx)
+        leaders.append(leader)
+    return leaders
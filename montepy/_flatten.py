@@ -0,0 +1,588 @@
+# Copyright 2026, Battelle Energy Alliance, LLC All Rights Reserved.
+from __future__ import annotations
+import copy
+import gc
+import itertools
+import pickle
+import tempfile
+import warnings
+
+import numpy as np
+
+import montepy
+from montepy._locator import _Lattice, _MAX_DEPTH
+from montepy.exceptions import *
+from montepy.geometry_operators import Operator
+from montepy.surfaces.half_space import HalfSpace, UnitHalfSpace
+from montepy.utilities import _relaxed_gc
+
+_BATCH_SIZE = 10_000
+"""The most cells to make before adding them to the problem."""
+
+_STREAM_BATCH_SIZE = 100
+"""The most cells to keep in memory at once, when they are written to a stream."""
+
+_EVERYWHERE = np.array([[-np.inf] * 3, [np.inf] * 3])
+
+
+def _translation(offset):
+    matrix = np.identity(4)
+    matrix[:3, 3] = offset
+    return matrix
+
+
+def _matrix_key(matrix):
+    """A hashable key for a matrix, so that equal matrices share their transforms and surfaces."""
+    # adding zero removes negative zeros
+    return tuple((np.round(matrix[:3], 10) + 0.0).ravel().tolist())
+
+
+def _move_box(box, matrix):
+    """Finds the axis-aligned box containing a box after it is moved by a matrix.
+
+    This uses interval arithmetic, so infinite bounds are only spread
+    to the axes that they are rotated onto.
+    """
+    if np.any(box[0] > box[1]):
+        return box.copy()
+    rotation = matrix[:3, :3].T
+    with np.errstate(invalid="ignore"):
+        ends = box[:, :, np.newaxis] * rotation
+    ends = np.where(rotation == 0.0, 0.0, ends)
+    return (
+        np.array([ends.min(axis=0).sum(axis=0), ends.max(axis=0).sum(axis=0)])
+        + matrix[:3, 3]
+    )
+
+
+def _intersect(box, other):
+    return np.array([np.maximum(box[0], other[0]), np.minimum(box[1], other[1])])
+
+
+def _is_empty(box):
+    # boxes that only touch share no volume
+    return bool(np.any(box[0] >= box[1]))
+
+
+def _is_filled(cell):
+    fill = cell.fill
+    return fill.universe_numbers is not None or fill.universe is not None
+
+
+def _grouped(node):
+    """Wraps a union in parentheses, so it can be intersected."""
+    if not isinstance(node, UnitHalfSpace) and node.operator == Operator.UNION:
+        return HalfSpace(node, Operator.GROUP)
+    return node
+
+
+class _Flattener:
+    """Unrolls the fills and lattices of a problem into cells of the real world.
+
+    The unfilled cells inside of every filled cell are found,
+    each with the chain of geometries that bound it:
+    from the filled cell in the real world down to the cell itself,
+    along with the matrix that moves each of these geometries into the real world.
+    These are counted first, and then found again as the new cells, surfaces, and transforms are made,
+    so that they are never all held at once.
+    The new objects are either added to the problem, or written to a stream a batch at a time.
+
+    Parameters
+    ----------
+    problem : MCNP_Problem
+        the problem to flatten.
+    max_instances : int
+        the most cells that may be made, or None for no limit.
+    """
+
+    def __init__(self, problem, max_instances):
+        self._problem = problem
+        self._max_instances = max_instances
+        self._universe_cells = {}
+        self._matrices = {}
+        self._identity = self._key(np.identity(4))
+        self._cell_templates = {}
+        self._surface_templates = {}
+        self._surfaces = {}
+        self._transforms = {}
+        self._written_surfaces = {}
+        self._written_transforms = {}
+        self._new_surfaces = []
+        self._new_transforms = []
+        self._surface_numbers = None
+        self._transform_numbers = None
+
+    def _key(self, matrix):
+        key = _matrix_key(matrix)
+        self._matrices.setdefault(key, matrix)
+        return key
+
+    def _cells_in(self, universe):
+        if universe not in self._universe_cells:
+            self._universe_cells[universe] = list(
+                self._problem.cells.where(universe=universe)
+            )
+        return self._universe_cells[universe]
+
+    def _iter_leaves(self):
+        """Finds every unfilled cell to be made, without making any of them.
+
+        Returns
+        -------
+        Generator[tuple[Cell, Cell, tuple]]
+            The filled cell in the real world, the cell to copy, and its chain of geometries.
+        """
+        for cell in self._cells_in(0):
+            if not _is_filled(cell):
+                continue
+            for leaf in self._visit(cell, None, np.identity(4), _EVERYWHERE, 0):
+                yield (cell,) + leaf
+
+    def _count_leaves(self):
+        """Counts the cells to be made, and checks that there are not too many."""
+        count = 0
+        for _ in self._iter_leaves():
+            count += 1
+            if self._max_instances is not None and count > self._max_instances:
+                raise ValueError(
+                    f"Flattening the universes makes more than {self._max_instances} cells."
+                )
+        return count
+
+    def _visit(self, cell, chain, matrix, box, depth):
+        """Finds the unfilled cells that a cell becomes, once moved by a matrix into the real world."""
+        if depth >= _MAX_DEPTH:
+            raise IllegalState(
+                f"Universes are nested more than {_MAX_DEPTH} levels deep. There is likely a fill loop."
+            )
+        if cell.lattice_type is not None:
+            yield from self._visit_lattice(cell, chain, matrix, box, depth)
+            return
+        box = _intersect(box, _move_box(cell.bounding_box(), matrix))
+        if _is_empty(box):
+            return
+        chain = (chain, cell, self._key(matrix))
+        if not _is_filled(cell):
+            yield cell, chain
+            return
+        if cell.fill.transform is not None:
+            matrix = matrix @ cell.fill.transform.as_matrix()
+        for child in self._cells_in(cell.fill.universe.number):
+            yield from self._visit(child, chain, matrix, box, depth + 1)
+
+    def _visit_lattice(self, cell, chain, matrix, box, depth):
+        lattice = _Lattice(cell)
+        own = cell.universe.number if cell.universe is not None else 0
+        fill = cell.fill
+        numbers = fill.universe_numbers
+        if numbers is not None:
+            ranges = [
+                np.arange(low, low + length)
+                for low, length in zip(fill.min_index, numbers.shape)
+            ]
+            universes = numbers.ravel()
+        else:
+            # lattices filled by one universe are only unrolled where they are inside the filled cell
+            if not np.all(np.isfinite(box)):
+                raise ValueError(
+                    f"Cell {cell.number}: a lattice filled by one universe can only be flattened inside a finite cell."
+                )
+            local = _move_box(box, np.linalg.inv(matrix))
+            corners = np.array(list(itertools.product(*local.T)))
+            ranges = [
+                np.arange(low, high + 1)
+                for low, high in zip(*lattice.index_range(corners))
+            ]
+            universes = np.full(
+                np.prod([len(span) for span in ranges]), fill.universe.number
+            )
+        indices = np.stack(np.meshgrid(*ranges, indexing="ij"), axis=-1).reshape(-1, 3)
+        offsets = lattice.offsets(indices)
+        element_box = cell.bounding_box()
+        fill_matrix = np.identity(4)
+        if fill.transform is not None:
+            fill_matrix = fill.transform.as_matrix()
+        for universe, offset in zip(universes.tolist(), offsets):
+            element_matrix = matrix @ _translation(offset)
+            inside = _intersect(box, _move_box(element_box, element_matrix))
+            if _is_empty(inside):
+                continue
+            element_chain = (chain, cell, self._key(element_matrix))
+            # elements of the lattice's own universe are filled by the lattice cell itself
+            if universe in {own, 0}:
+                yield cell, element_chain
+                continue
+            for child in self._cells_in(universe):
+                yield from self._visit(
+                    child,
+                    element_chain,
+                    element_matrix @ fill_matrix,
+                    inside,
+                    depth + 1,
+                )
+
+    def _cell_template(self, cell):
+        """Pickles a copy of a cell without its geometry, material, universe, or fill."""
+        if id(cell) not in self._cell_templates:
+            memo = {
+                id(obj): None
+                for obj in (
+                    cell._material,
+                    cell._geometry,
+                    cell._problem_ref,
+                    cell._collection_ref,
+                    cell._input,
+                )
+            }
+            memo[id(cell._surfaces)] = montepy.surface_collection.Surfaces()
+            memo[id(cell._complements)] = montepy.cells.Cells()
+            template = copy.deepcopy(cell, memo)
+            template.universe = None
+            if template.lattice_type is not None:
+                template.lattice_type = None
+            template.fill.multiple_universes = False
+            template.fill.universe = None
+            template.fill.transform = None
+            self._cell_templates[id(cell)] = pickle.dumps(template)
+        return self._cell_templates[id(cell)]
+
+    def _transform(self, matrix):
+        """Finds the transform for a matrix, so that equal matrices share a transform."""
+        key = _matrix_key(matrix)
+        if key not in self._transforms:
+            transform = montepy.Transform._from_matrix(matrix)
+            number = self._written_transforms.get(key)
+            if number is None:
+                number = next(self._transform_numbers)
+                self._new_transforms.append(transform)
+            transform.number = number
+            self._transforms[key] = transform
+        return self._transforms[key]
+
+    def _surface(self, surface, key):
+        """Finds the copy of a surface moved by a matrix, so repeated universes share their surfaces."""
+        if key == self._identity:
+            return surface
+        cache_key = (id(surface), key)
+        if cache_key not in self._surfaces:
+            if id(surface) not in self._surface_templates:
+                memo = {
+                    id(obj): None
+                    for obj in (
+                        surface._problem_ref,
+                        surface._collection_ref,
+                        surface._input,
+                        surface._transform,
+                        surface._periodic_surface,
+                    )
+                }
+                self._surface_templates[id(surface)] = pickle.dumps(
+                    copy.deepcopy(surface, memo)
+                )
+            new_surface = pickle.loads(self._surface_templates[id(surface)])
+            number = self._written_surfaces.get(cache_key)
+            if number is None:
+                number = next(self._surface_numbers)
+                self._new_surfaces.append(new_surface)
+            new_surface.number = number
+            matrix = self._matrices[key]
+            if surface.transform is not None:
+                matrix = matrix @ surface.transform.as_matrix()
+            if _matrix_key(matrix) != self._identity:
+                new_surface.transform = self._transform(matrix)
+            self._surfaces[cache_key] = new_surface
+        return self._surfaces[cache_key]
+
+    def _rebuild(self, node, key, inline, cells=frozenset()):
+        """Copies a geometry tree, with its surfaces moved by a matrix.
+
+        Parameters
+        ----------
+        node : HalfSpace
+            the geometry to copy.
+        key : tuple
+            the key of the matrix to move the surfaces by.
+        inline : Callable[[Cell], bool]
+            whether a complemented cell should be replaced with its geometry.
+        cells : frozenset[int]
+            the ids of the complemented cells that are being inlined.
+        """
+        if isinstance(node, UnitHalfSpace):
+            divider = node.divider
+            if not node.is_cell:
+                return UnitHalfSpace(self._surface(divider, key), node.side, False)
+            if not inline(divider):
+                return UnitHalfSpace(divider, node.side, True)
+            if id(divider) in cells:
+                raise IllegalState(
+                    f"Cell {divider.number} is complemented by its own geometry."
+                )
+            inner = self._rebuild(divider.geometry, key, inline, cells | {id(divider)})
+            # a complemented cell is already under a complement node, so only its geometry is inlined
+            if node.side:
+                return inner
+            return HalfSpace(inner, Operator.COMPLEMENT)
+        left = self._rebuild(node.left, key, inline, cells)
+        if node.right is None:
+            if (
+                node.operator == Operator.COMPLEMENT
+                and isinstance(left, UnitHalfSpace)
+                and not left.is_cell
+            ):
+                # a cell bounded by one surface was inlined, which can't be written as ``#-1``
+                return UnitHalfSpace(left.divider, not left.side, False)
+            return HalfSpace(left, node.operator)
+        return HalfSpace(
+            left, node.operator, self._rebuild(node.right, key, inline, cells)
+        )
+
+    def _make_cells(self, numbers, replaced, batch_size):
+        """Makes the new cells, a batch at a time.
+
+        Parameters
+        ----------
+        numbers : Iterable[int]
+            the number for each new cell.
+        replaced : dict[int, list[int]]
+            the numbers of the new cells are added to the number of the filled cell they replace.
+        batch_size : int
+            the most cells in a batch.
+
+        Returns
+        -------
+        Generator[list[Cell]]
+        """
+        batch = []
+        for (top, source, chain), number in zip(self._iter_leaves(), numbers):
+            replaced[top.number].append(number)
+            cell = pickle.loads(self._cell_template(source))
+            cell.number = number
+            parts = []
+            while chain is not None:
+                chain, geometry_cell, key = chain
+                parts.append(
+                    _grouped(self._rebuild(geometry_cell.geometry, key, lambda _: True))
+                )
+            geometry = parts.pop()
+            while parts:
+                geometry = HalfSpace(geometry, Operator.INTERSECTION, parts.pop())
+            cell.geometry = geometry
+            cell.material = source.material
+            batch.append(cell)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _plan(self):
+        """Finds what is removed, and what is kept, without changing the problem.
+
+        Returns
+        -------
+        tuple[range, list[Cell], set[int], dict[int, HalfSpace], dict[int, list[int]]]
+            The numbers of the new cells, the cells that are removed and their ids,
+            the new geometries of the cells that complement removed cells,
+            and the filled cells to the numbers of the cells that will replace them.
+        """
+        problem = self._problem
+        cycles = problem.universes.graph().cycles
+        if cycles:
+            raise IllegalState(
+                f"Universes can't be flattened, because they fill themselves: {cycles}"
+            )
+        count = self._count_leaves()
+        filled = [cell for cell in self._cells_in(0) if _is_filled(cell)]
+        removed = filled + [
+            cell
+            for cell in problem.cells
+            if cell.universe is not None and cell.universe.number != 0
+        ]
+        removed_ids = {id(cell) for cell in removed}
+        start = max(problem.cells.numbers, default=0) + 1
+        # cells in the real world may complement the filled cells being removed
+        kept_geometries = {}
+        for cell in problem.cells:
+            if id(cell) in removed_ids or cell.geometry is None:
+                continue
+            if any(id(other) in removed_ids for other in cell.complements):
+                kept_geometries[id(cell)] = self._rebuild(
+                    cell.geometry,
+                    self._identity,
+                    lambda other: id(other) in removed_ids,
+                )
+        self._surface_numbers = itertools.count(
+            max(problem.surfaces.numbers, default=0) + 1
+        )
+        self._transform_numbers = itertools.count(
+            max(problem.transforms.numbers, default=0) + 1
+        )
+        replaced = {cell.number: [] for cell in filled}
+        return (
+            range(start, start + count),
+            removed,
+            removed_ids,
+            kept_geometries,
+            replaced,
+        )
+
+    def flatten(self):
+        """Replaces every filled cell in the real world with the cells that fill it.
+
+        Returns
+        -------
+        dict[int, list[int]]
+            The number of each filled cell that was removed, to the numbers of the cells replacing it.
+        """
+        problem = self._problem
+        numbers, removed, removed_ids, kept_geometries, replaced = self._plan()
+        old_surfaces = {id(surf): surf for cell in removed for surf in cell.surfaces}
+        kept = [cell for cell in problem.cells if id(cell) not in removed_ids]
+        problem.cells._remove_many(removed)
+        problem.universes._remove_many(
+            [universe for universe in problem.universes if universe.number != 0]
+        )
+        for cell in kept:
+            if id(cell) in kept_geometries:
+                # this also drops the removed cells from the complements
+                cell._set_simplified_geometry(kept_geometries[id(cell)])
+        with _relaxed_gc():
+            # the new surfaces and transforms are added to the problem along with the cells
+            for batch in self._make_cells(numbers, replaced, _BATCH_SIZE):
+                problem.cells.extend(batch)
+        self._new_surfaces.clear()
+        self._new_transforms.clear()
+        used = {id(surf) for cell in problem.cells for surf in cell.surfaces}
+        problem.surfaces._remove_many(
+            [surf for key, surf in old_surfaces.items() if key not in used]
+        )
+        return replaced
+
+    def write(self, inp):
+        """Writes the flattened problem to a stream, without changing the problem.
+
+        The new cells are made a batch at a time, and are written to a temporary file,
+        and are then dropped, along with their new surfaces and transforms,
+        which are written to their own temporary files.
+        These are then copied into their blocks, after the objects that are kept from the problem.
+        The data of all cells, such as importances, are written in the cell block.
+
+        Parameters
+        ----------
+        inp : MCNP_InputFile
+            the writable input file.
+
+        Returns
+        -------
+        dict[int, list[int]]
+            The number of each filled cell that was removed, to the numbers of the cells replacing it.
+        """
+        problem = self._problem
+        numbers, removed, removed_ids, kept_geometries, replaced = self._plan()
+        old_surfaces = {id(surf) for cell in removed for surf in cell.surfaces}
+        used = set()
+        kept = []
+        for cell in problem.cells:
+            if id(cell) in removed_ids:
+                continue
+            if id(cell) in kept_geometries:
+                # the cell in the problem is left as it is
+                copied = pickle.loads(self._cell_template(cell))
+                copied.geometry = kept_geometries[id(cell)]
+                copied.material = cell.material
+                cell = copied
+            used.update(id(surf) for surf in cell.surfaces)
+            kept.append(cell)
+        version = problem.mcnp_version
+        with (
+            _Spool(version) as cells,
+            _Spool(version) as surfaces,
+            _Spool(version) as transforms,
+        ):
+            with _relaxed_gc():
+                for batch in self._make_cells(numbers, replaced, _STREAM_BATCH_SIZE):
+                    for cell in batch:
+                        used.update(
+                            id(surf)
+                            for surf in cell.surfaces
+                            if id(surf) in old_surfaces
+                        )
+                        cells.write(cell)
+                    self._write_new(surfaces, transforms)
+                    # the problem is frozen, so this only scans the dropped batch
+                    gc.collect()
+            prints = problem.print_in_data_block
+            prefixes = [
+                input_class._class_prefix()
+                for input_class in montepy.Cell._INPUTS_TO_PROPERTY
+            ]
+            old_prints = {prefix: prints[prefix] for prefix in prefixes}
+            try:
+                for prefix in prefixes:
+                    # the data block can't list the cells that are not in the problem
+                    prints[prefix] = False
+                problem._write_to_stream(
+                    inp,
+                    cells=kept + [cells],
+                    surfaces=[
+                        surf
+                        for surf in problem.surfaces
+                        if id(surf) in used or id(surf) not in old_surfaces
+                    ]
+                    + [surfaces],
+                    data_inputs=problem.data_inputs + [transforms],
+                )
+            finally:
+                for prefix, value in old_prints.items():
+                    prints[prefix] = value
+        return replaced
+
+    def _write_new(self, surfaces, transforms):
+        """Writes the new surfaces and transforms, and drops them along with the cached copies."""
+        for surface in self._new_surfaces:
+            surfaces.write(surface)
+        for transform in self._new_transforms:
+            transforms.write(transform)
+        self._new_surfaces.clear()
+        self._new_transforms.clear()
+        # they can be made again if they are used again, but are not written again
+        for cache_key, surface in self._surfaces.items():
+            self._written_surfaces[cache_key] = surface.number
+        for key, transform in self._transforms.items():
+            self._written_transforms[key] = transform.number
+        self._surfaces.clear()
+        self._transforms.clear()
+
+
+class _Spool:
+    """New inputs written to a temporary file, until they can be copied into their block.
+
+    This acts as a single input, so it can be written along with the other inputs of a block.
+
+    Parameters
+    ----------
+    mcnp_version : tuple[int]
+        the version to write the inputs for.
+    """
+
+    def __init__(self, mcnp_version):
+        self._mcnp_version = mcnp_version
+        self._file = tempfile.TemporaryFile("w+")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+    def write(self, obj):
+        with warnings.catch_warnings():
+            # the new objects are copies, so their values are expected to grow past the text they were copied from
+            warnings.simplefilter("ignore", LineExpansionWarning)
+            lines = obj.format_for_mcnp_input(self._mcnp_version)
+        for line in lines:
+            self._file.write(line + "\n")
+
+    def format_for_mcnp_input(self, mcnp_version):
+        self._file.seek(0)
+        return (line.rstrip("\n") for line in self._file)
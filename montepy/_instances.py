@@ -0,0 +1,229 @@
+# Copyright 2026, Battelle Energy Alliance, LLC All Rights Reserved.
+from __future__ import annotations
+
+import numpy as np
+
+import montepy
+from montepy._locator import _Lattice
+from montepy.exceptions import *
+
+
+def _universe_number(cell):
+    return cell.universe.number if cell.universe is not None else 0
+
+
+def _nested_in(graph, universes):
+    """Finds the universes, and all of the universes that they are nested in.
+
+    Parameters
+    ----------
+    graph : UniverseGraph
+        the graph of the universes.
+    universes : Iterable[int]
+        the numbers of the universes to start from.
+
+    Returns
+    -------
+    set[int]
+        the numbers of the universes, and of every universe that fills them, however deeply.
+    """
+    parents = {}
+    for parent, edges in graph.children.items():
+        for child in edges:
+            parents.setdefault(child, set()).add(parent)
+    found = set(universes)
+    queue = list(found)
+    while queue:
+        for parent in parents.get(queue.pop(), ()):
+            if parent not in found:
+                found.add(parent)
+                queue.append(parent)
+    return found
+
+
+def _translations(offsets):
+    """Makes a stack of 4x4 matrices that translate by each offset."""
+    matrices = np.broadcast_to(np.identity(4), (len(offsets), 4, 4)).copy()
+    matrices[:, :3, 3] = offsets
+    return matrices
+
+
+class _InstanceWalker:
+    """Finds every instance of a cell in the real world, by walking down the fills of the universes that can hold it.
+
+    Only the universes that the cell's universe is nested in are visited,
+    which are found from the cached :class:`~montepy.universes.UniverseGraph`.
+    Lattices are read from their arrays of universe numbers,
+    so no :class:`~montepy.Universe` objects are made for their elements.
+
+    Parameters
+    ----------
+    problem : MCNP_Problem
+        the problem the cell is in.
+    cell : Cell
+        the cell to find the instances of.
+    """
+
+    def __init__(self, problem, cell):
+        self._problem = problem
+        self._target = cell
+        graph = problem.universes.graph()
+        # this raises if the universes fill themselves
+        order = graph.order
+        self._universe = _universe_number(cell)
+        relevant = _nested_in(graph, [self._universe])
+        self._relevant = relevant
+        self._order = [number for number in order if number in relevant]
+        # find the fills up front, so that any errors are raised before any instances are found
+        self._fills = {}
+        for universe in self._order:
+            self._fills_of(universe)
+
+    def _fills_of(self, universe):
+        """Finds the cells of a universe that hold the target cell, and how they hold it.
+
+        Returns
+        -------
+        list[tuple[Cell, list[tuple[int, numpy.ndarray, numpy.ndarray]]]]
+            Each cell, and its elements grouped by the universe filling them,
+            or None for elements that are the target cell itself.
+            Each group has the (E, 3) lattice indices of its elements, or None if the cell is not a lattice,
+            and the (E, 4, 4) matrices that move the elements into the cell's universe.
+        """
+        if universe in self._fills:
+            return self._fills[universe]
+        fills = []
+        for cell in self._problem.cells.where(universe=universe):
+            fill = cell.fill
+            fill_matrix = np.identity(4)
+            if fill.transform is not None:
+                fill_matrix = fill.transform.as_matrix()
+            if cell.lattice_type is not None:
+                elements = self._lattice_elements(cell, fill_matrix)
+                if elements:
+                    fills.append((cell, elements))
+                continue
+            if cell is self._target:
+                fills.append((cell, [(None, None, np.identity(4)[np.newaxis])]))
+            elif fill.universe is not None and fill.universe.number in self._relevant:
+                fills.append(
+                    (cell, [(fill.universe.number, None, fill_matrix[np.newaxis])])
+                )
+        self._fills[universe] = fills
+        return fills
+
+    def _lattice_elements(self, cell, fill_matrix):
+        """Finds the elements of a lattice that hold the target cell, grouped by what fills them."""
+        fill = cell.fill
+        numbers = fill.universe_numbers
+        own = _universe_number(cell)
+        if numbers is None:
+            if fill.universe is None:
+                return []
+            if fill.universe.number in self._relevant or cell is self._target:
+                raise ValueError(
+                    f"Cell {cell.number}: the elements of a lattice filled by a single universe are not known. "
+                    "Fill it with an array of universes instead."
+                )
+            return []
+        elements = []
+        lattice = None
+        for number in np.unique(numbers).tolist():
+            if number in {own, 0}:
+                if cell is not self._target:
+                    continue
+                destination = None
+            elif number in self._relevant:
+                destination = number
+            else:
+                continue
+            if lattice is None:
+                lattice = _Lattice(cell)
+            indices = np.argwhere(numbers == number) + np.asarray(fill.min_index)
+            matrices = _translations(lattice.offsets(indices))
+            if destination is not None:
+                matrices = matrices @ fill_matrix
+            elements.append((destination, indices, matrices))
+        return elements
+
+    def iter_instances(self):
+        """Yields every instance of the cell, depth first.
+
+        Returns
+        -------
+        Generator[tuple[tuple[int, ...], tuple, numpy.ndarray]]
+            The path of cell numbers, the lattice index of each cell on the path, and the matrix of each instance.
+        """
+
+        def visit(universe, path, index, matrix):
+            for cell, elements in self._fills_of(universe):
+                cell_path = path + (cell.number,)
+                for destination, indices, matrices in elements:
+                    for i, element in enumerate(matrices):
+                        cell_index = index + (
+                            None if indices is None else tuple(indices[i].tolist()),
+                        )
+                        if destination is None:
+                            yield cell_path, cell_index, matrix @ element
+                        else:
+                            yield from visit(
+                                destination, cell_path, cell_index, matrix @ element
+                            )
+
+        yield from visit(0, (), (), np.identity(4))
+
+    def instance_arrays(self):
+        """Finds every instance of the cell at once, one level of universes at a time.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            The (N, depth) paths, (N, depth, 3) lattice indices, and (N, 4, 4) matrices of the instances.
+        """
+        start = (
+            np.zeros((1, 0), dtype=np.int64),
+            np.zeros((1, 0, 3), dtype=np.int64),
+            np.identity(4)[np.newaxis],
+        )
+        reached = {0: [start]}
+        found = []
+        for universe in self._order:
+            for paths, indices, matrices in reached.pop(universe, []):
+                count = len(paths)
+                for cell, elements in self._fills_of(universe):
+                    for destination, element_indices, element_matrices in elements:
+                        width = len(element_matrices)
+                        new_paths = np.repeat(paths, width, axis=0)
+                        new_paths = np.column_stack(
+                            [new_paths, np.full(len(new_paths), cell.number)]
+                        )
+                        if element_indices is None:
+                            element_indices = np.zeros((width, 3), dtype=np.int64)
+                        new_indices = np.concatenate(
+                            [
+                                np.repeat(indices, width, axis=0),
+                                np.tile(element_indices, (count, 1))[:, np.newaxis],
+                            ],
+                            axis=1,
+                        )
+                        new_matrices = (
+                            matrices[:, np.newaxis] @ element_matrices[np.newaxis]
+                        ).reshape(-1, 4, 4)
+                        chunk = (new_paths, new_indices, new_matrices)
+                        if destination is None:
+                            found.append(chunk)
+                        else:
+                            reached.setdefault(destination, []).append(chunk)
+        depth = max((paths.shape[1] for paths, _, _ in found), default=1)
+        total = sum(len(paths) for paths, _, _ in found)
+        paths = np.zeros((total, depth), dtype=np.int64)
+        indices = np.zeros((total, depth, 3), dtype=np.int64)
+        matrices = np.empty((total, 4, 4))
+        row = 0
+        for chunk_paths, chunk_indices, chunk_matrices in found:
+            end = row + len(chunk_paths)
+            paths[row:end, : chunk_paths.shape[1]] = chunk_paths
+            indices[row:end, : chunk_paths.shape[1]] = chunk_indices
+            matrices[row:end] = chunk_matrices
+            row = end
+        return paths, indices, matrices
@@ -0,0 +1,474 @@
+# Copyright 2026, Battelle Energy Alliance, LLC All Rights Reserved.
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+import math
+
+import numpy as np
+
+import montepy
+from montepy.data_inputs.lattice import LatticeType
+from montepy.exceptions import *
+from montepy.surfaces.surface import _validate_points
+from montepy.surfaces.surface_type import SurfaceType
+
+_MAX_DEPTH = 64
+"""The deepest universe nesting that will be followed before assuming a fill loop."""
+
+_MAX_BINS = 64
+"""The most bins to use along each axis of a universe's grid."""
+
+_TILE_SIZE = 2**20
+"""The most points to locate at once when rasterizing a slice."""
+
+_PLANE_TYPES = {SurfaceType.P, SurfaceType.PX, SurfaceType.PY, SurfaceType.PZ}
+
+
+class _Lattice:
+    """The element layout of a lattice cell bounded by pairs of planes.
+
+    As in MCNP, crossing the first surface of each pair of a rectangular lattice increases that index.
+    For a hexagonal lattice crossing the first, third, fifth, and seventh surfaces
+    moves to the elements ``[1, 0, 0]``, ``[0, 1, 0]``, ``[-1, 1, 0]``, and ``[0, 0, 1]``.
+
+    Parameters
+    ----------
+    cell : Cell
+        the lattice cell.
+    """
+
+    def __init__(self, cell):
+        self._hexagonal = cell.lattice_type == LatticeType.HEXAGONAL
+        leaves = []
+        for leaf in cell.geometry._iter_leaves():
+            if leaf.is_cell:
+                continue
+            if not any(leaf.divider is other.divider for other in leaves):
+                leaves.append(leaf)
+        if len(leaves) not in ({6, 8} if self._hexagonal else {2, 4, 6}) or any(
+            leaf.divider.surface_type not in _PLANE_TYPES for leaf in leaves
+        ):
+            raise NotImplementedError(
+                f"Cell {cell.number}: only lattices bounded by pairs of planes can be located in."
+            )
+        normals = []
+        lows = []
+        widths = []
+        for far, near in zip(leaves[::2], leaves[1::2]):
+            far_normal, far_offset = self._oriented_plane(far)
+            near_normal, near_offset = self._oriented_plane(near)
+            # crossing the first surface of each pair increases the index
+            scale = np.linalg.norm(far_normal)
+            normal = far_normal / scale
+            low = -near_offset / np.linalg.norm(near_normal)
+            normals.append(normal)
+            lows.append(low)
+            widths.append(far_offset / scale - low)
+        self._normals = np.array(normals)
+        self._lows = np.array(lows)
+        self._widths = np.array(widths)
+        if self._hexagonal:
+            self._center, self._steps = self._hexagonal_steps()
+        else:
+            self._steps = (np.linalg.pinv(self._normals) * self._widths).T
+
+    @staticmethod
+    def _oriented_plane(leaf):
+        """Finds the normal and offset of a plane, oriented so element 0 is on its negative side."""
+        values = leaf.divider.evaluate(np.vstack([np.zeros(3), np.identity(3)]))
+        normal = values[1:] - values[0]
+        offset = -values[0]
+        if leaf.side:
+            return -normal, -offset
+        return normal, offset
+
+    def _hexagonal_steps(self):
+        """Finds the center of element 0 of a hexagonal lattice, and the steps to its neighbours.
+
+        The steps to the elements past the first and third surfaces are found from the middles of those sides.
+        The fifth and sixth surfaces are between the first and third, and the second and fourth.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            The center, and the (2, 3) or (3, 3) steps.
+        """
+        normals = self._normals
+        highs = self._lows + self._widths
+        middles = self._lows + self._widths / 2
+        # the corners are found at the height of the center
+        if len(normals) == 4:
+            height_normal, height = normals[3], middles[3]
+        else:
+            height_normal, height = np.cross(normals[0], normals[1]), 0.0
+
+        def point(first, first_offset, second, second_offset):
+            try:
+                return np.linalg.solve(
+                    np.array([normals[first], normals[second], height_normal]),
+                    [first_offset, second_offset, height],
+                )
+            except np.linalg.LinAlgError as e:
+                raise NotImplementedError(
+                    "Only hexagonal lattices whose sides are not parallel can be located in."
+                ) from e
+
+        center = point(0, middles[0], 1, middles[1])
+        first_third = point(0, highs[0], 1, highs[1])
+        first_sixth = point(0, highs[0], 2, self._lows[2])
+        third_fifth = point(1, highs[1], 2, highs[2])
+        steps = [
+            first_third + first_sixth - 2 * center,
+            first_third + third_fifth - 2 * center,
+        ]
+        if len(normals) == 4:
+            steps.append(
+                np.linalg.solve(
+                    np.array([normals[0], normals[1], normals[3]]),
+                    [0.0, 0.0, self._widths[3]],
+                )
+            )
+        return center, np.array(steps)
+
+    def element_indices(self, points):
+        """Finds the lattice element index of each point, and its position within that element.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            The (N, 3) indices of the elements, and the (N, 3) points moved into element 0.
+        """
+        indices = np.zeros((len(points), 3), dtype=np.int64)
+        if self._hexagonal:
+            return self._hexagonal_indices(points, indices)
+        dims = len(self._normals)
+        indices[:, :dims] = np.floor(
+            (points @ self._normals.T - self._lows) / self._widths
+        )
+        return indices, points - self.offsets(indices)
+
+    def _hexagonal_indices(self, points, indices):
+        """Finds the hexagonal element of each point, from the four elements at the corners of the steps holding it."""
+        dims = len(self._steps)
+        steps = (points - self._center) @ np.linalg.pinv(self._steps)
+        indices[:, :2] = np.floor(steps[:, :2])
+        if dims == 3:
+            indices[:, 2] = np.floor(steps[:, 2] + 0.5)
+        middles = self._lows[:3] + self._widths[:3] / 2
+        best = np.full(len(points), np.inf)
+        chosen = indices.copy()
+        for corner in ([0, 0], [1, 0], [0, 1], [1, 1]):
+            candidate = indices.copy()
+            candidate[:, :2] += corner
+            moved = points - self.offsets(candidate)
+            # how far past the sides of element 0 the moved points are, relative to its size
+            distance = np.max(
+                np.abs(moved @ self._normals[:3].T - middles) / self._widths[:3],
+                axis=1,
+            )
+            closer = distance < best
+            best[closer] = distance[closer]
+            chosen[closer] = candidate[closer]
+        return chosen, points - self.offsets(chosen)
+
+    def offsets(self, indices):
+        """Finds how far the elements with these (N, 3) indices are moved from element 0.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        return indices[:, : len(self._steps)] @ self._steps
+
+    def index_range(self, points):
+        """Finds the lowest and highest indices of the elements that may overlap the convex hull of these points.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+        """
+        indices, _ = self.element_indices(points)
+        low = indices.min(axis=0)
+        high = indices.max(axis=0)
+        if self._hexagonal:
+            # a hexagonal element reaches past the steps holding its center
+            low[:2] -= 1
+            high[:2] += 1
+        return low, high
+
+
+class _UniverseGrid:
+    """A uniform grid over the bounding boxes of the cells of one universe.
+
+    Parameters
+    ----------
+    cells : list[Cell]
+        the cells in the universe.
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+        self._lattices = None
+        # lattice geometries only bound element 0, but the lattice fills the whole cell
+        boxes = np.array(
+            [
+                (
+                    [[-np.inf] * 3, [np.inf] * 3]
+                    if cell.lattice_type is not None
+                    else cell.bounding_box()
+                )
+                for cell in cells
+            ]
+        ).reshape(-1, 2, 3)
+        self._low = np.zeros(3)
+        self._high = np.zeros(3)
+        self._width = np.ones(3)
+        self._bins = np.ones(3, dtype=np.int64)
+        bins = max(1, min(_MAX_BINS, math.ceil(2 * len(cells) ** (1 / 3))))
+        for axis in range(3):
+            bounds = boxes[:, :, axis]
+            finite = bounds[np.isfinite(bounds)]
+            if len(finite) == 0 or finite.min() == finite.max():
+                continue
+            self._low[axis] = finite.min()
+            self._high[axis] = finite.max()
+            # add a bin on each side for everything outside of the finite boxes
+            self._bins[axis] = bins + 2
+            self._width[axis] = (finite.max() - finite.min()) / bins
+        self.boxes = boxes
+        self._ranges = [(self._bin_of(box[0]), self._bin_of(box[1])) for box in boxes]
+
+    @property
+    def lattices(self):
+        """The layout of each lattice cell, or None for cells that are not lattices.
+
+        Returns
+        -------
+        list[_Lattice]
+        """
+        if self._lattices is None:
+            self._lattices = [
+                _Lattice(cell) if cell.lattice_type is not None else None
+                for cell in self.cells
+            ]
+        return self._lattices
+
+    def _bin_of(self, points):
+        points = np.asarray(points)
+        bins = np.zeros(points.shape, dtype=np.int64)
+        # axes with a single bin are skipped, since everything is in bin 0
+        for axis in np.flatnonzero(self._bins > 1):
+            values = points[..., axis]
+            inner = (values - self._low[axis]) / self._width[axis]
+            column = np.clip(inner, 0, self._bins[axis] - 3).astype(np.int64) + 1
+            column = np.where(values < self._low[axis], 0, column)
+            bins[..., axis] = np.where(
+                values > self._high[axis], self._bins[axis] - 1, column
+            )
+        return bins
+
+    def candidates(self, points):
+        """Finds which cells each point may be in.
+
+        Returns
+        -------
+        Generator[tuple[int, numpy.ndarray]]
+            The index of each cell, and the indices of the points that are in its bins.
+        """
+        if np.all(self._bins == 1):
+            everything = np.arange(len(points))
+            for cell_idx, (low, high) in enumerate(self._ranges):
+                if len(points) and not np.any(high < low):
+                    yield cell_idx, everything
+            return
+        voxels = np.ravel_multi_index(self._bin_of(points).T, self._bins)
+        order = np.argsort(voxels, kind="stable")
+        starts = np.searchsorted(voxels[order], np.arange(np.prod(self._bins) + 1))
+        for cell_idx, (low, high) in enumerate(self._ranges):
+            if np.any(high < low):
+                continue
+            block = np.ravel_multi_index(
+                np.meshgrid(*[np.arange(l, h + 1) for l, h in zip(low, high)]),
+                self._bins,
+            ).ravel()
+            begins = starts[block]
+            lengths = starts[block + 1] - begins
+            total = lengths.sum()
+            if total == 0:
+                continue
+            offsets = np.repeat(begins - np.cumsum(lengths) + lengths, lengths)
+            yield cell_idx, order[offsets + np.arange(total)]
+
+
+class _Locator:
+    """Finds the cells containing many points, descending through filled universes.
+
+    Parameters
+    ----------
+    problem : MCNP_Problem
+        the problem to locate points in.
+    """
+
+    def __init__(self, problem):
+        self._cells = problem.cells
+        self._grids = {}
+
+    def _grid(self, universe):
+        if universe not in self._grids:
+            self._grids[universe] = _UniverseGrid(
+                list(self._cells.where(universe=universe))
+            )
+        return self._grids[universe]
+
+    def locate(self, points, universe, workers):
+        """Locates the points in the given universe.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            The cell numbers, material numbers, and fill paths.
+        """
+        points = _validate_points(points)
+        # build all grids before splitting the work up
+        self._build_grids(universe)
+        if workers <= 1 or len(points) < 2 * workers:
+            results = [self._locate_chunk(points, universe)]
+        else:
+            with ThreadPoolExecutor(workers) as executor:
+                results = list(
+                    executor.map(
+                        lambda chunk: self._locate_chunk(chunk, universe),
+                        np.array_split(points, workers),
+                    )
+                )
+        depth = max(result[2].shape[1] for result in results)
+        paths = np.concatenate(
+            [
+                np.pad(result[2], ((0, 0), (0, depth - result[2].shape[1])))
+                for result in results
+            ]
+        )
+        return (
+            np.concatenate([result[0] for result in results]),
+            np.concatenate([result[1] for result in results]),
+            paths,
+        )
+
+    def _build_grids(self, universe):
+        seen = set()
+        stack = [universe]
+        while stack:
+            number = stack.pop()
+            if number in seen:
+                continue
+            seen.add(number)
+            grid = self._grid(number)
+            # find the lattice layouts before the work is split between threads
+            grid.lattices
+            for cell in grid.cells:
+                stack.extend(self._fill_numbers(cell))
+
+    @staticmethod
+    def _fill_numbers(cell):
+        fill = cell.fill
+        numbers = fill.universe_numbers
+        if numbers is not None:
+            return set(np.unique(numbers).tolist()) - {0}
+        if fill.universe is not None:
+            return {fill.universe.number}
+        return set()
+
+    def _locate_chunk(self, points, universe):
+        cells = np.zeros(len(points), dtype=np.int64)
+        materials = np.zeros(len(points), dtype=np.int64)
+        paths = []
+        self._locate_in(
+            universe,
+            points,
+            np.arange(len(points)),
+            0,
+            (cells, materials, paths),
+        )
+        if paths:
+            paths = np.stack(paths, axis=1)
+        else:
+            paths = np.zeros((len(points), 0), dtype=np.int64)
+        return cells, materials, paths
+
+    def _locate_in(self, universe, points, indices, depth, results):
+        if depth >= _MAX_DEPTH:
+            raise IllegalState(
+                f"Universes are nested more than {_MAX_DEPTH} levels deep. There is likely a fill loop."
+            )
+        cells, materials, paths = results
+        if len(paths) <= depth:
+            paths.append(np.zeros(len(cells), dtype=np.int64))
+        grid = self._grid(universe)
+        found = np.full(len(points), -1, dtype=np.int64)
+        local = points
+        lattice_indices = None
+        for cell_idx, candidates in grid.candidates(points):
+            candidates = candidates[found[candidates] < 0]
+            if len(candidates) == 0:
+                continue
+            cell = grid.cells[cell_idx]
+            lattice = grid.lattices[cell_idx]
+            if lattice is not None:
+                if lattice_indices is None:
+                    local = points.copy()
+                    lattice_indices = np.zeros((len(points), 3), dtype=np.int64)
+                elements, moved = lattice.element_indices(points[candidates])
+                inside = cell.contains(moved)
+                lattice_indices[candidates[inside]] = elements[inside]
+                local[candidates[inside]] = moved[inside]
+            else:
+                inside = cell.contains(points[candidates])
+            found[candidates[inside]] = cell_idx
+        hits = np.flatnonzero(found >= 0)
+        hits = hits[np.argsort(found[hits], kind="stable")]
+        cell_indices, starts = np.unique(found[hits], return_index=True)
+        for cell_idx, group in zip(cell_indices, np.split(hits, starts[1:])):
+            cell = grid.cells[cell_idx]
+            global_idx = indices[group]
+            cells[global_idx] = cell.number
+            materials[global_idx] = cell.material.number if cell.material else 0
+            paths[depth][global_idx] = cell.number
+            for fill_universe, fill_mask in self._fill_groups(
+                cell,
+                len(group),
+                None if lattice_indices is None else lattice_indices[group],
+            ):
+                fill_points = local[group[fill_mask]]
+                if cell.fill.transform is not None:
+                    fill_points = cell.fill.transform._to_local_coordinates(fill_points)
+                self._locate_in(
+                    fill_universe,
+                    fill_points,
+                    global_idx[fill_mask],
+                    depth + 1,
+                    results,
+                )
+
+    @staticmethod
+    def _fill_groups(cell, count, lattice_indices):
+        """Splits the points in a cell by the universe they are filled with.
+
+        Returns
+        -------
+        Generator[tuple[int, numpy.ndarray]]
+            The universe number, and a mask of the points filled by it.
+        """
+        fill = cell.fill
+        own = cell.universe.number if cell.universe is not None else 0
+        numbers = fill.universe_numbers
+        if numbers is not None:
+            if lattice_indices is None:
+                return
+            offsets = lattice_indices - np.asarray(fill.min_index, dtype=np.int64)
+            in_array = np.all((offsets >= 0) & (offsets < numbers.shape), axis=1)
+            element_numbers = np.full(len(offsets), own, dtype=np.int64)
+            element_numbers[in_array] = numbers[tuple(offsets[in_array].T)]
+            for number in np.unique(element_numbers):
+                if number not in {own, 0}:
+                    yield int(number), element_numbers == number
+        elif fill.universe is not None and fill.universe.number not in {own, 0}:
+            yield fill.universe.number, np.ones(count, dtype=bool)
@@ -0,0 +1,187 @@
+# Copyright 2026, Battelle Energy Alliance, LLC All Rights Reserved.
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+import math
+
+import numpy as np
+
+_MAX_BATCH = 1_000_000
+"""The most points to sample and hold in memory at once."""
+
+
+def _clip_box(box, bounds):
+    """Limits a box to the given bounds, if any."""
+    if bounds is None:
+        return box
+    return np.array([np.maximum(box[0], bounds[0]), np.minimum(box[1], bounds[1])])
+
+
+def _count_hits(cell, box, rng, count):
+    """Samples points uniformly in a box, and counts how many are in the cell."""
+    hits = 0
+    for start in range(0, count, _MAX_BATCH):
+        size = min(_MAX_BATCH, count - start)
+        hits += int(
+            np.count_nonzero(cell.contains(rng.uniform(box[0], box[1], (size, 3))))
+        )
+    return hits
+
+
+def _estimate_volume(cell, box, rng, samples, rel_error, max_samples):
+    """Estimates the volume of a cell by sampling its bounding box.
+
+    Batches of ``samples`` points are sampled until the relative standard deviation
+    is below ``rel_error``, or ``max_samples`` points have been sampled.
+
+    Returns
+    -------
+    tuple[float, float]
+        The volume and its standard deviation.
+    """
+    if np.any(box[0] >= box[1]):
+        return 0.0, 0.0
+    if not np.all(np.isfinite(box)):
+        return math.nan, math.nan
+    box_volume = float(np.prod(box[1] - box[0]))
+    hits = 0
+    total = 0
+    while True:
+        count = samples if rel_error is None else min(samples, max_samples - total)
+        hits += _count_hits(cell, box, rng, count)
+        total += count
+        fraction = hits / total
+        std_dev = box_volume * math.sqrt(fraction * (1 - fraction) / total)
+        if rel_error is None or total >= max_samples:
+            break
+        if hits > 0 and std_dev <= rel_error * fraction * box_volume:
+            break
+    return fraction * box_volume, std_dev
+
+
+_CLAIM_BATCH = 2**18
+"""The number of points in each batch when checking which cells claim points.
+
+Every batch has its own random stream, so this is fixed to keep results independent of the number of workers.
+"""
+
+
+def _is_graveyard(cell):
+    importances = list(cell.importance.values())
+    return len(importances) > 0 and all(value == 0.0 for value in importances)
+
+
+def _universe_domain(grid):
+    """Finds the box around all finite, non-graveyard cells in a universe.
+
+    Returns
+    -------
+    numpy.ndarray
+        The (2, 3) box, or None if no cells are finite.
+    """
+    boxes = [
+        box
+        for cell, box in zip(grid.cells, grid.boxes)
+        if np.all(np.isfinite(box))
+        and np.all(box[0] <= box[1])
+        and not _is_graveyard(cell)
+    ]
+    if not boxes:
+        return None
+    boxes = np.array(boxes)
+    return np.array([boxes[:, 0].min(axis=0), boxes[:, 1].max(axis=0)])
+
+
+def _find_claims(grid, points):
+    """Finds which cells of a universe claim each point.
+
+    Lattice cells claim every point, because the lattice fills its whole universe.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The indices of the points, and of the cells claiming them, for every claim.
+    """
+    point_hits = []
+    cell_hits = []
+    for cell_idx, candidates in grid.candidates(points):
+        cell = grid.cells[cell_idx]
+        if cell.lattice_type is not None:
+            inside = candidates
+        else:
+            inside = candidates[cell.contains(points[candidates])]
+        point_hits.append(inside)
+        cell_hits.append(np.full(len(inside), cell_idx, dtype=np.int64))
+    if not point_hits:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(point_hits), np.concatenate(cell_hits)
+
+
+def _sample_batch(grid, box, count, seed):
+    """Samples a batch of points in a universe, and finds the gaps and overlaps.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        The points in no cell,
+        the points in more than one cell,
+        and the (M, 2) cell numbers of each overlapping pair.
+        Points in more than two cells are repeated for every pair.
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(box[0], box[1], (count, 3))
+    point_hits, cell_hits = _find_claims(grid, points)
+    counts = np.bincount(point_hits, minlength=len(points))
+    gaps = points[counts == 0]
+    overlapping = counts[point_hits] > 1
+    point_hits = point_hits[overlapping]
+    numbers = np.array([cell.number for cell in grid.cells], dtype=np.int64)[
+        cell_hits[overlapping]
+    ]
+    order = np.lexsort((numbers, point_hits))
+    point_hits = point_hits[order]
+    numbers = numbers[order]
+    pair_points = []
+    pairs = []
+    # every claim of a point is paired with every later claim of the same point
+    for offset in range(1, int(counts.max(initial=0))):
+        same = point_hits[:-offset] == point_hits[offset:]
+        pair_points.append(point_hits[:-offset][same])
+        pairs.append(
+            np.stack([numbers[:-offset][same], numbers[offset:][same]], axis=1)
+        )
+    if not pairs:
+        return gaps, np.zeros((0, 3)), np.zeros((0, 2), dtype=np.int64)
+    return gaps, points[np.concatenate(pair_points)], np.concatenate(pairs)
+
+
+def _sample_claims(grid, box, samples, seed, workers):
+    """Samples points uniformly in a box in a universe, and finds the gaps and overlaps.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, dict[tuple[int, int], numpy.ndarray]]
+        The points in no cell, and the points in each overlapping pair of cells.
+    """
+    counts = [
+        min(_CLAIM_BATCH, samples - start) for start in range(0, samples, _CLAIM_BATCH)
+    ]
+    seeds = seed.spawn(len(counts))
+
+    def sample(args):
+        return _sample_batch(grid, box, *args)
+
+    if workers <= 1:
+        results = list(map(sample, zip(counts, seeds)))
+    else:
+        with ThreadPoolExecutor(workers) as executor:
+            results = list(executor.map(sample, zip(counts, seeds)))
+    gaps = np.concatenate([result[0] for result in results])
+    points = np.concatenate([result[1] for result in results])
+    pairs = np.concatenate([result[2] for result in results])
+    overlaps = {}
+    if len(pairs):
+        unique, inverse = np.unique(pairs, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        for idx, (first, second) in enumerate(unique):
+            overlaps[(int(first), int(second))] = points[inverse == idx]
+    return gaps, overlaps
@@ -0,0 +1,535 @@
+# Copyright 2026, Battelle Energy Alliance, LLC All Rights Reserved.
+from __future__ import annotations
+import pickle
+
+import numpy as np
+
+import montepy
+from montepy.exceptions import *
+from montepy.surfaces import half_space
+from montepy.surfaces.surface_type import SurfaceType
+from montepy.utilities import _relaxed_gc
+
+_ST = SurfaceType
+
+_TOLERANCE = 1e-12
+"""Rotations and translations this close to zero are ignored."""
+
+_DECIMALS = 12
+"""The decimals the moved surface constants are rounded to."""
+
+_AXIS_TYPES = {
+    axis: types
+    for axis, types in enumerate(
+        [
+            (_ST.PX, _ST.SX, _ST.CX, _ST.C_X, _ST.KX, _ST.K_X, _ST.X),
+            (_ST.PY, _ST.SY, _ST.CY, _ST.C_Y, _ST.KY, _ST.K_Y, _ST.Y),
+            (_ST.PZ, _ST.SZ, _ST.CZ, _ST.C_Z, _ST.KZ, _ST.K_Z, _ST.Z),
+        ]
+    )
+}
+_PLANE, _SPHERE, _CYLINDER, _CYLINDER_PAR, _CONE, _CONE_PAR, _POINTS = range(7)
+
+
+def _axis_of(surface_type):
+    for axis, types in _AXIS_TYPES.items():
+        if surface_type in types:
+            return axis, types.index(surface_type)
+    return None, None
+
+
+def _off_axes(axis):
+    return [other for other in range(3) if other != axis]
+
+
+def _translation_slots(surface_type, length):
+    """Finds which surface constants are coordinates that are moved by a translation.
+
+    Returns
+    -------
+    tuple[list[tuple[int, int]], set[int]]
+        The index of each coordinate with its axis,
+        and the axes along which the surface does not change.
+        None if the surface type can not be translated in its own form.
+    """
+    if surface_type == _ST.SO:
+        return [], set()
+    if surface_type in {_ST.S, _ST.TX, _ST.TY, _ST.TZ}:
+        return [(0, 0), (1, 1), (2, 2)], set()
+    if surface_type == _ST.SQ:
+        return [(7, 0), (8, 1), (9, 2)], set()
+    if surface_type == _ST.RPP:
+        return [(i, i // 2) for i in range(6)], set()
+    axis, kind = _axis_of(surface_type)
+    if axis is None:
+        return None
+    off = _off_axes(axis)
+    if kind == _PLANE:
+        return [(0, axis)], set(off)
+    if kind in {_SPHERE, _CONE}:
+        return [(0, axis)], set()
+    if kind == _CYLINDER:
+        return [], {axis}
+    if kind == _CYLINDER_PAR:
+        return [(0, off[0]), (1, off[1])], {axis}
+    if kind == _CONE_PAR:
+        return [(0, 0), (1, 1), (2, 2)], set()
+    # the X, Y, and Z surfaces are pairs of axial coordinates and radii
+    return [(i, axis) for i in range(0, length, 2)], set()
+
+
+_RIGID_LAYOUTS = {
+    _ST.S: "p",
+    _ST.SPH: "p",
+    _ST.RCC: "pv",
+    _ST.BOX: "pvvv",
+    _ST.RHP: "pvvvv",
+    _ST.HEX: "pvvvv",
+    _ST.REC: "pvvv",
+    _ST.TRC: "pv",
+    _ST.WED: "pvvv",
+    _ST.ARB: "pppppppp",
+}
+"""The layout of points (p) and vectors (v) at the start of the constants of surfaces that can be moved in any way."""
+
+
+def _general_type(surface_type, length):
+    """Finds the more general type of surface to fall back to,
+    when a surface type can not be moved in its own form.
+
+    Returns
+    -------
+    tuple[SurfaceType, int]
+        the type to fall back to and its number of constants, or None if there is none.
+    """
+    if surface_type in {_ST.SO, _ST.SX, _ST.SY, _ST.SZ}:
+        return _ST.S, 4
+    if surface_type == _ST.RPP:
+        return _ST.BOX, 12
+    if surface_type == _ST.SQ:
+        return _ST.GQ, 10
+    axis, kind = _axis_of(surface_type)
+    if kind == _PLANE or surface_type == _ST.P:
+        return _ST.P, 4
+    if kind in {_CYLINDER, _CONE}:
+        return _AXIS_TYPES[axis][kind + 1], length + 2
+    # cones of one nappe can not be written as a quadric
+    if kind == _CYLINDER_PAR or (kind == _CONE_PAR and length == 4):
+        return _ST.GQ, 10
+    return None
+
+
+_REVOLUTION_TYPES = {
+    montepy.surfaces.surface._PLANE_SHAPE: (_PLANE, 1),
+    montepy.surfaces.surface._CYLINDER_SHAPE: (_CYLINDER, 1),
+    montepy.surfaces.surface._CONE_SHAPE: (_CONE, 3),
+}
+
+
+def _first_generalizations(surface_type, length, group):
+    """Splits a group of surfaces by the first type they are generalized to.
+
+    Surfaces of revolution defined by points are first written as the plane, cylinder, cone,
+    or ``SQ`` they are, so they are split by which one it is.
+    Other surfaces are all generalized the same way.
+
+    Returns
+    -------
+    list[tuple[tuple[SurfaceType, int], list[Surface]]]
+        The type and number of constants to generalize to first, or None to use :func:`_general_type`,
+        and the surfaces to generalize to it.
+    """
+    axis, kind = _axis_of(surface_type)
+    if kind != _POINTS:
+        return [(None, group)]
+    splits = {}
+    for surf in group:
+        shape, _ = montepy.surfaces.surface._revolution_shape(
+            [node.value for node in surf._surface_constants]
+        )
+        if shape in _REVOLUTION_TYPES:
+            shape_kind, count = _REVOLUTION_TYPES[shape]
+            first = (_AXIS_TYPES[axis][shape_kind], count)
+        else:
+            first = (_ST.SQ, 10)
+        splits.setdefault(first, []).append(surf)
+    return list(splits.items())
+
+
+def _can_move(surface_type, length, rotates, translation):
+    """Whether a surface type can be moved by a matrix without changing its form."""
+    if surface_type == _ST.P:
+        # the sense of a plane through three points depends on where the origin is
+        return length < 9
+    if surface_type in _RIGID_LAYOUTS or surface_type in {_ST.GQ, _ST.ELL}:
+        return True
+    if rotates:
+        return False
+    slots = _translation_slots(surface_type, length)
+    if slots is None:
+        return False
+    moved, free = slots
+    axes = {axis for _, axis in moved} | free
+    return all(
+        axis in axes for axis in np.flatnonzero(np.abs(translation) > _TOLERANCE)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Conversions to more general types.
+#
+# These take an (N, M) array of surface constants, and return the constants of the
+# same surfaces written as the more general type.
+# ---------------------------------------------------------------------------
+
+
+def _to_sphere(surface_type, constants):
+    ret = np.zeros((len(constants), 4))
+    ret[:, 3] = constants[:, -1]
+    axis, _ = _axis_of(surface_type)
+    if axis is not None:
+        ret[:, axis] = constants[:, 0]
+    return ret
+
+
+def _to_box(constants):
+    ret = np.zeros((len(constants), 12))
+    ret[:, 0:3] = constants[:, 0::2]
+    for axis in range(3):
+        ret[:, 3 + 4 * axis] = constants[:, 2 * axis + 1] - constants[:, 2 * axis]
+    return ret
+
+
+def _points_to_plane(constants):
+    """Writes planes through three points with coefficients, with the same sense.
+
+    MCNP puts the origin on the negative side of these planes.
+    If a plane passes through the origin then the points :math:`(0, 0, \\infty)`,
+    :math:`(0, \\infty, 0)`, and :math:`(\\infty, 0, 0)` are checked in turn to be on the positive side.
+    """
+    points = constants[:, 0:9].reshape(-1, 3, 3)
+    normals = np.cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0])
+    offsets = np.einsum("ni,ni->n", normals, points[:, 0])
+    checks = np.column_stack([offsets, normals[:, ::-1]])
+    deciding = checks[np.arange(len(checks)), np.argmax(checks != 0.0, axis=1)]
+    flip = np.where(deciding < 0.0, -1.0, 1.0)
+    ret = np.zeros((len(constants), 4))
+    ret[:, 0:3] = normals * flip[:, np.newaxis]
+    ret[:, 3] = offsets * flip
+    return ret
+
+
+def _to_plane(surface_type, constants):
+    if surface_type == _ST.P:
+        return _points_to_plane(constants)
+    axis, _ = _axis_of(surface_type)
+    ret = np.zeros((len(constants), 4))
+    ret[:, axis] = 1.0
+    ret[:, 3] = constants[:, 0]
+    return ret
+
+
+def _to_par_axis(surface_type, constants):
+    """Moves a cylinder or cone on an axis to the par-axis form."""
+    axis, kind = _axis_of(surface_type)
+    if kind == _CYLINDER:
+        ret = np.zeros((len(constants), 3))
+        ret[:, 2] = constants[:, 0]
+        return ret
+    ret = np.zeros((len(constants), constants.shape[1] + 2))
+    ret[:, axis] = constants[:, 0]
+    ret[:, 3:] = constants[:, 1:]
+    return ret
+
+
+def _to_quadric(surface_type, constants):
+    """Writes axis-aligned quadrics as general quadrics."""
+    count = len(constants)
+    squares = np.zeros((count, 3))
+    linears = np.zeros((count, 3))
+    center = np.zeros((count, 3))
+    offset = np.zeros(count)
+    if surface_type == _ST.SQ:
+        squares = constants[:, 0:3]
+        linears = 2 * constants[:, 3:6]
+        center = constants[:, 7:10]
+        offset = constants[:, 6]
+    else:
+        axis, kind = _axis_of(surface_type)
+        off = _off_axes(axis)
+        squares[:, off] = 1.0
+        if kind == _CYLINDER_PAR:
+            center[:, off] = constants[:, 0:2]
+            offset = -constants[:, 2] ** 2
+        else:
+            center = constants[:, 0:3]
+            squares[:, axis] = -constants[:, 3]
+    # expand the squares around the center
+    ret = np.zeros((count, 10))
+    ret[:, 0:3] = squares
+    ret[:, 6:9] = linears - 2 * squares * center
+    ret[:, 9] = np.sum(squares * center**2 - linears * center, axis=1) + offset
+    return ret
+
+
+def _from_revolution(surface_type, constants, target):
+    """Writes surfaces of revolution defined by points as the plane, cylinder, cone, or ``SQ`` they are."""
+    axis, _ = _axis_of(surface_type)
+    if target == _ST.SQ:
+        ret = np.zeros((len(constants), 10))
+        ret[:, 0:3] = 1.0
+    else:
+        ret = np.zeros((len(constants), 1 if _axis_of(target)[1] != _CONE else 3))
+    for row, values in zip(ret, constants.tolist()):
+        _, params = montepy.surfaces.surface._revolution_shape(values)
+        if target == _ST.SQ:
+            # r^2 = at^2 + bt + k
+            a, b, k = params
+            row[axis] = -a
+            row[3 + axis] = -b / 2
+            row[6] = -k
+        else:
+            row[:] = params
+    return ret
+
+
+def _generalize(surface_type, constants, target):
+    if _axis_of(surface_type)[1] == _POINTS:
+        return _from_revolution(surface_type, constants, target)
+    if target == _ST.S:
+        return _to_sphere(surface_type, constants)
+    if target == _ST.BOX:
+        return _to_box(constants)
+    if target == _ST.P:
+        return _to_plane(surface_type, constants)
+    if target == _ST.GQ:
+        return _to_quadric(surface_type, constants)
+    return _to_par_axis(surface_type, constants)
+
+
+# ---------------------------------------------------------------------------
+# Moving surfaces in their own form
+# ---------------------------------------------------------------------------
+
+
+def _move_points(points, matrix):
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def _move(surface_type, constants, matrix):
+    """Moves surfaces of one type by a matrix.
+
+    Parameters
+    ----------
+    surface_type : SurfaceType
+        the type of the surfaces.
+    constants : numpy.ndarray
+        An (N, M) array of the surface constants.
+    matrix : numpy.ndarray
+        the 4x4 matrix that moves points.
+
+    Returns
+    -------
+    numpy.ndarray
+        the (N, M) surface constants of the moved surfaces.
+    """
+    ret = constants.copy()
+    rotation = matrix[:3, :3]
+    length = constants.shape[1]
+    if surface_type == _ST.GQ:
+        inverse = np.linalg.inv(matrix)
+        back, shift = inverse[:3, :3], inverse[:3, 3]
+        quadratic = np.zeros((len(constants), 3, 3))
+        quadratic[:, [0, 1, 2], [0, 1, 2]] = constants[:, 0:3]
+        for i, (row, column) in zip((3, 4, 5), ((0, 1), (1, 2), (2, 0))):
+            quadratic[:, row, column] = quadratic[:, column, row] = constants[:, i] / 2
+        linears = constants[:, 6:9]
+        moved = np.einsum("ji,njk,kl->nil", back, quadratic, back)
+        ret[:, 0:3] = moved[:, [0, 1, 2], [0, 1, 2]]
+        ret[:, 3] = 2 * moved[:, 0, 1]
+        ret[:, 4] = 2 * moved[:, 1, 2]
+        ret[:, 5] = 2 * moved[:, 2, 0]
+        ret[:, 6:9] = (2 * np.einsum("njk,k->nj", quadratic, shift) + linears) @ back
+        ret[:, 9] = (
+            np.einsum("j,njk,k->n", shift, quadratic, shift)
+            + linears @ shift
+            + constants[:, 9]
+        )
+        return ret
+    if surface_type == _ST.P:
+        normals = constants[:, 0:3] @ np.linalg.inv(rotation)
+        ret[:, 0:3] = normals
+        ret[:, 3] = constants[:, 3] + normals @ matrix[:3, 3]
+        return ret
+    if surface_type == _ST.ELL:
+        ret[:, 0:3] = _move_points(constants[:, 0:3], matrix)
+        # the second point is the other focus, or the major axis
+        foci = constants[:, 6:7] > 0.0
+        ret[:, 3:6] = np.where(
+            foci,
+            _move_points(constants[:, 3:6], matrix),
+            constants[:, 3:6] @ rotation.T,
+        )
+        return ret
+    layout = _RIGID_LAYOUTS.get(surface_type)
+    if layout is not None:
+        for i, kind in enumerate(layout):
+            start = 3 * i
+            if start + 3 > length:
+                break
+            if kind == "p":
+                ret[:, start : start + 3] = _move_points(
+                    constants[:, start : start + 3], matrix
+                )
+            else:
+                ret[:, start : start + 3] = constants[:, start : start + 3] @ rotation.T
+        return ret
+    moved, _ = _translation_slots(surface_type, length)
+    for index, axis in moved:
+        ret[:, index] += matrix[axis, 3]
+    return ret
+
+
+def _template(surface_type, length):
+    """Pickles a surface of a type, which is much faster to copy than to parse."""
+    key = (surface_type, length)
+    if key not in _TEMPLATES:
+        surface = montepy.surfaces.surface_builder.parse_surface(
+            f"1 {surface_type.value} " + " ".join(["1.0"] * length)
+        )
+        _TEMPLATES[key] = pickle.dumps(surface)
+    return _TEMPLATES[key]
+
+
+_TEMPLATES = {}
+
+
+def _replacement(surface, surface_type, constants):
+    """Makes a new surface of a different type to replace a surface."""
+    new_surface = pickle.loads(_template(surface_type, len(constants)))
+    new_surface.number = surface.number
+    for node, value in zip(new_surface._surface_constants, constants):
+        node.value = value
+    new_surface._is_reflecting = surface._is_reflecting
+    new_surface._is_white_boundary = surface._is_white_boundary
+    new_surface._periodic_surface = surface._periodic_surface
+    return new_surface
+
+
+def _replace_surfaces(surfaces, replacements):
+    """Replaces surfaces everywhere that they are used.
+
+    Parameters
+    ----------
+    surfaces : Surfaces
+        the collection being moved.
+    replacements : dict[int, Surface]
+        the new surface for the id of each surface being replaced.
+    """
+    # slices of a problem's surfaces are not linked to it, but their surfaces are
+    problem = surfaces._problem
+    for surf in surfaces:
+        if problem:
+            break
+        problem = surf._problem
+    if problem:
+        for cell in problem.cells:
+            if not any(id(surf) in replacements for surf in cell.surfaces):
+                continue
+            cell.surfaces._replace_many(replacements)
+            if cell.geometry is not None:
+                for leaf in cell.geometry._iter_leaves():
+                    if not leaf.is_cell and id(leaf._divider) in replacements:
+                        leaf._divider = replacements[id(leaf._divider)]
+    surfaces._replace_many(replacements)
+    everything = surfaces
+    if problem and problem.surfaces is not surfaces:
+        problem.surfaces._replace_many(replacements)
+        everything = problem.surfaces
+    for surf in everything:
+        periodic = surf._periodic_surface
+        if periodic is not None and id(periodic) in replacements:
+            surf._periodic_surface = replacements[id(periodic)]
+
+
+def apply_transform(surfaces, transform):
+    """Moves every surface in a collection by a transform, by rewriting their surface constants.
+
+    See :func:`~montepy.surface_collection.Surfaces.apply_transform`.
+    """
+    matrix = transform.as_matrix()
+    groups = {}
+    for surf in surfaces:
+        if surf.surface_type is None or any(
+            node.value is None for node in surf._surface_constants
+        ):
+            raise IllegalState(
+                f"Surface: {surf.number} does not have a surface type and all constants set."
+            )
+        own = surf._transform
+        key = (surf.surface_type, len(surf._surface_constants), id(own))
+        groups.setdefault(key, (own, []))[1].append(surf)
+    # find how every group is moved before anything is changed
+    plans = []
+    for (surface_type, length, _), (own, whole_group) in groups.items():
+        moving = matrix if own is None else matrix @ own.as_matrix()
+        rotates = not np.allclose(moving[:3, :3], np.identity(3), atol=_TOLERANCE)
+        if _can_move(surface_type, length, rotates, moving[:3, 3]):
+            plans.append(([surface_type], moving, whole_group))
+            continue
+        for first, group in _first_generalizations(surface_type, length, whole_group):
+            types, count = [surface_type], length
+            if first is not None:
+                types.append(first[0])
+                count = first[1]
+            while not _can_move(types[-1], count, rotates, moving[:3, 3]):
+                general = _general_type(types[-1], count)
+                if general is None:
+                    raise NotImplementedError(
+                        f"Surface: {group[0].number} of type: {surface_type.value} "
+                        "can not be moved by this transform without a TR."
+                    )
+                types.append(general[0])
+                count = general[1]
+            plans.append((types, moving, group))
+    with _relaxed_gc():
+        replacements = _move_groups(plans)
+    for _, _, group in plans:
+        for surf in group:
+            half_space._invalidate_geometry(surf)
+    if replacements:
+        _replace_surfaces(surfaces, replacements)
+
+
+def _move_groups(plans):
+    """Rewrites the surface constants of every group of surfaces.
+
+    Returns
+    -------
+    dict[int, Surface]
+        the new surface for the id of each surface that must be replaced.
+    """
+    replacements = {}
+    for types, moving, group in plans:
+        constants = np.array(
+            [[node.value for node in surf._surface_constants] for surf in group],
+            dtype=float,
+        )
+        for current, general in zip(types, types[1:]):
+            constants = _generalize(current, constants, general)
+        surface_type, target = types[0], types[-1]
+        replace = target != surface_type or constants.shape[1] != len(
+            group[0]._surface_constants
+        )
+        constants = _move(target, constants, moving)
+        # round off the error of moving the constants, and add zero to remove negative zeros
+        constants = np.round(constants, _DECIMALS) + 0.0
+        for surf, row in zip(group, constants.tolist()):
+            surf._transform = None
+            if replace:
+                replacements[id(surf)] = _replacement(surf, target, row)
+                continue
+            for node, value in zip(surf._surface_constants, row):
+                if node.value != value:
+                    node.value = value
+    return replacements
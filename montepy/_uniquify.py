@@ -0,0 +1,279 @@
+# Copyright 2026, Battelle Energy Alliance, LLC All Rights Reserved.
+from __future__ import annotations
+import io
+import itertools
+import pickle
+
+import numpy as np
+
+import montepy
+from montepy._instances import _nested_in, _universe_number
+from montepy.exceptions import *
+from montepy.utilities import _relaxed_gc
+
+
+def _new_numbers(taken, count, numbering):
+    """Finds numbers for new objects that are not in use.
+
+    Parameters
+    ----------
+    taken : set[int]
+        the numbers already in use.
+    count : int
+        how many numbers are needed.
+    numbering : str
+        ``"offset"`` for the numbers after the largest number in use,
+        or ``"compact"`` for the lowest numbers that are not in use.
+
+    Returns
+    -------
+    list[int]
+        the new numbers, in increasing order.
+    """
+    if numbering == "offset":
+        start = max(taken, default=0) + 1
+        return list(range(start, start + count))
+    free = (number for number in itertools.count(1) if number not in taken)
+    return list(itertools.islice(free, count))
+
+
+class _TemplatePickler(pickle.Pickler):
+    """Pickles objects, but only refers to the objects that are shared with the copies."""
+
+    def __init__(self, file, shared):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self._shared = shared
+
+    def persistent_id(self, obj):
+        key = id(obj)
+        if key in self._shared:
+            return key
+        return None
+
+
+class _TemplateUnpickler(pickle.Unpickler):
+    """Unpickles a copy made by :class:`_TemplatePickler`, with the shared objects filled back in."""
+
+    def __init__(self, file, shared):
+        super().__init__(file)
+        self._shared = shared
+
+    def persistent_load(self, key):
+        return self._shared[key]
+
+
+class _Uniquifier:
+    """Gives every instance of some cells its own material, by copying the universes that they are in.
+
+    Every universe that holds the cells is copied once for every time it is used after the first,
+    so the first instance of every universe keeps the original cells and universe.
+    The cells of each universe are pickled together once,
+    with the surfaces, materials, universes, and named transforms shared, rather than copied,
+    so every copy of a universe is one ``pickle.loads``.
+    Every material is also pickled once, so the copies only share the ``Nucleus`` and ``Library`` singletons.
+
+    Parameters
+    ----------
+    problem : MCNP_Problem
+        the problem the cells are in.
+    cells : list[Cell]
+        the cells to give their own materials.
+    numbering : str
+        the scheme to number the new cells, universes, and materials with.
+    """
+
+    def __init__(self, problem, cells, numbering):
+        self._problem = problem
+        self._targets = {id(cell): cell for cell in cells if cell.material is not None}
+        self._numbering = numbering
+        self._shared = None
+        self._material_templates = {}
+        self._slots = {}
+        self._universe_numbers = None
+        self._cell_numbers = None
+        self._material_numbers = None
+        self._new_universes = []
+        self._new_materials = []
+        self._found = {cell.number: [] for cell in self._targets.values()}
+
+    def _plan(self):
+        """Finds the cells of every universe to copy, and how many of each object will be made.
+
+        Returns
+        -------
+        tuple[list[int], dict[int, list[Cell]]]
+            The universes holding the cells from the outside in, and the original cells in each of them.
+        """
+        problem = self._problem
+        graph = problem.universes.graph()
+        # this raises if the universes fill themselves
+        order = graph.order
+        instances = graph.instances
+        targets = {_universe_number(cell) for cell in self._targets.values()}
+        relevant = _nested_in(graph, targets)
+        order = [number for number in order if number in relevant]
+        originals = {
+            number: list(problem.cells.where(universe=number)) for number in order
+        }
+        for cells in originals.values():
+            for cell in cells:
+                fill = cell.fill
+                if (
+                    cell.lattice_type is not None
+                    and fill.universe_numbers is None
+                    and fill.universe is not None
+                    and fill.universe.number in relevant
+                ):
+                    raise ValueError(
+                        f"Cell {cell.number}: the elements of a lattice filled by a single universe can not be given their own universes. "
+                        "Fill it with an array of universes instead."
+                    )
+        copies = {number: max(instances[number] - 1, 0) for number in order}
+        copies[0] = 0
+        materials = sum(
+            instances[_universe_number(cell)] for cell in self._targets.values()
+        )
+        self._universe_numbers = iter(
+            _new_numbers(
+                set(problem.universes.numbers) | {0},
+                sum(copies.values()),
+                self._numbering,
+            )
+        )
+        self._cell_numbers = iter(
+            _new_numbers(
+                set(problem.cells.numbers),
+                sum(copies[number] * len(originals[number]) for number in order),
+                self._numbering,
+            )
+        )
+        self._material_numbers = iter(
+            _new_numbers(set(problem.materials.numbers), materials, self._numbering)
+        )
+        return order, originals
+
+    def _share(self):
+        """Finds the objects that copies of cells share, rather than copy."""
+        problem = self._problem
+        shared = {}
+        for collection in (problem.surfaces, problem.materials, problem.universes):
+            for obj in collection:
+                shared[id(obj)] = obj
+        for transform in problem.transforms:
+            if not transform.hidden_transform:
+                shared[id(transform)] = transform
+        for cell in problem.cells:
+            shared[id(cell)] = cell
+            if cell._input is not None:
+                shared[id(cell._input)] = cell._input
+        self._shared = shared
+
+    def _cell_template(self, cells):
+        """Pickles all of the cells of a universe together, so complements between them are copied too."""
+        own = {id(cell) for cell in cells}
+        shared = {key: obj for key, obj in self._shared.items() if key not in own}
+        stream = io.BytesIO()
+        _TemplatePickler(stream, shared).dump(cells)
+        return stream.getvalue(), shared
+
+    def _material(self, material):
+        """Makes a new copy of a material with a new number."""
+        if id(material) not in self._material_templates:
+            self._material_templates[id(material)] = pickle.dumps(
+                material, pickle.HIGHEST_PROTOCOL
+            )
+        new_material = pickle.loads(self._material_templates[id(material)])
+        new_material.number = next(self._material_numbers)
+        self._new_materials.append(new_material)
+        return new_material
+
+    def _claim(self, number, count):
+        """Claims the universes for the next instances of a universe.
+
+        The first instance of every universe is the original universe.
+
+        Returns
+        -------
+        list[Universe]
+        """
+        slots = self._slots.setdefault(number, [])
+        claimed = []
+        for _ in range(count):
+            if slots:
+                universe = montepy.Universe(next(self._universe_numbers))
+                self._new_universes.append(universe)
+            else:
+                universe = self._problem.universes[number]
+            slots.append(universe)
+            claimed.append(universe)
+        return claimed
+
+    def _update_fill(self, cell, relevant):
+        """Points a fill to the universes claimed for its instances."""
+        fill = cell.fill
+        numbers = fill.universe_numbers
+        if numbers is not None:
+            own = _universe_number(cell)
+            table = dict(fill._universe_table)
+            new_numbers = numbers.copy()
+            for number in np.unique(numbers).tolist():
+                if number in {own, 0} or number not in relevant:
+                    continue
+                mask = numbers == number
+                claimed = self._claim(number, int(np.count_nonzero(mask)))
+                new_numbers[mask] = [universe.number for universe in claimed]
+                table.update((universe.number, universe) for universe in claimed)
+            fill._set_universe_numbers(new_numbers, table)
+        elif fill.universe is not None and fill.universe.number in relevant:
+            fill.universe = self._claim(fill.universe.number, 1)[0]
+
+    def _make_cells(self, order, originals):
+        """Copies the universes, and gives every instance of the cells a new material.
+
+        Returns
+        -------
+        list[Cell]
+            the new copies of cells.
+        """
+        relevant = set(order)
+        self._slots[0] = [self._problem.universes.get(0)]
+        new_cells = []
+        for number in order:
+            cells = originals[number]
+            slots = self._slots.get(number, [])
+            if len(slots) > 1:
+                template, shared = self._cell_template(cells)
+            for i, universe in enumerate(slots):
+                if i == 0:
+                    copies = cells
+                else:
+                    copies = _TemplateUnpickler(io.BytesIO(template), shared).load()
+                    for cell in copies:
+                        cell.number = next(self._cell_numbers)
+                        cell.universe = universe
+                    new_cells.extend(copies)
+                for original, cell in zip(cells, copies):
+                    self._update_fill(cell, relevant)
+                    if id(original) in self._targets:
+                        cell.material = self._material(original.material)
+                        self._found[original.number].append(cell.number)
+        return new_cells
+
+    def uniquify(self):
+        """Gives every instance of the cells their own material.
+
+        Returns
+        -------
+        dict[int, list[int]]
+            The number of every cell, to the numbers of the cells that are its instances.
+        """
+        problem = self._problem
+        order, originals = self._plan()
+        self._share()
+        with _relaxed_gc():
+            new_cells = self._make_cells(order, originals)
+            # the cells are added last, so their new materials and universes are already in the problem
+            problem.materials.extend(self._new_materials)
+            problem.universes.extend(self._new_universes)
+            problem.cells.extend(new_cells)
+        return self._found
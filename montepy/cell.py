@@ -2,6 +2,7 @@
 from __future__ import annotations
 import copy
 import itertools
+import numpy as np
 from numbers import Integral, Real
 import sly
 from typing import Union
@@ -14,18 +15,28 @@ from montepy.data_inputs.data_parser import PREFIX_MATCHES
 from montepy.input_parser.cell_parser import CellParser
 from montepy.input_parser import syntax_node
 from montepy.exceptions import *
-from montepy.numbered_mcnp_object import Numbered_MCNP_Object, InitInput
+from montepy.numbered_mcnp_object import (
+    Numbered_MCNP_Object,
+    InitInput,
+    _invalidate_indexes,
+)
 from montepy.data_inputs.material import Material
 from montepy.geometry_operators import Operator
+from montepy.surfaces import half_space
 from montepy.surfaces.half_space import HalfSpace, UnitHalfSpace
-from montepy.surfaces.surface import Surface
+from montepy.surfaces.surface import Surface, _validate_points
 from montepy.surface_collection import Surfaces
 from montepy.universe import Universe
 from montepy.utilities import *
 import montepy
 
 
+def _material_validator(self, material):
+    _invalidate_indexes(self)
+
+
 def _link_geometry_to_cell(self, geom):
+    half_space._invalidate_geometry(self)
     geom._cell = self
     geom._add_new_children_to_cell(geom)
 
@@ -141,6 +152,8 @@ class Cell(Numbered_MCNP_Object):
         self._density_node = self._generate_default_node(float, None)
         self._surfaces = Surfaces()
         self._complements = Cells()
+        self._compiled_geometry = None
+        self._bounding_box = None
         try:
             super().__init__(input, self._parser, number)
         # Add more information to issue that parser can't access
@@ -255,6 +268,7 @@ class Cell(Numbered_MCNP_Object):
 
     @universe.setter
     def universe(self, value):
+        _invalidate_indexes(self)
         if value is None:
             if self._problem:
                 if 0 not in self._problem.universes.numbers:
@@ -439,7 +453,9 @@ class Cell(Numbered_MCNP_Object):
         """
         pass
 
-    @make_prop_pointer("_material", (Material, type(None)), deletable=True)
+    @make_prop_pointer(
+        "_material", (Material, type(None)), validator=_material_validator
+    )
     def material(self):
         """The Material object for the cell.
 
@@ -451,6 +467,11 @@ class Cell(Numbered_MCNP_Object):
         """
         pass
 
+    @material.deleter
+    def material(self):
+        self._material = None
+        _invalidate_indexes(self)
+
     @make_prop_pointer("_geometry", HalfSpace, validator=_link_geometry_to_cell)
     def geometry(self):
         """The Geometry for this problem.
@@ -633,6 +654,189 @@ class Cell(Numbered_MCNP_Object):
                     if self in cell.complements:
                         yield cell
 
+    def contains(self, points) -> np.ndarray:
+        """Checks which of many points are inside of this cell.
+
+        The geometry is compiled once into vectorized operations on the senses of its surfaces,
+        and cached until the geometry is changed.
+        Every surface, including those of complemented cells, is evaluated only once per call.
+        Points that are exactly on a surface are treated as being on its positive side.
+
+        .. versionadded:: 1.4.0
+
+        Parameters
+        ----------
+        points : numpy.typing.ArrayLike
+            An (N, 3) array of the :math:`(x, y, z)` points to check,
+            or a single point.
+
+        Returns
+        -------
+        numpy.ndarray
+            A boolean array of length N which is True for the points inside this cell.
+
+        Raises
+        ------
+        IllegalState
+            If this cell has no geometry, or the geometry is not linked to its surfaces.
+
+        See Also
+        --------
+        montepy.Surface.evaluate : for how the surfaces are evaluated.
+        """
+        points = _validate_points(points)
+        return self._compiled_region()(points)
+
+    def bounding_box(self) -> np.ndarray:
+        """Finds an axis-aligned box that contains this cell.
+
+        The box is found by propagating the bounding boxes of the surfaces
+        (see :func:`~montepy.Surface.bounding_box`) through the geometry:
+        intersections intersect the boxes, and unions join them.
+        Complements, including complemented cells, are bounded with De Morgan's laws.
+        The box is conservative: it always contains the whole cell, but may be larger than needed.
+
+        The box is cached until the geometry, or any of its surfaces or transforms are changed.
+
+        .. versionadded:: 1.4.0
+
+        Returns
+        -------
+        numpy.ndarray
+            A (2, 3) array of the lower and upper corners of the box.
+            Infinite bounds are ``numpy.inf``.
+            If the cell is known to be empty the lower corner is above the upper corner.
+
+        Raises
+        ------
+        IllegalState
+            If this cell has no geometry, or the geometry is not linked to its surfaces.
+        """
+        if self._bounding_box is None:
+            self._bounding_box = self._compiled_region().bounding_box()
+        return self._bounding_box.copy()
+
+    def simplify_geometry(self, expand_complements: bool = False) -> bool:
+        """Rewrites the geometry of this cell into a simpler form of the same region.
+
+        This can shrink generated geometries, which makes MCNP track particles faster.
+        The geometry is simplified by:
+
+        * removing unneeded parentheses, e.g., ``(-1 2) -3`` becomes ``-1 2 -3``;
+        * removing repeated half-spaces, e.g., ``-1 2 -1`` becomes ``-1 2``;
+        * removing absorbed terms, e.g., ``-1 (-1 : 2)`` becomes ``-1``;
+        * flipping complemented half-spaces, e.g., ``#(-1)`` becomes ``1``;
+        * removing half-spaces that can not change the region based on the bounding boxes of the rest of the region
+          (see :func:`~montepy.Surface.bounding_box`),
+          e.g., a plane that does not cut the sphere it is intersected with;
+        * removing parts of unions, and intersections that are found to be empty,
+          or everywhere.
+
+        The original half-spaces are reused so their formatting and comments are kept where possible.
+        The geometry is only changed if it can be made simpler,
+        and :attr:`surfaces` and :attr:`complements` are updated to match it.
+
+        Lattice cells are never changed,
+        as the order of their surfaces sets how their elements are indexed.
+        Geometries that are found to be empty or everywhere are not changed,
+        as those can not be written.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test.imcnp")
+            cell = problem.cells[3]
+            surfaces = problem.surfaces
+            # PZ 10 is above the SO 3 surface 1010
+            cell.geometry &= -surfaces[1010] & -surfaces[1020]
+            print(cell.geometry)
+            print(cell.simplify_geometry())
+            print(cell.geometry)
+
+        .. testoutput::
+
+            (((+1000*+1005)*-1010)*(-1010*-1020))
+            True
+            ((+1000*+1005)*-1010)
+
+        Parameters
+        ----------
+        expand_complements : bool
+            If True, complemented cells, e.g., ``#2``, are replaced with their geometry,
+            and all complements are pushed down to the surfaces with De Morgan's laws.
+            Otherwise complements are kept.
+
+        Returns
+        -------
+        bool
+            True if the geometry was changed.
+
+        Raises
+        ------
+        TypeError
+            If expand_complements is not a bool.
+        IllegalState
+            If this cell has no geometry, the geometry is not linked to its surfaces,
+            or a cell is complemented by its own geometry.
+        """
+        if not isinstance(expand_complements, bool):
+            raise TypeError(
+                f"expand_complements must be a bool. {expand_complements} given."
+            )
+        new = self._simplified_geometry(expand_complements)
+        if new is None:
+            return False
+        self._set_simplified_geometry(new)
+        return True
+
+    def _simplified_geometry(self, expand_complements):
+        """Finds the simplified geometry of this cell without changing it.
+
+        Returns
+        -------
+        HalfSpace
+            The new geometry, or None if it can't be simplified.
+        """
+        if self.geometry is None:
+            raise IllegalState(f"Cell {self.number} has no geometry defined.")
+        if self.lattice_type is not None:
+            return None
+        return half_space._Simplifier(expand_complements).simplify(self.geometry)
+
+    def _set_simplified_geometry(self, geometry):
+        self.geometry = geometry
+        # rebuild the surfaces and complements, as some may no longer be used
+        self._surfaces = Surfaces()
+        self._complements = Cells()
+        geometry.update_pointers(None, None, self)
+
+    def _compiled_region(self) -> half_space._CompiledRegion:
+        """Gets the compiled form of this cell's geometry, compiling it if it is stale."""
+        if self.geometry is None:
+            raise IllegalState(f"Cell {self.number} has no geometry defined.")
+        if self._compiled_geometry is None:
+            compiled = half_space._CompiledRegion(self.geometry)
+            for source in compiled.sources:
+                half_space._add_geometry_dependent(source, self)
+            self._compiled_geometry = compiled
+        return self._compiled_geometry
+
+    def _clear_geometry_cache(self):
+        self._compiled_geometry = None
+        self._bounding_box = None
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # the surfaces may not be copied with this, so the compiled geometry can't be trusted
+        state["_compiled_geometry"] = None
+        state["_bounding_box"] = None
+        return state
+
     def update_pointers(self, cells, materials, surfaces):
         """Attaches this object to the appropriate objects for surfaces and materials.
 
@@ -2,6 +2,8 @@
 import montepy
 from montepy.numbered_object_collection import NumberedObjectCollection
 from montepy.exceptions import *
+import numpy as np
+from montepy.data_inputs.importance import Importance
 import warnings
 from numbers import Integral
 
@@ -204,6 +206,381 @@ class Cells(NumberedObjectCollection):
                     ret += buf
         return ret
 
+    def _default_particles(self, particles):
+        """Gets the particles to use for importance arrays in the order of :class:`~montepy.Particle`."""
+        if particles is None:
+            particles = self._problem.mode.particles if self._problem else ()
+        for particle in particles:
+            if not isinstance(particle, montepy.Particle):
+                raise TypeError(f"particles must be Particles. {particle} given.")
+        particles = set(particles)
+        return [particle for particle in montepy.Particle if particle in particles]
+
+    def to_arrays(self, particles=None):
+        """Exports the data for all cells to a NumPy structured array.
+
+        This is built in a single pass over the cells, and avoids the overhead of the
+        properties of every cell, so it is suitable for analyzing very large models.
+
+        The array has one row per cell in the order of this collection, with the fields:
+
+        * ``number``: the cell number.
+        * ``material``: the material number, or 0 for a void cell.
+        * ``density``: the density of the material, or ``nan`` for a void cell.
+        * ``is_atom_density``: True if the density is in atom/b-cm, False if it is in g/cc.
+        * ``universe``: the number of the universe the cell is in.
+        * ``fill``: the number of the universe filling the cell, or -1 if the cell isn't filled
+          with a single universe.
+        * ``fill_lattice``: True if the cell is filled with multiple universes in a lattice.
+        * ``volume``: the cell volume, or ``nan`` if it has not been set.
+        * ``importance``: a nested structured array with one field per particle,
+          named by the lower case name of the particle, e.g., ``arr["importance"]["neutron"]``.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test.imcnp")
+            arr = problem.cells.to_arrays()
+            print(arr["number"])
+            print(arr["importance"]["photon"])
+
+        .. testoutput::
+
+            [ 1  2  3 99  5]
+            [1.  0.5 1.  0.  3. ]
+
+        Parameters
+        ----------
+        particles : Iterable[Particle]
+            The particles to export the importances for.
+            By default these are the particles in the problem's mode,
+            or none if this isn't linked to a problem.
+
+        Returns
+        -------
+        numpy.ndarray
+            a structured array of the cell data.
+
+        Raises
+        ------
+        TypeError
+            if particles contains anything other than a Particle.
+        """
+        particles = self._default_particles(particles)
+        length = len(self._objects)
+        numbers = np.empty(length, dtype=np.int64)
+        materials = np.zeros(length, dtype=np.int64)
+        densities = np.full(length, np.nan)
+        atom_flags = np.zeros(length, dtype=bool)
+        universes = np.zeros(length, dtype=np.int64)
+        fills = np.full(length, -1, dtype=np.int64)
+        lattice_flags = np.zeros(length, dtype=bool)
+        volumes = np.full(length, np.nan)
+        importances = np.full((len(particles), length), Importance._DEFAULT_IMP)
+        for i, cell in enumerate(self._objects):
+            numbers[i] = cell._number.value
+            material = cell._material
+            if material is not None:
+                materials[i] = material._number.value
+                density = cell._density_node.value
+                if density is not None:
+                    densities[i] = density
+                atom_flags[i] = bool(cell._is_atom_dens)
+            universe = cell._universe._universe
+            if universe is not None:
+                universes[i] = universe._number.value
+            fill = cell._fill
+            if fill._multi_universe:
+                lattice_flags[i] = True
+            elif fill._universe is not None:
+                fills[i] = fill._universe._number.value
+            volume = cell._volume._volume
+            if volume is not None and volume.value is not None:
+                volumes[i] = volume.value
+            trees = cell._importance._particle_importances
+            for j, particle in enumerate(particles):
+                tree = trees.get(particle)
+                if tree:
+                    importances[j, i] = tree["data"][0].value
+        imp_dtype = np.dtype(
+            [(particle.name.lower(), np.float64) for particle in particles]
+        )
+        ret = np.empty(
+            length,
+            dtype=[
+                ("number", np.int64),
+                ("material", np.int64),
+                ("density", np.float64),
+                ("is_atom_density", bool),
+                ("universe", np.int64),
+                ("fill", np.int64),
+                ("fill_lattice", bool),
+                ("volume", np.float64),
+                ("importance", imp_dtype),
+            ],
+        )
+        ret["number"] = numbers
+        ret["material"] = materials
+        ret["density"] = densities
+        ret["is_atom_density"] = atom_flags
+        ret["universe"] = universes
+        ret["fill"] = fills
+        ret["fill_lattice"] = lattice_flags
+        ret["volume"] = volumes
+        for j, particle in enumerate(particles):
+            ret["importance"][particle.name.lower()] = importances[j]
+        return ret
+
+    @staticmethod
+    def _validate_value_array(name, values, length, numbers, errors):
+        """Converts values to a float array, and records any negative or non-finite entries in errors."""
+        try:
+            values = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise TypeError(f"{name} must be an array of numbers. {values} given.")
+        if values.shape != (length,):
+            raise ValueError(
+                f"{name} must be a 1-D array of the same length as numbers: {length}. "
+                f"Shape {values.shape} given."
+            )
+        bad = ~np.isfinite(values) | (values < 0)
+        for number, value in zip(numbers[bad], values[bad]):
+            errors.append(
+                f"Cell {number}: {name} must be a finite number ≥ 0. {value} given."
+            )
+        return values
+
+    def set_values(
+        self,
+        numbers,
+        density=None,
+        is_atom_density=None,
+        importance=None,
+        volume=None,
+    ):
+        """Sets the values of many cells at once from arrays.
+
+        This is the reverse of :func:`to_arrays`.
+        All of the arrays are validated at once before any cell is modified,
+        and then the underlying values are updated in a single loop.
+        If any entries are invalid a single error listing all of them is raised,
+        and no cells are modified.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            import numpy as np
+            problem = montepy.read_input("tests/inputs/test.imcnp")
+            problem.cells.set_values(
+                [1, 2],
+                density=np.array([10.0, 7.8]),
+                is_atom_density=False,
+                importance={montepy.Particle.NEUTRON: np.array([2.0, 4.0])},
+                volume=[5.0, 6.0],
+            )
+            print(problem.cells[2])
+            print(problem.cells[2].importance.neutron)
+
+        .. testoutput::
+
+            CELL: 2, mat: 2, DENS: 7.8 g/cm3
+            4.0
+
+        Parameters
+        ----------
+        numbers : numpy.ndarray
+            the numbers of the cells to update.
+        density : numpy.ndarray
+            the new densities for the cells. The cells must not be void.
+        is_atom_density : Union[bool, numpy.ndarray]
+            Whether the densities are in atom/b-cm (True) or g/cc (False).
+            If not given the current density type of each cell is kept.
+        importance : dict[Particle, numpy.ndarray]
+            the new importances for each particle.
+        volume : numpy.ndarray
+            the new volumes for the cells.
+
+        Raises
+        ------
+        TypeError
+            if the arguments are of the wrong type.
+        ValueError
+            if the arrays are of the wrong shape, or if any entries are invalid,
+            e.g., cells that don't exist, negative values, or densities for void cells.
+        """
+        try:
+            numbers = np.asarray(numbers)
+        except (TypeError, ValueError):
+            raise TypeError(f"numbers must be an array of ints. {numbers} given.")
+        if numbers.ndim != 1:
+            raise ValueError(f"numbers must be a 1-D array. {numbers} given.")
+        if len(numbers) and not np.issubdtype(numbers.dtype, np.integer):
+            raise TypeError(f"numbers must be an array of ints. {numbers} given.")
+        if importance is None:
+            importance = {}
+        if not isinstance(importance, dict):
+            raise TypeError(
+                f"importance must be a dict of particles to arrays. {importance} given."
+            )
+        length = len(numbers)
+        errors = []
+        if density is not None:
+            density = self._validate_value_array(
+                "density", density, length, numbers, errors
+            )
+            if is_atom_density is not None:
+                is_atom_density = np.asarray(is_atom_density)
+                if is_atom_density.dtype != bool:
+                    raise TypeError(
+                        f"is_atom_density must be a bool or an array of bools. {is_atom_density} given."
+                    )
+                is_atom_density = np.broadcast_to(is_atom_density, (length,))
+        if volume is not None:
+            volume = self._validate_value_array(
+                "volume", volume, length, numbers, errors
+            )
+        importances = {}
+        for particle, values in importance.items():
+            if not isinstance(particle, montepy.Particle):
+                raise TypeError(f"importance keys must be Particles. {particle} given.")
+            importances[particle] = self._validate_value_array(
+                f"importance[{particle}]", values, length, numbers, errors
+            )
+        cells = []
+        for number in numbers.tolist():
+            cell = self.get(number)
+            if cell is None:
+                errors.append(f"Cell {number}: not found in {type(self).__name__}.")
+            elif density is not None and cell._material is None:
+                errors.append(f"Cell {number}: a density can't be set for a void cell.")
+            cells.append(cell)
+        if errors:
+            raise ValueError(
+                f"{len(errors)} invalid entries given to set_values:\n"
+                + "\n".join(errors)
+            )
+        if length:
+            for particle in importances:
+                cells[0]._importance._check_particle_in_problem(particle)
+        if density is not None:
+            atom_flags = None if is_atom_density is None else is_atom_density.tolist()
+            for i, (cell, value) in enumerate(zip(cells, density.tolist())):
+                if atom_flags is not None:
+                    cell._is_atom_dens = atom_flags[i]
+                cell._density_node.value = value
+        if volume is not None:
+            for cell, value in zip(cells, volume.tolist()):
+                vol = cell._volume
+                if vol._volume is None:
+                    vol._volume = vol._generate_default_node(float, None)
+                vol._volume.value = value
+        for particle, values in importances.items():
+            for cell, value in zip(cells, values.tolist()):
+                imp = cell._importance
+                if particle not in imp._particle_importances:
+                    imp._generate_default_cell_tree(particle)
+                imp._explicitly_set = True
+                imp._particle_importances[particle]["data"][0].value = value
+
+    def __build_query_index(self, attr):
+        """Builds an index of cell lists keyed by the number of the universe or material."""
+        index = {}
+        for cell in self._objects:
+            if attr == "universe":
+                obj = cell._universe._universe
+            else:
+                obj = cell._material
+            number = obj._number.value if obj is not None else 0
+            index.setdefault(number, []).append(cell)
+        return index
+
+    def where(self, universe=None, material=None):
+        """Finds all cells that match all of the given criteria.
+
+        The queries are backed by indexes of the cells by universe and material.
+        These are built on the first query, and are reused until a cell,
+        or the collection, is changed.
+        This makes repeated queries on large models much faster than scanning all cells.
+
+        Examples
+        ^^^^^^^^
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test.imcnp")
+            for cell in problem.cells.where(universe=0, material=2):
+                print(cell.number)
+
+        .. testoutput::
+
+            2
+
+        More complicated queries can be built by filtering the results:
+
+        .. testcode::
+
+            particle = montepy.Particle.NEUTRON
+            cells = [
+                cell
+                for cell in problem.cells.where(material=2)
+                if cell.importance[particle] > 0.0
+            ]
+
+        .. versionadded:: 1.4.0
+
+        Parameters
+        ----------
+        universe : Union[Universe, int]
+            the universe, or its number, that the cells must be in.
+        material : Union[Material, int]
+            the material, or its number, that the cells must be filled with.
+            A value of 0 matches void cells.
+
+        Returns
+        -------
+        Generator[Cell]
+            the matching cells in the order of this collection.
+
+        Raises
+        ------
+        TypeError
+            if a criterion is of the wrong type.
+        """
+        criteria = []
+        for attr, value, obj_type in (
+            ("universe", universe, montepy.Universe),
+            ("material", material, montepy.Material),
+        ):
+            if value is None:
+                continue
+            if isinstance(value, obj_type):
+                value = value.number
+            elif not isinstance(value, Integral):
+                raise TypeError(
+                    f"{attr} must be a {obj_type.__name__} or an int. {value} given."
+                )
+            index = self._get_index(attr, lambda: self.__build_query_index(attr))
+            criteria.append(index.get(value, []))
+        if not criteria:
+            return (cell for cell in self._objects[:])
+        criteria.sort(key=len)
+        matches = criteria[0]
+        for other in criteria[1:]:
+            ids = {id(cell) for cell in other}
+            matches = [cell for cell in matches if id(cell) in ids]
+        return (cell for cell in matches)
+
     def clone(
         self, clone_material=False, clone_region=False, starting_number=None, step=None
     ):
@@ -9,7 +9,9 @@ from montepy.exceptions import *
 from montepy.input_parser.block_type import BlockType
 from montepy.input_parser.mcnp_input import Input, Jump
 from montepy.input_parser import syntax_node
+from montepy.input_parser.shortcuts import Shortcuts
 from montepy.mcnp_object import MCNP_Object
+from montepy.numbered_mcnp_object import _invalidate_indexes
 from montepy.universe import Universe
 from montepy.utilities import *
 
@@ -51,6 +53,9 @@ class Fill(CellModifierInput):
         self._old_numbers = None
         self._universe = None
         self._universes = None
+        self._universe_numbers = None
+        self._universe_table = None
+        self._compress_universes = False
         self._transform = None
         self._hidden_transform = None
         self._old_transform_number = None
@@ -205,30 +210,23 @@ class Fill(CellModifierInput):
                     "The minimum value must be smaller than the max value."
                     f"Min: {min_val}, Max: {max_val}, Input: {value.format()}"
                 )
-        self._old_numbers = np.zeros(self._sizes, dtype=np.dtype(int))
-        words = iter(value["data"]["universes"])
-        new_nodes = []
-        for k in self._axis_range(2):
-            for j in self._axis_range(1):
-                for i in self._axis_range(0):
-                    try:
-                        try:
-                            val = next(words)
-                        # if ended early
-                        except StopIteration:
-                            words = it.cycle([None])
-                            val = None
-                        if val is None:
-                            val = self._generate_default_node(int, None)
-                            new_nodes.append(val)
-                        else:
-                            val.convert_to_int()
-                            assert val.value >= 0
-                        self._old_numbers[i][j][k] = val.value if val.value else 0
-                    except (ValueError, AssertionError) as e:
-                        raise ValueError(
-                            f"Values provided must be valid universes. {val.value} given."
-                        )
+        size = int(np.prod(self._sizes))
+        nodes = list(it.islice(value["data"]["universes"], size))
+        new_nodes = [
+            self._generate_default_node(int, None) for _ in range(size - len(nodes))
+        ]
+        numbers = np.zeros(size, dtype=np.int32)
+        for idx, val in enumerate(nodes):
+            try:
+                val.convert_to_int()
+                assert val.value >= 0
+                numbers[idx] = val.value
+            except (ValueError, AssertionError) as e:
+                raise ValueError(
+                    f"Values provided must be valid universes. {val.value} given."
+                )
+        # the universes are listed with the i index changing fastest
+        self._old_numbers = numbers.reshape(self._sizes, order="F")
 
         # inset new nodes
         for new_node in new_nodes:
@@ -268,13 +266,15 @@ class Fill(CellModifierInput):
             raise ValueError(
                 "A single universe can only be set when multiple_universes is False."
             )
+        _invalidate_indexes(self)
         self._universe = value
         if value is not None:
-            self._universes = None
+            self._clear_universes()
             self.multiple_universes = False
 
     @universe.deleter
     def universe(self):
+        _invalidate_indexes(self)
         self._universe = None
 
     @property
@@ -299,6 +299,7 @@ class Fill(CellModifierInput):
         * :manual631sub:`5.5.5.3`
         * :manual63sub:`5.5.5.3`
         * :manual62:`87`
+        * :func:`universe_numbers`
 
 
         .. versionchanged:: 1.2.0
@@ -354,6 +355,8 @@ class Fill(CellModifierInput):
             expanded to 3D by adding dimensions at the end.
         """
         if self.multiple_universes:
+            if self._universes is None and self._universe_numbers is not None:
+                self._universes = self._resolve_universes()
             return self._universes
         return None
 
@@ -365,7 +368,7 @@ class Fill(CellModifierInput):
         if value is None:
             self.multiple_universes = False
             self.universe = None
-            self._universes = None
+            self._clear_universes()
             return
 
         if value.ndim <= 2:
@@ -383,19 +386,19 @@ class Fill(CellModifierInput):
                 raise IllegalState(
                     "Universe IDs can only be set if the Fill is part of a Problem."
                 )
-
-            universes_array = np.empty(value.shape, dtype=object)
-            for idx_tuple, uid in np.ndenumerate(value):
+            table = {0: None}
+            for uid in np.unique(value).tolist():
                 if uid == 0:
-                    universes_array[idx_tuple] = None
-                else:
-                    try:
-                        universes_array[idx_tuple] = self._problem.universes[uid]
-                    except KeyError as e:
-                        raise KeyError(
-                            f"Universe ID {uid} at index {idx_tuple} is not defined in the problem."
-                        ) from e
-            value = universes_array
+                    continue
+                try:
+                    table[uid] = self._problem.universes[uid]
+                except KeyError as e:
+                    idx_tuple = tuple(np.argwhere(value == uid)[0].tolist())
+                    raise KeyError(
+                        f"Universe ID {uid} at index {idx_tuple} is not defined in the problem."
+                    ) from e
+            self._set_universe_numbers(value, table)
+            return
 
         def is_universes(array):
             type_checker = lambda x: isinstance(x, (Universe, type(None)))
@@ -405,16 +408,110 @@ class Fill(CellModifierInput):
             raise TypeError(
                 f"All values in array must be a Universe (or None). {value} given."
             )
+        self._set_universe_shape(value.shape)
+        self._universe_numbers = None
+        self._universe_table = None
+        self._universes = value
+
+    def _set_universe_shape(self, shape):
+        """Switches to a multi-universe fill, and updates the indices for an array of the given shape."""
+        _invalidate_indexes(self)
         self.multiple_universes = True
         self._universe = None
         if self.min_index is None:
             self.min_index = np.array([0] * 3)
-        self.max_index = self.min_index + np.array(value.shape) - 1
-        self._universes = value
+        self.max_index = self.min_index + np.array(shape) - 1
+
+    def _set_universe_numbers(self, numbers, table):
+        """Sets the universes of a multi-universe fill by their numbers.
+
+        Parameters
+        ----------
+        numbers : numpy.ndarray
+            the 3D array of universe numbers.
+        table : dict[int, Universe]
+            the universe for every number in the array.
+        """
+        self._set_universe_shape(numbers.shape)
+        self._universes = None
+        self._universe_numbers = numbers.astype(np.int32)
+        self._universe_table = table
+
+    def _clear_universes(self):
+        _invalidate_indexes(self)
+        self._universes = None
+        self._universe_numbers = None
+        self._universe_table = None
+
+    def _resolve_universes(self):
+        """Builds the array of Universe objects from the universe numbers.
+
+        Every distinct number is only looked up once.
+
+        Returns
+        -------
+        numpy.ndarray
+            the 3D array of Universe objects, or None.
+        """
+        unique, inverse = np.unique(self._universe_numbers, return_inverse=True)
+        resolved = np.empty(len(unique), dtype=object)
+        for idx, number in enumerate(unique.tolist()):
+            resolved[idx] = self._universe_table[number]
+        return np.take(resolved, inverse).reshape(self._universe_numbers.shape)
+
+    @property
+    def universe_numbers(self):
+        """The numbers of the universes that this cell will be filled with in a lattice.
+
+        This is the same as :func:`universes`, but as an integer array.
+        Elements that are not filled by any universe are 0.
+        This is much faster for large lattices than :func:`universes`,
+        as it does not need to make an array of Universe objects.
+
+        Only returns a value when :func:`multiple_universes` is true, otherwise none.
+
+        .. versionadded:: 1.4.0
+
+        Returns
+        -------
+        numpy.ndarray
+            a new 3-D array of the current universe numbers.
+        """
+        if not self.multiple_universes:
+            return None
+        if self._universes is not None:
+            # the objects are kept once they are given out as they may be modified
+            universes = self._universes
+            ids = np.frompyfunc(id, 1, 1)(universes).astype(np.int64)
+            unique, first, inverse = np.unique(
+                ids, return_index=True, return_inverse=True
+            )
+            numbers = np.array(
+                [
+                    universe.number if universe is not None else 0
+                    for universe in universes.flat[first]
+                ],
+                dtype=np.int32,
+            )
+            return np.take(numbers, inverse).reshape(universes.shape)
+        if self._universe_numbers is None:
+            return None
+        unique, inverse = np.unique(self._universe_numbers, return_inverse=True)
+        current = np.array(
+            [
+                universe.number if universe is not None else 0
+                for universe in map(self._universe_table.get, unique.tolist())
+            ],
+            dtype=np.int32,
+        )
+        if np.array_equal(unique, current):
+            return self._universe_numbers.copy()
+        # some universes have been renumbered
+        return np.take(current, inverse).reshape(self._universe_numbers.shape)
 
     @universes.deleter
     def universes(self):
-        self._universes = None
+        self._clear_universes()
         self.multiple_universes = False
 
     @make_prop_pointer(
@@ -468,9 +565,37 @@ class Fill(CellModifierInput):
     def multiple_universes(self, value):
         if not isinstance(value, bool):
             raise TypeError("Multiple_univeses must be set to a bool")
+        _invalidate_indexes(self)
         self._multi_universe = value
         if not value:
-            self._universes = None
+            self._clear_universes()
+
+    @make_prop_pointer("_compress_universes", bool)
+    def compress_universes(self):
+        """Whether to write the universes of a lattice fill with repeat shortcuts.
+
+        When this is true, runs of three or more of the same universe are written as,
+        e.g., ``1 3R``, instead of ``1 1 1 1``.
+        This can make the inputs of large, regular lattices much shorter.
+        Any comments between repeated universes are removed.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+        To compress every lattice in a problem before writing it:
+
+        .. code-block:: python
+
+            for cell in problem.cells:
+                cell.fill.compress_universes = True
+
+        Returns
+        -------
+        bool
+            True if the universes will be written with repeat shortcuts.
+        """
+        pass
 
     @make_prop_val_node("_old_number")
     def old_universe_number(self):
@@ -575,6 +700,7 @@ class Fill(CellModifierInput):
             return self._problem.universes[number]
 
         if self.in_cell_block:
+            _invalidate_indexes(self)
             if self.old_transform_number:
                 self._transform = self._problem.transforms[self.old_transform_number]
             if (
@@ -582,15 +708,14 @@ class Fill(CellModifierInput):
                 or self.old_universe_numbers is not None
             ):
                 if isinstance(self.old_universe_numbers, np.ndarray):
-                    self._universes = np.empty_like(
-                        self.old_universe_numbers, dtype="O"
-                    )
-                    for i in self._axis_range(0):
-                        for j in self._axis_range(1):
-                            for k in self._axis_range(2):
-                                self._universes[i][j][k] = get_universe(
-                                    self.old_universe_numbers[i][j][k].item()
-                                )
+                    numbers = self.old_universe_numbers
+                    table = {
+                        number: get_universe(number)
+                        for number in np.unique(numbers).tolist()
+                    }
+                    self._universes = None
+                    self._universe_numbers = numbers.astype(np.int32)
+                    self._universe_table = table
                 else:
                     self._universe = get_universe(self.old_universe_number)
         else:
@@ -702,8 +827,18 @@ class Fill(CellModifierInput):
                 yield value
 
         if self.multiple_universes:
-            get_number = np.vectorize(lambda u: u.number)
-            payload = get_number(self.universes).T.ravel()
+            numbers = self.universe_numbers
+            # the universes were never linked to a problem
+            if numbers is None:
+                numbers = self.old_universe_numbers
+            numbers = numbers.ravel(order="F")
+            if self.compress_universes:
+                value_nodes = it.chain(tree, _value_node_generator())
+                self._tree["data"].nodes["universes"] = self._repeat_universes(
+                    numbers, value_nodes
+                )
+                return
+            payload = numbers.tolist()
         else:
             payload = [
                 (
@@ -725,6 +860,40 @@ class Fill(CellModifierInput):
         buffer = buffer[: len(buffer) - back_idx]
         tree.update_with_new_values(buffer)
 
+    @staticmethod
+    def _repeat_universes(numbers, value_nodes):
+        """Makes a list of universes where runs of the same universe are repeat shortcuts.
+
+        Parameters
+        ----------
+        numbers : numpy.ndarray
+            the flattened universe numbers.
+        value_nodes : Iterator[ValueNode]
+            the nodes to reuse for the universe numbers.
+
+        Returns
+        -------
+        ListNode
+            the new list of universes.
+        """
+        starts = np.flatnonzero(np.r_[True, numbers[1:] != numbers[:-1]])
+        lengths = np.diff(np.r_[starts, len(numbers)])
+        tree = syntax_node.ListNode("fill universes")
+        for number, length in zip(numbers[starts].tolist(), lengths.tolist()):
+            nodes = list(it.islice(value_nodes, length))
+            for node in nodes:
+                node.value = number
+            if length < 3:
+                for node in nodes:
+                    tree.append(node)
+                continue
+            if nodes[0].padding is None:
+                nodes[0].padding = syntax_node.PaddingNode(" ")
+            shortcut = syntax_node.ShortcutNode(short_type=Shortcuts.REPEAT)
+            shortcut.load_nodes(nodes)
+            tree.append(shortcut)
+        return tree
+
     def _update_multi_index_limits(self):
         """
         Updates cell fill tree with the indices limit for a multi-universe fill.
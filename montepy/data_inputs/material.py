@@ -7,6 +7,8 @@ from numbers import Integral, Real
 from typing import Generator, Union
 import weakref
 
+import numpy as np
+
 import montepy
 from montepy.data_inputs import data_input, thermal_scattering
 from montepy.data_inputs.nuclide import Library, Nucleus, Nuclide
@@ -294,13 +296,16 @@ class Material(data_input.DataInputAbstract, Numbered_MCNP_Object):
         input: InitInput = None,
         number: int = None,
     ):
-        self._components = []
+        self._nuclides = []
+        self._fraction_nodes = []
+        self._zaids = np.empty(0, dtype=np.int64)
+        self._meta_states = np.empty(0, dtype=np.int8)
+        self._fractions = np.empty(0, dtype=np.float64)
         self._thermal_scattering = None
         self._is_atom_fraction = True
         self._number = self._generate_default_node(int, -1, None)
         self._number.never_pad = True
-        self._elements = set()
-        self._nuclei = set()
+        self._nuclide_indexes = {}
         self._default_libs = _DefaultLibraries(self)
         super().__init__(input)
         self._load_init_num(number)
@@ -317,6 +322,10 @@ class Material(data_input.DataInputAbstract, Numbered_MCNP_Object):
                     is_first = False
                 else:
                     self._grab_default(*group)
+            self._zaids, self._meta_states = self._nucleus_arrays(self._nuclides)
+            self._fractions = np.array(
+                [node.value for node in self._fraction_nodes], dtype=np.float64
+            )
         else:
             self._create_default_tree()
 
@@ -335,9 +344,27 @@ class Material(data_input.DataInputAbstract, Numbered_MCNP_Object):
                     input,
                     f"Material definitions for material: {self.number} cannot use atom and mass fraction at the same time",
                 )
-        self._elements.add(isotope.element)
-        self._nuclei.add(isotope.nucleus)
-        self._components.append((isotope, fraction))
+        self._nuclides.append(isotope)
+        self._fraction_nodes.append(fraction)
+
+    @staticmethod
+    def _nucleus_arrays(nuclides):
+        """Makes the arrays of the ZAIDs and metastable states of nuclides."""
+        nuclei = [nuclide.nucleus for nuclide in nuclides]
+        zaids = np.array([nucleus.ZAID for nucleus in nuclei], dtype=np.int64)
+        meta_states = np.array(
+            [nucleus.meta_state for nucleus in nuclei], dtype=np.int8
+        )
+        return zaids, meta_states
+
+    def _base_zaids(self) -> np.ndarray:
+        """Finds the ``Z * 1000 + A`` of every component, without the metastable state."""
+        zaids = self._zaids.copy()
+        for old, new in Nuclide._STUPID_ZAID_SWAP.items():
+            zaids[self._zaids == old] = new
+        metastable = self._meta_states > 0
+        zaids[metastable] -= 300 + 100 * self._meta_states[metastable].astype(np.int64)
+        return zaids
 
     def _grab_default(self, param: syntax_node.SyntaxNode):
         """Grabs and parses default libraris from init process."""
@@ -369,6 +396,8 @@ class Material(data_input.DataInputAbstract, Numbered_MCNP_Object):
 
         This is called from _DefaultLibraries.
         """
+        # keep the components before the libraries, in the order they were added
+        self._add_component_nodes()
         self._ensure_has_ending_padding()
         self._tree["data"].append_param(node)
 
@@ -516,36 +545,39 @@ See <https://www.montepy.org/migrations/migrate0_1.html> for more information ""
         if not isinstance(idx, (Integral, slice)):
             raise TypeError(f"Not a valid index. {idx} given.")
         if isinstance(idx, Integral):
-            comp = self._components[idx]
-            return self.__unwrap_comp(comp)
+            return (self._nuclides[idx], float(self._fractions[idx]))
         # else it's a slice
-        return [self.__unwrap_comp(comp) for comp in self._components[idx]]
-
-    @staticmethod
-    def __unwrap_comp(comp):
-        return (comp[0], comp[1].value)
+        return list(zip(self._nuclides[idx], self._fractions[idx].tolist()))
 
     def __iter__(self):
         def gen_wrapper():
-            for comp in self._components:
-                yield self.__unwrap_comp(comp)
+            for i in range(len(self._nuclides)):
+                yield (self._nuclides[i], float(self._fractions[i]))
 
         return gen_wrapper()
 
     def __setitem__(self, idx, newvalue):
         """"""
-        if not isinstance(idx, (Integral, slice)):
+        if not isinstance(idx, Integral):
             raise TypeError(f"Not a valid index. {idx} given.")
-        old_vals = self._components[idx]
+        old_nuclide = self._nuclides[idx]
         self._check_valid_comp(newvalue)
-        node_idx = self._tree["data"].nodes.index((old_vals[0]._tree, old_vals[1]), idx)
-        # grab fraction
-        old_vals[1].value = newvalue[1]
-        self._tree["data"].nodes[node_idx] = (newvalue[0]._tree, old_vals[1])
-        self._components[idx] = (newvalue[0], old_vals[1])
+        if idx < 0:
+            idx += len(self)
+        new_nuclide = newvalue[0]
+        node = self._fraction_nodes[idx]
+        if node is not None:
+            data = self._tree["data"]
+            node_idx = data.nodes.index((old_nuclide._tree, node), idx)
+            data.nodes[node_idx] = (new_nuclide._tree, node)
+        self._nuclides[idx] = new_nuclide
+        self._fractions[idx] = newvalue[1]
+        self._zaids[idx] = new_nuclide.nucleus.ZAID
+        self._meta_states[idx] = new_nuclide.nucleus.meta_state
+        self._update_nuclide_indexes(added=(new_nuclide,), removed=(old_nuclide,))
 
     def __len__(self):
-        return len(self._components)
+        return len(self._nuclides)
 
     def _check_valid_comp(self, newvalue: tuple[Nuclide, Real]):
         """Checks valid compositions and raises an error if needed."""
@@ -584,30 +616,54 @@ See <https://www.montepy.org/migrations/migrate0_1.html> for more information ""
             self.__delitem(0)
 
     def __delitem(self, idx):
-        comp = self._components[idx]
-        element = self[idx][0].element
-        nucleus = self[idx][0].nucleus
-        found_el = False
-        found_nuc = False
-        # keep indices positive for testing.
+        nuclide = self._nuclides[idx]
+        # keep indices positive for the arrays.
         if idx < 0:
             idx += len(self)
-        # determine if other components use this element and nucleus
-        for i, (nuclide, _) in enumerate(self):
-            if i == idx:
-                continue
-            if nuclide.element == element:
-                found_el = True
-            if nuclide.nucleus == nucleus:
-                found_nuc = True
-            if found_el and found_nuc:
-                break
-        if not found_el:
-            self._elements.remove(element)
-        if not found_nuc:
-            self._nuclei.remove(nucleus)
-        self._tree["data"].nodes.remove((comp[0]._tree, comp[1]))
-        del self._components[idx]
+        node = self._fraction_nodes[idx]
+        if node is not None:
+            self._tree["data"].nodes.remove((nuclide._tree, node))
+        del self._nuclides[idx]
+        del self._fraction_nodes[idx]
+        self._zaids = np.delete(self._zaids, idx)
+        self._meta_states = np.delete(self._meta_states, idx)
+        self._fractions = np.delete(self._fractions, idx)
+        self._update_nuclide_indexes(removed=(nuclide,))
+
+    def _update_nuclide_indexes(self, added=(), removed=()):
+        """Updates the nuclide indexes of the collections that this material is in.
+
+        .. versionadded:: 1.4.0
+
+        Parameters
+        ----------
+        added : Iterable[Nuclide]
+            the nuclides of the components that were added to this material.
+        removed : Iterable[Nuclide]
+            the nuclides of the components that were removed from this material.
+        """
+        for index_ref in list(self._nuclide_indexes.values()):
+            index = index_ref()
+            if index is not None:
+                index.update(self, added, removed)
+
+    def _fraction_of(self, nuclide: Union[Nuclide, Nucleus, Element]) -> float:
+        """Finds the total fraction of the components that match a nuclide, nucleus, or element.
+
+        Nuclides only match components with the same library.
+
+        .. versionadded:: 1.4.0
+        """
+        if isinstance(nuclide, Element):
+            return float(self._fractions[self._base_zaids() // 1000 == nuclide.Z].sum())
+        matches = self._zaids == nuclide.ZAID
+        if isinstance(nuclide, Nucleus):
+            return float(self._fractions[matches].sum())
+        return sum(
+            float(self._fractions[i])
+            for i in np.flatnonzero(matches)
+            if self._nuclides[i].library == nuclide.library
+        )
 
     def __contains__(self, nuclide):
         if not isinstance(nuclide, (Nuclide, Nucleus, Element, str, Integral)):
@@ -622,19 +678,15 @@ See <https://www.montepy.org/migrations/migrate0_1.html> for more information ""
         # switch to nucleus if no library.
         if isinstance(nuclide, Nuclide) and not nuclide.library:
             nuclide = nuclide.nucleus
-        if isinstance(nuclide, (Nucleus, Nuclide)):
-            if isinstance(nuclide, Nuclide):
-                if nuclide.nucleus not in self._nuclei:
-                    return False
-                for self_nuc, _ in self:
-                    if self_nuc == nuclide:
-                        return True
-                return False
-            if isinstance(nuclide, Nucleus):
-                return nuclide in self._nuclei
+        if isinstance(nuclide, Nuclide):
+            return any(
+                self._nuclides[i].library == nuclide.library
+                for i in np.flatnonzero(self._zaids == nuclide.ZAID)
+            )
+        if isinstance(nuclide, Nucleus):
+            return bool(np.any(self._zaids == nuclide.ZAID))
         if isinstance(nuclide, Element):
-            element = nuclide
-            return element in self._elements
+            return bool(np.any(self._base_zaids() // 1000 == nuclide.Z))
 
     def append(self, nuclide_frac_pair: tuple[Nuclide, float]):
         """Appends the tuple to this material.
@@ -647,19 +699,47 @@ See <https://www.montepy.org/migrations/migrate0_1.html> for more information ""
             a tuple of the nuclide and the fraction to add.
         """
         self._check_valid_comp(nuclide_frac_pair)
-        self._elements.add(nuclide_frac_pair[0].element)
-        self._nuclei.add(nuclide_frac_pair[0].nucleus)
-        # node for fraction
-        node = self._generate_default_node(
-            float, str(nuclide_frac_pair[1]), self._NEW_LINE_STR
+        self._extend_components([nuclide_frac_pair[0]], [nuclide_frac_pair[1]])
+
+    def _extend_components(self, nuclides: list[Nuclide], fractions):
+        """Adds many components to this material at once, without checking them.
+
+        The syntax nodes for the components are only made when this material is written,
+        or when a default library is added.
+
+        .. versionadded:: 1.4.0
+
+        Parameters
+        ----------
+        nuclides : list[Nuclide]
+            the nuclides to add.
+        fractions : Iterable[float]
+            the fraction of each nuclide.
+        """
+        zaids, meta_states = self._nucleus_arrays(nuclides)
+        self._nuclides.extend(nuclides)
+        self._fraction_nodes.extend([None] * len(nuclides))
+        self._zaids = np.concatenate([self._zaids, zaids])
+        self._meta_states = np.concatenate([self._meta_states, meta_states])
+        self._fractions = np.concatenate(
+            [self._fractions, np.asarray(fractions, dtype=np.float64)]
         )
-        syntax_node.ValueNode(str(nuclide_frac_pair[1]), float)
-        node.is_negatable_float = True
-        nuclide_frac_pair = (nuclide_frac_pair[0], node)
-        node.is_negative = not self._is_atom_fraction
-        self._components.append(nuclide_frac_pair)
-        self._ensure_has_ending_padding()
-        self._tree["data"].append_nuclide(("_", nuclide_frac_pair[0]._tree, node))
+        self._update_nuclide_indexes(added=nuclides)
+
+    def _add_component_nodes(self):
+        """Makes the syntax nodes for the components that do not have them yet, and adds them to the tree."""
+        for i, node in enumerate(self._fraction_nodes):
+            if node is not None:
+                continue
+            nuclide = self._nuclides[i]
+            node = self._generate_default_node(
+                float, str(float(self._fractions[i])), self._NEW_LINE_STR
+            )
+            node.is_negatable_float = True
+            node.is_negative = not self._is_atom_fraction
+            self._ensure_has_ending_padding()
+            self._tree["data"].append_nuclide(("_", nuclide._tree, node))
+            self._fraction_nodes[i] = node
 
     def _ensure_has_ending_padding(self):
         def get_last_val_node():
@@ -906,32 +986,8 @@ See <https://www.montepy.org/migrations/migrate0_1.html> for more information ""
                 if nuclide not in self and bool_func == all:
                     return False
 
-        nuclides_search = {}
-        nuclei_search = {}
-        element_search = {}
-        for nuclide in nuclide_finders:
-            if isinstance(nuclide, Element):
-                element_search[nuclide] = 0.0
-            if isinstance(nuclide, Nucleus):
-                nuclei_search[nuclide] = 0.0
-            if isinstance(nuclide, Nuclide):
-                nuclides_search[str(nuclide).lower()] = 0.0
-
-        for nuclide, fraction in self:
-            if str(nuclide).lower() in nuclides_search:
-                nuclides_search[str(nuclide).lower()] += fraction
-            if nuclide.nucleus in nuclei_search:
-                nuclei_search[nuclide.nucleus] += fraction
-            if nuclide.element in element_search:
-                element_search[nuclide.element] += fraction
-
-        threshold_check = lambda x: x > threshold
         return bool_func(
-            (
-                bool_func(map(threshold_check, nuclides_search.values())),
-                bool_func(map(threshold_check, nuclei_search.values())),
-                bool_func(map(threshold_check, element_search.values())),
-            )
+            self._fraction_of(nuclide) > threshold for nuclide in nuclide_finders
         )
 
     def clear(self):
@@ -947,9 +1003,7 @@ See <https://www.montepy.org/migrations/migrate0_1.html> for more information ""
 
         .. versionadded:: 1.0.0
         """
-        total_frac = sum(self.values)
-        for _, val_node in self._components:
-            val_node.value /= total_frac
+        self._fractions /= self._fractions.sum()
 
     @property
     def values(self):
@@ -1085,17 +1139,117 @@ See <https://www.montepy.org/migrations/migrate0_1.html> for more information ""
 
         return _MatCompWrapper(self, 0, setter)
 
-    def __prep_element_filter(self, filter_obj):
-        """Makes a filter function for an element.
+    @property
+    def fractions(self) -> np.ndarray:
+        """The fractions of the components of this material, as a NumPy array.
+
+        The fractions are stored in this array, so changing it in place changes this material,
+        and whole material operations can be vectorized.
+        It is replaced by a new array when components are added or removed.
+        The fractions are only copied to the syntax tree when this material is written.
+
+        Examples
+        ^^^^^^^^
+
+        .. testcode::
+
+            import montepy
+            mat = montepy.Material()
+            mat.number = 5
+            mat.add_nuclide("8016.00c", 2.0)
+            mat.add_nuclide("U-235.00c", 0.04)
+            mat.add_nuclide("U-238.00c", 0.96)
+
+            # double the enrichment of the uranium
+            uranium = mat.zaids // 1000 == 92
+            mat.fractions[uranium] *= [2.0, 0.92 / 0.96]
+            print(mat.fractions)
+            print(mat.values[1])
+
+        .. testoutput::
+
+            [2.   0.08 0.92]
+            0.08
+
+        .. versionadded:: 1.4.0
+
+        Returns
+        -------
+        numpy.ndarray
+            the fraction of every component, in the same order as this material.
+        """
+        return self._fractions
+
+    @fractions.setter
+    def fractions(self, fractions):
+        fractions = np.asarray(fractions)
+        if not np.issubdtype(fractions.dtype, np.number) or np.issubdtype(
+            fractions.dtype, np.complexfloating
+        ):
+            raise TypeError(f"fractions must be an array of floats. {fractions} given.")
+        if fractions.shape != self._fractions.shape:
+            raise ValueError(
+                f"fractions must have one fraction for each of the {len(self)} components. {fractions.shape} given."
+            )
+        if not np.all(fractions >= 0.0):
+            raise ValueError(
+                f"fractions must be greater than or equal to 0. {fractions} given."
+            )
+        self._fractions[:] = fractions
+
+    @property
+    def zaids(self) -> np.ndarray:
+        """The ZAIDs of the nuclides of the components of this material, as a read-only NumPy array.
+
+        These follow the MCNP convention for the ZAIDs of metastable isomers, like :attr:`~montepy.Nuclide.ZAID`.
+
+        Examples
+        ^^^^^^^^
+
+        .. testcode::
+
+            import montepy
+            mat = montepy.Material()
+            mat.number = 5
+            mat.add_nuclide("1001.80c", 2.0)
+            mat.add_nuclide("Am-242m1.80c", 1.0)
+            print(mat.zaids)
+
+        .. testoutput::
+
+            [ 1001 95242]
+
+        .. versionadded:: 1.4.0
+
+        Returns
+        -------
+        numpy.ndarray
+            the ZAID of every component, in the same order as this material.
+        """
+        zaids = self._zaids.view()
+        zaids.flags.writeable = False
+        return zaids
+
+    @staticmethod
+    def __mask(values, filter_obj):
+        """Filters an array of values at once, with the same rules as :func:`__prep_filter`.
 
         For use by find
         """
-        if isinstance(filter_obj, str):
-            filter_obj = Element.get_by_symbol(filter_obj).Z
-        if isinstance(filter_obj, Element):
-            filter_obj = filter_obj.Z
-        wrapped_filter = self.__prep_filter(filter_obj, "Z")
-        return wrapped_filter
+        if filter_obj is None:
+            return np.ones(len(values), dtype=bool)
+        if not isinstance(filter_obj, slice):
+            return values == filter_obj
+        mask = np.ones(len(values), dtype=bool)
+        start = 0
+        if filter_obj.start:
+            start = filter_obj.start
+            mask &= values >= start
+        if filter_obj.stop:
+            mask &= values < filter_obj.stop
+        if filter_obj.step:
+            mask &= (values - start) % filter_obj.step == 0
+        return mask
 
     def __prep_filter(self, filter_obj, attr=None):
         """Makes a filter function wrapper"""
@@ -1286,20 +1440,20 @@ See <https://www.montepy.org/migrations/migrate0_1.html> for more information ""
                 A = 0
             if library is None:
                 library = ""
-        filters = [
-            first_filter,
-            self.__prep_element_filter(element),
-            self.__prep_filter(A, "A"),
-            self.__prep_filter(meta_state, "meta_state"),
-            self.__prep_filter(library, "library"),
-        ]
-        for idx, component in enumerate(self):
-            for filt in filters:
-                found = filt(component[0])
-                if not found:
-                    break
-            if found:
-                yield idx, component
+        if isinstance(element, str):
+            element = Element.get_by_symbol(element)
+        if isinstance(element, Element):
+            element = element.Z
+        # the nuclei are filtered all at once from the arrays
+        base_zaids = self._base_zaids()
+        mask = self.__mask(base_zaids // 1000, element)
+        mask &= self.__mask(base_zaids % 1000, A)
+        mask &= self.__mask(self._meta_states, meta_state)
+        filters = [first_filter, self.__prep_filter(library, "library")]
+        for idx in np.flatnonzero(mask).tolist():
+            nuclide = self._nuclides[idx]
+            if all(filt(nuclide) for filt in filters):
+                yield idx, (nuclide, float(self._fractions[idx]))
 
     def find_vals(
         self,
@@ -1370,7 +1524,7 @@ See <https://www.montepy.org/migrations/migrate0_1.html> for more information ""
             yield fraction
 
     def __bool__(self):
-        return bool(self._components)
+        return bool(self._nuclides)
 
     @make_prop_pointer("_thermal_scattering", thermal_scattering.ThermalScatteringLaw)
     def thermal_scattering(self) -> thermal_scattering.ThermalScatteringLaw:
@@ -1403,7 +1557,11 @@ See <https://www.montepy.org/migrations/migrate0_1.html> for more information ""
         return lines
 
     def _update_values(self):
-        for nuclide, fraction in self._components:
+        self._add_component_nodes()
+        for nuclide, fraction, value in zip(
+            self._nuclides, self._fraction_nodes, self._fractions.tolist()
+        ):
+            fraction.value = value
             node = nuclide._tree
             parts = node.value.split(".")
             fraction.is_negative = not self.is_atom_fraction
@@ -1500,10 +1658,14 @@ See <https://www.montepy.org/migrations/migrate0_1.html> for more information ""
         return elements
 
     def validate(self):
-        if len(self._components) == 0 and self.number != 0:
+        if len(self._nuclides) == 0 and self.number != 0:
             raise IllegalState(
                 f"Material: {self.number} does not have any components defined."
             )
+        if not np.all(self._fractions >= 0.0):
+            raise IllegalState(
+                f"Material: {self.number} has fractions that are negative or not a number."
+            )
 
     def __eq__(self, other):
         if not isinstance(other, Material):
@@ -1521,6 +1683,13 @@ See <https://www.montepy.org/migrations/migrate0_1.html> for more information ""
                 return False
         return True
 
+    def __getstate__(self):
+        state = super().__getstate__()
+        # the indexes are linked by weakrefs that can't be pickled
+        state.pop("_nuclide_indexes", None)
+        return state
+
     def __setstate__(self, state):
+        state["_nuclide_indexes"] = {}
         super().__setstate__(state)
         self._default_libs._link_to_parent(self)
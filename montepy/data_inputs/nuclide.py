@@ -506,6 +506,7 @@ class Nuclide:
         node: ValueNode = None,
     ):
         self._library = Library("")
+        self._node = None
         ZAID = ""
 
         if not isinstance(name, (str, Integral, Element, Nucleus, Nuclide, type(None))):
@@ -520,7 +521,7 @@ class Nuclide:
         if node is not None and isinstance(node, ValueNode):
             if node.type == float:
                 node = ValueNode(node.token, str, node.padding)
-            self._tree = node
+            self._node = node
             ZAID = node.value
         parts = ZAID.split(".")
         if ZAID:
@@ -541,11 +542,35 @@ class Nuclide:
         if not isinstance(library, str):
             raise TypeError(f"Library can only be str. {library} given.")
         self._library = Library(library)
-        if not node:
+
+    @property
+    def _tree(self) -> ValueNode:
+        """The syntax node for this nuclide.
+
+        Nuclides that were not read from a file only make this when it is first needed to write them.
+        """
+        if self._node is None:
             padding_num = DEFAULT_NUCLIDE_WIDTH - len(self.mcnp_str())
             if padding_num < 1:
                 padding_num = 1
-            self._tree = ValueNode(self.mcnp_str(), str, PaddingNode(" " * padding_num))
+            self._node = ValueNode(self.mcnp_str(), str, PaddingNode(" " * padding_num))
+        return self._node
+
+    def _copy(self) -> "Nuclide":
+        """Makes a copy of this nuclide without parsing it again.
+
+        The nucleus and library can not be changed, so they are shared with the copy,
+        but the syntax node is not.
+
+        Returns
+        -------
+        Nuclide
+        """
+        ret = Nuclide.__new__(Nuclide)
+        ret._nucleus = self._nucleus
+        ret._library = self._library
+        ret._node = None
+        return ret
 
     @classmethod
     def _handle_stupid_legacy_stupidity(cls, ZAID):
@@ -1,7 +1,9 @@
 # Copyright 2024, Battelle Energy Alliance, LLC All Rights Reserved.
 from __future__ import annotations
 import copy
+import functools
 import numpy as np
+import pickle
 import re
 from typing import Union
 
@@ -13,6 +15,54 @@ from montepy.numbered_mcnp_object import Numbered_MCNP_Object, InitInput
 from montepy.utilities import *
 
 
+def _invalidate_geometry(self, *args):
+    """Marks cached geometry data, such as bounding boxes, built from this transform as stale."""
+    montepy.surfaces.half_space._invalidate_geometry(self)
+
+
+@functools.cache
+def _identity_template():
+    """Pickles an identity transform, which is much faster to copy than to parse."""
+    return pickle.dumps(
+        Transform("tr1 0.0 0.0 0.0 1.0 0.0 0.0 0.0 1.0 0.0 0.0 0.0 1.0")
+    )
+
+
+def _basis_from_axes(x_prime, x_in_aux):
+    """Finishes a rotation matrix from its first row and its first column.
+
+    Parameters
+    ----------
+    x_prime : numpy.ndarray
+        The :math:`x'` axis in the main coordinate system.
+    x_in_aux : numpy.ndarray
+        The :math:`x` axis in the auxiliary coordinate system.
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+    cosine = np.clip(x_prime[0], -1.0, 1.0)
+    sine = np.sqrt(1.0 - cosine**2)
+    basis = np.identity(3)
+    basis[0, 0] = cosine
+    if sine == 0.0:
+        # x and x' are the same axis, or opposite axes
+        basis[2, 2] = np.sign(cosine)
+        return basis
+    row = x_prime[1:] / sine
+    column = x_in_aux[1:] / sine
+    basis[0, 1:] = x_prime[1:]
+    basis[1:, 0] = x_in_aux[1:]
+    perpendicular_row = np.array([-row[1], row[0]])
+    perpendicular_column = np.array([-column[1], column[0]])
+    # of the two matrices with these axes, this is the one without a reflection
+    basis[1:, 1:] = -cosine * np.outer(column, row) - np.outer(
+        perpendicular_column, perpendicular_row
+    )
+    return basis
+
+
 class Transform(data_input.DataInputAbstract, Numbered_MCNP_Object):
     """Input to represent a transform input (TR).
 
@@ -112,7 +162,7 @@ class Transform(data_input.DataInputAbstract, Numbered_MCNP_Object):
         """
         return self._pass_through
 
-    @make_prop_pointer("_is_in_degrees", bool)
+    @make_prop_pointer("_is_in_degrees", bool, validator=_invalidate_geometry)
     def is_in_degrees(self):
         """The rotation matrix is in degrees and not in cosines
 
@@ -148,6 +198,7 @@ class Transform(data_input.DataInputAbstract, Numbered_MCNP_Object):
             raise TypeError("displacement_vector must be a numpy array")
         if len(vector) != 3:
             raise ValueError("displacement_vector must have three components")
+        _invalidate_geometry(self)
         self._displacement_vector = vector
 
     @property
@@ -166,9 +217,10 @@ class Transform(data_input.DataInputAbstract, Numbered_MCNP_Object):
             raise TypeError("rotation_matrix must be a numpy array")
         if len(matrix) < 5 or len(matrix) > 9:
             raise ValueError("rotation_matrix must have between 5 and 9 components.")
+        _invalidate_geometry(self)
         self._rotation_matrix = matrix
 
-    @make_prop_pointer("_is_main_to_aux", bool)
+    @make_prop_pointer("_is_main_to_aux", bool, validator=_invalidate_geometry)
     def is_main_to_aux(self):
         """Whether or not the displacement vector points from the main origin to auxilary
         origin, or vice versa.
@@ -179,6 +231,235 @@ class Transform(data_input.DataInputAbstract, Numbered_MCNP_Object):
         """
         return self._is_main_to_aux
 
+    def _rotation_basis(self):
+        """Builds the full 3x3 rotation matrix from the MCNP rotation entries.
+
+        The rows are the auxiliary axes expressed in the main coordinate system.
+        As in MCNP, 6 entries are the :math:`x'` and :math:`y'` axes,
+        5 entries are the :math:`x'` axis and the :math:`x` axis in the auxiliary system,
+        and 3 entries are only the :math:`x'` axis,
+        around which the other axes are set up in a consistent, but arbitrary, way.
+
+        Returns
+        -------
+        numpy.ndarray
+
+        Raises
+        ------
+        IllegalState
+            If the rotation matrix does not have 0, 3, 5, 6, or 9 entries.
+        """
+        entries = np.asarray(self.rotation_matrix, dtype=float)
+        if len(entries) == 0:
+            return np.identity(3)
+        if self.is_in_degrees:
+            entries = np.cos(np.deg2rad(entries))
+        if len(entries) == 9:
+            return entries.reshape(3, 3)
+        if len(entries) == 6:
+            basis = entries.reshape(2, 3)
+            return np.vstack([basis, np.cross(basis[0], basis[1])])
+        if len(entries) == 5:
+            return _basis_from_axes(entries[0:3], entries[[0, 3, 4]])
+        if len(entries) == 3:
+            x_prime = entries / np.linalg.norm(entries)
+            # the main axis furthest from x' gives a well conditioned y'
+            other = np.identity(3)[np.argmin(np.abs(x_prime))]
+            y_prime = other - (other @ x_prime) * x_prime
+            y_prime /= np.linalg.norm(y_prime)
+            return np.vstack([x_prime, y_prime, np.cross(x_prime, y_prime)])
+        raise IllegalState(
+            f"Transform: {self.number} has {len(entries)} rotation entries. "
+            "Only 3, 5, 6, or 9 entries define a rotation."
+        )
+
+    def _to_local_coordinates(self, points):
+        """Converts points from the main coordinate system into this transform's
+        auxiliary coordinate system.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            An (N, 3) array of points in the main coordinate system.
+
+        Returns
+        -------
+        numpy.ndarray
+            An (N, 3) array of the same points in the auxiliary coordinate system.
+        """
+        basis = self._rotation_basis()
+        displacement = np.zeros(3)
+        if len(self.displacement_vector) > 0:
+            displacement = np.asarray(self.displacement_vector, dtype=float)
+        if self.is_main_to_aux:
+            return (points - displacement) @ basis.T
+        return points @ basis.T + displacement
+
+    def _to_main_box(self, box):
+        """Finds an axis-aligned box in the main coordinate system containing a box
+        in this transform's auxiliary coordinate system.
+
+        This uses interval arithmetic, so infinite bounds are only spread
+        to the axes that they are rotated onto.
+
+        Parameters
+        ----------
+        box : numpy.ndarray
+            A (2, 3) array of the lower and upper corners of the box in the auxiliary coordinate system.
+
+        Returns
+        -------
+        numpy.ndarray
+            A (2, 3) array of the lower and upper corners of the box in the main coordinate system.
+        """
+        if np.any(box[0] > box[1]):
+            return box.copy()
+        basis = self._rotation_basis()
+        displacement = np.zeros(3)
+        if len(self.displacement_vector) > 0:
+            displacement = np.asarray(self.displacement_vector, dtype=float)
+        if not self.is_main_to_aux:
+            box = box - displacement
+        # the inverse of the rotation is its transpose
+        with np.errstate(invalid="ignore"):
+            ends = box[:, :, np.newaxis] * basis
+        ends = np.where(basis == 0.0, 0.0, ends)
+        ret = np.array([ends.min(axis=0).sum(axis=0), ends.max(axis=0).sum(axis=0)])
+        if self.is_main_to_aux:
+            ret += displacement
+        return ret
+
+    def as_matrix(self):
+        """Builds the 4x4 homogeneous matrix that moves points from this transform's
+        auxiliary coordinate system into the main coordinate system.
+
+        Rotations given in degrees are converted to cosines first,
+        and the displacement is placed according to :attr:`is_main_to_aux`.
+        Applying this matrix to a point in homogeneous coordinates,
+        :math:`(x, y, z, 1)`, gives where the point of a surface using this transform is in the main coordinate system.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            transform = montepy.Transform("*tr1 1 2 3 90 0 90 180 90 90 90 90 0")
+            print(transform.as_matrix().round(6))
+
+        .. testoutput::
+
+            [[ 0. -1.  0.  1.]
+             [ 1.  0.  0.  2.]
+             [ 0.  0.  1.  3.]
+             [ 0.  0.  0.  1.]]
+
+        Returns
+        -------
+        numpy.ndarray
+
+        Raises
+        ------
+        IllegalState
+            If the rotation matrix does not have 0, 3, 5, 6, or 9 entries.
+        """
+        basis = self._rotation_basis()
+        displacement = np.zeros(3)
+        if len(self.displacement_vector) > 0:
+            displacement = np.asarray(self.displacement_vector, dtype=float)
+        matrix = np.identity(4)
+        matrix[:3, :3] = basis.T
+        if self.is_main_to_aux:
+            matrix[:3, 3] = displacement
+        else:
+            matrix[:3, 3] = -basis.T @ displacement
+        return matrix
+
+    @classmethod
+    def _from_matrix(cls, matrix):
+        """Makes a new transform from a 4x4 homogeneous matrix.
+
+        The transform is written in cosines, with the displacement from the main origin to the auxiliary origin.
+
+        Parameters
+        ----------
+        matrix : numpy.ndarray
+            The matrix that moves points from the auxiliary coordinate system into the main coordinate system.
+
+        Returns
+        -------
+        Transform
+        """
+        transform = pickle.loads(_identity_template())
+        transform.displacement_vector = np.array(matrix[:3, 3], dtype=float)
+        transform.rotation_matrix = np.array(matrix[:3, :3].T, dtype=float).ravel()
+        return transform
+
+    def compose(self, other):
+        """Combines this transform with another transform that is nested inside of it.
+
+        The new transform moves points by ``other`` first, and then by this transform.
+        This is the transform of a surface using ``other`` in a universe filled with this transform.
+
+        The new transform is written in cosines, is main to aux,
+        and has the same number as this transform.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            outer = montepy.Transform("tr1 10 0 0")
+            inner = montepy.Transform("tr2 0 5 0")
+            print(outer.compose(inner).displacement_vector)
+
+        .. testoutput::
+
+            [10.  5.  0.]
+
+        Parameters
+        ----------
+        other : Transform
+            The transform to apply first.
+
+        Returns
+        -------
+        Transform
+            A new transform that applies both transforms.
+
+        Raises
+        ------
+        TypeError
+            If other is not a Transform.
+        """
+        if not isinstance(other, Transform):
+            raise TypeError(f"Can only compose a Transform. {other} given.")
+        ret = Transform._from_matrix(self.as_matrix() @ other.as_matrix())
+        ret.number = self.number
+        return ret
+
+    def inverse(self):
+        """Finds the transform that undoes this transform.
+
+        The new transform is written in cosines, is main to aux,
+        and has the same number as this transform.
+
+        .. versionadded:: 1.4.0
+
+        Returns
+        -------
+        Transform
+            A new transform that moves points from the main coordinate system into this transform's auxiliary coordinate system.
+        """
+        ret = Transform._from_matrix(np.linalg.inv(self.as_matrix()))
+        ret.number = self.number
+        return ret
+
     def __str__(self):
         return f"TRANSFORM: {self.number}"
 
@@ -267,14 +548,18 @@ class Transform(data_input.DataInputAbstract, Numbered_MCNP_Object):
         if self.is_main_to_aux != other.is_main_to_aux:
             return False
 
-        for i, component in enumerate(self.displacement_vector):
-            if abs(component - other.displacement_vector[i]) >= tolerance:
-                return False
+        displacement = np.asarray(self.displacement_vector, dtype=float)
+        other_displacement = np.asarray(other.displacement_vector, dtype=float)
+        if np.any(
+            np.abs(displacement - other_displacement[: len(displacement)]) >= tolerance
+        ):
+            return False
 
         if len(self.rotation_matrix) > 0:
             if len(other.rotation_matrix) == 0:
                 return False
-            for i, component in enumerate(self.rotation_matrix):
-                if abs(component - other.rotation_matrix[i]) >= tolerance:
-                    return False
+            rotation = np.asarray(self.rotation_matrix, dtype=float)
+            other_rotation = np.asarray(other.rotation_matrix, dtype=float)
+            if np.any(np.abs(rotation - other_rotation[: len(rotation)]) >= tolerance):
+                return False
         return True
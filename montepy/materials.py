@@ -3,15 +3,100 @@
 from __future__ import annotations
 import collections as co
 import copy
+import itertools
+import weakref
 from typing import Generator, Union
 from numbers import Integral, Real
 
+import numpy as np
+
 import montepy
 from montepy.numbered_object_collection import NumberedDataObjectCollection
 
 Material = montepy.data_inputs.material.Material
 
 
+class _NuclideIndex:
+    """An inverted index of the material components of each element and nucleus.
+
+    Only the number of components of each element and nucleus in every material is stored,
+    and the fractions are read from the arrays of the materials, so they are always up to date.
+    This is kept up to date by the materials themselves as their components change.
+
+    .. versionadded:: 1.4.0
+
+    Parameters
+    ----------
+    materials : Iterable[Material]
+        the materials to start the index with.
+    """
+
+    __slots__ = "_counts", "_materials", "_counter", "__weakref__"
+
+    def __init__(self, materials):
+        self._counts = {}
+        self._materials = {}
+        self._counter = itertools.count()
+        for material in materials:
+            self.add(material)
+
+    def add(self, material: Material):
+        """Adds a material to this index, and links the material to it."""
+        mat_id = id(material)
+        if mat_id in self._materials:
+            return
+        self._materials[mat_id] = (next(self._counter), material)
+        material._nuclide_indexes[id(self)] = weakref.ref(self)
+        self.update(material, added=material._nuclides)
+
+    def remove(self, material: Material):
+        """Removes a material from this index, and unlinks the material from it."""
+        if id(material) not in self._materials:
+            return
+        self.update(material, removed=material._nuclides)
+        material._nuclide_indexes.pop(id(self), None)
+        del self._materials[id(material)]
+
+    def clear(self):
+        """Removes all materials from this index."""
+        for _, material in self._materials.values():
+            material._nuclide_indexes.pop(id(self), None)
+        self._counts.clear()
+        self._materials.clear()
+
+    def update(self, material: Material, added=(), removed=()):
+        """Updates the nuclides of the components of a material in this index.
+
+        The removed components are processed before the added components.
+        """
+        mat_id = id(material)
+        if mat_id not in self._materials:
+            return
+        for nuclide in removed:
+            for key in (nuclide.element, nuclide.nucleus):
+                by_material = self._counts.get(key, {})
+                count = by_material.get(mat_id, 0) - 1
+                if count > 0:
+                    by_material[mat_id] = count
+                else:
+                    by_material.pop(mat_id, None)
+        for nuclide in added:
+            for key in (nuclide.element, nuclide.nucleus):
+                by_material = self._counts.setdefault(key, {})
+                by_material[mat_id] = by_material.get(mat_id, 0) + 1
+
+    def get(self, key) -> dict[int, int]:
+        """Gets the number of components of an element or nucleus by the id of their material."""
+        return self._counts.get(key, {})
+
+    def sort(self, mat_ids) -> list[Material]:
+        """Gets the materials for the ids in the order they were added to this index."""
+        return [
+            material
+            for _, material in sorted(self._materials[mat_id] for mat_id in mat_ids)
+        ]
+
+
 class Materials(NumberedDataObjectCollection):
     """A container of multiple :class:`~montepy.Material` instances.
 
@@ -42,8 +127,35 @@ class Materials(NumberedDataObjectCollection):
     """
 
     def __init__(self, objects=None, problem=None):
+        self._nuclide_index = None
         super().__init__(Material, objects, problem)
 
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_nuclide_index"] = None
+        return state
+
+    def _append_hook(self, obj, **kwargs):
+        super()._append_hook(obj, **kwargs)
+        if self._nuclide_index is not None:
+            self._nuclide_index.add(obj)
+
+    def _delete_hook(self, obj, **kwargs):
+        super()._delete_hook(obj, **kwargs)
+        if self._nuclide_index is not None:
+            self._nuclide_index.remove(obj)
+
+    def _clear_hook(self):
+        if self._nuclide_index is not None:
+            self._nuclide_index.clear()
+            self._nuclide_index = None
+
+    def __get_nuclide_index(self) -> _NuclideIndex:
+        """Gets the inverted nuclide index, and builds it if needed."""
+        if self._nuclide_index is None:
+            self._nuclide_index = _NuclideIndex(self._objects)
+        return self._nuclide_index
+
     def get_containing_any(
         self,
         *nuclides: Union[
@@ -58,9 +170,14 @@ class Materials(NumberedDataObjectCollection):
     ) -> Generator[Material]:
         """Get all materials that contain any of these these nuclides.
 
-        This uses :func:`~montepy.Material.contains_all` under the hood.
+        This follows the same rules as :func:`~montepy.Material.contains_any`.
         See that documentation for more guidance.
 
+        The materials are found with an inverted index of which materials contain each
+        element and nucleus. It is built on the first query, and is kept up to date
+        as materials are changed. Only the materials found in the index are
+        then checked against the ``threshold``.
+
         Examples
         ^^^^^^^^
 
@@ -122,9 +239,14 @@ class Materials(NumberedDataObjectCollection):
     ) -> Generator[Material]:
         """Get all materials that contain all of these nuclides.
 
-        This uses :func:`~montepy.Material.contains_all` under the hood.
+        This follows the same rules as :func:`~montepy.Material.contains_all`.
         See that documentation for more guidance.
 
+        The materials are found with an inverted index of which materials contain each
+        element and nucleus. It is built on the first query, and is kept up to date
+        as materials are changed. Only the materials found in the index are
+        then checked against the ``threshold``.
+
         Examples
         ^^^^^^^^
 
@@ -185,31 +307,125 @@ class Materials(NumberedDataObjectCollection):
         threshold: float = 0.0,
         strict: bool = False,
     ) -> Generator[Material]:
+        self.__check_threshold(threshold, strict)
         nuclide_finders = []
         for nuclide in nuclides:
             nuclide_finders.append(Material._promote_nuclide(nuclide, strict))
-
-        def sort_by_type(nuclide):
-            type_map = {
-                montepy.data_inputs.element.Element: 0,
-                montepy.Nucleus: 1,
-                montepy.data_inputs.nuclide.Nuclide: 2,
-            }
-            return type_map[type(nuclide)]
-
-        # optimize by most hashable and fail fast
-        nuclide_finders = sorted(nuclide_finders, key=sort_by_type)
-        for material in self:
-            if material._contains_arb(
-                *nuclide_finders,
-                bool_func=bool_func,
-                threshold=threshold,
-                strict=strict,
+        index = self.__get_nuclide_index()
+        searches = [
+            (finder, index.get(self.__index_key(finder))) for finder in nuclide_finders
+        ]
+        if not searches:
+            candidates = self._objects[:] if bool_func is all else []
+        else:
+            # find the candidates from the smallest index entries first
+            searches_by_size = sorted(searches, key=lambda search: len(search[1]))
+            if bool_func is all:
+                mat_ids = [
+                    mat_id
+                    for mat_id in searches_by_size[0][1]
+                    if all(mat_id in matches for _, matches in searches_by_size[1:])
+                ]
+            else:
+                mat_ids = set()
+                for _, matches in searches:
+                    mat_ids.update(matches)
+            candidates = index.sort(mat_ids)
+        for material in candidates:
+            mat_id = id(material)
+            if bool_func(
+                mat_id in matches and material._fraction_of(finder) > threshold
+                for finder, matches in searches
             ):
-                # maybe? Maybe not?
-                # should Materials act like a set?
                 yield material
 
+    @staticmethod
+    def __check_threshold(threshold, strict):
+        if not isinstance(threshold, Real):
+            raise TypeError(
+                f"Threshold must be a float. {threshold} of type: {type(threshold)} given"
+            )
+        if threshold < 0.0:
+            raise ValueError(f"Threshold must be positive or zero. {threshold} given.")
+        if not isinstance(strict, bool):
+            raise TypeError(
+                f"Strict must be bool. {strict} of type: {type(strict)} given."
+            )
+
+    @staticmethod
+    def __index_key(finder):
+        """Gets the element or nucleus to look up a promoted nuclide with in the index.
+
+        Nuclides are found by their nucleus as their library can be changed in place.
+        """
+        if isinstance(finder, montepy.data_inputs.nuclide.Nuclide):
+            return finder.nucleus
+        return finder
+
+    def containing(
+        self,
+        nuclide: Union[
+            montepy.data_inputs.nuclide.Nuclide,
+            montepy.Nucleus,
+            montepy.Element,
+            str,
+            int,
+        ],
+        threshold: float = 0.0,
+        strict: bool = False,
+    ) -> Generator[Material]:
+        """Get all materials that contain the given nuclide.
+
+        This gives the same results as :func:`get_containing_any` with a single nuclide,
+        but the arguments are checked immediately rather than when the results are iterated over.
+
+        Examples
+        ^^^^^^^^
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("foo.imcnp")
+            for mat in problem.materials.containing("H-1", threshold=0.3):
+                print(mat)
+
+        .. testoutput::
+
+            MATERIAL: 1, ['hydrogen', 'oxygen']
+
+        .. versionadded:: 1.4.0
+
+        Parameters
+        ----------
+        nuclide : Union[Nuclide, Nucleus, Element, str, int]
+            the nuclide to check for.
+        threshold : float
+            the minimum concentration of a nuclide to be considered. The
+            material components are not first normalized.
+        strict : bool
+            If True this does not let an elemental nuclide match all
+            child isotopes, isomers, nor will an isotope match all
+            isomers, nor will a blank library match all libraries.
+
+        Returns
+        -------
+        Generator[Material]
+            A generator of all matching materials
+
+        Raises
+        ------
+        TypeError
+            if any argument is of the wrong type.
+        ValueError
+            if the threshold is negative, or if nuclide
+            cannot be interpreted as a Nuclide.
+        """
+        self.__check_threshold(threshold, strict)
+        Material._promote_nuclide(nuclide, strict)
+        return self._contains_arb(
+            nuclide, bool_func=any, threshold=threshold, strict=strict
+        )
+
     @property
     def default_libraries(self) -> dict[montepy.LibraryType, montepy.Library]:
         """The default libraries for this problem defined by ``M0``.
@@ -245,6 +461,69 @@ class Materials(NumberedDataObjectCollection):
             self.append(default)
             return self.default_libraries
 
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Exports the compositions of all materials to flattened NumPy arrays.
+
+        This is built in a single pass over the materials.
+        The components of all materials are concatenated in the order of this collection.
+        The components of the ``i``-th material are in the slice ``offsets[i]:offsets[i + 1]``.
+
+        The arrays returned are:
+
+        * ``number``: the material numbers.
+        * ``is_atom_fraction``: True if the material is in atom fractions, False for mass fractions.
+        * ``offsets``: the offsets into the component arrays for each material,
+          with one more entry than there are materials.
+        * ``zaid``: the ZAID of each component nuclide following the MCNP convention.
+        * ``library``: the library of each component, e.g., ``"80c"``, or ``""`` if none was given.
+        * ``fraction``: the fraction of each component.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test.imcnp")
+            arrays = problem.materials.to_arrays()
+            start, end = arrays["offsets"][0:2]
+            print(arrays["zaid"][start:end])
+            print(arrays["fraction"][start:end])
+
+        .. testoutput::
+
+            [92235 92238]
+            [ 5. 95.]
+
+        Returns
+        -------
+        dict[str, numpy.ndarray]
+            a dictionary of the arrays of the material data.
+        """
+        numbers = []
+        atom_flags = []
+        offsets = [0]
+        zaids = []
+        libraries = []
+        fractions = []
+        for mat in self._objects:
+            numbers.append(mat._number.value)
+            atom_flags.append(mat._is_atom_fraction)
+            zaids.append(mat._zaids)
+            libraries.extend(str(nuclide.library) for nuclide in mat._nuclides)
+            fractions.append(mat._fractions)
+            offsets.append(offsets[-1] + len(mat._nuclides))
+        return {
+            "number": np.array(numbers, dtype=np.int64),
+            "is_atom_fraction": np.array(atom_flags, dtype=bool),
+            "offsets": np.array(offsets, dtype=np.int64),
+            "zaid": np.concatenate([np.empty(0, dtype=np.int64)] + zaids),
+            "library": np.array(libraries, dtype=str),
+            "fraction": np.concatenate([np.empty(0, dtype=np.float64)] + fractions),
+        }
+
     def mix(
         self,
         materials: list[Material],
@@ -318,6 +597,185 @@ class Materials(NumberedDataObjectCollection):
             not all the materials are of the same fraction type, or if a
             negative starting_number or step are given.
         """
+        self.__check_mix_materials(materials)
+        if not isinstance(fractions, list):
+            raise TypeError(f"fractions must be a list. {fractions} given.")
+        for frac in fractions:
+            if not isinstance(frac, Real):
+                raise TypeError(f"fraction in fractions must be a float. {frac} given.")
+            if frac < 0.0:
+                raise ValueError(f"Fraction cannot be negative. {frac} given.")
+        if len(fractions) != len(materials):
+            raise ValueError(
+                f"Length of materials and fractions don't match. The lengths are, materials: {len(materials)}, fractions: {len(fractions)}"
+            )
+        starting_number, step = self.__check_numbering(starting_number, step)
+        ret = Material()
+        ret.number = self.request_number(starting_number, step)
+        ret.is_atom_fraction = materials[0].is_atom_fraction
+        new_mats = copy.deepcopy(materials)
+        for mat, fraction in zip(new_mats, fractions):
+            mat.normalize()
+            ret._extend_components(mat._nuclides, mat.fractions * fraction)
+        return ret
+
+    def mix_many(
+        self,
+        materials: list[Material],
+        fraction_matrix,
+        merge_libraries: bool = False,
+        starting_number=None,
+        step=None,
+    ) -> list[Material]:
+        """Mixes the given materials in many sets of fractions at once, to create many new materials.
+
+        This works like :func:`mix`, but every row of ``fraction_matrix`` makes a new material.
+        The components of all of the materials are found once, and every mixture is made by one matrix product,
+        so the materials are not copied or normalized for every mixture.
+        Identical nuclides from different materials are merged into one component of each new material,
+        and components with a fraction of zero are left out.
+
+        All materials must use the same fraction type, either atom fraction or mass fraction.
+        The fractions given to this method are interpreted in that way as well,
+        and the new materials use the same fraction type.
+
+        The new materials are automatically added to this collection.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        For example, a table of borated water at many concentrations of boron can be made at once:
+
+        .. testcode::
+
+            import montepy
+            import numpy as np
+
+            mats = montepy.Materials()
+            h2o = montepy.Material(number=1)
+            h2o.add_nuclide("1001.80c", 2.0)
+            h2o.add_nuclide("8016.80c", 1.0)
+            boric_acid = montepy.Material(number=2)
+            for nuclide, fraction in {
+                "1001.80c": 3.0,
+                "B-10.80c": 0.189,
+                "B-11.80c": 0.796,
+                "O-16.80c": 3.0,
+            }.items():
+                boric_acid.add_nuclide(nuclide, fraction)
+            mats.extend([h2o, boric_acid])
+
+            boric_conc = np.array([0.0, 500.0, 1000.0]) * 1e-6
+            fractions = np.column_stack([1 - boric_conc, boric_conc])
+            borated_water = mats.mix_many([h2o, boric_acid], fractions, starting_number=10)
+            print([mat.number for mat in borated_water])
+            print(len(borated_water[0]), len(borated_water[2]))
+            for nuclide, fraction in borated_water[2]:
+                print(nuclide, round(fraction, 6))
+
+        .. testoutput::
+
+            [10, 11, 12]
+            2 4
+             H-1     (80c) 0.666429
+             O-16    (80c) 0.333429
+             B-10    (80c) 2.7e-05
+             B-11    (80c) 0.000114
+
+        Parameters
+        ----------
+        materials : list[Material]
+            the materials to mix.
+        fraction_matrix : numpy.ndarray
+            the (N, len(materials)) fractions of the materials in each of the N new materials,
+            in either atom or mass fractions, depending on the materials fraction type.
+        merge_libraries : bool
+            If True, the nuclides of the same nucleus are merged even if they use different libraries,
+            and the library of the first of them is used.
+            Otherwise, only nuclides with the same library are merged.
+        starting_number : Union[int, None]
+            the number to start from when finding numbers for the new materials.
+        step : Union[int, None]
+            the step size to take when finding new numbers.
+
+        Returns
+        -------
+        list[Material]
+            the new materials, one for every row of ``fraction_matrix``.
+
+        Raises
+        ------
+        TypeError
+            if invalid objects are given.
+        ValueError
+            if the shape of ``fraction_matrix`` does not match the materials, if it has negative fractions,
+            if not all the materials are of the same fraction type, or if a
+            negative starting_number or step are given.
+        """
+        self.__check_mix_materials(materials)
+        try:
+            fraction_matrix = np.asarray(fraction_matrix, dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            raise TypeError(
+                f"fraction_matrix must be an array of numbers. {fraction_matrix} given."
+            ) from e
+        if fraction_matrix.ndim != 2 or fraction_matrix.shape[1] != len(materials):
+            raise ValueError(
+                f"fraction_matrix must have the shape (N, {len(materials)}). {fraction_matrix.shape} given."
+            )
+        if not np.all(fraction_matrix >= 0.0):
+            raise ValueError(
+                f"Fractions cannot be negative or nan. {fraction_matrix} given."
+            )
+        if not isinstance(merge_libraries, bool):
+            raise TypeError(f"merge_libraries must be a bool. {merge_libraries} given.")
+        starting_number, step = self.__check_numbering(starting_number, step)
+        # find the union of the components of all of the materials
+        columns = {}
+        nuclides = []
+        rows = []
+        indices = []
+        weights = []
+        for row, mat in enumerate(materials):
+            total = mat._fractions.sum()
+            for nuclide in mat._nuclides:
+                key = (
+                    nuclide.nucleus
+                    if merge_libraries
+                    else (nuclide.nucleus, nuclide.library)
+                )
+                if key not in columns:
+                    columns[key] = len(nuclides)
+                    nuclides.append(nuclide)
+                indices.append(columns[key])
+            rows.extend([row] * len(mat))
+            weights.append(mat._fractions / total if total > 0.0 else mat._fractions)
+        compositions = np.zeros((len(materials), len(nuclides)))
+        if nuclides:
+            np.add.at(compositions, (rows, indices), np.concatenate(weights))
+        mixed = fraction_matrix @ compositions
+        taken = set(self.numbers)
+        number = starting_number
+        ret = []
+        for fractions in mixed:
+            while number in taken:
+                number += step
+            new_mat = Material(number=number)
+            number += step
+            new_mat.is_atom_fraction = materials[0].is_atom_fraction
+            used = np.flatnonzero(fractions)
+            new_mat._extend_components(
+                [nuclides[i]._copy() for i in used.tolist()], fractions[used]
+            )
+            ret.append(new_mat)
+        self.extend(ret)
+        return ret
+
+    @staticmethod
+    def __check_mix_materials(materials):
+        """Checks that the materials to mix are all materials of the same fraction type."""
         if not isinstance(materials, list):
             raise TypeError(f"materials must be a list. {materials} given.")
         if len(materials) == 0:
@@ -331,17 +789,14 @@ class Materials(NumberedDataObjectCollection):
                 raise ValueError(
                     f"All materials must have the same is_atom_fraction value. {mat} is the odd one out."
                 )
-        if not isinstance(fractions, list):
-            raise TypeError(f"fractions must be a list. {fractions} given.")
-        for frac in fractions:
-            if not isinstance(frac, Real):
-                raise TypeError(f"fraction in fractions must be a float. {frac} given.")
-            if frac < 0.0:
-                raise ValueError(f"Fraction cannot be negative. {frac} given.")
-        if len(fractions) != len(materials):
-            raise ValueError(
-                f"Length of materials and fractions don't match. The lengths are, materials: {len(materials)}, fractions: {len(fractions)}"
-            )
+
+    def __check_numbering(self, starting_number, step):
+        """Checks the numbers to start from and step by to number new materials, and fills in their defaults.
+
+        Returns
+        -------
+        tuple[int, int]
+        """
         if not isinstance(starting_number, (Integral, type(None))):
             raise TypeError(
                 f"starting_number must be an int. {starting_number} of type {type(starting_number)} given."
@@ -354,18 +809,8 @@ class Materials(NumberedDataObjectCollection):
             raise TypeError(f"step must be an int. {step} of type {type(step)} given.")
         if step is not None and step <= 0:
             raise ValueError(f"step must be positive. {step} given.")
-        ret = Material()
         if starting_number is None:
             starting_number = self.starting_number
         if step is None:
             step = self.step
-        ret.number = self.request_number(starting_number, step)
-        ret.is_atom_fraction = materials[0].is_atom_fraction
-        new_mats = copy.deepcopy(materials)
-        for mat, fraction in zip(new_mats, fractions):
-            mat.normalize()
-            for nuclide, frac in mat._components:
-                frac = copy.deepcopy(frac)
-                frac.value *= fraction
-                ret._components.append((nuclide, frac))
-        return ret
+        return starting_number, step
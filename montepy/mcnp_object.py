@@ -489,7 +489,7 @@ The new input was:\n\n"""
 
     def __getstate__(self):
         state = self.__dict__.copy()
-        bad_keys = {"_problem_ref", "_parser"}
+        bad_keys = {"_problem_ref", "_parser", "_geometry_dependents"}
         for key in bad_keys:
             if key in state:
                 del state[key]
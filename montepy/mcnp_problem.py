@@ -1,12 +1,28 @@
 # Copyright 2024, Battelle Energy Alliance, LLC All Rights Reserved.
+from concurrent.futures import ThreadPoolExecutor
 import copy
 from enum import Enum
 import itertools
+import math
+import numpy as np
+from numbers import Integral, Real
 import os
 import warnings
 
 from montepy.data_inputs import mode, transform
+from montepy._adjacency import _CellAdjacency
+from montepy._buckets import _first_matches
 from montepy._cell_data_control import CellDataPrintController
+from montepy._flatten import _Flattener
+from montepy._instances import _InstanceWalker
+from montepy._locator import _Locator, _TILE_SIZE, _UniverseGrid
+from montepy._sampling import (
+    _clip_box,
+    _estimate_volume,
+    _sample_claims,
+    _universe_domain,
+)
+from montepy._uniquify import _Uniquifier
 from montepy.cell import Cell
 from montepy.cells import Cells
 from montepy.exceptions import *
@@ -24,6 +40,199 @@ from montepy.transforms import Transforms
 import montepy
 
 
+def _merge_number_map(taken, numbers, renumber, keep_zero=False):
+    """Computes the new numbers for objects being merged into a collection.
+
+    Parameters
+    ----------
+    taken : set[int]
+        the numbers already in use in the collection being merged into.
+    numbers : list[int]
+        the numbers of the objects being merged.
+    renumber : str
+        the renumbering scheme: ``"offset"`` or ``"compact"``.
+    keep_zero : bool
+        Whether to never renumber 0.
+
+    Returns
+    -------
+    dict[int, int]
+        a mapping of the old numbers to the new numbers.
+    """
+    if renumber == "offset":
+        offset = max(taken, default=0)
+        return {num: num if keep_zero and num == 0 else num + offset for num in numbers}
+    remap = {}
+    claimed = taken | set(numbers)
+    candidate = 1
+    for num in numbers:
+        if num in taken and not (keep_zero and num == 0):
+            while candidate in claimed:
+                candidate += 1
+            claimed.add(candidate)
+            remap[num] = candidate
+        else:
+            remap[num] = num
+    return remap
+
+
+def _quantize(values, tolerance):
+    """Rounds the values to the significant digits implied by a relative tolerance."""
+    digits = max(int(-math.log10(tolerance)), 1)
+    return tuple(float(f"{value:.{digits}e}") for value in values)
+
+
+def _material_merge_key(material, tolerance):
+    """A hashable key that is equal for materials with identical compositions."""
+    components = sorted(
+        (
+            nuclide.nucleus.Z,
+            nuclide.nucleus.A,
+            nuclide.nucleus.meta_state,
+            str(nuclide.library),
+            fraction,
+        )
+        for nuclide, fraction in material
+    )
+    laws = ()
+    if material.thermal_scattering is not None:
+        laws = tuple(material.thermal_scattering.thermal_scattering_laws)
+    return (
+        material.is_atom_fraction,
+        tuple(component[:-1] for component in components),
+        _quantize([component[-1] for component in components], tolerance),
+        tuple(
+            sorted(
+                (str(key), str(lib)) for key, lib in material.default_libraries.items()
+            )
+        ),
+        laws,
+    )
+
+
+def _surface_merge_key(surf, tolerance):
+    """A hashable key that is equal for surfaces that are identical.
+
+    Returns None for periodic surfaces, which are never considered duplicates.
+    """
+    if surf.old_periodic_surface or surf.periodic_surface is not None:
+        return None
+    transform = None
+    if surf.transform is not None:
+        trans = surf.transform
+        transform = (
+            trans.is_in_degrees,
+            trans.is_main_to_aux,
+            _quantize(trans.displacement_vector, tolerance),
+            _quantize(trans.rotation_matrix, tolerance),
+        )
+    return (
+        surf.surface_type,
+        surf.is_reflecting,
+        surf.is_white_boundary,
+        transform,
+        _quantize(surf.surface_constants, tolerance),
+    )
+
+
+_ATOL = 1e-8
+"""The absolute tolerance used by :func:`numpy.isclose` when comparing surface constants."""
+
+
+def _transform_classes(transforms, tolerance):
+    """Groups transforms into classes of equivalent transforms.
+
+    Returns
+    -------
+    dict[int, int]
+        The class of each transform, keyed by the ``id`` of the transform.
+    """
+    groups = {}
+    for trans in {id(trans): trans for trans in transforms}.values():
+        key = (
+            trans.is_in_degrees,
+            trans.is_main_to_aux,
+            len(trans.displacement_vector),
+        )
+        groups.setdefault(key, []).append(trans)
+    classes = {}
+    for key, group in groups.items():
+        displacements = np.array(
+            [trans.displacement_vector for trans in group], dtype=float
+        ).reshape(len(group), -1)
+        leaders = _first_matches(
+            displacements,
+            tolerance,
+            lambda kept, other: group[kept].equivalent(group[other], tolerance),
+        )
+        for trans, leader in zip(group, leaders):
+            classes[id(trans)] = id(group[leader])
+    return classes
+
+
+def _find_duplicate_surfaces(surfaces, tolerance):
+    """Finds all surfaces that are effectively the same as an earlier surface in one pass.
+
+    Surfaces are grouped by their type, boundary conditions, and class of equivalent transforms.
+    Within a group the constants are compared with a relative ``tolerance``,
+    and only surfaces in neighbouring tolerance buckets are compared.
+    The constants are bucketed on an inverse hyperbolic sine scale.
+    This is linear near zero, where the absolute tolerance dominates,
+    and logarithmic for large constants, where the relative tolerance does,
+    so close constants are always within ``3 * tolerance`` of each other on it.
+
+    Returns
+    -------
+    dict[int, tuple[Surface, Surface]]
+        The surfaces to delete, mapping the number of each duplicate surface to a tuple of it,
+        and the earlier surface to replace it with.
+    """
+    # the private attributes are read directly as this is a single pass over many surfaces
+    surfaces = [
+        surf
+        for surf in surfaces
+        if not surf._old_periodic_surface.value and surf._periodic_surface is None
+    ]
+    classes = _transform_classes(
+        [surf._transform for surf in surfaces if surf._transform is not None],
+        tolerance,
+    )
+    groups = {}
+    for surf in surfaces:
+        constants = [node.value for node in surf._surface_constants]
+        key = (
+            surf.surface_type,
+            surf._is_reflecting,
+            surf._is_white_boundary,
+            None if surf._transform is None else classes[id(surf._transform)],
+            len(constants),
+        )
+        groups.setdefault(key, ([], []))
+        groups[key][0].append(surf)
+        groups[key][1].append(constants)
+    matches = {}
+    for group, constants in groups.values():
+        constants = np.array(constants, dtype=float).reshape(len(group), -1)
+        if tolerance < 0.5:
+            bucketed = np.arcsinh(constants * (tolerance / _ATOL))
+        else:
+            # the buckets are not guaranteed to hold every match for large tolerances
+            bucketed = np.zeros((len(group), 0))
+
+        def is_match(kept, other):
+            return np.all(
+                np.abs(constants[kept] - constants[other])
+                <= _ATOL + tolerance * np.abs(constants[other])
+            )
+
+        for surf, leader in zip(
+            group, _first_matches(bucketed, 3 * tolerance, is_match)
+        ):
+            if group[leader] is not surf:
+                matches[surf.number] = (surf, group[leader])
+    return matches
+
+
 class MCNP_Problem:
     """A class to represent an entire MCNP problem in a semantic way.
 
@@ -61,6 +270,7 @@ class MCNP_Problem:
         self._data_inputs = []
         self._mcnp_version = DEFAULT_VERSION
         self._mode = mode.Mode()
+        self._adjacency = _CellAdjacency()
 
     def __setstate__(self, nom_nom):
         self.__dict__.update(nom_nom)
@@ -70,6 +280,30 @@ class MCNP_Problem:
     def __get_collect_attr_name(collect_type):
         return f"_{collect_type.__name__.lower()}"
 
+    def _numbered_collections(self):
+        """Gets the collections of numbered objects owned by this problem.
+
+        .. versionadded:: 1.4.0
+
+        Returns
+        -------
+        list[NumberedObjectCollection]
+        """
+        collections = []
+        for collect_type in set(self._NUMBERED_OBJ_MAP.values()):
+            collection = getattr(self, self.__get_collect_attr_name(collect_type), None)
+            if collection is not None:
+                collections.append(collection)
+        return collections
+
+    def _clear_indexes(self):
+        """Marks the lazily built secondary indexes of the collections of this problem as stale.
+
+        .. versionadded:: 1.4.0
+        """
+        for collection in self._numbered_collections():
+            collection._clear_indexes()
+
     @property
     def original_inputs(self):
         """A list of the MCNP_Inputs read from the original file.
@@ -495,26 +729,1296 @@ class MCNP_Problem:
     def remove_duplicate_surfaces(self, tolerance):
         """Finds duplicate surfaces in the problem, and remove them.
 
+        .. versionchanged:: 1.4.0
+
+            Duplicates are found in one pass by bucketing the surface constants,
+            rather than by comparing every pair of surfaces.
+            Surfaces with different boundary conditions, or that are periodic,
+            are no longer considered duplicates.
+
         Parameters
         ----------
         tolerance : float
             The amount of relative error to consider two surfaces
             identical
+
+        Raises
+        ------
+        TypeError
+            if tolerance is not a float.
+        ValueError
+            if tolerance is not positive.
         """
-        to_delete = montepy.surface_collection.Surfaces()
-        matching_map = {}
-        for surface in self.surfaces:
-            if surface not in to_delete:
-                matches = surface.find_duplicate_surfaces(self.surfaces, tolerance)
-                if matches:
-                    for match in matches:
-                        to_delete.add(match)
-                        matching_map[match.number] = (match, surface)
+        if not isinstance(tolerance, Real):
+            raise TypeError(f"tolerance must be a float. {tolerance} given.")
+        if tolerance <= 0:
+            raise ValueError(f"tolerance must be positive. {tolerance} given.")
+        matching_map = _find_duplicate_surfaces(self.surfaces, tolerance)
+        if not matching_map:
+            return
         for cell in self.cells:
-            cell.remove_duplicate_surfaces(matching_map)
+            deleting = {
+                surf.number: matching_map[surf.number]
+                for surf in cell.surfaces
+                if surf.number in matching_map and matching_map[surf.number][0] is surf
+            }
+            if deleting:
+                cell.remove_duplicate_surfaces(deleting)
         self.__update_internal_pointers()
-        for surface in to_delete:
-            self._surfaces.remove(surface)
+        self._surfaces._remove_many([dead for dead, _ in matching_map.values()])
+
+    _MERGE_ORDER = ("transforms", "surfaces", "materials", "universes", "cells")
+    """The order collections are merged in so children always exist before parents."""
+
+    def merge(self, other, renumber="offset", dedupe=False, tolerance=1e-6, clone=True):
+        """Merges all of the numbered objects of another problem into this problem.
+
+        The cells, surfaces, materials, transforms, and universes of ``other`` are cloned (or moved),
+        renumbered to avoid any number conflicts with this problem, and then added to this problem in one batch.
+        All number remappings are computed up front from the numbers in use,
+        so merging scales linearly with the size of both problems.
+
+        Two renumbering schemes are available:
+
+        * ``"offset"``: every number in ``other`` is shifted by the largest number in use
+          by the same collection in this problem. This preserves the relative numbering of ``other``.
+        * ``"compact"``: numbers that do not conflict are kept,
+          and conflicting numbers are replaced with the lowest available numbers.
+
+        Universe 0, the real world, is never renumbered,
+        and cells of ``other`` in the real world will be in the real world of this problem.
+
+        .. versionadded:: 1.4.0
+
+        Notes
+        -----
+        Only numbered objects are merged. Other data inputs of ``other``,
+        such as ``MODE``, ``KCODE``, sources, and tallies are ignored.
+
+        Cloning ``other`` is by far the most expensive part of merging.
+        When ``other`` is not needed afterwards use ``clone=False``,
+        which moves the objects out of ``other`` instead,
+        leaving ``other`` without any cells, surfaces, materials, transforms, or universes.
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test.imcnp")
+            other = montepy.read_input("tests/inputs/test.imcnp")
+            remaps = problem.merge(other, renumber="compact")
+            print(len(problem.cells))
+            print(remaps["cells"][1])
+
+        .. testoutput::
+
+            10
+            4
+
+        Parameters
+        ----------
+        other : MCNP_Problem
+            the problem to merge into this problem.
+        renumber : str
+            the renumbering scheme to use: ``"offset"`` or ``"compact"``.
+        dedupe : bool
+            If true, materials and surfaces in ``other`` that are identical to ones in this problem
+            are not added, and the objects from this problem are used in their place.
+        tolerance : float
+            The amount of relative error to consider two materials or surfaces identical.
+        clone : bool
+            Whether to merge clones of the objects of ``other``, leaving ``other`` unmodified,
+            or to move the objects out of ``other``.
+
+        Returns
+        -------
+        dict[str, dict[int, int]]
+            A dictionary mapping the collection name, e.g., ``"cells"``,
+            to a dictionary mapping the old number in ``other`` to the new number in this problem.
+
+        Raises
+        ------
+        TypeError
+            if ``other`` is not an MCNP_Problem, or the arguments are of the wrong type.
+        ValueError
+            if an unknown renumbering scheme is given, or tolerance is not positive.
+        """
+        if not isinstance(other, MCNP_Problem):
+            raise TypeError(f"other must be an MCNP_Problem. {other} given.")
+        if renumber not in {"offset", "compact"}:
+            raise ValueError(
+                f"renumber must be either 'offset' or 'compact'. {renumber} given."
+            )
+        if not isinstance(dedupe, bool):
+            raise TypeError(f"dedupe must be a bool. {dedupe} given.")
+        if not isinstance(tolerance, Real):
+            raise TypeError(f"tolerance must be a number. {tolerance} given.")
+        if tolerance <= 0:
+            raise ValueError(f"tolerance must be positive. {tolerance} given.")
+        if not isinstance(clone, bool):
+            raise TypeError(f"clone must be a bool. {clone} given.")
+        if clone:
+            other = other.clone()
+        duplicates = {}
+        if dedupe:
+            duplicates["materials"] = self.__find_merge_duplicates(
+                self.materials, other.materials, _material_merge_key, tolerance
+            )
+            duplicates["surfaces"] = self.__find_merge_duplicates(
+                self.surfaces, other.surfaces, _surface_merge_key, tolerance
+            )
+        my_world = self.universes.get(0)
+        their_world = other.universes.get(0)
+        if my_world is not None and their_world is not None:
+            duplicates["universes"] = {0: (their_world, my_world)}
+        remaps = {}
+        for attr in self._MERGE_ORDER:
+            mine = getattr(self, attr)
+            theirs = getattr(other, attr)
+            dead = duplicates.get(attr, {})
+            taken = mine._numbers_in_use()
+            keep_numbers = [obj.number for obj in theirs if obj.number not in dead]
+            remap = _merge_number_map(
+                taken, keep_numbers, renumber, attr == "universes"
+            )
+            # move the dead objects out of the way of the new numbers
+            next_free = max(itertools.chain(taken, remap.values()), default=0) + 1
+            for obj in theirs:
+                obj._unlink_from_collection()
+                if obj.number in dead:
+                    obj.number = next_free
+                    next_free += 1
+                else:
+                    obj.number = remap[obj.number]
+            for old_num, (_, kept) in dead.items():
+                remap[old_num] = kept.number
+            remaps[attr] = remap
+        for cell in other.cells:
+            cell.surfaces._rebuild_number_cache()
+            cell.complements._rebuild_number_cache()
+        self.__replace_merge_duplicates(other, duplicates)
+        for attr in self._MERGE_ORDER:
+            mine = getattr(self, attr)
+            dead = duplicates.get(attr, {})
+            dead = {id(dead_obj) for dead_obj, _ in dead.values()}
+            new_objs = [obj for obj in getattr(other, attr) if id(obj) not in dead]
+            if attr == "cells":
+                # all children were already added; skip the per-cell child search
+                for obj in new_objs:
+                    mine.append(obj, initial_load=True)
+            else:
+                mine.extend(new_objs)
+        if not clone:
+            self.__empty_merged_problem(other)
+        return remaps
+
+    def __empty_merged_problem(self, other):
+        """Removes all numbered objects from a problem whose objects were moved into this problem."""
+        moved = set()
+        for attr in self._MERGE_ORDER:
+            collection = getattr(other, attr)
+            moved |= {id(obj) for obj in collection}
+            setattr(
+                other,
+                self.__get_collect_attr_name(type(collection)),
+                type(collection)(problem=other),
+            )
+        other._data_inputs = [
+            data_input
+            for data_input in other._data_inputs
+            if id(data_input) not in moved
+        ]
+
+    @staticmethod
+    def __find_merge_duplicates(mine, theirs, key_func, tolerance):
+        """Finds the objects in theirs that are identical to an object in mine.
+
+        Returns
+        -------
+        dict[int, tuple]
+            a dict mapping the number of the duplicate object to a tuple of the duplicate and the object to keep.
+        """
+        buckets = {}
+        for obj in mine:
+            key = key_func(obj, tolerance)
+            if key is not None:
+                buckets.setdefault(key, obj)
+        ret = {}
+        for obj in theirs:
+            key = key_func(obj, tolerance)
+            if key is not None and key in buckets:
+                ret[obj.number] = (obj, buckets[key])
+        return ret
+
+    @staticmethod
+    def __replace_merge_duplicates(other, duplicates):
+        """Rewrites all references in other to duplicated objects to the objects being kept."""
+        mats = {
+            id(dead): kept for dead, kept in duplicates.get("materials", {}).values()
+        }
+        surfs = {
+            id(dead): kept for dead, kept in duplicates.get("surfaces", {}).values()
+        }
+        worlds = duplicates.get("universes", {}).get(0)
+        for cell in other.cells:
+            if cell.material is not None and id(cell.material) in mats:
+                cell.material = mats[id(cell.material)]
+            if surfs:
+                for leaf in cell.geometry._iter_leaves():
+                    if not leaf.is_cell and id(leaf.divider) in surfs:
+                        dead = leaf.divider
+                        leaf.divider = surfs[id(dead)]
+                        if dead in cell.surfaces:
+                            cell.surfaces.remove(dead)
+            if worlds:
+                dead_world, world = worlds
+                if cell.universe is dead_world:
+                    cell._universe._universe = world
+                if cell.fill.universe is dead_world:
+                    cell.fill._universe = world
+        for surf in other.surfaces:
+            if surf.periodic_surface is not None and id(surf.periodic_surface) in surfs:
+                surf._periodic_surface = surfs[id(surf.periodic_surface)]
+
+    def bounding_boxes(self, cells=None):
+        """Finds conservative axis-aligned bounding boxes for many cells at once.
+
+        The boxes of both sides of every surface in the problem are found in a single pass first,
+        so every surface is only bounded once no matter how many cells use it.
+        The boxes of the surfaces are then propagated through each cell's geometry,
+        as described in :func:`~montepy.Cell.bounding_box`.
+        All of these results are cached until the geometry is changed.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+            numbers, boxes = problem.bounding_boxes()
+            print(numbers[5], boxes[5])
+
+        .. testoutput::
+
+            10 [[-1. -1. -5.]
+             [ 3.  3.  5.]]
+
+        Parameters
+        ----------
+        cells : Iterable[Cell]
+            The cells to find the bounding boxes of. By default all cells in the problem are used.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            The numbers of the cells,
+            and an (N, 2, 3) array of the lower and upper corners of each cell's box.
+
+        Raises
+        ------
+        IllegalState
+            if a cell has no geometry, or its geometry is not linked to its surfaces.
+        """
+        if cells is None:
+            cells = self.cells
+        cells = list(cells)
+        for surface in self.surfaces:
+            if surface.surface_type is not None:
+                surface.bounding_box(False)
+                surface.bounding_box(True)
+        numbers = np.array([cell.number for cell in cells], dtype=np.int64)
+        boxes = np.array([cell.bounding_box() for cell in cells], dtype=float)
+        return numbers, boxes.reshape(-1, 2, 3)
+
+    def estimate_volumes(
+        self,
+        cells=None,
+        samples=100_000,
+        workers=1,
+        seed=None,
+        rel_error=None,
+        max_samples=None,
+        bounds=None,
+        set_volumes=False,
+    ):
+        """Estimates the volumes of many cells by stochastic sampling.
+
+        Points are sampled uniformly in the bounding box of each cell (see :func:`~montepy.Cell.bounding_box`),
+        and are checked with :func:`~montepy.Cell.contains`.
+        The volume is the fraction of points in the cell times the volume of the box,
+        and the uncertainty is the standard deviation of this binomial estimate.
+        Only the geometry of each cell is used, in the coordinates of its own universe;
+        fills are ignored.
+
+        When ``rel_error`` is given, batches of ``samples`` points are sampled for each cell
+        until its relative standard deviation is at most ``rel_error``,
+        or ``max_samples`` points have been sampled.
+
+        Cells whose bounding box is not finite, and that aren't limited by ``bounds``,
+        have a volume of ``nan``.
+        Cells that are known to be empty have a volume of 0.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+            numbers, volumes, std_devs = problem.estimate_volumes(
+                [problem.cells[10], problem.cells[13]], seed=42, rel_error=0.01
+            )
+            print(volumes[0], std_devs[0])
+            print(abs(volumes[1] - 4.18879) < 5 * std_devs[1])
+
+        .. testoutput::
+
+            160.0 0.0
+            True
+
+        Parameters
+        ----------
+        cells : Iterable[Cell]
+            The cells to estimate the volumes of. By default all cells in the problem are used.
+        samples : int
+            The number of points to sample in each cell's box,
+            or in each batch when ``rel_error`` is given.
+        workers : int
+            The number of threads to split the cells between.
+        seed : int
+            The seed for the random number generator.
+            Each cell gets its own stream from this seed, so the results are repeatable
+            regardless of the number of workers.
+        rel_error : float
+            The target relative standard deviation of each volume.
+        max_samples : int
+            The most points to sample for a cell when ``rel_error`` is given.
+            Defaults to 100 times ``samples``.
+        bounds : numpy.typing.ArrayLike
+            A (2, 3) array of the lower and upper corners of a box to limit all sampling to.
+            Only the parts of the cells in this box are counted.
+            This allows cells that aren't bounded by their own surfaces to be estimated.
+        set_volumes : bool
+            If True, set :attr:`~montepy.Cell.volume` of every cell with a finite volume estimate.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            The numbers of the cells, their volumes, and the standard deviations of the volumes.
+
+        Raises
+        ------
+        TypeError
+            if any of the arguments are of the wrong type.
+        ValueError
+            if samples, workers, max_samples, or rel_error are not positive,
+            or bounds is not a (2, 3) array.
+        IllegalState
+            if a cell has no geometry, or its geometry is not linked to its surfaces.
+        """
+        for name, value in [("samples", samples), ("workers", workers)]:
+            if not isinstance(value, Integral):
+                raise TypeError(f"{name} must be an int. {value} given.")
+            if value < 1:
+                raise ValueError(f"{name} must be positive. {value} given.")
+        if seed is not None and not isinstance(seed, Integral):
+            raise TypeError(f"seed must be an int. {seed} given.")
+        if rel_error is not None:
+            if not isinstance(rel_error, Real):
+                raise TypeError(f"rel_error must be a float. {rel_error} given.")
+            if rel_error <= 0:
+                raise ValueError(f"rel_error must be positive. {rel_error} given.")
+        if max_samples is None:
+            max_samples = 100 * samples
+        if not isinstance(max_samples, Integral):
+            raise TypeError(f"max_samples must be an int. {max_samples} given.")
+        if max_samples < 1:
+            raise ValueError(f"max_samples must be positive. {max_samples} given.")
+        bounds = self.__validate_bounds(bounds)
+        if not isinstance(set_volumes, bool):
+            raise TypeError(f"set_volumes must be a bool. {set_volumes} given.")
+        if cells is None:
+            cells = self.cells
+        cells = list(cells)
+        numbers, boxes = self.bounding_boxes(cells)
+        generators = [
+            np.random.default_rng(stream)
+            for stream in np.random.SeedSequence(seed).spawn(len(cells))
+        ]
+
+        def estimate(args):
+            cell, box, rng = args
+            return _estimate_volume(
+                cell,
+                _clip_box(box, bounds),
+                rng,
+                samples,
+                rel_error,
+                max_samples,
+            )
+
+        jobs = zip(cells, boxes, generators)
+        if workers <= 1:
+            results = list(map(estimate, jobs))
+        else:
+            with ThreadPoolExecutor(workers) as executor:
+                results = list(executor.map(estimate, jobs))
+        volumes = np.array([result[0] for result in results], dtype=float)
+        std_devs = np.array([result[1] for result in results], dtype=float)
+        if set_volumes:
+            finite = np.isfinite(volumes)
+            for cell, volume in zip(itertools.compress(cells, finite), volumes[finite]):
+                cell.volume = float(volume)
+        return numbers, volumes, std_devs
+
+    def find_overlaps(
+        self, samples=1_000_000, workers=1, seed=None, universe=None, bounds=None
+    ):
+        """Finds cells that overlap each other by sampling points.
+
+        Points are sampled uniformly in the domain of each universe.
+        A grid of the cells' bounding boxes finds the cells that may contain each point,
+        and those cells are checked with :func:`~montepy.Cell.contains`.
+        Points that are in more than one cell of the same universe are reported.
+        A lattice cell fills its whole universe, so it overlaps every other cell in its universe.
+
+        The domain of a universe is the box around all of its cells that have finite bounding boxes,
+        except for the graveyard: cells with all importances set to zero.
+        Universes without any such cells are skipped, unless ``bounds`` is given.
+
+        Sampling can only show that cells overlap, and not that they don't.
+        Overlaps that are small compared to the domain may need many samples to be found.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+            # make cell 11 overlap cell 10
+            problem.cells[11].geometry = -problem.surfaces[11] & +problem.surfaces[20]
+            overlaps = problem.find_overlaps(
+                samples=10_000, seed=1, bounds=[[-5, -5, -5], [5, 5, 5]]
+            )
+            print(list(overlaps))
+
+        .. testoutput::
+
+            [(10, 11)]
+
+        Parameters
+        ----------
+        samples : int
+            The number of points to sample in each universe.
+        workers : int
+            The number of threads to split the batches of points between.
+        seed : int
+            The seed for the random number generator.
+            The results are repeatable regardless of the number of workers.
+        universe : int
+            The number of the only universe to check. By default all universes are checked.
+        bounds : numpy.typing.ArrayLike
+            A (2, 3) array of the lower and upper corners of the box to sample in,
+            instead of the domain of each universe.
+
+        Returns
+        -------
+        dict[tuple[int, int], numpy.ndarray]
+            The points found in each pair of overlapping cells,
+            keyed by the cell numbers in increasing order.
+            The points are in the coordinates of the cells' universe.
+
+        Raises
+        ------
+        TypeError
+            if any of the arguments are of the wrong type.
+        ValueError
+            if samples or workers are not positive, bounds is not a (2, 3) array,
+            or ``universe`` has no domain and bounds is not given.
+        IllegalState
+            if a cell has no geometry, or its geometry is not linked to its surfaces.
+        """
+        overlaps = {}
+        for _, _, universe_overlaps in self.__sample_universes(
+            samples, workers, seed, universe, bounds
+        ):
+            overlaps.update(universe_overlaps)
+        return overlaps
+
+    def find_gaps(
+        self, samples=1_000_000, workers=1, seed=None, universe=None, bounds=None
+    ):
+        """Finds undefined regions, which are in no cell, by sampling points.
+
+        Points are sampled in the domain of each universe the same way as :func:`find_overlaps`,
+        and points that are not in any cell of the universe are reported.
+
+        Sampling can only show that there are gaps, and not that there aren't.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            import numpy as np
+            problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+            # leave a hole through cell 10
+            problem.cells[10].geometry &= +problem.surfaces[1]
+            gaps = problem.find_gaps(
+                samples=10_000, seed=1, bounds=[[-5, -5, -5], [5, 5, 5]]
+            )
+            print(list(gaps))
+            print(bool((np.hypot(gaps[0][:, 0], gaps[0][:, 1]) <= 0.5).all()))
+
+        .. testoutput::
+
+            [0]
+            True
+
+        Parameters
+        ----------
+        samples : int
+            The number of points to sample in each universe.
+        workers : int
+            The number of threads to split the batches of points between.
+        seed : int
+            The seed for the random number generator.
+            The results are repeatable regardless of the number of workers.
+        universe : int
+            The number of the only universe to check. By default all universes are checked.
+        bounds : numpy.typing.ArrayLike
+            A (2, 3) array of the lower and upper corners of the box to sample in,
+            instead of the domain of each universe.
+
+        Returns
+        -------
+        dict[int, numpy.ndarray]
+            The points in no cell of each universe that has gaps, keyed by the universe number.
+
+        Raises
+        ------
+        TypeError
+            if any of the arguments are of the wrong type.
+        ValueError
+            if samples or workers are not positive, bounds is not a (2, 3) array,
+            or ``universe`` has no domain and bounds is not given.
+        IllegalState
+            if a cell has no geometry, or its geometry is not linked to its surfaces.
+        """
+        gaps = {}
+        for number, universe_gaps, _ in self.__sample_universes(
+            samples, workers, seed, universe, bounds
+        ):
+            if len(universe_gaps):
+                gaps[number] = universe_gaps
+        return gaps
+
+    def __sample_universes(self, samples, workers, seed, universe, bounds):
+        """Samples points in universes to find their gaps and overlaps.
+
+        Returns
+        -------
+        list[tuple[int, numpy.ndarray, dict[tuple[int, int], numpy.ndarray]]]
+            The number, gaps, and overlaps of each sampled universe.
+        """
+        for name, value in [("samples", samples), ("workers", workers)]:
+            if not isinstance(value, Integral):
+                raise TypeError(f"{name} must be an int. {value} given.")
+            if value < 1:
+                raise ValueError(f"{name} must be positive. {value} given.")
+        if seed is not None and not isinstance(seed, Integral):
+            raise TypeError(f"seed must be an int. {seed} given.")
+        if universe is not None and not isinstance(universe, Integral):
+            raise TypeError(f"universe must be an int. {universe} given.")
+        bounds = self.__validate_bounds(bounds)
+        if universe is None:
+            numbers = sorted(universe.number for universe in self.universes)
+        else:
+            numbers = [universe]
+        results = []
+        for number, universe_seed in zip(
+            numbers, np.random.SeedSequence(seed).spawn(len(numbers))
+        ):
+            grid = _UniverseGrid(list(self.cells.where(universe=number)))
+            box = bounds if bounds is not None else _universe_domain(grid)
+            if box is None:
+                if universe is not None:
+                    raise ValueError(
+                        f"Universe {universe} has no finite cells to sample in. bounds must be given."
+                    )
+                continue
+            results.append(
+                (number, *_sample_claims(grid, box, samples, universe_seed, workers))
+            )
+        return results
+
+    @staticmethod
+    def __validate_bounds(bounds):
+        if bounds is None:
+            return None
+        try:
+            bounds = np.asarray(bounds, dtype=float)
+        except (TypeError, ValueError) as e:
+            raise TypeError(
+                f"bounds must be an array of numbers. {bounds} given."
+            ) from e
+        if bounds.shape != (2, 3):
+            raise ValueError(
+                f"bounds must be a (2, 3) array. Shape: {bounds.shape} given."
+            )
+        return bounds
+
+    def locate(self, points, universe=0, workers=1):
+        """Finds which cell contains each of many points, like MCNP's tracking does.
+
+        Points are located in the cells of ``universe``.
+        When a point is in a cell that is filled, the point is moved into the coordinates of the filling universe,
+        through the fill's transform and lattice element, and is located again in that universe.
+        This continues until a cell that is not filled is found.
+
+        Each universe's cells are placed in a uniform grid using conservative bounding boxes of the cells,
+        so each point is only checked against the cells that may contain it.
+        Cells are checked with :func:`~montepy.Cell.contains`.
+
+        .. versionadded:: 1.4.0
+
+        Notes
+        -----
+        Rectangular (``LAT=1``) and hexagonal (``LAT=2``) lattices bounded by pairs of planes are supported.
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+            cells, materials, paths = problem.locate([[0.0, 0.0, 0.0], [2.0, 0.0, 0.0]])
+            print(cells, materials)
+            print(paths)
+
+        .. testoutput::
+
+            [1 4] [1 3]
+            [[10  3  1]
+             [10  3  4]]
+
+        Parameters
+        ----------
+        points : numpy.typing.ArrayLike
+            An (N, 3) array of the :math:`(x, y, z)` points to locate, or a single point.
+        universe : int
+            the number of the universe to start locating the points in.
+        workers : int
+            The number of threads to split the points between.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            Three integer arrays: the number of the innermost cell containing each point,
+            the number of the material in that cell,
+            and an (N, depth) array of the cell numbers from ``universe`` down to the innermost cell.
+            The numbers are 0 where no cell contains a point, the cell is void, or the path is shorter.
+
+        Raises
+        ------
+        TypeError
+            if the points are not numbers, or the universe or workers are not integers.
+        ValueError
+            if the points are not an (N, 3) array, or workers is not positive.
+        IllegalState
+            if a cell's geometry can not be evaluated, or there is a fill loop.
+        NotImplementedError
+            if a point is in a lattice that is not bounded by pairs of planes.
+        """
+        if not isinstance(universe, Integral):
+            raise TypeError(f"universe must be an int. {universe} given.")
+        if not isinstance(workers, Integral):
+            raise TypeError(f"workers must be an int. {workers} given.")
+        if workers < 1:
+            raise ValueError(f"workers must be positive. {workers} given.")
+        return _Locator(self).locate(points, universe, workers)
+
+    def slice(
+        self,
+        origin,
+        basis_u,
+        basis_v,
+        width,
+        height,
+        pixels=(512, 512),
+        color_by="material",
+        universe=0,
+        workers=1,
+    ):
+        """Rasterizes a planar slice of the geometry into an array of cell or material numbers.
+
+        This is similar to the MCNP geometry plotter.
+        The center of every pixel is located with :func:`locate`,
+        so fills, transforms, and lattices are followed down to the innermost cell.
+        All lattice elements filled by the same universe are located in that universe together,
+        so large lattices of repeated universes are rasterized quickly.
+        Large images are located in tiles to limit the memory used.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+            image = problem.slice(
+                (1.0, 1.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), 4.0, 4.0, pixels=(8, 8)
+            )
+            print(image)
+
+        .. testoutput::
+
+            [[3 3 3 3 2 2 2 2]
+             [3 3 3 3 2 1 1 2]
+             [3 3 3 3 2 1 1 2]
+             [3 3 3 3 2 2 2 2]
+             [2 2 2 2 3 3 3 3]
+             [2 1 1 2 3 3 3 3]
+             [2 1 1 2 3 3 3 3]
+             [2 2 2 2 3 3 3 3]]
+
+        Parameters
+        ----------
+        origin : numpy.typing.ArrayLike
+            The :math:`(x, y, z)` point at the center of the slice.
+        basis_u : numpy.typing.ArrayLike
+            The direction of the horizontal axis of the slice, from left to right.
+        basis_v : numpy.typing.ArrayLike
+            The direction of the vertical axis of the slice, from bottom to top.
+        width : float
+            The width of the slice along ``basis_u``.
+        height : float
+            The height of the slice along ``basis_v``.
+        pixels : tuple[int, int]
+            The number of pixels along the width and height.
+        color_by : str
+            Either ``"material"`` to give the material number in each pixel,
+            or ``"cell"`` to give the innermost cell number.
+        universe : int
+            The number of the universe to slice.
+        workers : int
+            The number of threads to split the pixels of each tile between.
+
+        Returns
+        -------
+        numpy.ndarray
+            A (height pixels, width pixels) integer array.
+            The first row is the top of the slice and the first column is its left side.
+            Pixels that are in no cell, or in a void cell when coloring by material, are 0.
+
+        Raises
+        ------
+        TypeError
+            if any of the arguments are of the wrong type.
+        ValueError
+            if the basis vectors are zero or parallel, the size or pixels are not positive,
+            or color_by is not ``"material"`` or ``"cell"``.
+        IllegalState
+            if a cell's geometry can not be evaluated, or there is a fill loop.
+        NotImplementedError
+            if a pixel is in a lattice that is not bounded by pairs of planes.
+        """
+        vectors = []
+        for name, vector in [
+            ("origin", origin),
+            ("basis_u", basis_u),
+            ("basis_v", basis_v),
+        ]:
+            try:
+                vector = np.asarray(vector, dtype=float)
+            except (TypeError, ValueError) as e:
+                raise TypeError(
+                    f"{name} must be a vector of numbers. {vector} given."
+                ) from e
+            if vector.shape != (3,):
+                raise ValueError(f"{name} must have three components. {vector} given.")
+            vectors.append(vector)
+        origin, basis_u, basis_v = vectors
+        if np.linalg.norm(np.cross(basis_u, basis_v)) == 0.0:
+            raise ValueError("basis_u and basis_v must be non-zero and not parallel.")
+        basis_u = basis_u / np.linalg.norm(basis_u)
+        basis_v = basis_v / np.linalg.norm(basis_v)
+        for name, value in [("width", width), ("height", height)]:
+            if not isinstance(value, Real):
+                raise TypeError(f"{name} must be a float. {value} given.")
+            if value <= 0:
+                raise ValueError(f"{name} must be positive. {value} given.")
+        if not isinstance(pixels, (tuple, list)) or len(pixels) != 2:
+            raise TypeError(f"pixels must be a tuple of two ints. {pixels} given.")
+        for count in pixels:
+            if not isinstance(count, Integral):
+                raise TypeError(f"pixels must be a tuple of two ints. {pixels} given.")
+            if count < 1:
+                raise ValueError(f"pixels must be positive. {pixels} given.")
+        if color_by not in {"material", "cell"}:
+            raise ValueError(
+                f"color_by must be either 'material' or 'cell'. {color_by} given."
+            )
+        if not isinstance(universe, Integral):
+            raise TypeError(f"universe must be an int. {universe} given.")
+        if not isinstance(workers, Integral):
+            raise TypeError(f"workers must be an int. {workers} given.")
+        if workers < 1:
+            raise ValueError(f"workers must be positive. {workers} given.")
+        columns, rows = pixels
+        locator = _Locator(self)
+        image = np.zeros(columns * rows, dtype=np.int64)
+        for start in range(0, len(image), _TILE_SIZE):
+            row, column = np.divmod(
+                np.arange(start, min(start + _TILE_SIZE, len(image))), columns
+            )
+            u = ((column + 0.5) / columns - 0.5) * width
+            v = (0.5 - (row + 0.5) / rows) * height
+            points = origin + np.outer(u, basis_u) + np.outer(v, basis_v)
+            cells, materials, _ = locator.locate(points, universe, workers)
+            image[start : start + len(points)] = (
+                cells if color_by == "cell" else materials
+            )
+        return image.reshape(rows, columns)
+
+    def simplify_geometry(self, cells=None, expand_complements=False):
+        """Rewrites the geometry of many cells into simpler forms of the same regions.
+
+        See :func:`~montepy.Cell.simplify_geometry` for how the geometries are simplified.
+        All of the geometries are simplified before any are changed,
+        so cells that complement each other are simplified consistently.
+        This runs in a single thread, as rewriting the geometry trees is pure Python,
+        and would not be any faster in threads.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test.imcnp")
+            print(problem.cells[5].geometry)
+            print(problem.simplify_geometry(expand_complements=True))
+            print(problem.cells[5].geometry)
+
+        .. testoutput::
+
+            #99
+            [5]
+            -1010
+
+        Parameters
+        ----------
+        cells : Iterable[Cell]
+            The cells to simplify. By default all cells in the problem are simplified.
+        expand_complements : bool
+            If True, complemented cells are replaced with their geometry,
+            and all complements are pushed down to the surfaces.
+
+        Returns
+        -------
+        list[int]
+            The numbers of the cells that were changed.
+
+        Raises
+        ------
+        TypeError
+            if expand_complements is not a bool.
+        IllegalState
+            if a cell has no geometry, its geometry is not linked to its surfaces,
+            or a cell is complemented by its own geometry.
+        """
+        if not isinstance(expand_complements, bool):
+            raise TypeError(
+                f"expand_complements must be a bool. {expand_complements} given."
+            )
+        if cells is None:
+            cells = self.cells
+        cells = list(cells)
+        geometries = [cell._simplified_geometry(expand_complements) for cell in cells]
+        changed = []
+        for cell, geometry in zip(cells, geometries):
+            if geometry is not None:
+                cell._set_simplified_geometry(geometry)
+                changed.append(cell.number)
+        return changed
+
+    def cell_adjacency(self):
+        """Finds which cells are next to each other, because they are on opposite sides of a shared surface.
+
+        Two cells in the same universe are adjacent if one uses the positive side of a surface,
+        and the other uses its negative side.
+        Complemented cells are treated as their geometry with the sides of all its surfaces flipped.
+        Cells are grouped by the sides of the surfaces they use in a single pass,
+        so cells are never compared pairwise.
+        These groups are cached, and when the geometry changes only the cells whose surfaces changed are regrouped.
+
+        This is found from the surfaces only, so cells that share a surface may not actually touch,
+        e.g., two cells on opposite sides of a plane, but far apart.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+            numbers, indptr, indices = problem.cell_adjacency()
+            idx = list(numbers).index(11)
+            print(numbers[indices[indptr[idx] : indptr[idx + 1]]])
+
+        .. testoutput::
+
+            [10 12 13]
+
+        The arrays can be used directly to make a sparse matrix with ``scipy``:
+
+        .. code-block:: python
+
+            adjacency = scipy.sparse.csr_array((np.ones(len(indices)), indices, indptr))
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            The numbers of all cells, in increasing order,
+            and the ``indptr`` and ``indices`` arrays of the adjacency in compressed sparse row form.
+            The neighbors of the cell ``numbers[i]`` are ``numbers[indices[indptr[i]:indptr[i + 1]]]``,
+            which are also in increasing order.
+
+        Raises
+        ------
+        IllegalState
+            if a cell has no geometry, or its geometry is not linked to its surfaces.
+        """
+        return self._adjacency(self.cells)
+
+    def flatten_universes(self, max_instances=None, destination=None, overwrite=False):
+        """Unrolls all fills and lattices, so that every cell is in the real world.
+
+        Every filled cell in universe 0 is replaced by a copy of each cell that fills it,
+        all the way down through nested universes and lattice elements.
+        Each copy is bounded by its own geometry intersected with the geometry of every cell containing it.
+        The fill transforms and lattice offsets of each level are composed as 4x4 matrices,
+        and the surfaces of each copy are moved by these with a new transform.
+        Universes that are repeated with the same transform share the same copied surfaces.
+        Lattice elements filled by the lattice's own universe become copies of the lattice cell itself.
+        Cells, surfaces, and transforms are numbered after the largest existing number of each.
+
+        Cells outside of the filled cells can be skipped, when their bounding box does not overlap the filled cell.
+        Cells in other universes, and surfaces that are no longer used, are removed from the problem.
+
+        .. versionadded:: 1.4.0
+
+        .. note::
+            Only lattices bounded by pairs of planes can be flattened.
+            Lattices filled by a single universe are only unrolled inside the bounding box of the filled cell,
+            which must be finite.
+
+        When a destination is given, the flattened problem is written to it instead,
+        and this problem is not changed.
+        The new cells are then made and written a batch at a time,
+        so they are never all held in memory at once.
+        The data of all cells, such as importances, are written in the cell block.
+        Otherwise all new cells are made in memory and added to this problem.
+        The cells to make are counted before any of them are made,
+        so ``max_instances`` can be used to bound the work done.
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+            replaced = problem.flatten_universes()
+            print(replaced[13])
+            print(problem.cells[replaced[13][0]].geometry)
+
+        .. testoutput::
+
+            [22, 23]
+            (-20*-36)
+
+        Parameters
+        ----------
+        max_instances : int
+            The most cells that may be made, which is checked before the problem is changed.
+            By default there is no limit.
+        destination : io.TextIOBase, str, os.PathLike
+            File path or writable object to write the flattened problem to.
+            By default this problem is flattened in place.
+        overwrite : bool
+            Whether to overwrite 'destination' if it is an existing file
+
+        Returns
+        -------
+        dict[int, list[int]]
+            The number of each filled cell that was removed, to the numbers of the cells that replaced it.
+
+        Raises
+        ------
+        TypeError
+            if max_instances is not an int, or destination is not a file path or writable object.
+        ValueError
+            if max_instances is not positive, more than max_instances cells would be made,
+            or a lattice filled by a single universe is in an infinite cell.
+        IllegalState
+            if universes fill themselves, or a cell is complemented by its own geometry.
+        NotImplementedError
+            if a lattice is not bounded by pairs of planes.
+        """
+        if max_instances is not None:
+            if not isinstance(max_instances, Integral):
+                raise TypeError(f"max_instances must be an int. {max_instances} given.")
+            if max_instances < 1:
+                raise ValueError(
+                    f"max_instances must be positive. {max_instances} given."
+                )
+        flattener = _Flattener(self, max_instances)
+        if destination is None:
+            return flattener.flatten()
+        if hasattr(destination, "write") and callable(getattr(destination, "write")):
+            return flattener.write(MCNP_InputFile.from_open_stream(destination))
+        elif isinstance(destination, (str, os.PathLike)):
+            new_file = MCNP_InputFile(destination, overwrite=overwrite)
+            with new_file.open("w") as fh:
+                return flattener.write(fh)
+        raise TypeError(
+            f"destination {destination} is not a file path or writable object"
+        )
+
+    def iter_instances(self, cell):
+        """Iterates over every instance of a cell in the real world, through all fills and lattices.
+
+        A cell in a universe has one instance for every time that universe is used in universe 0,
+        i.e., once for every path of filled cells and lattice elements from the real world down to it.
+        Only the universes that the cell's universe is nested in are walked,
+        which are found from :func:`~montepy.Universes.graph`,
+        and lattices are read from :func:`~montepy.data_inputs.fill.Fill.universe_numbers`,
+        so no :class:`~montepy.Universe` objects are made for the lattice elements.
+        The instances are found lazily, depth first.
+
+        Each instance is a tuple of:
+
+        * ``path``: the numbers of the cells from universe 0 down to, and including, the cell.
+        * ``index``: the ``(i, j, k)`` lattice element of each cell in the path, or None for cells that are not lattices.
+        * ``transform``: the 4x4 matrix that moves the cell into the real world,
+          like :func:`~montepy.data_inputs.transform.Transform.as_matrix`.
+
+        Lattice elements filled by the lattice's own universe are instances of the lattice cell itself.
+
+        .. versionadded:: 1.4.0
+
+        .. note::
+            Only lattices bounded by pairs of planes, which are filled by arrays of universes, can be walked.
+            Every element of a lattice's array is an instance, even if it is outside of the cell the lattice fills.
+
+        .. seealso::
+
+            :func:`instance_arrays` to find all of the instances as arrays at once.
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+            for path, index, transform in problem.iter_instances(problem.cells[4]):
+                print(path, index, transform[:3, 3])
+
+        .. testoutput::
+
+            (10, 3, 4) (None, (0, 1, 0), None) [0. 2. 0.]
+            (10, 3, 4) (None, (1, 0, 0), None) [2. 0. 0.]
+
+        Parameters
+        ----------
+        cell : Cell
+            the cell to find the instances of.
+
+        Returns
+        -------
+        Generator[tuple[tuple[int, ...], tuple[tuple[int, int, int] | None, ...], numpy.ndarray]]
+            the path, lattice indices, and matrix of every instance.
+
+        Raises
+        ------
+        TypeError
+            if cell is not a Cell.
+        ValueError
+            if cell is not in this problem, or a lattice holding it is filled by a single universe.
+        IllegalState
+            if universes fill themselves.
+        NotImplementedError
+            if a lattice holding the cell is not bounded by pairs of planes.
+        """
+        return _InstanceWalker(self, self.__check_instance_cell(cell)).iter_instances()
+
+    def instance_arrays(self, cell):
+        """Finds every instance of a cell in the real world at once, as arrays.
+
+        This finds the same instances as :func:`iter_instances`,
+        but each universe is walked once for all of the instances that reach it,
+        and the transforms of every lattice element are composed at once with NumPy.
+        The instances are grouped by the universes they are reached through,
+        so they may be in a different order than :func:`iter_instances`.
+
+        .. versionadded:: 1.4.0
+
+        .. note::
+            Only lattices bounded by pairs of planes, which are filled by arrays of universes, can be walked.
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+            paths, indices, transforms = problem.instance_arrays(problem.cells[4])
+            print(paths)
+            print(indices[:, 1])
+            print(transforms[:, :3, 3])
+
+        .. testoutput::
+
+            [[10  3  4]
+             [10  3  4]]
+            [[0 1 0]
+             [1 0 0]]
+            [[0. 2. 0.]
+             [2. 0. 0.]]
+
+        Parameters
+        ----------
+        cell : Cell
+            the cell to find the instances of.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            Three arrays: an (N, depth) integer array of the cell numbers of the path to each instance,
+            an (N, depth, 3) integer array of the lattice element of each cell in the paths,
+            and an (N, 4, 4) array of the matrices that move each instance into the real world.
+            The numbers and indices are 0 where the cell is not a lattice, or the path is shorter.
+
+        Raises
+        ------
+        TypeError
+            if cell is not a Cell.
+        ValueError
+            if cell is not in this problem, or a lattice holding it is filled by a single universe.
+        IllegalState
+            if universes fill themselves.
+        NotImplementedError
+            if a lattice holding the cell is not bounded by pairs of planes.
+        """
+        return _InstanceWalker(self, self.__check_instance_cell(cell)).instance_arrays()
+
+    def uniquify_materials(self, cells, numbering="offset"):
+        """Gives every instance of some cells in the real world its own material, e.g., for depletion.
+
+        A cell in a universe that is used many times, e.g., a fuel pin in a lattice,
+        is one cell with one material, but has many instances, see :func:`iter_instances`.
+        This copies every universe that the cells are nested in once for every time it is used,
+        and points every fill and lattice element to its own copy,
+        so that every instance is its own cell.
+        Every instance of the cells is then given its own copy of its material.
+        The first instance of every universe keeps the original cells and universe,
+        and the original materials are not changed.
+
+        Each universe is pickled once, with its surfaces, materials, and transforms shared rather than copied,
+        so every copy of a universe is made by one unpickling.
+        The new materials, universes, and cells are added to this problem in one batch.
+
+        .. versionadded:: 1.4.0
+
+        .. note::
+            Lattices holding the cells must be filled by arrays of universes.
+            The lattices are kept; to replace them with cells in the real world see :func:`flatten_universes`.
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+            found = problem.uniquify_materials(problem.universes[1])
+            print(found)
+            print([problem.cells[number].material.number for number in found[1]])
+
+        .. testoutput::
+
+            {1: [1, 14, 16], 2: [2, 15, 17]}
+            [4, 6, 8]
+
+        Parameters
+        ----------
+        cells : Universe, Cells, or Iterable[Cell]
+            the cells to give their own materials, or the universe whose cells should have their own materials.
+            Cells without a material are skipped.
+        numbering : str
+            the numbering scheme for the new cells, universes, and materials: ``"offset"`` to number them after the largest number in use,
+            or ``"compact"`` to use the lowest numbers that are not in use.
+
+        Returns
+        -------
+        dict[int, list[int]]
+            The number of every cell with a material, to the numbers of the cells that are its instances.
+
+        Raises
+        ------
+        TypeError
+            if cells is not a Universe or an iterable of Cells.
+        ValueError
+            if an unknown numbering scheme is given, a cell is not in this problem,
+            or a lattice holding a cell is filled by a single universe.
+        IllegalState
+            if universes fill themselves.
+        """
+        if numbering not in {"offset", "compact"}:
+            raise ValueError(
+                f"numbering must be either 'offset' or 'compact'. {numbering} given."
+            )
+        if isinstance(cells, Universe):
+            if cells not in self.universes:
+                raise ValueError(f"Universe {cells.number} is not in this problem.")
+            cells = self.cells.where(universe=cells.number)
+        elif isinstance(cells, (str, bytes)) or not hasattr(cells, "__iter__"):
+            raise TypeError(
+                f"cells must be a Universe or an iterable of Cells. {cells} given."
+            )
+        cells = [self.__check_instance_cell(cell) for cell in cells]
+        return _Uniquifier(self, cells, numbering).uniquify()
+
+    def __check_instance_cell(self, cell):
+        if not isinstance(cell, Cell):
+            raise TypeError(f"cell must be a Cell. {cell} given.")
+        if cell not in self.cells:
+            raise ValueError(f"Cell {cell.number} is not in this problem.")
+        return cell
 
     def add_cell_children_to_problem(self):  # pragma: no cover
         """Deprecated: Adds the surfaces, materials, and transforms of all cells in this problem to this problem to the
@@ -579,23 +2083,38 @@ class MCNP_Problem:
         """
         return self.write_problem(file_path, overwrite)
 
-    def _write_to_stream(self, inp):
+    def _write_to_stream(self, inp, cells=None, surfaces=None, data_inputs=None):
         """Writes the problem to a writeable stream.
 
+        .. versionchanged:: 1.4.0
+            The cells, surfaces, and data_inputs parameters were added.
+
         Parameters
         ----------
         inp : MCNP_InputFile
             Writable input file
+        cells : Iterable
+            the objects to write in the cell block instead of the cells of this problem.
+        surfaces : Iterable
+            the objects to write in the surface block instead of the surfaces of this problem.
+        data_inputs : Iterable
+            the objects to write in the data block instead of the data inputs of this problem.
         """
+        if cells is None:
+            cells = self.cells
+        if surfaces is None:
+            surfaces = self.surfaces
+        if data_inputs is None:
+            data_inputs = self.data_inputs
         with warnings.catch_warnings(record=True) as warning_catch:
             objects_list = []
             if self.message:
                 objects_list.append(([self.message], False))
             objects_list += [
                 ([self.title], False),
-                (self.cells, True),
-                (self.surfaces, True),
-                (self.data_inputs, True),
+                (cells, True),
+                (surfaces, True),
+                (data_inputs, True),
             ]
             for objects, terminate in objects_list:
                 for obj in objects:
@@ -614,7 +2133,7 @@ class MCNP_Problem:
                         inp.write(line + "\n")
 
                 # writing cell data in DATA BLOCK if the last written object inherits DataInputAbstract and there is cell data to write
-                if objects is self.data_inputs:
+                if objects is data_inputs:
                     for line in self.cells._run_children_format_for_mcnp(
                         self.data_inputs, self.mcnp_version
                     ):
@@ -12,9 +12,35 @@ import montepy
 from montepy.utilities import *
 
 
+def _invalidate_indexes(owner):
+    """Marks the lazily built secondary indexes that may depend on the given owner as stale.
+
+    This must be called whenever an object attribute that a collection may index changes,
+    or when a collection itself changes.
+    Only the collection the owner belongs to,
+    and the collections of the problem it is linked to are affected.
+
+    .. versionadded:: 1.4.0
+
+    Parameters
+    ----------
+    owner : MCNP_Object or NumberedObjectCollection
+        the object, or collection, that was changed.
+    """
+    collection = getattr(owner, "_collection", None)
+    if collection is not None:
+        collection._clear_indexes()
+    if isinstance(owner, montepy.numbered_object_collection.NumberedObjectCollection):
+        owner._clear_indexes()
+    problem = owner._problem
+    if problem is not None:
+        problem._clear_indexes()
+
+
 def _number_validator(self, number):
     if number < 0:
         raise ValueError("number must be >= 0")
+    _invalidate_indexes(self)
 
     # Only validate against collection if linked to a collection
     if self._collection is not None:
@@ -130,10 +156,16 @@ class Numbered_MCNP_Object(MCNP_Object):
         collection : NumberedObjectCollection
             The collection to link this object to.
         """
+        old_collection = self._collection
+        if old_collection is not None and old_collection is not collection:
+            old_collection._clear_indexes()
         self._collection_ref = weakref.ref(collection)
 
     def _unlink_from_collection(self):
         """Unlinks this object from its collection."""
+        old_collection = self._collection
+        if old_collection is not None:
+            old_collection._clear_indexes()
         self._collection_ref = None
 
     def __getstate__(self):
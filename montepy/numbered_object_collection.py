@@ -7,7 +7,7 @@ import weakref
 from numbers import Integral
 
 import montepy
-from montepy.numbered_mcnp_object import Numbered_MCNP_Object
+from montepy.numbered_mcnp_object import Numbered_MCNP_Object, _invalidate_indexes
 from montepy.exceptions import *
 from montepy.utilities import *
 
@@ -160,6 +160,7 @@ class NumberedObjectCollection(ABC):
         self._start_num = 1
         self._step = 1
         self._problem_ref = None
+        self._indexes = {}
         if problem is not None:
             self._problem_ref = weakref.ref(problem)
         if objects:
@@ -216,6 +217,7 @@ class NumberedObjectCollection(ABC):
         weakref_key = "_problem_ref"
         if weakref_key in state:
             del state[weakref_key]
+        state["_indexes"] = {}
         return state
 
     def __setstate__(self, crunchy_data):
@@ -280,6 +282,78 @@ class NumberedObjectCollection(ABC):
         self.__num_cache.pop(old_num, None)
         self.__num_cache[new_num] = obj
 
+    def _rebuild_number_cache(self):
+        """Rebuilds the internal number cache from the objects in this collection.
+
+        This is needed after objects have been renumbered in bulk while unlinked
+        from this collection.
+
+        .. versionadded:: 1.4.0
+        """
+        self.__num_cache = {obj.number: obj for obj in self._objects}
+
+    def _numbers_in_use(self):
+        """Gets a new set of the numbers in use by this collection.
+
+        When this collection is linked to a problem the number cache is trusted,
+        which avoids reading the number of every object.
+
+        .. versionadded:: 1.4.0
+
+        Returns
+        -------
+        set[int]
+        """
+        # this is the optimized version to get all numbers
+        if self._problem:
+            return set(self.__num_cache)
+        return set(self.numbers)
+
+    def _get_index(self, name, builder):
+        """Gets a lazily built secondary index of this collection.
+
+        The index is built on first use and is cached until this collection,
+        or any indexed attribute of one of its objects, is changed.
+        The index is only cached when this collection will be told of these changes.
+        That is when it is a collection of a problem,
+        or when it is the collection that all of its objects belong to.
+
+        .. versionadded:: 1.4.0
+
+        Parameters
+        ----------
+        name : str
+            the name of the index to cache it under.
+        builder : Callable
+            a function that takes no arguments and builds the index.
+
+        Returns
+        -------
+        object
+            the index as returned by ``builder``.
+        """
+        try:
+            return self._indexes[name]
+        except KeyError:
+            pass
+        index = builder()
+        problem = self._problem
+        if (
+            problem is not None
+            and any(
+                collection is self for collection in problem._numbered_collections()
+            )
+        ) or all(obj._collection is self for obj in self._objects):
+            self._indexes[name] = index
+        return index
+
+    def _clear_indexes(self):
+        """Marks the lazily built secondary indexes of this collection as stale.
+
+        .. versionadded:: 1.4.0
+        """
+        self._indexes.clear()
+
     @property
     def objects(self):
         """Returns a shallow copy of the internal objects list.
@@ -316,6 +390,8 @@ class NumberedObjectCollection(ABC):
         """Removes all objects from this collection."""
         self._objects.clear()
         self.__num_cache.clear()
+        _invalidate_indexes(self)
+        self._clear_hook()
 
     def extend(self, other_list):
         """Extends this collection with another list.
@@ -332,11 +408,7 @@ class NumberedObjectCollection(ABC):
         """
         if not isinstance(other_list, (list, type(self))):
             raise TypeError("The extending list must be a list")
-        # this is the optimized version to get all numbers
-        if self._problem:
-            nums = set(self.__num_cache)
-        else:
-            nums = set(self.numbers)
+        nums = self._numbers_in_use()
         for obj in other_list:
             if not isinstance(obj, self._obj_class):
                 raise TypeError(
@@ -369,6 +441,60 @@ class NumberedObjectCollection(ABC):
         else:
             raise KeyError(f"This object is not in this collection")
 
+    def _remove_many(self, objs):
+        """Removes many objects from this collection at once.
+
+        This only rebuilds the internal list once,
+        rather than once for every object removed.
+
+        .. versionadded:: 1.4.0
+
+        Parameters
+        ----------
+        objs : list[Numbered_MCNP_Object]
+            the objects to remove. Objects that are not in this collection are ignored.
+        """
+        dead = {id(obj) for obj in objs}
+        removed = [obj for obj in self._objects if id(obj) in dead]
+        if not removed:
+            return
+        self._objects[:] = [obj for obj in self._objects if id(obj) not in dead]
+        for obj in removed:
+            if self.__num_cache.get(obj.number, None) is obj:
+                del self.__num_cache[obj.number]
+            obj._unlink_from_collection()
+            self._delete_hook(obj)
+        _invalidate_indexes(self)
+
+    def _replace_many(self, replacements):
+        """Replaces many objects in this collection with new objects of the same number.
+
+        The new objects take the place of the old objects,
+        so the order of this collection is kept.
+
+        .. versionadded:: 1.4.0
+
+        Parameters
+        ----------
+        replacements : dict[int, Numbered_MCNP_Object]
+            the new object for the ``id`` of each object to replace.
+            Objects that are not in this collection are ignored.
+        """
+        replaced = False
+        for i, obj in enumerate(self._objects):
+            new_obj = replacements.get(id(obj))
+            if new_obj is None:
+                continue
+            self._objects[i] = new_obj
+            self.__num_cache[new_obj.number] = new_obj
+            obj._unlink_from_collection()
+            new_obj._link_to_collection(self)
+            if self._problem:
+                new_obj.link_to_problem(self._problem)
+            replaced = True
+        if replaced:
+            _invalidate_indexes(self)
+
     def clone(self, starting_number=None, step=None):
         """Create a new instance of this collection, with all new independent
         objects with new numbers.
@@ -466,6 +592,13 @@ class NumberedObjectCollection(ABC):
         """A hook that is called every time delete is called."""
         pass
 
+    def _clear_hook(self):
+        """A hook that is called every time all objects are removed at once.
+
+        .. versionadded:: 1.4.0
+        """
+        pass
+
     def __internal_append(self, obj, **kwargs):
         """The internal append method.
 
@@ -498,6 +631,7 @@ class NumberedObjectCollection(ABC):
         self.__num_cache[obj.number] = obj
         self._objects.append(obj)
         obj._link_to_collection(self)
+        _invalidate_indexes(self)
         self._append_hook(obj, **kwargs)
         if self._problem:
             obj.link_to_problem(self._problem)
@@ -510,6 +644,7 @@ class NumberedObjectCollection(ABC):
         self.__num_cache.pop(obj.number, None)
         self._objects.remove(obj)
         obj._unlink_from_collection()
+        _invalidate_indexes(self)
         self._delete_hook(obj, **kwargs)
 
     def add(self, obj: Numbered_MCNP_Object):
@@ -842,6 +977,8 @@ class NumberedObjectCollection(ABC):
         new_vals = self & other
         self.__num_cache.clear()
         self._objects.clear()
+        _invalidate_indexes(self)
+        self._clear_hook()
         self.update(new_vals)
         return self
 
@@ -849,7 +986,15 @@ class NumberedObjectCollection(ABC):
         return self.__set_logic(other, lambda a, b: a | b)
 
     def __ior__(self, other):
-        new_vals = other - self
+        if self._problem and isinstance(other, type(self)):
+            # the number cache is complete while linked to a problem, so avoid collecting every number
+            new_vals = {}
+            for obj in other:
+                if obj.number not in self.__num_cache:
+                    new_vals[obj.number] = obj
+            new_vals = list(new_vals.values())
+        else:
+            new_vals = other - self
         self.extend(new_vals)
         return self
 
@@ -869,6 +1014,8 @@ class NumberedObjectCollection(ABC):
         new_values = self ^ other
         self._objects.clear()
         self.__num_cache.clear()
+        _invalidate_indexes(self)
+        self._clear_hook()
         self.update(new_values)
         return self
 
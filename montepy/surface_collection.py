@@ -1,6 +1,9 @@
 # Copyright 2024, Battelle Energy Alliance, LLC All Rights Reserved.
 from __future__ import annotations
+import numpy as np
+
 import montepy
+from montepy import _surface_transform
 from montepy.surfaces.surface import Surface
 from montepy.surfaces.surface_type import SurfaceType
 from montepy.numbered_object_collection import NumberedObjectCollection
@@ -64,6 +67,140 @@ class Surfaces(NumberedObjectCollection):
     def __init__(self, surfaces: list = None, problem: montepy.MCNP_Problem = None):
         super().__init__(Surface, surfaces, problem)
 
+    def to_arrays(self):
+        """Exports the data for all surfaces to a NumPy structured array.
+
+        This is built in a single pass over the surfaces.
+        The array has one row per surface in the order of this collection, with the fields:
+
+        * ``number``: the surface number.
+        * ``type``: the surface mnemonic, e.g., ``"PZ"``.
+        * ``constants``: the surface constants, padded with ``nan`` to the length of the longest set of constants.
+        * ``is_reflecting``: True if this is a reflecting boundary.
+        * ``is_white_boundary``: True if this is a white boundary.
+        * ``transform``: the number of the transform for the surface, or -1 if there is none.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test.imcnp")
+            arr = problem.surfaces.to_arrays()
+            print(arr["type"][:4])
+            print(arr["constants"][3, :2])
+
+        .. testoutput::
+
+            ['SO' 'RCC' 'SO' 'CZ']
+            [ 5. nan]
+
+        Returns
+        -------
+        numpy.ndarray
+            a structured array of the surface data.
+        """
+        numbers = []
+        types = []
+        constants = []
+        reflecting = []
+        white = []
+        transforms = []
+        for surf in self._objects:
+            numbers.append(surf._number.value)
+            types.append(surf.surface_type.value)
+            constants.append([node.value for node in surf._surface_constants])
+            reflecting.append(surf._is_reflecting)
+            white.append(surf._is_white_boundary)
+            transform = surf._transform
+            transforms.append(-1 if transform is None else transform._number.value)
+        width = max(map(len, constants), default=0)
+        padded = np.full((len(constants), width), np.nan)
+        for i, row in enumerate(constants):
+            padded[i, : len(row)] = row
+        ret = np.empty(
+            len(numbers),
+            dtype=[
+                ("number", np.int64),
+                ("type", "U4"),
+                ("constants", np.float64, (width,)),
+                ("is_reflecting", bool),
+                ("is_white_boundary", bool),
+                ("transform", np.int64),
+            ],
+        )
+        ret["number"] = numbers
+        ret["type"] = types
+        ret["constants"] = padded
+        ret["is_reflecting"] = reflecting
+        ret["is_white_boundary"] = white
+        ret["transform"] = transforms
+        return ret
+
+    def apply_transform(self, transform):
+        """Moves all surfaces in this collection by a transform, by rewriting their surface constants.
+
+        This has the same effect as setting :attr:`~montepy.Surface.transform` on every surface,
+        but no ``TR`` is used.
+        Surfaces that already have a transform are moved by both transforms, and no longer have a transform.
+        The surfaces of each type are moved together with NumPy.
+
+        When a surface can not be written in its own form after it is moved,
+        it is replaced by a new surface of a more general type with the same number.
+        For example, spheres become ``S``, cylinders and cones on an axis are moved off of it with ``C/X`` and ``K/X``,
+        planes become ``P``, ``RPP`` become ``BOX``, and other rotated quadrics become ``GQ``.
+        Planes given by three points are always written with coefficients, i.e., ``P A B C D``,
+        as their sense depends on which side of them the origin is.
+        ``X``, ``Y``, and ``Z`` surfaces are written as the plane, cylinder, cone, or ``SQ`` through their points
+        when they are moved off of their axis.
+        The new surfaces replace the old surfaces in this collection,
+        and in the cells and surfaces of the problem this collection is linked to.
+
+        .. versionadded:: 1.4.0
+
+        .. note::
+            Tori, and cones with one nappe, including ``X``, ``Y``, and ``Z`` surfaces through two points that are cones,
+            can not be rotated.
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test.imcnp")
+            transform = montepy.Transform("tr1 0 0 10")
+            problem.surfaces[1000:1025].apply_transform(transform)
+            print(problem.surfaces[1005].surface_constants[:3])
+            print(problem.surfaces[1010].surface_type)
+
+        .. testoutput::
+
+            [0.0, 1.5, 9.5]
+            S
+
+        Parameters
+        ----------
+        transform : Transform
+            the transform to move the surfaces by.
+
+        Raises
+        ------
+        TypeError
+            if transform is not a Transform.
+        IllegalState
+            if a surface does not have its type and all constants set.
+        NotImplementedError
+            if a surface can not be moved without a transform.
+            No surfaces are changed in this case.
+        """
+        if not isinstance(transform, montepy.Transform):
+            raise TypeError(f"transform must be a Transform. {transform} given.")
+        _surface_transform.apply_transform(self, transform)
+
 
 def __setup_surfaces_generators():
     for surf_type in SurfaceType:
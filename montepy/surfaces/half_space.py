@@ -12,6 +12,52 @@ from montepy.input_parser.syntax_node import (
 from montepy.utilities import *
 
 from numbers import Integral
+import numpy as np
+import weakref
+
+
+def _add_geometry_dependent(obj, dependent):
+    """Records that cached geometry data of ``dependent`` was built from ``obj``.
+
+    The caches of ``dependent`` are dropped by :func:`_invalidate_geometry` when ``obj`` changes.
+
+    Parameters
+    ----------
+    obj : object
+        the geometry object, e.g., a surface, that the data was built from.
+    dependent : object
+        the object, e.g., a cell, that cached the data.
+    """
+    dependents = obj.__dict__.get("_geometry_dependents")
+    if dependents is None:
+        dependents = weakref.WeakValueDictionary()
+        obj._geometry_dependents = dependents
+    dependents[id(dependent)] = dependent
+
+
+def _invalidate_geometry(obj, *args):
+    """Marks the cached geometry data that was built from the given object as stale.
+
+    This drops the caches of the object,
+    and of every object whose caches were built from it, such as the cells that use a surface.
+    The dependents register themselves again when they rebuild their caches.
+    This accepts and ignores extra arguments so it can be used as a property validator.
+
+    Parameters
+    ----------
+    obj : object
+        the surface, transform, cell, or HalfSpace that changed.
+    """
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        clear = getattr(obj, "_clear_geometry_cache", None)
+        if clear is not None:
+            clear()
+        dependents = obj.__dict__.get("_geometry_dependents")
+        if dependents:
+            stack.extend(dependents.values())
+            dependents.clear()
 
 
 class HalfSpace:
@@ -85,7 +131,7 @@ class HalfSpace:
         self._node = node
         self._cell = None
 
-    @make_prop_pointer("_left", ())
+    @make_prop_pointer("_left", (), validator=_invalidate_geometry)
     def left(self):
         """The left side of the binary tree of this half_space.
 
@@ -96,7 +142,7 @@ class HalfSpace:
         """
         pass
 
-    @make_prop_pointer("_right", (), deletable=True)
+    @make_prop_pointer("_right", (), validator=_invalidate_geometry)
     def right(self):
         """The right side of the binary tree of this half_space if any.
 
@@ -107,7 +153,12 @@ class HalfSpace:
         """
         pass
 
-    @make_prop_pointer("_operator", Operator)
+    @right.deleter
+    def right(self):
+        _invalidate_geometry(self)
+        self._right = None
+
+    @make_prop_pointer("_operator", Operator, validator=_invalidate_geometry)
     def operator(self):
         """The operator for applying to this binary tree.
 
@@ -197,21 +248,18 @@ class HalfSpace:
         """
         if self._cell is None:
             return
-        cells, surfaces = other._get_leaf_objects()
-        for container, parent in zip(
-            (cells, surfaces), (self._cell.complements, self._cell.surfaces)
-        ):
-            for item in container:
-                if not isinstance(
-                    item, (montepy.surfaces.surface.Surface, montepy.Cell)
-                ):
-                    raise IllegalState(
-                        f"The geometry was not fully initialized, and cannot be changed. "
-                        f"The offending cell is {self._cell}. "
-                        f"Run cell.update_pointers."
-                    )
-                if item not in parent:
-                    parent.append(item)
+        # walk the leaves directly, instead of building a collection for every node
+        for leaf in other._iter_leaves():
+            item = leaf.divider
+            if not isinstance(item, (montepy.surfaces.surface.Surface, montepy.Cell)):
+                raise IllegalState(
+                    f"The geometry was not fully initialized, and cannot be changed. "
+                    f"The offending cell is {self._cell}. "
+                    f"Run cell.update_pointers."
+                )
+            parent = self._cell.complements if leaf.is_cell else self._cell.surfaces
+            if item not in parent:
+                parent.append(item)
 
     def remove_duplicate_surfaces(
         self,
@@ -265,6 +313,27 @@ class HalfSpace:
             surfaces |= new_surfaces
         return cells, surfaces
 
+    def _iter_leaves(self):
+        """Iterate over all of the UnitHalfSpace leaves of this tree.
+
+        Unlike :func:`_get_leaf_objects` this does not build any collections.
+
+        .. versionadded:: 1.4.0
+
+        Returns
+        -------
+        Generator[UnitHalfSpace]
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, UnitHalfSpace):
+                yield node
+                continue
+            if node.right is not None:
+                stack.append(node.right)
+            stack.append(node.left)
+
     def _update_values(self):
         self._ensure_has_nodes()
         self._update_node()
@@ -439,6 +508,12 @@ class HalfSpace:
             length += len(self.right)
         return length
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the cells compiled from this tree are not copied with it
+        state.pop("_geometry_dependents", None)
+        return state
+
     def __eq__(self, other):
         # don't allow subclassing on right side
         if type(self) != type(other):
@@ -551,6 +626,7 @@ class UnitHalfSpace(HalfSpace):
             raise TypeError("Divider must be a Cell or Surface")
         if self.is_cell != isinstance(div, montepy.Cell):
             raise TypeError("Divider type must match with is_cell")
+        _invalidate_geometry(self)
         self._divider = div
         if self._cell is not None:
             if self.is_cell:
@@ -560,7 +636,7 @@ class UnitHalfSpace(HalfSpace):
             if div not in container:
                 container.append(div)
 
-    @make_prop_pointer("_is_cell", bool)
+    @make_prop_pointer("_is_cell", bool, validator=_invalidate_geometry)
     def is_cell(self):
         """Whether or not the divider this uses is a cell.
 
@@ -598,7 +674,7 @@ class UnitHalfSpace(HalfSpace):
         """
         return self._node
 
-    @make_prop_pointer("_side", bool)
+    @make_prop_pointer("_side", bool, validator=_invalidate_geometry)
     def side(self):
         """Which side of the divider this HalfSpace is on.
 
@@ -650,6 +726,7 @@ class UnitHalfSpace(HalfSpace):
             container = cells
             par_container = self._cell.complements
         if isinstance(self.divider, Integral):
+            _invalidate_geometry(self)
             try:
                 self._divider = container[self._divider]
                 if self._divider not in par_container:
@@ -662,6 +739,9 @@ class UnitHalfSpace(HalfSpace):
                 raise BrokenObjectLinkError(
                     "Cell", self._cell.number, "Surface", self._divider
                 )
+        # the parent's containers are rebuilt when the pointers are updated again
+        elif self._divider not in par_container:
+            par_container.append(self._divider)
 
     def _ensure_has_nodes(self):
         if self.node is None:
@@ -753,3 +833,526 @@ class UnitHalfSpace(HalfSpace):
             and self.divider is other.divider
             and self.side == other.side
         )
+
+
+def _box_union(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    return np.array([np.minimum(left[0], right[0]), np.maximum(left[1], right[1])])
+
+
+def _box_intersection(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    ret = np.array([np.maximum(left[0], right[0]), np.minimum(left[1], right[1])])
+    if np.any(ret[0] > ret[1]):
+        # the boxes don't overlap so the intersection is empty
+        return np.array([[np.inf] * 3, [-np.inf] * 3])
+    return ret
+
+
+class _CompiledRegion:
+    """A HalfSpace tree compiled to be evaluated for many points at once.
+
+    The tree is flattened into postfix instructions over the senses of its unique surfaces.
+    Complemented cells are inlined, so every surface is only evaluated once
+    per batch of points, even when it is used many times.
+    Points that are on a surface are treated as being on its positive side.
+
+    .. versionadded:: 1.4.0
+
+    Parameters
+    ----------
+    half_space : HalfSpace
+        the geometry to compile.
+    """
+
+    def __init__(self, half_space: HalfSpace):
+        self._surfaces = {}
+        self._program = []
+        self._sources = []
+        self._compile(half_space, frozenset())
+
+    def _compile(self, half_space, cells):
+        stack = [(half_space, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                self._sources.append(node)
+            if isinstance(node, UnitHalfSpace):
+                divider = node.divider
+                if isinstance(divider, Integral):
+                    raise IllegalState(
+                        f"Geometry cannot be evaluated while not linked to surfaces. Run Cell.update_pointers"
+                    )
+                if node.is_cell:
+                    if id(divider) in cells:
+                        raise IllegalState(
+                            f"Cell {divider.number} is complemented by its own geometry."
+                        )
+                    if divider.geometry is None:
+                        raise IllegalState(
+                            f"Cell {divider.number} has no geometry defined."
+                        )
+                    self._sources.append(divider)
+                    self._compile(divider.geometry, cells | {id(divider)})
+                    continue
+                index, _ = self._surfaces.setdefault(
+                    id(divider), (len(self._surfaces), divider)
+                )
+                self._program.append((None, index, node.side))
+            elif expanded:
+                if node.operator in {
+                    Operator.INTERSECTION,
+                    Operator.UNION,
+                    Operator.COMPLEMENT,
+                }:
+                    self._program.append((node.operator,))
+            else:
+                stack.append((node, True))
+                if node.right is not None:
+                    stack.append((node.right, False))
+                stack.append((node.left, False))
+
+    @property
+    def surfaces(self):
+        """The unique surfaces used by this region.
+
+        Returns
+        -------
+        list[Surface]
+        """
+        return [surface for _, surface in self._surfaces.values()]
+
+    @property
+    def sources(self):
+        """The objects that this region was built from.
+
+        These are the HalfSpaces of the tree, the complemented cells, and the surfaces.
+        The region, and anything built from it, is stale when any of them change.
+
+        Returns
+        -------
+        list
+        """
+        return self._sources + self.surfaces
+
+    def bounding_box(self) -> np.ndarray:
+        """Finds a conservative axis-aligned bounding box of this region.
+
+        Every instruction is done on a pair of boxes:
+        one around the region, and one around its complement.
+        This allows complements to be bounded by De Morgan's laws,
+        rather than treating them as unbounded.
+
+        Returns
+        -------
+        numpy.ndarray
+            A (2, 3) array of the lower and upper corners of the box.
+        """
+        return self.bounding_boxes()[0]
+
+    def bounding_boxes(self) -> tuple[np.ndarray, np.ndarray]:
+        """Finds conservative axis-aligned bounding boxes of this region, and its complement.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            The (2, 3) boxes around the region, and around its complement.
+        """
+        boxes = [
+            (surface.bounding_box(False), surface.bounding_box(True))
+            for surface in self.surfaces
+        ]
+        stack = []
+        for instruction in self._program:
+            operator = instruction[0]
+            if operator is None:
+                _, index, side = instruction
+                inside, outside = boxes[index]
+                stack.append((outside, inside) if side else (inside, outside))
+            elif operator == Operator.COMPLEMENT:
+                stack.append(stack.pop()[::-1])
+            else:
+                right = stack.pop()
+                left = stack.pop()
+                if operator == Operator.INTERSECTION:
+                    stack.append(
+                        (
+                            _box_intersection(left[0], right[0]),
+                            _box_union(left[1], right[1]),
+                        )
+                    )
+                else:
+                    stack.append(
+                        (
+                            _box_union(left[0], right[0]),
+                            _box_intersection(left[1], right[1]),
+                        )
+                    )
+        return stack.pop()
+
+    def __call__(self, points: np.ndarray) -> np.ndarray:
+        positive = [surface.evaluate(points) >= 0.0 for surface in self.surfaces]
+        stack = []
+        for instruction in self._program:
+            operator = instruction[0]
+            if operator is None:
+                _, index, side = instruction
+                stack.append(positive[index] if side else ~positive[index])
+            elif operator == Operator.COMPLEMENT:
+                stack.append(~stack.pop())
+            else:
+                right = stack.pop()
+                if operator == Operator.INTERSECTION:
+                    stack.append(stack.pop() & right)
+                else:
+                    stack.append(stack.pop() | right)
+        return stack.pop()
+
+
+_EVERYWHERE = np.array([[-np.inf] * 3, [np.inf] * 3])
+_NOWHERE = np.array([[np.inf] * 3, [-np.inf] * 3])
+
+
+def _is_empty_box(box: np.ndarray) -> bool:
+    return bool(np.any(box[0] > box[1]))
+
+
+class _Term:
+    """A node of a HalfSpace tree in the flattened form used to simplify it.
+
+    The kinds of terms are:
+
+    * ``"surface"``: one side of a surface.
+    * ``"cell"``: the region of a cell, which is only ever written complemented.
+    * ``"not"``: the complement of its only child.
+    * ``"and"`` and ``"or"``: the intersection, or union of any number of children.
+    * ``"true"`` and ``"false"``: everywhere, and nowhere.
+
+    Every term has a hashable ``key`` that is equal for terms that are the same set.
+
+    .. versionadded:: 1.4.0
+    """
+
+    __slots__ = ("kind", "children", "divider", "side", "source", "key", "_boxes")
+
+    def __init__(self, kind, children=(), divider=None, side=True, source=None):
+        self.kind = kind
+        self.children = tuple(children)
+        self.divider = divider
+        self.side = side
+        # the HalfSpace this was read from, so it can be reused with its syntax nodes
+        self.source = source
+        if kind == "surface":
+            self.key = (kind, id(divider), side)
+        elif kind == "cell":
+            self.key = (kind, id(divider))
+        elif kind == "not":
+            self.key = (kind, self.children[0].key)
+        elif kind in {"and", "or"}:
+            self.key = (kind, frozenset(child.key for child in self.children))
+        else:
+            self.key = (kind,)
+        self._boxes = None
+
+    def boxes(self):
+        """Finds conservative bounding boxes of this term, and its complement.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+        """
+        if self._boxes is None:
+            kind = self.kind
+            if kind == "surface":
+                self._boxes = (
+                    self.divider.bounding_box(self.side),
+                    self.divider.bounding_box(not self.side),
+                )
+            elif kind == "cell":
+                self._boxes = self.divider._compiled_region().bounding_boxes()
+            elif kind == "not":
+                self._boxes = self.children[0].boxes()[::-1]
+            elif kind == "true":
+                self._boxes = (_EVERYWHERE, _NOWHERE)
+            elif kind == "false":
+                self._boxes = (_NOWHERE, _EVERYWHERE)
+            else:
+                inside = _EVERYWHERE if kind == "and" else _NOWHERE
+                outside = _NOWHERE if kind == "and" else _EVERYWHERE
+                for child in self.children:
+                    child_inside, child_outside = child.boxes()
+                    if kind == "and":
+                        inside = _box_intersection(inside, child_inside)
+                        outside = _box_union(outside, child_outside)
+                    else:
+                        inside = _box_union(inside, child_inside)
+                        outside = _box_intersection(outside, child_outside)
+                self._boxes = (inside, outside)
+        return self._boxes
+
+
+_TRUE = _Term("true")
+_FALSE = _Term("false")
+
+
+class _Simplifier:
+    """Rewrites HalfSpace trees into simpler trees of the same region.
+
+    The tree is first read into :class:`_Term` form, which flattens parentheses and
+    chains of the same operator.
+    As it is read:
+
+    * repeated children of intersections and unions are removed;
+    * intersections of a half-space and its complement are found to be empty,
+      and unions of them to be everywhere;
+    * absorbed children are removed, e.g., ``a (a : b)`` becomes ``a``;
+    * children that can not change the region, because of the bounding boxes of their siblings, are removed;
+    * complements of half-spaces are flipped, and double complements are removed.
+
+    The tree is then rebuilt from new :class:`HalfSpace` instances, reusing the original leaves
+    so their syntax nodes are kept.
+
+    .. versionadded:: 1.4.0
+
+    Parameters
+    ----------
+    expand_complements : bool
+        Whether to replace complemented cells with their geometry,
+        and push all complements down to the surfaces with De Morgan's laws.
+    """
+
+    def __init__(self, expand_complements: bool = False):
+        self._expand = expand_complements
+
+    def simplify(self, half_space: HalfSpace):
+        """Simplifies a HalfSpace tree.
+
+        Parameters
+        ----------
+        half_space : HalfSpace
+            the tree to simplify. It is not modified.
+
+        Returns
+        -------
+        HalfSpace
+            The simplified tree, or None if it can not be made any simpler.
+            Trees that are found to be empty, or everywhere, are not simplified
+            as those can not be written.
+        """
+        term = self._read(half_space, False, frozenset())
+        if term.kind in {"true", "false"}:
+            return None
+        new = self._write(term)
+        if _layout(new) == _layout(half_space):
+            return None
+        return new
+
+    def _read(self, half_space, foreign, cells):
+        """Reads a HalfSpace tree into a simplified term.
+
+        Parameters
+        ----------
+        half_space : HalfSpace
+            the tree to read.
+        foreign : bool
+            Whether this tree is from another cell, so its leaves can not be reused.
+        cells : frozenset[int]
+            The ids of the cells being expanded, to catch cells that complement themselves.
+        """
+        if isinstance(half_space, UnitHalfSpace):
+            divider = self._divider(half_space)
+            if half_space.is_cell:
+                return self._read_cell(divider, cells)
+            return _Term(
+                "surface",
+                divider=divider,
+                side=half_space.side,
+                source=None if foreign else half_space,
+            )
+        operator = half_space.operator
+        if operator == Operator.GROUP:
+            return self._read(half_space.left, foreign, cells)
+        if operator == Operator.COMPLEMENT:
+            left = half_space.left
+            if isinstance(left, UnitHalfSpace) and left.is_cell and not self._expand:
+                cell = _Term("cell", divider=self._divider(left))
+                return _Term("not", [cell], source=None if foreign else half_space)
+            return self._complement(self._read(left, foreign, cells), cells)
+        # read chains of the same operator without recursing down them
+        children = []
+        stack = [half_space]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, UnitHalfSpace) and node.operator == operator:
+                stack.append(node.right)
+                stack.append(node.left)
+            else:
+                children.append(self._read(node, foreign, cells))
+        kind = "and" if operator == Operator.INTERSECTION else "or"
+        return self._combine(kind, children)
+
+    @staticmethod
+    def _divider(leaf):
+        if isinstance(leaf.divider, Integral):
+            raise IllegalState(
+                f"Geometry cannot be simplified while not linked to surfaces. Run Cell.update_pointers"
+            )
+        return leaf.divider
+
+    def _read_cell(self, cell, cells):
+        if id(cell) in cells:
+            raise IllegalState(
+                f"Cell {cell.number} is complemented by its own geometry."
+            )
+        if cell.geometry is None:
+            raise IllegalState(f"Cell {cell.number} has no geometry defined.")
+        return self._read(cell.geometry, True, cells | {id(cell)})
+
+    def _complement(self, term, cells):
+        """Finds the complement of a term."""
+        kind = term.kind
+        if kind == "surface":
+            return _Term("surface", divider=term.divider, side=not term.side)
+        if kind == "true":
+            return _FALSE
+        if kind == "false":
+            return _TRUE
+        if kind == "not":
+            child = term.children[0]
+            if child.kind == "cell":
+                # a cell can only be written complemented
+                return self._read_cell(child.divider, cells)
+            return child
+        if kind in {"and", "or"} and self._expand:
+            return self._combine(
+                "or" if kind == "and" else "and",
+                [self._complement(child, cells) for child in term.children],
+            )
+        return _Term("not", [term])
+
+    @staticmethod
+    def _negated_key(term):
+        """The key of the complement of a term, if it is simple to find."""
+        if term.kind == "surface":
+            return ("surface", id(term.divider), not term.side)
+        if term.kind == "not":
+            return term.children[0].key
+        return ("not", term.key)
+
+    def _combine(self, kind, children):
+        """Builds a simplified intersection or union of terms."""
+        identity, absorbing = (_TRUE, _FALSE) if kind == "and" else (_FALSE, _TRUE)
+        parts = []
+        keys = set()
+        for child in children:
+            for part in child.children if child.kind == kind else (child,):
+                if part.kind == absorbing.kind:
+                    return absorbing
+                if part.kind == identity.kind or part.key in keys:
+                    continue
+                keys.add(part.key)
+                parts.append(part)
+        if any(self._negated_key(part) in keys for part in parts):
+            return absorbing
+        # absorption: a (a : b) is a, and a : (a b) is a
+        other = "or" if kind == "and" else "and"
+        parts = [
+            part
+            for part in parts
+            if not (
+                part.kind == other and any(child.key in keys for child in part.children)
+            )
+        ]
+        parts = self._reduce_by_boxes(kind, parts)
+        if parts is None:
+            return absorbing
+        if not parts:
+            return identity
+        if len(parts) == 1:
+            return parts[0]
+        return _Term(kind, parts)
+
+    @staticmethod
+    def _reduce_by_boxes(kind, parts):
+        """Removes the parts that can not change an intersection or union,
+        based on the bounding boxes of the other parts.
+
+        For an intersection a part can be removed if the box of the other parts
+        does not overlap the box of its complement.
+        Unions are handled the same way with De Morgan's laws.
+
+        Returns
+        -------
+        list[_Term]
+            The parts to keep, or None if the intersection is empty, or the union is everywhere.
+        """
+        if len(parts) < 2:
+            return parts
+        inner = 0 if kind == "and" else 1
+        boxes = [part.boxes() for part in parts]
+        prefixes = [_EVERYWHERE]
+        for box in boxes:
+            prefixes.append(_box_intersection(prefixes[-1], box[inner]))
+        if _is_empty_box(prefixes[-1]):
+            return None
+        # later parts are checked first, so earlier parts are kept when parts are equivalent
+        suffix = _EVERYWHERE
+        kept = []
+        for idx in range(len(parts) - 1, -1, -1):
+            others = _box_intersection(prefixes[idx], suffix)
+            if _is_empty_box(_box_intersection(others, boxes[idx][1 - inner])):
+                continue
+            suffix = _box_intersection(suffix, boxes[idx][inner])
+            kept.append(parts[idx])
+        return kept[::-1]
+
+    def _write(self, term):
+        """Builds a new HalfSpace tree from a term."""
+        kind = term.kind
+        if kind == "surface":
+            if term.source is not None:
+                return term.source
+            return UnitHalfSpace(term.divider, term.side, False)
+        if kind == "not":
+            if term.source is not None:
+                return term.source
+            child = term.children[0]
+            if child.kind == "cell":
+                return HalfSpace(
+                    UnitHalfSpace(child.divider, True, True), Operator.COMPLEMENT
+                )
+            return HalfSpace(self._write(child), Operator.COMPLEMENT)
+        operator = Operator.INTERSECTION if kind == "and" else Operator.UNION
+        ret = None
+        for child in term.children:
+            child_tree = self._write(child)
+            if kind == "and" and child.kind == "or":
+                child_tree = HalfSpace(child_tree, Operator.GROUP)
+            ret = child_tree if ret is None else HalfSpace(ret, operator, child_tree)
+        return ret
+
+
+def _layout(half_space):
+    """A hashable description of how a HalfSpace tree will be written.
+
+    This ignores how chains of the same operator are nested,
+    and the parentheses of complements, as neither change the output.
+    """
+    if isinstance(half_space, UnitHalfSpace):
+        return (id(half_space.divider), half_space.side, half_space.is_cell)
+    operator = half_space.operator
+    if operator == Operator.COMPLEMENT:
+        inner = half_space.left
+        if not isinstance(inner, UnitHalfSpace) and inner.operator == Operator.GROUP:
+            inner = inner.left
+        return (operator, _layout(inner))
+    if operator == Operator.GROUP:
+        return (operator, _layout(half_space.left))
+    parts = []
+    stack = [half_space]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, UnitHalfSpace) and node.operator == operator:
+            stack.append(node.right)
+            stack.append(node.left)
+        else:
+            parts.append(_layout(node))
+    return (operator, tuple(parts))
@@ -62,6 +62,140 @@ class _SurfaceTypeSpec:
     num_param_values: int
     params: list[_SurfaceParamSpec]
     equation: Callable = None
+    bounding_box: Callable = None
+
+
+_SURFACE_EQUATIONS: dict[SurfaceType, Callable] = {}
+"""Maps each surface type to the equation used to evaluate it."""
+
+_SURFACE_BOUNDING_BOXES: dict[SurfaceType, Callable] = {}
+"""Maps each surface type to the function finding the bounding box of one of its sides.
+
+The functions take the surface constants, and the side (True for positive),
+and return a (2, 3) array of the lower and upper corners of the box.
+Surface types without a function are treated as unbounded.
+"""
+
+
+def _validate_points(points) -> np.ndarray:
+    """Validates and converts points into an (N, 3) array of floats.
+
+    Parameters
+    ----------
+    points : numpy.typing.ArrayLike
+        A single point, or an (N, 3) array of points.
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+    try:
+        points = np.asarray(points, dtype=float)
+    except (TypeError, ValueError) as e:
+        raise TypeError(f"points must be an array of numbers. {points} given.") from e
+    if points.ndim == 1:
+        points = points.reshape(1, -1)
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError(
+            f"points must be an (N, 3) array of points. Shape: {points.shape} given."
+        )
+    return points
+
+
+def _invalidating_validator(validator: Callable = None) -> Callable:
+    """Wraps a surface constant validator to also mark cached geometry data as stale."""
+
+    def wrapper(self, value):
+        if validator is not None:
+            validator(self, value)
+        half_space._invalidate_geometry(self)
+
+    return wrapper
+
+
+# ---------------------------------------------------------------------------
+# Bounding boxes
+#
+# Boxes are (2, 3) arrays of the lower and upper corners,
+# and are conservative: they always contain the whole side of the surface.
+# ---------------------------------------------------------------------------
+
+
+def _infinite_box() -> np.ndarray:
+    return np.array([[-np.inf] * 3, [np.inf] * 3])
+
+
+def _empty_box() -> np.ndarray:
+    return np.array([[np.inf] * 3, [-np.inf] * 3])
+
+
+def _centered_box(center, half_widths) -> np.ndarray:
+    center = np.asarray(center, dtype=float)
+    half_widths = np.broadcast_to(np.asarray(half_widths, dtype=float), 3)
+    return np.array([center - half_widths, center + half_widths])
+
+
+def _corners_box(corners) -> np.ndarray:
+    corners = np.asarray(corners, dtype=float)
+    return np.array([corners.min(axis=0), corners.max(axis=0)])
+
+
+def _closed_box(func: Callable) -> Callable:
+    """Makes a bounding box function for a closed surface from the box of its inside."""
+
+    def box(c, side):
+        if side:
+            return _infinite_box()
+        return func(c)
+
+    return box
+
+
+def _axis_plane_box(axis: int) -> Callable:
+    def box(c, side):
+        ret = _infinite_box()
+        ret[0 if side else 1, axis] = c[0]
+        return ret
+
+    return box
+
+
+def _axis_cylinder_box(axis: int, center_idx: tuple[int, int] = None) -> Callable:
+    def box(c):
+        center = np.zeros(3)
+        if center_idx is not None:
+            others = [i for i in range(3) if i != axis]
+            center[others] = [c[i] for i in center_idx]
+        ret = _centered_box(center, c[-1])
+        ret[:, axis] = [-np.inf, np.inf]
+        return ret
+
+    return _closed_box(box)
+
+
+def _sphere_box(center: Callable) -> Callable:
+    return _closed_box(lambda c: _centered_box(center(c), c[-1]))
+
+
+def _torus_box(axis: int) -> Callable:
+    def box(c):
+        half_widths = np.full(3, c[3] + c[5])
+        half_widths[axis] = c[4]
+        return _centered_box(c[0:3], half_widths)
+
+    return _closed_box(box)
+
+
+def _disc_box(center, axis, radius) -> np.ndarray:
+    """Finds the bounding box of a disc of the given radius perpendicular to the axis."""
+    axis = np.asarray(axis, dtype=float)
+    axis = axis / np.linalg.norm(axis)
+    return _centered_box(center, radius * np.sqrt(np.clip(1 - axis**2, 0.0, 1.0)))
+
+
+def _join_boxes(*boxes) -> np.ndarray:
+    boxes = np.array(boxes)
+    return np.array([boxes[:, 0].min(axis=0), boxes[:, 1].max(axis=0)])
 
 
 class _SurfaceClassFactory(_ExceptionContextAdder):
@@ -81,6 +215,12 @@ class _SurfaceClassFactory(_ExceptionContextAdder):
         namespace["_NUM_PARAMS"] = spec.num_param_values
         namespace["_ALLOWED_SURFACE_TYPES"] = spec.surface_types
         namespace["__equation"] = spec.equation
+        if spec.equation is not None:
+            for surf_type in spec.surface_types:
+                _SURFACE_EQUATIONS[surf_type] = spec.equation
+        if spec.bounding_box is not None:
+            for surf_type in spec.surface_types:
+                _SURFACE_BOUNDING_BOXES[surf_type] = spec.bounding_box
         # default surface_type scenario
         if len(spec.surface_types) == 1:
             surf_type = next(iter(spec.surface_types))
@@ -132,7 +272,10 @@ class _SurfaceClassFactory(_ExceptionContextAdder):
         base_func.__name__ = param.name
         base_func.__doc__ = base_func.__doc__.format(**asdict(param))
         return make_prop_val_node(
-            f"_{param.name}", param.types, param.base_type, param.validator
+            f"_{param.name}",
+            param.types,
+            param.base_type,
+            _invalidating_validator(param.validator),
         )(base_func)
 
     @classmethod
@@ -185,6 +328,7 @@ class _SurfaceClassFactory(_ExceptionContextAdder):
                 if validator is not None:
                     validator(self, val)
                 converted.append(val)
+            half_space._invalidate_geometry(self)
             for in_val, storage in zip(converted, getattr(self, hidden_param)):
                 storage.value = in_val
 
@@ -234,6 +378,7 @@ class Surface(Numbered_MCNP_Object, metaclass=_SurfaceClassFactory):
         self._old_transform_number.is_negatable_identifier = True
         self._is_reflecting = False
         self._is_white_boundary = False
+        self._bounding_boxes = {}
         self._surface_constants = []
         self._surface_type = self._generate_default_node(str, None)
         self._modifier = self._generate_default_node(str, None)
@@ -460,6 +605,7 @@ class Surface(Numbered_MCNP_Object, metaclass=_SurfaceClassFactory):
                 raise TypeError(
                     f"The surface constant provided: {constant} must be a float"
                 )
+        half_space._invalidate_geometry(self)
         for i, value in enumerate(constants):
             self._surface_constants[i].value = value
 
@@ -493,7 +639,11 @@ class Surface(Numbered_MCNP_Object, metaclass=_SurfaceClassFactory):
         """
         pass
 
-    @make_prop_pointer("_transform", transform.Transform, deletable=True)
+    @make_prop_pointer(
+        "_transform",
+        transform.Transform,
+        validator=half_space._invalidate_geometry,
+    )
     def transform(self):
         """The Transform object that translates this surface
 
@@ -503,6 +653,11 @@ class Surface(Numbered_MCNP_Object, metaclass=_SurfaceClassFactory):
         """
         pass
 
+    @transform.deleter
+    def transform(self):
+        half_space._invalidate_geometry(self)
+        self._transform = None
+
     @make_prop_val_node("_old_number")
     def old_number(self):
         """The surface number that was used in the read file
@@ -670,6 +825,148 @@ class Surface(Numbered_MCNP_Object, metaclass=_SurfaceClassFactory):
                 ret.append(surface)
         return ret
 
+    def evaluate(self, points) -> np.ndarray:
+        """Evaluates the surface equation at many points at once.
+
+        The points are given in the main coordinate system,
+        and are moved into this surface's coordinate system when it has a :attr:`transform`.
+        Macrobodies are evaluated as the maximum of the functions of their facets.
+        In all cases the value is negative inside the surface (negative sense),
+        zero on it, and positive outside of it.
+
+        .. versionadded:: 1.4.0
+
+        Parameters
+        ----------
+        points : numpy.typing.ArrayLike
+            An (N, 3) array of the :math:`(x, y, z)` points to evaluate,
+            or a single point.
+
+        Returns
+        -------
+        numpy.ndarray
+            An array of length N of the value of the surface equation at each point.
+
+        Raises
+        ------
+        TypeError
+            If the points are not numbers.
+        ValueError
+            If the points are not an (N, 3) array.
+        IllegalState
+            If the surface type or any surface constants are not set,
+            or the points of an ``X``, ``Y``, or ``Z`` surface do not define a surface.
+        """
+        points = _validate_points(points)
+        if self.surface_type is None:
+            raise IllegalState(
+                f"Surface: {self.number} does not have a surface type set."
+            )
+        equation = _SURFACE_EQUATIONS[self.surface_type]
+        constants = self.surface_constants
+        if any(c is None for c in constants):
+            raise IllegalState(
+                f"Surface: {self.number} does not have all required constants set."
+            )
+        if self.transform is not None:
+            points = self.transform._to_local_coordinates(points)
+        x, y, z = points.T
+        values = equation(x, y, z, [float(c) for c in constants])
+        return np.broadcast_to(np.asarray(values, dtype=float), len(points)).copy()
+
+    def sense(self, points) -> np.ndarray:
+        """Finds which side of this surface many points are on.
+
+        .. versionadded:: 1.4.0
+
+        Parameters
+        ----------
+        points : numpy.typing.ArrayLike
+            An (N, 3) array of the :math:`(x, y, z)` points to check,
+            or a single point.
+
+        Returns
+        -------
+        numpy.ndarray
+            An array of length N that is ``-1`` for points with a negative sense,
+            ``1`` for points with a positive sense,
+            and ``0`` for points on the surface.
+
+        See Also
+        --------
+        evaluate : for details on how the surface is evaluated, and the errors raised.
+        """
+        return np.sign(self.evaluate(points)).astype(np.int8)
+
+    def _clear_geometry_cache(self):
+        self._bounding_boxes = {}
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # the transform may not be copied with this, so the boxes can't be trusted
+        state["_bounding_boxes"] = {}
+        return state
+
+    def bounding_box(self, side: bool = False) -> np.ndarray:
+        """Finds an axis-aligned box that contains one side of this surface.
+
+        The box is conservative: it always contains the whole side of the surface,
+        but may be larger than needed.
+        Sides that are unbounded, and surfaces whose extent isn't known
+        (e.g., cones, general quadrics, and ``X``, ``Y``, and ``Z`` surfaces),
+        have infinite bounds.
+        When this surface has a :attr:`transform` the box is found in the surface's coordinate system,
+        and then the box around its transformed corners is found.
+
+        The box is cached until this surface, its constants, or its transform are changed.
+
+        .. versionadded:: 1.4.0
+
+        Parameters
+        ----------
+        side : bool
+            Which side of the surface to bound: True for the positive side,
+            and False for the negative side (i.e., inside a closed surface).
+
+        Returns
+        -------
+        numpy.ndarray
+            A (2, 3) array of the lower and upper corners of the box.
+            Infinite bounds are ``numpy.inf``.
+
+        Raises
+        ------
+        TypeError
+            If side is not a bool.
+        IllegalState
+            If the surface type or any surface constants are not set,
+            or the points of an ``X``, ``Y``, or ``Z`` surface do not define a surface.
+        """
+        if not isinstance(side, bool):
+            raise TypeError(f"side must be a bool. {side} given.")
+        cached = self._bounding_boxes.get(side)
+        if cached is not None:
+            return cached.copy()
+        if self.surface_type is None:
+            raise IllegalState(
+                f"Surface: {self.number} does not have a surface type set."
+            )
+        constants = self.surface_constants
+        if any(c is None for c in constants):
+            raise IllegalState(
+                f"Surface: {self.number} does not have all required constants set."
+            )
+        box_func = _SURFACE_BOUNDING_BOXES.get(self.surface_type)
+        if box_func is None:
+            box = _infinite_box()
+        else:
+            box = box_func([float(c) for c in constants], side)
+        if self.transform is not None:
+            box = self.transform._to_main_box(box)
+            half_space._add_geometry_dependent(self.transform, self)
+        self._bounding_boxes[side] = box
+        return box.copy()
+
     def __neg__(self):
         if not self.number or self.number <= 0:
             raise IllegalState(
@@ -766,6 +1063,7 @@ _x_cylinder_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: y**2 + z**2 - c[0] ** 2,
+    bounding_box=_axis_cylinder_box(0),
 )
 
 _y_cylinder_spec = _SurfaceTypeSpec(
@@ -782,6 +1080,7 @@ _y_cylinder_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: x**2 + z**2 - c[0] ** 2,
+    bounding_box=_axis_cylinder_box(1),
 )
 
 _z_cylinder_spec = _SurfaceTypeSpec(
@@ -798,6 +1097,7 @@ _z_cylinder_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: x**2 + y**2 - c[0] ** 2,
+    bounding_box=_axis_cylinder_box(2),
 )
 
 
@@ -978,6 +1278,7 @@ _x_cylinder_par_axis_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: (y - c[0]) ** 2 + (z - c[1]) ** 2 - c[2] ** 2,
+    bounding_box=_axis_cylinder_box(0, (0, 1)),
 )
 
 _y_cylinder_par_axis_spec = _SurfaceTypeSpec(
@@ -1017,6 +1318,7 @@ _y_cylinder_par_axis_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: (x - c[0]) ** 2 + (z - c[1]) ** 2 - c[2] ** 2,
+    bounding_box=_axis_cylinder_box(1, (0, 1)),
 )
 
 _z_cylinder_par_axis_spec = _SurfaceTypeSpec(
@@ -1056,6 +1358,7 @@ _z_cylinder_par_axis_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: (x - c[0]) ** 2 + (y - c[1]) ** 2 - c[2] ** 2,
+    bounding_box=_axis_cylinder_box(2, (0, 1)),
 )
 
 
@@ -1225,6 +1528,7 @@ _x_plane_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: x - c[0],
+    bounding_box=_axis_plane_box(0),
 )
 
 _y_plane_spec = _SurfaceTypeSpec(
@@ -1254,6 +1558,7 @@ _y_plane_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: y - c[0],
+    bounding_box=_axis_plane_box(1),
 )
 
 _z_plane_spec = _SurfaceTypeSpec(
@@ -1283,6 +1588,7 @@ _z_plane_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: z - c[0],
+    bounding_box=_axis_plane_box(2),
 )
 
 
@@ -1356,6 +1662,41 @@ class ZPlane(AxisPlane, metaclass=_SurfaceClassFactory, spec=_z_plane_spec):
 # GeneralPlane  (P)
 # ---------------------------------------------------------------------------
 
+
+def _general_plane_equation(x, y, z, c):
+    """Evaluates a general plane given either by coefficients or by three points.
+
+    For the three point form the sense follows MCNP: the origin is on the negative side.
+    If the plane passes through the origin then the points :math:`(0, 0, \\infty)`,
+    :math:`(0, \\infty, 0)`, and :math:`(\\infty, 0, 0)` are checked in turn to be on the
+    positive side.
+    """
+    if len(c) < 9:
+        return c[0] * x + c[1] * y + c[2] * z - c[3]
+    p1, p2, p3 = np.array(c[:9]).reshape(3, 3)
+    normal = np.cross(p2 - p1, p3 - p1)
+    d = normal @ p1
+    for value in (d, normal[2], normal[1], normal[0]):
+        if value != 0.0:
+            if value < 0.0:
+                normal, d = -normal, -d
+            break
+    return normal[0] * x + normal[1] * y + normal[2] * z - d
+
+
+def _general_plane_box(c, side):
+    """Bounds a side of a general plane, which is only bounded when it is perpendicular to an axis."""
+    values = _general_plane_equation(*np.hstack([np.zeros((3, 1)), np.identity(3)]), c)
+    normal = values[1:] - values[0]
+    (axes,) = np.nonzero(normal)
+    ret = _infinite_box()
+    if len(axes) == 1:
+        axis = axes[0]
+        positive_bound = side == (normal[axis] > 0.0)
+        ret[0 if positive_bound else 1, axis] = -values[0] / normal[axis]
+    return ret
+
+
 _general_plane_spec = _SurfaceTypeSpec(
     surface_types={SurfaceType.P},
     num_param_values=4,
@@ -1405,7 +1746,8 @@ _general_plane_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
-    equation=lambda x, y, z, c: c[0] * x + c[1] * y + c[2] * z - c[3],
+    equation=_general_plane_equation,
+    bounding_box=_general_plane_box,
 )
 
 
@@ -1467,6 +1809,7 @@ _sphere_at_origin_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: x**2 + y**2 + z**2 - c[0] ** 2,
+    bounding_box=_sphere_box(lambda c: (0.0, 0.0, 0.0)),
 )
 
 
@@ -1554,6 +1897,7 @@ _general_sphere_spec = _SurfaceTypeSpec(
     + (y - c[1]) ** 2
     + (z - c[2]) ** 2
     - c[3] ** 2,
+    bounding_box=_sphere_box(lambda c: c[0:3]),
 )
 
 
@@ -1669,6 +2013,7 @@ _x_sphere_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: (x - c[0]) ** 2 + y**2 + z**2 - c[1] ** 2,
+    bounding_box=_sphere_box(lambda c: (c[0], 0.0, 0.0)),
 )
 
 _y_sphere_spec = _SurfaceTypeSpec(
@@ -1699,6 +2044,7 @@ _y_sphere_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: x**2 + (y - c[0]) ** 2 + z**2 - c[1] ** 2,
+    bounding_box=_sphere_box(lambda c: (0.0, c[0], 0.0)),
 )
 
 _z_sphere_spec = _SurfaceTypeSpec(
@@ -1729,6 +2075,7 @@ _z_sphere_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: x**2 + y**2 + (z - c[0]) ** 2 - c[1] ** 2,
+    bounding_box=_sphere_box(lambda c: (0.0, 0.0, c[0])),
 )
 
 
@@ -1912,6 +2259,20 @@ class ConeOnAxis(Surface, metaclass=_SurfaceClassFactory, spec=_cone_on_axis_spe
 # XCone, YCone, ZCone  (KX, KY, KZ — axis-specific)
 # ---------------------------------------------------------------------------
 
+
+def _cone_equation(radial_sq, axial, t_squared, c, nappe_idx):
+    """Evaluates a cone, honoring the optional nappe flag at ``c[nappe_idx]``.
+
+    Points on the far side of the apex from a selected nappe are always outside of it.
+    """
+    value = radial_sq - t_squared * axial**2
+    if len(c) > nappe_idx:
+        value = np.where(
+            c[nappe_idx] * axial < 0, radial_sq + t_squared * axial**2, value
+        )
+    return value
+
+
 _x_cone_spec = _SurfaceTypeSpec(
     surface_types={SurfaceType.KX},
     num_param_values=2,
@@ -1938,7 +2299,7 @@ _x_cone_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
-    equation=lambda x, y, z, c: y**2 + z**2 - c[1] * (x - c[0]) ** 2,
+    equation=lambda x, y, z, c: _cone_equation(y**2 + z**2, x - c[0], c[1], c, 2),
 )
 
 _y_cone_spec = _SurfaceTypeSpec(
@@ -1967,7 +2328,7 @@ _y_cone_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
-    equation=lambda x, y, z, c: x**2 + z**2 - c[1] * (y - c[0]) ** 2,
+    equation=lambda x, y, z, c: _cone_equation(x**2 + z**2, y - c[0], c[1], c, 2),
 )
 
 _z_cone_spec = _SurfaceTypeSpec(
@@ -1996,7 +2357,7 @@ _z_cone_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
-    equation=lambda x, y, z, c: x**2 + y**2 - c[1] * (z - c[0]) ** 2,
+    equation=lambda x, y, z, c: _cone_equation(x**2 + y**2, z - c[0], c[1], c, 2),
 )
 
 
@@ -2255,9 +2616,9 @@ _x_cone_par_axis_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
-    equation=lambda x, y, z, c: (y - c[1]) ** 2
-    + (z - c[2]) ** 2
-    - c[3] * (x - c[0]) ** 2,
+    equation=lambda x, y, z, c: _cone_equation(
+        (y - c[1]) ** 2 + (z - c[2]) ** 2, x - c[0], c[3], c, 4
+    ),
 )
 
 _y_cone_par_axis_spec = _SurfaceTypeSpec(
@@ -2302,9 +2663,9 @@ _y_cone_par_axis_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
-    equation=lambda x, y, z, c: (x - c[0]) ** 2
-    + (z - c[2]) ** 2
-    - c[3] * (y - c[1]) ** 2,
+    equation=lambda x, y, z, c: _cone_equation(
+        (x - c[0]) ** 2 + (z - c[2]) ** 2, y - c[1], c[3], c, 4
+    ),
 )
 
 _z_cone_par_axis_spec = _SurfaceTypeSpec(
@@ -2349,9 +2710,9 @@ _z_cone_par_axis_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
-    equation=lambda x, y, z, c: (x - c[0]) ** 2
-    + (y - c[1]) ** 2
-    - c[3] * (z - c[2]) ** 2,
+    equation=lambda x, y, z, c: _cone_equation(
+        (x - c[0]) ** 2 + (y - c[1]) ** 2, z - c[2], c[3], c, 4
+    ),
 )
 
 
@@ -2446,6 +2807,26 @@ class ZConeParAxis(
 # AxisAlignedQuadric  (SQ)
 # ---------------------------------------------------------------------------
 
+
+def _quadric_box(c, side):
+    """Bounds the inside of an axis-aligned quadric that is an ellipsoid."""
+    coefficients = np.array(c[0:7])
+    if all(a < 0.0 for a in c[0:3]):
+        coefficients = -coefficients
+        side = not side
+    if side or any(a <= 0.0 for a in coefficients[0:3]):
+        return _infinite_box()
+    squares = coefficients[0:3]
+    linears = coefficients[3:6]
+    # complete the square for each axis
+    radius_sq = np.sum(linears**2 / squares) - coefficients[6]
+    if radius_sq < 0.0:
+        return _empty_box()
+    return _centered_box(
+        np.array(c[7:10]) - linears / squares, np.sqrt(radius_sq / squares)
+    )
+
+
 _axis_aligned_quadric_spec = _SurfaceTypeSpec(
     surface_types={SurfaceType.SQ},
     num_param_values=10,
@@ -2535,8 +2916,9 @@ _axis_aligned_quadric_spec = _SurfaceTypeSpec(
     + c[2] * (z - c[9]) ** 2
     + 2 * c[3] * (x - c[7])
     + 2 * c[4] * (y - c[8])
-    + 2 * c[5] * (z - c[10])
+    + 2 * c[5] * (z - c[9])
     + c[6],
+    bounding_box=_quadric_box,
 )
 
 
@@ -2653,8 +3035,8 @@ _general_quadric_spec = _SurfaceTypeSpec(
     + c[5] * z * x
     + c[6] * x
     + c[7] * y
-    + c[9] * z
-    + c[10],
+    + c[8] * z
+    + c[9],
 )
 
 
@@ -2750,7 +3132,7 @@ _torus_spec = _SurfaceTypeSpec(
         _SurfaceParamSpec(
             name="minor_radius_1",
             start_idx=4,
-            description="Minor radius :math:`B` perpendicular to the torus axis",
+            description="Minor radius :math:`B` parallel to the torus axis",
             types=(float, int),
             base_type=float,
             validator=_enforce_positive_radius,
@@ -2766,7 +3148,7 @@ _torus_spec = _SurfaceTypeSpec(
         _SurfaceParamSpec(
             name="minor_radius_2",
             start_idx=5,
-            description="Minor radius :math:`C` parallel to the torus axis",
+            description="Minor radius :math:`C` perpendicular to the torus axis",
             types=(float, int),
             base_type=float,
             validator=_enforce_positive_radius,
@@ -2919,7 +3301,7 @@ _x_torus_spec = _SurfaceTypeSpec(
         _SurfaceParamSpec(
             name="minor_radius_1",
             start_idx=4,
-            description="Minor radius :math:`B` perpendicular to the torus axis",
+            description="Minor radius :math:`B` parallel to the torus axis",
             types=(float, int),
             base_type=float,
             validator=_enforce_positive_radius,
@@ -2935,7 +3317,7 @@ _x_torus_spec = _SurfaceTypeSpec(
         _SurfaceParamSpec(
             name="minor_radius_2",
             start_idx=5,
-            description="Minor radius :math:`C` parallel to the torus axis",
+            description="Minor radius :math:`C` perpendicular to the torus axis",
             types=(float, int),
             base_type=float,
             validator=_enforce_positive_radius,
@@ -2950,9 +3332,10 @@ _x_torus_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: (np.sqrt((y - c[1]) ** 2 + (z - c[2]) ** 2) - c[3]) ** 2
-    / c[4] ** 2
-    + (x - c[0]) ** 2 / c[5] ** 2
+    / c[5] ** 2
+    + (x - c[0]) ** 2 / c[4] ** 2
     - 1,
+    bounding_box=_torus_box(0),
 )
 
 _y_torus_spec = _SurfaceTypeSpec(
@@ -3018,7 +3401,7 @@ _y_torus_spec = _SurfaceTypeSpec(
         _SurfaceParamSpec(
             name="minor_radius_1",
             start_idx=4,
-            description="Minor radius :math:`B` perpendicular to the torus axis",
+            description="Minor radius :math:`B` parallel to the torus axis",
             types=(float, int),
             base_type=float,
             validator=_enforce_positive_radius,
@@ -3034,7 +3417,7 @@ _y_torus_spec = _SurfaceTypeSpec(
         _SurfaceParamSpec(
             name="minor_radius_2",
             start_idx=5,
-            description="Minor radius :math:`C` parallel to the torus axis",
+            description="Minor radius :math:`C` perpendicular to the torus axis",
             types=(float, int),
             base_type=float,
             validator=_enforce_positive_radius,
@@ -3049,9 +3432,10 @@ _y_torus_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: (np.sqrt((x - c[0]) ** 2 + (z - c[2]) ** 2) - c[3]) ** 2
-    / c[4] ** 2
-    + (y - c[1]) ** 2 / c[5] ** 2
+    / c[5] ** 2
+    + (y - c[1]) ** 2 / c[4] ** 2
     - 1,
+    bounding_box=_torus_box(1),
 )
 
 _z_torus_spec = _SurfaceTypeSpec(
@@ -3117,7 +3501,7 @@ _z_torus_spec = _SurfaceTypeSpec(
         _SurfaceParamSpec(
             name="minor_radius_1",
             start_idx=4,
-            description="Minor radius :math:`B` perpendicular to the torus axis",
+            description="Minor radius :math:`B` parallel to the torus axis",
             types=(float, int),
             base_type=float,
             validator=_enforce_positive_radius,
@@ -3133,7 +3517,7 @@ _z_torus_spec = _SurfaceTypeSpec(
         _SurfaceParamSpec(
             name="minor_radius_2",
             start_idx=5,
-            description="Minor radius :math:`C` parallel to the torus axis",
+            description="Minor radius :math:`C` perpendicular to the torus axis",
             types=(float, int),
             base_type=float,
             validator=_enforce_positive_radius,
@@ -3148,9 +3532,10 @@ _z_torus_spec = _SurfaceTypeSpec(
         ),
     ],
     equation=lambda x, y, z, c: (np.sqrt((x - c[0]) ** 2 + (y - c[1]) ** 2) - c[3]) ** 2
-    / c[4] ** 2
-    + (z - c[2]) ** 2 / c[5] ** 2
+    / c[5] ** 2
+    + (z - c[2]) ** 2 / c[4] ** 2
     - 1,
+    bounding_box=_torus_box(2),
 )
 
 
@@ -3220,6 +3605,367 @@ class ZTorus(Torus, metaclass=_SurfaceClassFactory, spec=_z_torus_spec):
     pass
 
 
+# ---------------------------------------------------------------------------
+# Surfaces of revolution defined by points  (X, Y, Z)
+#
+# These are pairs of axial coordinates and radii, and do not have a class,
+# so their functions are registered directly.
+# ---------------------------------------------------------------------------
+
+_PLANE_SHAPE, _CYLINDER_SHAPE, _CONE_SHAPE, _QUADRIC_SHAPE = range(4)
+
+_OFF_AXES = {axis: [i for i in range(3) if i != axis] for axis in range(3)}
+
+
+def _revolution_shape(c):
+    """Finds the surface of revolution through the points of an X, Y, or Z surface.
+
+    As in MCNP, one pair of an axial coordinate and a radius is a plane,
+    two pairs are a plane, a cylinder, or a cone of one nappe,
+    and three pairs are a quadric.
+
+    Returns
+    -------
+    tuple[int, list[float]]
+        The shape, and its constants: the axial coordinate of a plane;
+        the radius of a cylinder; the apex, squared tangent, and nappe of a cone;
+        or :math:`(a, b, k)` of a quadric :math:`r^2 = at^2 + bt + k`.
+    """
+    if len(c) not in {2, 4, 6}:
+        raise IllegalState(
+            f"X, Y, and Z surfaces need 1 to 3 pairs of coordinates and radii. {len(c)} constants given."
+        )
+    axials = np.array(c[0::2])
+    radii = np.array(c[1::2])
+    if np.all(axials == axials[0]):
+        return _PLANE_SHAPE, [axials[0]]
+    if len(axials) == 2:
+        slope = (radii[1] - radii[0]) / (axials[1] - axials[0])
+        if slope == 0.0:
+            return _CYLINDER_SHAPE, [radii[0]]
+        return _CONE_SHAPE, [
+            axials[0] - radii[0] / slope,
+            slope**2,
+            np.sign(slope),
+        ]
+    if len(set(axials)) < 3:
+        raise IllegalState(
+            f"The points of an X, Y, or Z surface must all have different axial coordinates, or all the same. {axials} given."
+        )
+    return _QUADRIC_SHAPE, list(np.linalg.solve(np.vander(axials, 3), radii**2))
+
+
+def _revolution_equation(axis: int) -> Callable:
+    def equation(x, y, z, c):
+        coordinates = (x, y, z)
+        axial = coordinates[axis]
+        radial_sq = sum(coordinates[i] ** 2 for i in _OFF_AXES[axis])
+        shape, params = _revolution_shape(c)
+        if shape == _PLANE_SHAPE:
+            return axial - params[0]
+        if shape == _CYLINDER_SHAPE:
+            return radial_sq - params[0] ** 2
+        if shape == _CONE_SHAPE:
+            return _cone_equation(radial_sq, axial - params[0], params[1], params, 2)
+        a, b, k = params
+        return radial_sq - (a * axial**2 + b * axial + k)
+
+    return equation
+
+
+def _revolution_box(axis: int) -> Callable:
+    def box(c, side):
+        shape, params = _revolution_shape(c)
+        if shape == _PLANE_SHAPE:
+            return _axis_plane_box(axis)(params, side)
+        if shape == _CYLINDER_SHAPE:
+            return _axis_cylinder_box(axis)(params, side)
+        a, b, k = params
+        # only the inside of an ellipsoid, or of a cylinder, is bounded
+        if shape == _CONE_SHAPE or side or a > 0.0 or (a == 0.0 and b != 0.0):
+            return _infinite_box()
+        if a == 0.0:
+            if k < 0.0:
+                return _empty_box()
+            return _axis_cylinder_box(axis)([np.sqrt(k)], side)
+        peak = k - b**2 / (4 * a)
+        if peak < 0.0:
+            return _empty_box()
+        ret = _centered_box(np.zeros(3), np.sqrt(peak))
+        vertex = -b / (2 * a)
+        half_length = np.sqrt(peak / -a)
+        ret[:, axis] = [vertex - half_length, vertex + half_length]
+        return ret
+
+    return box
+
+
+_SURFACE_EQUATIONS.update(
+    {
+        SurfaceType.X: _revolution_equation(0),
+        SurfaceType.Y: _revolution_equation(1),
+        SurfaceType.Z: _revolution_equation(2),
+    }
+)
+_SURFACE_BOUNDING_BOXES.update(
+    {
+        SurfaceType.X: _revolution_box(0),
+        SurfaceType.Y: _revolution_box(1),
+        SurfaceType.Z: _revolution_box(2),
+    }
+)
+
+
+# ---------------------------------------------------------------------------
+# Macrobody equations
+#
+# Macrobodies are evaluated as the maximum of the functions of their facets,
+# so they are negative inside, zero on the surface, and positive outside.
+# ---------------------------------------------------------------------------
+
+
+def _stack_points(x, y, z):
+    return np.stack([x, y, z], axis=-1)
+
+
+def _slab(t, length):
+    """Negative for ``0 < t < length`` and positive outside of that range."""
+    return np.maximum(-t, t - length)
+
+
+def _skewed_coordinates(x, y, z, corner, edges):
+    """Finds the coordinates of the points in the basis of the (possibly skewed) edges."""
+    offsets = _stack_points(x, y, z) - corner
+    return np.linalg.solve(np.array(edges).T, offsets.T)
+
+
+def _axial_coordinates(x, y, z, base, height):
+    """Splits the points into their position along, and distance from, an axis.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, float]
+        The offsets from the base, the position along the axis,
+        the radial distance from the axis, and the length of the axis.
+    """
+    offsets = _stack_points(x, y, z) - base
+    length = np.linalg.norm(height)
+    axis = height / length
+    axial = offsets @ axis
+    radial = np.linalg.norm(offsets - np.outer(axial, axis), axis=-1)
+    return offsets, axial, radial, length
+
+
+def _box_equation(x, y, z, c):
+    alpha, beta, gamma = _skewed_coordinates(
+        x, y, z, np.array(c[0:3]), [c[3:6], c[6:9], c[9:12]]
+    )
+    return np.maximum.reduce([_slab(alpha, 1), _slab(beta, 1), _slab(gamma, 1)])
+
+
+def _rpp_equation(x, y, z, c):
+    return np.maximum.reduce(
+        [c[0] - x, x - c[1], c[2] - y, y - c[3], c[4] - z, z - c[5]]
+    )
+
+
+def _sphere_macrobody_equation(x, y, z, c):
+    return np.linalg.norm(_stack_points(x, y, z) - np.array(c[0:3]), axis=-1) - c[3]
+
+
+def _rcc_equation(x, y, z, c):
+    _, axial, radial, length = _axial_coordinates(
+        x, y, z, np.array(c[0:3]), np.array(c[3:6])
+    )
+    return np.maximum(_slab(axial, length), radial - c[6])
+
+
+def _rhp_equation(x, y, z, c):
+    height = np.array(c[3:6])
+    offsets, axial, _, length = _axial_coordinates(x, y, z, np.array(c[0:3]), height)
+    facets = [np.array(c[6:9]), np.array(c[9:12]), np.array(c[12:15])]
+    if not np.any(facets[1]) and not np.any(facets[2]):
+        # only one facet given, so rotate it around the axis to find the others
+        axis = height / length
+        turned = np.cross(axis, facets[0])
+        facets[1:] = [
+            facets[0] * math.cos(angle) + turned * math.sin(angle)
+            for angle in (math.pi / 3, 2 * math.pi / 3)
+        ]
+    return np.maximum.reduce(
+        [_slab(axial, length)]
+        + [np.abs(offsets @ facet) / (facet @ facet) - 1 for facet in facets]
+    )
+
+
+def _rec_equation(x, y, z, c):
+    offsets, axial, _, length = _axial_coordinates(
+        x, y, z, np.array(c[0:3]), np.array(c[3:6])
+    )
+    major = np.array(c[6:9])
+    minor = np.array(c[9:12])
+    ellipse = (offsets @ major) ** 2 / (major @ major) ** 2 + (offsets @ minor) ** 2 / (
+        minor @ minor
+    ) ** 2
+    return np.maximum(_slab(axial, length), ellipse - 1)
+
+
+def _trc_equation(x, y, z, c):
+    _, axial, radial, length = _axial_coordinates(
+        x, y, z, np.array(c[0:3]), np.array(c[3:6])
+    )
+    radius = c[6] + (c[7] - c[6]) * axial / length
+    return np.maximum(_slab(axial, length), radial - radius)
+
+
+def _ellipsoid_equation(x, y, z, c):
+    points = _stack_points(x, y, z)
+    first = np.array(c[0:3])
+    second = np.array(c[3:6])
+    if c[6] > 0.0:
+        # foci and the semi-major axis length
+        return (
+            np.linalg.norm(points - first, axis=-1)
+            + np.linalg.norm(points - second, axis=-1)
+            - 2 * c[6]
+        )
+    # center, semi-major axis vector and the semi-minor axis length
+    offsets = points - first
+    major_sq = second @ second
+    axial_sq = (offsets @ second) ** 2 / major_sq
+    radial_sq = np.sum(offsets**2, axis=-1) - axial_sq
+    return axial_sq / major_sq + radial_sq / c[6] ** 2 - 1
+
+
+def _wedge_equation(x, y, z, c):
+    alpha, beta, gamma = _skewed_coordinates(
+        x, y, z, np.array(c[0:3]), [c[3:6], c[6:9], c[9:12]]
+    )
+    return np.maximum.reduce([-alpha, -beta, alpha + beta - 1, _slab(gamma, 1)])
+
+
+def _arb_equation(x, y, z, c):
+    vertices = np.array(c[0:24]).reshape(8, 3)
+    faces = []
+    for code in c[24:30]:
+        code = int(round(code))
+        if code == 0:
+            continue
+        faces.append([int(digit) - 1 for digit in f"{code:04d}" if digit != "0"])
+    used = sorted({idx for face in faces for idx in face})
+    centroid = vertices[used].mean(axis=0)
+    points = _stack_points(x, y, z)
+    values = []
+    for face in faces:
+        first, second, third = vertices[face[:3]]
+        normal = np.cross(second - first, third - first)
+        # orient each facet so the center of the polyhedron is inside
+        if normal @ (centroid - first) > 0:
+            normal = -normal
+        values.append((points - first) @ normal / np.linalg.norm(normal))
+    return np.maximum.reduce(values)
+
+
+def _parallelepiped_corners(corner, edges):
+    corner = np.array(corner)
+    return [
+        corner + np.array([i, j, k]) @ np.array(edges)
+        for i in (0, 1)
+        for j in (0, 1)
+        for k in (0, 1)
+    ]
+
+
+def _box_box(c):
+    return _corners_box(_parallelepiped_corners(c[0:3], [c[3:6], c[6:9], c[9:12]]))
+
+
+def _rpp_box(c):
+    return np.array(c[0:6]).reshape(3, 2).T
+
+
+def _rcc_box(c):
+    base = np.array(c[0:3])
+    height = np.array(c[3:6])
+    return _join_boxes(
+        _disc_box(base, height, c[6]), _disc_box(base + height, height, c[6])
+    )
+
+
+def _rhp_box(c):
+    base = np.array(c[0:3])
+    height = np.array(c[3:6])
+    first, second = np.array(c[6:9]), np.array(c[9:12])
+    if not np.any(second):
+        axis = height / np.linalg.norm(height)
+        turned = np.cross(axis, first)
+        second = first * math.cos(math.pi / 3) + turned * math.sin(math.pi / 3)
+    # the prism is inside of the parallelogram prism of its first two pairs of facets
+    system = np.array([first, second, height])
+    corners = []
+    for i in (-1, 1):
+        for j in (-1, 1):
+            offset = np.linalg.solve(
+                system, [i * first @ first, j * second @ second, 0]
+            )
+            corners.extend([base + offset, base + height + offset])
+    return _corners_box(corners)
+
+
+def _rec_box(c):
+    base = np.array(c[0:3])
+    height = np.array(c[3:6])
+    half_widths = np.sqrt(np.array(c[6:9]) ** 2 + np.array(c[9:12]) ** 2)
+    return _join_boxes(
+        _centered_box(base, half_widths), _centered_box(base + height, half_widths)
+    )
+
+
+def _trc_box(c):
+    base = np.array(c[0:3])
+    height = np.array(c[3:6])
+    return _join_boxes(
+        _disc_box(base, height, c[6]), _disc_box(base + height, height, c[7])
+    )
+
+
+def _ellipsoid_box(c):
+    first = np.array(c[0:3])
+    second = np.array(c[3:6])
+    if c[6] > 0.0:
+        center = (first + second) / 2
+        major = c[6]
+        axis = second - first
+        minor = math.sqrt(max(major**2 - (axis @ axis) / 4, 0.0))
+    else:
+        center = first
+        axis = second
+        major = np.linalg.norm(second)
+        minor = abs(c[6])
+    length = np.linalg.norm(axis)
+    if length == 0.0:
+        return _centered_box(center, max(major, minor))
+    axis_sq = (axis / length) ** 2
+    return _centered_box(center, np.sqrt(major**2 * axis_sq + minor**2 * (1 - axis_sq)))
+
+
+def _wedge_box(c):
+    corner = np.array(c[0:3])
+    base = [corner, corner + np.array(c[3:6]), corner + np.array(c[6:9])]
+    return _corners_box(base + [point + np.array(c[9:12]) for point in base])
+
+
+def _arb_box(c):
+    vertices = np.array(c[0:24]).reshape(8, 3)
+    used = {
+        int(digit) - 1
+        for code in c[24:30]
+        for digit in f"{int(round(code)):04d}"
+        if digit != "0"
+    }
+    return _corners_box(vertices[sorted(used)])
+
+
 # ---------------------------------------------------------------------------
 # Box  (BOX)
 # ---------------------------------------------------------------------------
@@ -3265,6 +4011,8 @@ _box_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
+    equation=_box_equation,
+    bounding_box=_closed_box(_box_box),
 )
 
 
@@ -3363,6 +4111,8 @@ _rpp_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
+    equation=_rpp_equation,
+    bounding_box=_closed_box(_rpp_box),
 )
 
 
@@ -3432,6 +4182,8 @@ _sphere_macrobody_spec = _SurfaceTypeSpec(
             validator=_enforce_positive_radius,
         ),
     ],
+    equation=_sphere_macrobody_equation,
+    bounding_box=_sphere_box(lambda c: c[0:3]),
 )
 
 
@@ -3509,6 +4261,8 @@ _rcc_spec = _SurfaceTypeSpec(
             validator=_enforce_positive_radius,
         ),
     ],
+    equation=_rcc_equation,
+    bounding_box=_closed_box(_rcc_box),
 )
 
 
@@ -3604,6 +4358,8 @@ _rhp_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
+    equation=_rhp_equation,
+    bounding_box=_closed_box(_rhp_box),
 )
 
 
@@ -3690,6 +4446,8 @@ _rec_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
+    equation=_rec_equation,
+    bounding_box=_closed_box(_rec_box),
 )
 
 
@@ -3774,6 +4532,8 @@ _trc_spec = _SurfaceTypeSpec(
             validator=_enforce_positive_radius,
         ),
     ],
+    equation=_trc_equation,
+    bounding_box=_closed_box(_trc_box),
 )
 
 
@@ -3828,6 +4588,8 @@ _ellipsoid_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
+    equation=_ellipsoid_equation,
+    bounding_box=_closed_box(_ellipsoid_box),
 )
 
 
@@ -3893,6 +4655,8 @@ _wedge_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
+    equation=_wedge_equation,
+    bounding_box=_closed_box(_wedge_box),
 )
 
 
@@ -4036,6 +4800,8 @@ _arb_spec = _SurfaceTypeSpec(
             base_type=float,
         ),
     ],
+    equation=_arb_equation,
+    bounding_box=_closed_box(_arb_box),
 )
 
 
@@ -1,8 +1,50 @@
 # Copyright 2024, Battelle Energy Alliance, LLC All Rights Reserved.
 from __future__ import annotations
+from numbers import Real
+
+import numpy as np
+
 import montepy
+from montepy._buckets import _first_matches
 from montepy.numbered_object_collection import NumberedDataObjectCollection
 from montepy.data_inputs.transform import Transform
+from montepy.surfaces import half_space
+
+_ROTATION_WEIGHTS = np.arange(1, 10) / 45
+"""The weights of the rotation cosines in the keys used to bucket transforms, which sum to 1."""
+
+
+def _find_duplicate_transforms(transforms, tolerance):
+    """Finds all transforms that move points the same as an earlier transform in one pass.
+
+    Every transform is normalized to the top three rows of its matrix from :func:`~montepy.Transform.as_matrix`,
+    so transforms in degrees or cosines, and in either direction, are compared the same way.
+    These vectors are quantized into buckets, and only transforms in neighbouring buckets are compared.
+
+    Returns
+    -------
+    dict[int, tuple[Transform, Transform]]
+        The transforms to delete, mapping the number of each duplicate transform to a tuple of it,
+        and the earlier transform to replace it with.
+    """
+    group = list(transforms)
+    vectors = [trans.as_matrix()[:3].ravel() for trans in group]
+    vectors = np.array(vectors, dtype=float).reshape(len(group), 12)
+    # Exact zeros are on the edge of a bucket, so bucketing all 12 values searches up to 4096 buckets.
+    # The displacement, and a weighted mean of the rotation, change by at most the tolerance between matches,
+    # so bucketing on them searches at most 16 buckets.
+    keys = np.column_stack(
+        [vectors[:, 3::4], np.delete(vectors, [3, 7, 11], axis=1) @ _ROTATION_WEIGHTS]
+    )
+
+    def is_match(kept, other):
+        return np.all(np.abs(vectors[kept] - vectors[other]) <= tolerance)
+
+    matches = {}
+    for trans, leader in zip(group, _first_matches(keys, tolerance, is_match)):
+        if group[leader] is not trans:
+            matches[trans.number] = (trans, group[leader])
+    return matches
 
 
 class Transforms(NumberedDataObjectCollection):
@@ -25,3 +67,142 @@ class Transforms(NumberedDataObjectCollection):
 
     def __init__(self, objects: list = None, problem: montepy.MCNP_Problem = None):
         super().__init__(Transform, objects, problem)
+
+    def find_duplicates(self, tolerance):
+        """Finds the transforms in this collection that are equivalent to an earlier transform.
+
+        Transforms are compared by their matrices from :func:`~montepy.Transform.as_matrix`,
+        so the same transform written in degrees or cosines,
+        or in the opposite direction, is a duplicate.
+        Two transforms are equivalent when every rotation cosine, and displacement,
+        are within ``tolerance`` of each other.
+        The matrices are quantized into buckets first,
+        so only transforms in neighbouring buckets are compared,
+        and this scales linearly with the number of transforms.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.MCNP_Problem("")
+            problem.transforms.append(montepy.Transform("tr1 0 0 1"))
+            problem.transforms.append(montepy.Transform("*tr2 0 0 1 0 90 90 90 0 90 90 90 0"))
+            problem.transforms.append(montepy.Transform("tr3 0 0 2"))
+            for number, transform in problem.transforms.find_duplicates(1e-6).items():
+                print(number, transform.number)
+
+        .. testoutput::
+
+            2 1
+
+        Parameters
+        ----------
+        tolerance : float
+            The largest difference between any rotation cosine, or displacement, for two transforms to be equivalent.
+
+        Returns
+        -------
+        dict[int, Transform]
+            A mapping of the number of each duplicate transform to the earlier transform it is equivalent to.
+
+        Raises
+        ------
+        TypeError
+            if tolerance is not a float.
+        ValueError
+            if tolerance is not positive.
+        IllegalState
+            if a transform does not have 0, 3, 5, 6, or 9 rotation entries.
+        """
+        self._check_tolerance(tolerance)
+        return {
+            number: kept
+            for number, (_, kept) in _find_duplicate_transforms(self, tolerance).items()
+        }
+
+    def remove_duplicates(self, tolerance):
+        """Finds the transforms in this collection that are equivalent to an earlier transform, and removes them.
+
+        Duplicates are found with :func:`find_duplicates`.
+        Every surface, and cell fill, of the problem that uses a duplicate transform
+        is then pointed to the earlier transform in one pass,
+        and the duplicates are removed from this collection, and from the problem.
+
+        .. versionadded:: 1.4.0
+
+        .. note::
+            MontePy does not support ``TRCL`` on cells,
+            so only the transforms of surfaces and cell fills are rewritten.
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test_universe.imcnp")
+            transform = montepy.Transform("*tr6 0 0 1 0 90 90 90 0 90 90 90 0")
+            problem.transforms.append(transform)
+            problem.surfaces[1000].transform = transform
+            problem.transforms.remove_duplicates(1e-6)
+            print(list(problem.transforms.numbers))
+            print(problem.surfaces[1000].transform.number)
+
+        .. testoutput::
+
+            [5]
+            5
+
+        Parameters
+        ----------
+        tolerance : float
+            The largest difference between any rotation cosine, or displacement, for two transforms to be equivalent.
+
+        Raises
+        ------
+        TypeError
+            if tolerance is not a float.
+        ValueError
+            if tolerance is not positive.
+        IllegalState
+            if a transform does not have 0, 3, 5, 6, or 9 rotation entries.
+        """
+        self._check_tolerance(tolerance)
+        matches = _find_duplicate_transforms(self, tolerance)
+        if not matches:
+            return
+        replacements = {id(dead): kept for dead, kept in matches.values()}
+        # slices of a problem's transforms are not linked to it, but their transforms are
+        problem = self._problem
+        for trans in self:
+            if problem:
+                break
+            problem = trans._problem
+        if problem:
+            for surf in problem.surfaces:
+                if surf._transform is not None and id(surf._transform) in replacements:
+                    half_space._invalidate_geometry(surf)
+                    surf._transform = replacements[id(surf._transform)]
+            for cell in problem.cells:
+                fill = cell._fill
+                if (
+                    fill._transform is not None
+                    and not fill._hidden_transform
+                    and id(fill._transform) in replacements
+                ):
+                    fill._transform = replacements[id(fill._transform)]
+        dead = [dead for dead, _ in matches.values()]
+        self._remove_many(dead)
+        if problem and problem.transforms is not self:
+            problem.transforms._remove_many(dead)
+
+    @staticmethod
+    def _check_tolerance(tolerance):
+        if not isinstance(tolerance, Real):
+            raise TypeError(f"tolerance must be a float. {tolerance} given.")
+        if tolerance <= 0:
+            raise ValueError(f"tolerance must be positive. {tolerance} given.")
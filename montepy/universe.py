@@ -67,8 +67,9 @@ class Universe(Numbered_MCNP_Object):
 
         for cell in self._problem.cells:
             if cell.fill:
-                if cell.fill.universes is not None:
-                    if np.any(cell.fill.universes.flatten() == self):
+                numbers = cell.fill.universe_numbers
+                if numbers is not None:
+                    if np.any(numbers == self.number):
                         yield cell
                 elif cell.fill.universe == self:
                     yield cell
@@ -1,10 +1,222 @@
 # Copyright 2024, Battelle Energy Alliance, LLC All Rights Reserved.
 from __future__ import annotations
+import collections
+
+import numpy as np
+
 import montepy
+from montepy.exceptions import IllegalState
+from montepy.numbered_mcnp_object import _invalidate_indexes
 from montepy.numbered_object_collection import NumberedObjectCollection
 from montepy.universe import Universe
 
 
+def _find_cycles(children):
+    """Finds the groups of universes that fill each other with Tarjan's algorithm.
+
+    Parameters
+    ----------
+    children : dict[int, dict[int, int]]
+        the universes that fill each universe.
+
+    Returns
+    -------
+    list[list[int]]
+        the sorted numbers of the universes in each cycle.
+    """
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    cycles = []
+    for root in children:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(children[root]))]
+        while work:
+            node, edges = work[-1]
+            for child in edges:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(children[child])))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in children[node]:
+                        cycles.append(sorted(component))
+    return cycles
+
+
+class UniverseGraph:
+    """The hierarchy of the universes in a problem, i.e., which universes fill the cells of which universes.
+
+    This should be made with :func:`~montepy.universes.Universes.graph`.
+
+    A universe fills another universe once for every cell in it that is filled by that universe,
+    and once for every element of a lattice in it that is filled by that universe.
+    Lattice elements that are filled by the lattice's own universe are not counted.
+    A lattice that is filled by a single universe is counted as one instance,
+    because the number of its elements that are used is not known.
+
+    .. versionadded:: 1.4.0
+
+    Parameters
+    ----------
+    children : dict[int, dict[int, int]]
+        the numbers of the universes that fill each universe,
+        and how many times they fill it.
+    """
+
+    def __init__(self, children: dict[int, dict[int, int]]):
+        self._children = children
+        self._cycles = _find_cycles(children)
+        self._order = None
+        self._depths = None
+        self._instances = None
+        if not self._cycles:
+            self._sort()
+
+    def _sort(self):
+        """Finds the topological order, depths, and instances of the universes."""
+        in_degree = dict.fromkeys(self._children, 0)
+        for edges in self._children.values():
+            for child in edges:
+                in_degree[child] += 1
+        queue = collections.deque(
+            number for number, degree in in_degree.items() if degree == 0
+        )
+        order = []
+        while queue:
+            number = queue.popleft()
+            order.append(number)
+            for child in self._children[number]:
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    queue.append(child)
+        depths = {0: 0}
+        instances = dict.fromkeys(order, 0)
+        instances[0] = 1
+        for number in order:
+            if number not in depths:
+                continue
+            for child, count in self._children[number].items():
+                depths[child] = max(depths.get(child, 0), depths[number] + 1)
+                instances[child] += instances[number] * count
+        self._order = order
+        self._depths = depths
+        self._instances = instances
+
+    def _check_acyclic(self):
+        if self._cycles:
+            raise IllegalState(
+                f"Universes fill themselves, so they can not be ordered: {self._cycles}"
+            )
+
+    @property
+    def children(self) -> dict[int, dict[int, int]]:
+        """The universes that fill each universe, and how many times they fill it.
+
+        Every universe in the problem is included, even if it is empty.
+
+        Returns
+        -------
+        dict[int, dict[int, int]]
+            the numbers of the universes filling each universe, to the number of times they fill it.
+        """
+        return {number: dict(edges) for number, edges in self._children.items()}
+
+    @property
+    def cycles(self) -> list[list[int]]:
+        """The groups of universes that fill each other, or themselves.
+
+        These are not allowed by MCNP, and would be filled forever.
+
+        Returns
+        -------
+        list[list[int]]
+            the numbers of the universes in each cycle. This is empty if there are no cycles.
+        """
+        return [list(cycle) for cycle in self._cycles]
+
+    @property
+    def order(self) -> list[int]:
+        """The universes in topological order, so that every universe is before all universes that fill it.
+
+        Returns
+        -------
+        list[int]
+            the numbers of all of the universes.
+
+        Raises
+        ------
+        IllegalState
+            if there are cycles.
+        """
+        self._check_acyclic()
+        return list(self._order)
+
+    @property
+    def depths(self) -> dict[int, int]:
+        """How deeply each universe is nested below the real world, universe 0.
+
+        When a universe is used at many depths the deepest is given.
+        Universes that are not used in the real world are not included.
+
+        Returns
+        -------
+        dict[int, int]
+            the depth of each universe.
+
+        Raises
+        ------
+        IllegalState
+            if there are cycles.
+        """
+        self._check_acyclic()
+        return dict(self._depths)
+
+    @property
+    def instances(self) -> dict[int, int]:
+        """The total number of times that each universe is used in the real world, universe 0.
+
+        This is the product of the number of times each universe fills the next,
+        summed over every path from the real world to the universe.
+
+        Returns
+        -------
+        dict[int, int]
+            the number of instances of each universe.
+
+        Raises
+        ------
+        IllegalState
+            if there are cycles.
+        """
+        self._check_acyclic()
+        return dict(self._instances)
+
+    def __repr__(self):
+        return f"UniverseGraph: {self._children}"
+
+
 class Universes(NumberedObjectCollection):
     """A container of multiple :class:`~montepy.Universe` instances.
 
@@ -25,3 +237,84 @@ class Universes(NumberedObjectCollection):
 
     def __init__(self, objects: list = None, problem: montepy.MCNP_Problem = None):
         super().__init__(Universe, objects, problem)
+
+    def graph(self) -> UniverseGraph:
+        """Finds the hierarchy of how the universes in the problem fill each other.
+
+        This is found in one pass over the fills of the cells,
+        and is cached until a cell, universe, or fill is changed.
+        This includes changes made in place to the arrays of :func:`~montepy.data_inputs.fill.Fill.universes`,
+        which are found by comparing the universe numbers of those arrays to the numbers the graph was built from.
+
+        .. versionadded:: 1.4.0
+
+        Examples
+        --------
+
+        .. testcode::
+
+            import montepy
+            problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+            graph = problem.universes.graph()
+            print(graph.children[2])
+            print(graph.instances[1], graph.depths[1])
+
+        .. testoutput::
+
+            {1: 2, 3: 2}
+            3 2
+
+        Returns
+        -------
+        UniverseGraph
+            the graph of the universes.
+
+        Raises
+        ------
+        IllegalState
+            if this collection is not linked to a problem.
+        """
+        if self._problem is None:
+            raise IllegalState(
+                "The universe graph can only be found for universes in a problem."
+            )
+        graph, lattices = self._get_index("graph", self.__build_graph)
+        for fill, numbers in lattices:
+            # the arrays of Universe objects can be changed in place
+            if fill._universes is not None and not np.array_equal(
+                fill.universe_numbers, numbers
+            ):
+                _invalidate_indexes(self)
+                graph, _ = self._get_index("graph", self.__build_graph)
+                break
+        return graph
+
+    def __build_graph(self):
+        """Builds the graph, and finds the universe numbers of every lattice it was built from.
+
+        Returns
+        -------
+        tuple[UniverseGraph, list[tuple[Fill, numpy.ndarray]]]
+        """
+        children = {number: {} for number in self.numbers}
+        children.setdefault(0, {})
+        lattices = []
+        for cell in self._problem.cells:
+            parent = cell.universe.number if cell.universe is not None else 0
+            fill = cell.fill
+            numbers = fill.universe_numbers
+            if numbers is not None:
+                lattices.append((fill, numbers))
+                unique, counts = np.unique(numbers, return_counts=True)
+                fills = zip(unique.tolist(), counts.tolist())
+            elif fill.universe is not None:
+                fills = [(fill.universe.number, 1)]
+            else:
+                continue
+            edges = children.setdefault(parent, {})
+            for child, count in fills:
+                if child == 0 or (numbers is not None and child == parent):
+                    continue
+                edges[child] = edges.get(child, 0) + count
+                children.setdefault(child, {})
+        return UniverseGraph(children), lattices
@@ -1,5 +1,6 @@
 # Copyright 2024-2025, Battelle Energy Alliance, LLC All Rights Reserved.
 from hypothesis import given, note, strategies as st
+import numpy as np
 import pytest
 
 import montepy
@@ -386,3 +387,210 @@ def verify_export(cell):
                 assert old_attr == new_attr
         else:
             assert new_attr is None
+
+
+CONTAINS_POINTS = [[0.0, 0.0, 0.0], [0.0, 0.0, 2.0], [0.0, 0.0, -2.0], [5.0, 0.0, 0.0]]
+
+
+@pytest.fixture
+def contains_geometry():
+    sphere = montepy.SphereAtOrigin(number=1)
+    sphere.radius = 3.0
+    top = montepy.ZPlane(number=2)
+    top.location = 1.0
+    bottom = montepy.ZPlane(number=3)
+    bottom.location = -1.0
+    inner = Cell(number=1)
+    inner.geometry = -sphere & -top & +bottom
+    outer = Cell(number=2)
+    outer.geometry = -sphere & ~inner
+    return sphere, top, bottom, inner, outer
+
+
+def test_cell_contains(contains_geometry):
+    sphere, top, bottom, inner, outer = contains_geometry
+    result = inner.contains(CONTAINS_POINTS)
+    assert result.dtype == bool
+    assert result.tolist() == [True, False, False, False]
+    assert outer.contains(CONTAINS_POINTS).tolist() == [False, True, True, False]
+    assert inner.contains([0.0, 0.0, 0.5]).tolist() == [True]
+    union = Cell(number=3)
+    union.geometry = +top | -bottom
+    assert union.contains(CONTAINS_POINTS).tolist() == [False, True, True, False]
+
+
+def test_cell_contains_evaluates_surfaces_once(contains_geometry, monkeypatch):
+    sphere, top, bottom, inner, outer = contains_geometry
+    calls = []
+    original = montepy.Surface.evaluate
+
+    def evaluate(self, points):
+        calls.append(self.number)
+        return original(self, points)
+
+    monkeypatch.setattr(montepy.Surface, "evaluate", evaluate)
+    outer.contains(CONTAINS_POINTS)
+    assert sorted(calls) == [1, 2, 3]
+
+
+def test_cell_contains_cache_invalidated(contains_geometry):
+    sphere, top, bottom, inner, outer = contains_geometry
+    assert inner.contains(CONTAINS_POINTS).tolist() == [True, False, False, False]
+    compiled = inner._compiled_geometry
+    inner.contains(CONTAINS_POINTS)
+    assert inner._compiled_geometry is compiled
+    # surfaces are evaluated live
+    top.location = 3.0
+    assert inner.contains(CONTAINS_POINTS).tolist() == [True, True, False, False]
+    # mutating the tree through the HalfSpace operators
+    inner.geometry &= -bottom
+    assert inner.contains(CONTAINS_POINTS).tolist() == [False, False, False, False]
+    inner.geometry.right.side = True
+    assert inner.contains(CONTAINS_POINTS).tolist() == [True, True, False, False]
+    inner.geometry.operator = montepy.geometry_operators.Operator.UNION
+    assert inner.contains(CONTAINS_POINTS).tolist() == [True, True, False, True]
+    inner.geometry.right.divider = top
+    assert inner.contains(CONTAINS_POINTS).tolist() == [True, True, False, False]
+    # complemented cells are also updated
+    inner.geometry = -sphere & -top & +bottom
+    assert outer.contains(CONTAINS_POINTS).tolist() == [False, False, True, False]
+
+
+def test_cell_bounding_box(contains_geometry):
+    sphere, top, bottom, inner, outer = contains_geometry
+    np.testing.assert_allclose(
+        inner.bounding_box(), [[-3.0, -3.0, -1.0], [3.0, 3.0, 1.0]]
+    )
+    np.testing.assert_allclose(outer.bounding_box(), [[-3.0] * 3, [3.0] * 3])
+    union = Cell(number=3)
+    union.geometry = +top | -bottom
+    assert np.isinf(union.bounding_box()).all()
+    # complements are bounded with De Morgan's laws
+    complement = Cell(number=4)
+    complement.geometry = ~(+sphere | +top)
+    np.testing.assert_allclose(
+        complement.bounding_box(), [[-3.0, -3.0, -3.0], [3.0, 3.0, 1.0]]
+    )
+    complement.geometry = ~inner
+    assert np.isinf(complement.bounding_box()).all()
+    empty = Cell(number=5)
+    empty.geometry = +top & -bottom
+    low, high = empty.bounding_box()
+    assert (low > high).all()
+
+
+def test_cell_bounding_box_cache_invalidated(contains_geometry):
+    sphere, top, bottom, inner, outer = contains_geometry
+    box = inner.bounding_box()
+    assert inner._bounding_box is not box
+    cached = inner._bounding_box
+    inner.bounding_box()
+    assert inner._bounding_box is cached
+    # only the cells that use a surface are invalidated when it changes
+    other = montepy.ZPlane(number=4)
+    other.location = 1.0
+    lone = Cell(number=3)
+    lone.geometry = -other
+    lone.bounding_box()
+    other.location = 2.0
+    assert inner._bounding_box is cached
+    assert lone._bounding_box is None
+    outer.bounding_box()
+    sphere.radius = 2.0
+    assert inner._bounding_box is None
+    assert outer._bounding_box is None
+    np.testing.assert_allclose(
+        inner.bounding_box(), [[-2.0, -2.0, -1.0], [2.0, 2.0, 1.0]]
+    )
+    inner.geometry &= -top
+    top.location = 0.5
+    np.testing.assert_allclose(
+        inner.bounding_box(), [[-2.0, -2.0, -1.0], [2.0, 2.0, 0.5]]
+    )
+    inner.geometry = -sphere
+    np.testing.assert_allclose(inner.bounding_box(), [[-2.0] * 3, [2.0] * 3])
+    # cells that complement a cell are invalidated with it
+    outer.bounding_box()
+    inner.geometry.side = True
+    assert outer._bounding_box is None
+    np.testing.assert_allclose(outer.bounding_box(), [[-2.0] * 3, [2.0] * 3])
+
+
+def test_cell_contains_bad(contains_geometry):
+    sphere, top, bottom, inner, outer = contains_geometry
+    with pytest.raises(ValueError):
+        inner.contains([[0.0, 0.0]])
+    with pytest.raises(TypeError):
+        inner.contains("hi")
+    with pytest.raises(montepy.exceptions.IllegalState):
+        Cell(number=5).contains(CONTAINS_POINTS)
+    with pytest.raises(montepy.exceptions.IllegalState):
+        Cell("1 0 -2").contains(CONTAINS_POINTS)
+    inner.geometry = -sphere & ~outer
+    with pytest.raises(montepy.exceptions.IllegalState):
+        outer.contains(CONTAINS_POINTS)
+    with pytest.raises(montepy.exceptions.IllegalState):
+        outer.bounding_box()
+    with pytest.raises(montepy.exceptions.IllegalState):
+        Cell(number=5).bounding_box()
+
+
+@pytest.mark.parametrize(
+    "number, geometry, output",
+    [
+        (1, "((-1*+2)*-3)", "1 0 -1 2 -3 imp:n=1"),
+        (2, "(((-1*+2)*-3)*+4)", "2 0 -1 2 -3 4 imp:n=1"),
+        (3, "-1", "3 0 -1 imp:n=1"),
+        (4, "(+1*-5)", "4 0 1 -5 imp:n=1"),
+        (5, "-5", "5 0 -5 imp:n=1"),
+        (6, "-5", "6 0 -5 imp:n=1"),
+    ],
+)
+def test_cell_simplify_geometry(number, geometry, output):
+    problem = montepy.read_input("tests/inputs/test_simplify.imcnp")
+    cell = problem.cells[number]
+    assert cell.simplify_geometry()
+    assert str(cell.geometry) == geometry
+    assert "\n".join(cell.format_for_mcnp_input((6, 2, 0))).strip() == output
+    assert sorted(cell.surfaces.numbers) == sorted(
+        {leaf.divider.number for leaf in cell.geometry._iter_leaves()}
+    )
+    assert not cell.simplify_geometry()
+
+
+def test_cell_simplify_geometry_unchanged():
+    problem = montepy.read_input("tests/inputs/test_simplify.imcnp")
+    # already simple, empty, and complements that are kept
+    for number in [7, 8, 9, 10]:
+        geometry = problem.cells[number].geometry
+        assert not problem.cells[number].simplify_geometry()
+        assert problem.cells[number].geometry is geometry
+    cell = problem.cells[1]
+    cell.lattice_type = montepy.data_inputs.lattice.LatticeType.RECTANGULAR
+    assert not cell.simplify_geometry()
+
+
+def test_cell_simplify_geometry_complements():
+    problem = montepy.read_input("tests/inputs/test_simplify.imcnp")
+    cell = Cell("20 0 #(-1 2) #(3 : -4) #4")
+    problem.cells.append(cell)
+    cell.update_pointers(problem.cells, problem.materials, problem.surfaces)
+    assert not cell.simplify_geometry()
+    assert cell.simplify_geometry(expand_complements=True)
+    assert str(cell.geometry) == "((((+1:-2)*-3)*+4)*(-1:+5))"
+    assert "(1 : -2) -3 4 (-1 : 5)" in cell.format_for_mcnp_input((6, 2, 0))[0]
+    assert list(cell.complements) == []
+    assert sorted(cell.surfaces.numbers) == [1, 2, 3, 4, 5]
+
+
+def test_cell_simplify_geometry_bad(contains_geometry):
+    sphere, top, bottom, inner, outer = contains_geometry
+    with pytest.raises(TypeError):
+        inner.simplify_geometry(1)
+    with pytest.raises(montepy.exceptions.IllegalState):
+        Cell(number=5).simplify_geometry()
+    with pytest.raises(montepy.exceptions.IllegalState):
+        Cell("1 0 -2 -2").simplify_geometry()
+    inner.geometry = -sphere & ~outer
+    with pytest.raises(montepy.exceptions.IllegalState):
+        outer.simplify_geometry(expand_complements=True)
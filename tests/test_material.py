@@ -1,5 +1,6 @@
 # Copyright 2024, Battelle Energy Alliance, LLC All Rights Reserved.
 from hypothesis import assume, given, note, strategies as st, settings, HealthCheck
+import numpy as np
 import pathlib
 import pytest
 
@@ -10,7 +11,7 @@ from montepy.data_inputs.nuclide import Nucleus, Nuclide, Library
 from montepy.data_inputs.material import Material, _DefaultLibraries as DL
 from montepy.data_inputs.material_component import MaterialComponent
 from montepy.data_inputs.thermal_scattering import ThermalScatteringLaw
-from montepy.exceptions import MalformedInputError, UnknownElement
+from montepy.exceptions import IllegalState, MalformedInputError, UnknownElement
 from montepy.input_parser.block_type import BlockType
 from montepy.input_parser.mcnp_input import Input
 from montepy.particle import LibraryType
@@ -207,6 +208,21 @@ class TestMaterial:
             big_material[2] = (Nuclide("1001.80c"), -1.0)
         _.verify_export(big_material)
 
+    def test_material_setter_contains(_):
+        mat = Material()
+        mat.add_nuclide("H-1.80c", 2.0)
+        mat.add_nuclide("O-16.80c", 1.0)
+        mat[1] = (Nuclide("U-235.80c"), 1.0)
+        assert "U-235" in mat
+        assert "U" in mat
+        assert "O-16" not in mat
+        assert "O" not in mat
+        mat[1] = (Nuclide("U-238.80c"), 1.0)
+        assert "U-235" not in mat
+        assert "U" in mat
+        del mat[1]
+        assert "U" not in mat
+
     def test_material_deleter(_, big_material):
         old_comp = big_material[6]
         del big_material[6]
@@ -648,6 +664,59 @@ Pu-239   (80c) 0.1
         for big_material in materials:
             _.verify_export(big_material)
 
+    def test_material_arrays(_, materials):
+        for big_material in materials:
+            assert big_material.zaids.tolist() == [
+                nuclide.ZAID for nuclide in big_material.nuclides
+            ]
+            with pytest.raises(ValueError):
+                big_material.zaids[0] = 1001
+            np.testing.assert_allclose(big_material.fractions, 0.05)
+            big_material.fractions[:3] *= 2.0
+            assert big_material.values[2] == pytest.approx(0.1)
+            big_material.normalize()
+            assert big_material.fractions.sum() == pytest.approx(1.0)
+            big_material.fractions = np.full(len(big_material), 0.5)
+            assert list(big_material.values) == [0.5] * len(big_material)
+            with pytest.raises(TypeError):
+                big_material.fractions = ["hi"] * len(big_material)
+            with pytest.raises(ValueError):
+                big_material.fractions = [0.5]
+            with pytest.raises(ValueError):
+                big_material.fractions = np.full(len(big_material), -0.5)
+            del big_material[0]
+            big_material.append((Nuclide("Am-242m1.80c"), 0.25))
+            assert len(big_material.fractions) == len(big_material)
+            assert big_material.zaids[-1] == 95242
+            assert big_material.fractions[-1] == 0.25
+            assert (
+                list(big_material.find(element="Am", A=242, meta_state=1))[-1][0]
+                == len(big_material) - 1
+            )
+            _.verify_export(big_material)
+            big_material.fractions[0] = np.nan
+            with pytest.raises(IllegalState):
+                big_material.format_for_mcnp_input((6, 3, 0))
+
+    def test_material_lazy_nodes(_):
+        mat = Material(number=1)
+        mat.add_nuclide("H-1.80c", 2.0)
+        mat.add_nuclide("O-16.80c", 1.0)
+        # the syntax nodes are only made to write the material
+        assert len(mat._tree["data"]) == 0
+        assert all(node is None for node in mat._fraction_nodes)
+        mat.values[1] = 3.0
+        assert " ".join(mat.format_for_mcnp_input((6, 3, 0))).split()[-2:] == [
+            "8016.80c",
+            "3.0",
+        ]
+        assert len(mat._tree["data"]) == 2
+        mat.add_nuclide("U-235.80c", 1.0)
+        mat.default_libraries["nlib"] = "00c"
+        output = " ".join(mat.format_for_mcnp_input((6, 3, 0)))
+        assert output.index("92235.80c") < output.index("NLIB")
+        _.verify_export(mat)
+
     def verify_export(_, mat):
         output = mat.format_for_mcnp_input((6, 3, 0))
         print("Material output", output)
@@ -1,5 +1,9 @@
 # Copyright 2024, Battelle Energy Alliance, LLC All Rights Reserved.
+import copy
+import io
+import numpy as np
 import pytest
+import warnings
 
 import montepy
 from montepy.mcnp_problem import MCNP_Problem
@@ -47,3 +51,899 @@ def test_problem_clone(problem):
         ):
             assert old_obj is not new_obj
             assert new_obj._problem is new_problem
+
+
+@pytest.fixture
+def merge_problems(problem_path):
+    return montepy.read_input(problem_path), montepy.read_input(problem_path)
+
+
+def test_problem_merge_offset(merge_problems):
+    problem, other = merge_problems
+    old_cells = len(problem.cells)
+    remaps = problem.merge(other)
+    assert len(problem.cells) == 2 * old_cells
+    assert remaps["cells"] == {1: 100, 2: 101, 3: 102, 99: 198, 5: 104}
+    assert remaps["universes"][0] == 0
+    assert remaps["universes"][350] == 700
+    # other is untouched
+    assert sorted(other.cells.keys()) == [1, 2, 3, 5, 99]
+    for attr in {"cells", "surfaces", "materials", "universes"}:
+        collection = getattr(problem, attr)
+        assert len(set(collection.keys())) == len(collection)
+        for obj in collection:
+            assert obj._problem is problem
+        # the objects that were added are linked to their new collection
+        for number in remaps[attr].values():
+            if attr != "universes" or number != 0:
+                assert collection[number]._collection is collection
+    new_cell = problem.cells[100]
+    assert new_cell.material is problem.materials[remaps["materials"][1]]
+    assert new_cell.material is not problem.cells[1].material
+    assert new_cell.universe is problem.universes[700]
+    assert problem.cells[104].universe is problem.universes[0]
+    assert problem.cells[104].fill.universe is problem.universes[700]
+    assert problem.cells[104].complements[198] is problem.cells[198]
+    for surf in new_cell.surfaces:
+        assert surf is problem.surfaces[surf.number]
+        assert surf.number > 2038
+
+
+def test_problem_merge_compact(merge_problems):
+    problem, other = merge_problems
+    remaps = problem.merge(other, renumber="compact")
+    assert remaps["cells"] == {1: 4, 2: 6, 3: 7, 99: 8, 5: 9}
+    assert remaps["materials"] == {1: 4, 2: 5, 3: 6}
+    assert remaps["surfaces"][1000] == 1
+    assert problem.cells[4].surfaces[1] is problem.surfaces[1]
+    # materials are also added to the data block
+    for mat in problem.materials:
+        assert mat in problem.data_inputs
+
+
+def test_problem_merge_dedupe(merge_problems):
+    problem, other = merge_problems
+    old_surfs = len(problem.surfaces)
+    old_mats = len(problem.materials)
+    remaps = problem.merge(other, dedupe=True)
+    assert len(problem.surfaces) == old_surfs
+    assert len(problem.materials) == old_mats
+    assert remaps["surfaces"][1000] == 1000
+    new_cell = problem.cells[remaps["cells"][1]]
+    assert new_cell.material is problem.cells[1].material
+    assert new_cell.surfaces[1000] is problem.surfaces[1000]
+    _, leaf_surfs = new_cell.geometry._get_leaf_objects()
+    assert leaf_surfs[1000] is problem.surfaces[1000]
+
+
+def test_problem_merge_round_trip(merge_problems, tmp_path):
+    problem, other = merge_problems
+    problem.merge(other, renumber="compact", dedupe=True)
+    out = tmp_path / "merged.imcnp"
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", montepy.exceptions.LineExpansionWarning)
+        problem.write_problem(out)
+    new_problem = montepy.read_input(out)
+    assert sorted(new_problem.cells.keys()) == sorted(problem.cells.keys())
+    assert len(new_problem.surfaces) == len(problem.surfaces)
+
+
+@pytest.mark.parametrize(
+    "args, error",
+    [
+        ((None,), TypeError),
+        (("other", "bad"), ValueError),
+        (("other", "offset", 1), TypeError),
+        (("other", "offset", False, "1"), TypeError),
+        (("other", "offset", False, 0.0), ValueError),
+    ],
+)
+def test_problem_merge_bad(merge_problems, args, error):
+    problem, other = merge_problems
+    args = tuple(other if arg == "other" else arg for arg in args)
+    with pytest.raises(error):
+        problem.merge(*args)
+
+
+def test_problem_merge_move(merge_problems):
+    problem, other = merge_problems
+    cell = other.cells[1]
+    mat = other.materials[1]
+    remaps = problem.merge(other, clone=False)
+    assert problem.cells[remaps["cells"][1]] is cell
+    assert cell.number == remaps["cells"][1]
+    assert cell._problem is problem
+    assert problem.materials[remaps["materials"][1]] is mat
+    assert mat in problem.data_inputs
+    for attr in {"cells", "surfaces", "materials", "transforms", "universes"}:
+        assert len(getattr(other, attr)) == 0
+    assert mat not in other.data_inputs
+
+
+@pytest.fixture(scope="module")
+def locate_problem():
+    return montepy.read_input("tests/inputs/test_locate.imcnp")
+
+
+def test_problem_locate(locate_problem):
+    points = [
+        [0.0, 0.0, 0.0],
+        [0.7, 0.0, 0.0],
+        [2.0, 0.0, 0.0],
+        [2.1, 2.0, 0.0],
+        [0.0, 2.0, 4.0],
+        [10.2, 0.0, 0.0],
+        [10.7, 0.0, 0.0],
+        [20.0, 0.0, 0.0],
+        [100.0, 0.0, 0.0],
+    ]
+    cells, materials, paths = locate_problem.locate(points)
+    assert cells.tolist() == [1, 2, 4, 1, 4, 1, 2, 11, 12]
+    assert materials.tolist() == [1, 2, 3, 1, 3, 1, 2, 0, 0]
+    assert paths.tolist() == [
+        [10, 3, 1],
+        [10, 3, 2],
+        [10, 3, 4],
+        [10, 3, 1],
+        [10, 3, 4],
+        [13, 1, 0],
+        [13, 2, 0],
+        [11, 0, 0],
+        [12, 0, 0],
+    ]
+    cells, materials, paths = locate_problem.locate([0.2, 0.0, 0.0], universe=1)
+    assert cells.tolist() == [1]
+    assert paths.tolist() == [[1]]
+    cells, _, paths = locate_problem.locate([0.0, 0.0, 0.0], universe=5)
+    assert cells.tolist() == [0]
+    assert paths.shape == (1, 1)
+
+
+def test_problem_locate_matches_contains(locate_problem):
+    rng = np.random.default_rng(42)
+    points = rng.uniform(-60.0, 60.0, (2000, 3))
+    points[:1000] = rng.uniform(-2.0, 12.0, (1000, 3))
+    cells, _, paths = locate_problem.locate(points)
+    expected = np.zeros(len(points), dtype=int)
+    for cell in locate_problem.cells.where(universe=0):
+        expected[cell.contains(points)] = cell.number
+    assert (paths[:, 0] == expected).all()
+    threaded = locate_problem.locate(points, workers=3)
+    for result, other in zip((cells, _, paths), threaded):
+        assert (result == other).all()
+
+
+@pytest.mark.parametrize(
+    "args, error",
+    [
+        (([0.0, 0.0],), ValueError),
+        (("hi",), TypeError),
+        (([0.0, 0.0, 0.0], "0"), TypeError),
+        (([0.0, 0.0, 0.0], 0, 1.5), TypeError),
+        (([0.0, 0.0, 0.0], 0, 0), ValueError),
+    ],
+)
+def test_problem_locate_bad(locate_problem, args, error):
+    with pytest.raises(error):
+        locate_problem.locate(*args)
+
+
+def test_problem_locate_lattice_bad():
+    problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+    # hexagonal lattices need 6 or 8 planes
+    problem.cells[3].lattice_type = montepy.data_inputs.lattice.LatticeType.HEXAGONAL
+    with pytest.raises(NotImplementedError):
+        problem.locate([0.0, 0.0, 0.0])
+    problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+    problem.cells[3].geometry &= -problem.surfaces[6]
+    with pytest.raises(NotImplementedError):
+        problem.locate([0.0, 0.0, 0.0])
+
+
+HEX_LATTICE = """Hexagonal lattice test problem
+4 3 -1.0 -16 u=3 imp:n=1
+5 0 16 u=3 imp:n=1
+7 2 -1.0 -16 u=5 imp:n=1
+8 0 16 u=5 imp:n=1
+3 0 -1 2 -3 4 -5 6 u=2 lat=2 imp:n=1 fill=-1:1 -1:1 0:0 3 3 3 3 3 5 5 5 3
+10 0 -10 fill=2 imp:n=1
+11 0 10 imp:n=0
+
+1 PX 1
+2 PX -1
+3 P 0.5 0.8660254037844386 0 1
+4 P 0.5 0.8660254037844386 0 -1
+5 P -0.5 0.8660254037844386 0 1
+6 P -0.5 0.8660254037844386 0 -1
+10 RPP -3 3 -3 3 -5 5
+16 SO 5
+
+m2 1001.80c 2 8016.80c 1
+m3 6000.80c 1
+"""
+
+HEX_STEPS = np.array([[2.0, 0.0, 0.0], [1.0, np.sqrt(3), 0.0]])
+
+
+@pytest.fixture
+def hex_problem():
+    return montepy.read_input(io.StringIO(HEX_LATTICE))
+
+
+def test_problem_locate_hexagonal(hex_problem):
+    # the elements past the first, third, and fifth surfaces are filled by universe 5
+    points = np.array(
+        [
+            [0.0, 0.0, 0.0],
+            [0.95, 0.0, 0.0],
+            [1.05, 0.0, 0.0],
+            [0.5, 0.8, 0.0],
+            [0.5, 0.9, 0.0],
+            [-0.5, 0.9, 0.0],
+            [1.0, -np.sqrt(3), 0.0],
+        ]
+    )
+    _, materials, paths = hex_problem.locate(points)
+    assert materials.tolist() == [3, 3, 2, 3, 2, 2, 3]
+    assert paths[:, 2].tolist() == [4, 4, 7, 4, 7, 7, 4]
+    # every point is in the element with the nearest center
+    points = np.random.default_rng(0).uniform([-3, -3, -2], [3, 3, 2], (5000, 3))
+    elements = np.array([(i, j) for i in range(-4, 5) for j in range(-4, 5)])
+    centers = elements @ HEX_STEPS[:, :2]
+    distances = np.linalg.norm(points[:, np.newaxis, :2] - centers, axis=2)
+    nearest = elements[np.argmin(distances, axis=1)]
+    filled = [(1, 0), (0, 1), (-1, 1)]
+    expected = [
+        0 if np.any(np.abs(index) > 1) else 2 if tuple(index) in filled else 3
+        for index in nearest.tolist()
+    ]
+    np.testing.assert_array_equal(hex_problem.locate(points)[1], expected)
+
+
+@pytest.mark.filterwarnings("ignore::montepy.exceptions.LineExpansionWarning")
+@pytest.mark.parametrize("single", [False, True])
+def test_problem_flatten_universes_hexagonal(single):
+    deck = HEX_LATTICE
+    if single:
+        deck = deck.replace("fill=-1:1 -1:1 0:0 3 3 3 3 3 5 5 5 3", "fill=5")
+    problem = montepy.read_input(io.StringIO(deck))
+    points = np.random.default_rng(0).uniform([-3, -3, -2], [3, 3, 2], (5000, 3))
+    replaced = _flatten_and_compare(problem, points)
+    if not single:
+        # 9 lattice elements, each filled by 2 cells
+        assert len(replaced[10]) == 18
+
+
+def test_problem_bounding_boxes(locate_problem):
+    numbers, boxes = locate_problem.bounding_boxes()
+    assert numbers.tolist() == [cell.number for cell in locate_problem.cells]
+    assert boxes.shape == (len(numbers), 2, 3)
+    for cell, box in zip(locate_problem.cells, boxes):
+        np.testing.assert_array_equal(box, cell.bounding_box())
+    np.testing.assert_allclose(boxes[-1], [[9.0, -1.0, -1.0], [11.0, 1.0, 1.0]])
+    cells = [locate_problem.cells[11], locate_problem.cells[4]]
+    numbers, boxes = locate_problem.bounding_boxes(cells)
+    assert numbers.tolist() == [11, 4]
+    np.testing.assert_allclose(boxes[0], [[-50.0] * 3, [50.0] * 3])
+
+
+def test_problem_estimate_volumes(locate_problem):
+    numbers, volumes, std_devs = locate_problem.estimate_volumes(seed=42)
+    assert numbers.tolist() == [cell.number for cell in locate_problem.cells]
+    results = dict(zip(numbers.tolist(), zip(volumes, std_devs)))
+    assert results[10] == (160.0, 0.0)
+    volume, std_dev = results[13]
+    assert abs(volume - 4 / 3 * np.pi) < 5 * std_dev
+    # cells bounded by only a cylinder, or by nothing
+    assert np.isnan(results[1][0])
+    assert np.isnan(results[12][0])
+    # repeatable no matter the number of workers
+    threaded = locate_problem.estimate_volumes(seed=42, workers=3)
+    for result, other in zip((numbers, volumes, std_devs), threaded):
+        np.testing.assert_array_equal(result, other)
+
+
+def test_problem_estimate_volumes_bounds():
+    problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+    cells = [problem.cells[1], problem.cells[2], problem.cells[13]]
+    numbers, volumes, std_devs = problem.estimate_volumes(
+        cells, seed=1, bounds=[[-1.0] * 3, [1.0] * 3], set_volumes=True
+    )
+    assert numbers.tolist() == [1, 2, 13]
+    assert abs(volumes[0] - np.pi / 2) < 5 * std_devs[0]
+    assert abs(volumes[1] - (8 - np.pi / 2)) < 5 * std_devs[1]
+    assert volumes[2] == 0.0
+    assert problem.cells[1].volume == pytest.approx(volumes[0])
+    assert problem.cells[13].volume == 0.0
+    assert problem.cells[10].volume is None
+
+
+def test_problem_estimate_volumes_rel_error(locate_problem):
+    cells = [locate_problem.cells[13]]
+    _, volumes, std_devs = locate_problem.estimate_volumes(
+        cells, samples=100, seed=3, rel_error=0.02
+    )
+    assert std_devs[0] <= 0.02 * volumes[0]
+    _, volumes, std_devs = locate_problem.estimate_volumes(
+        cells, samples=100, seed=3, rel_error=1e-6, max_samples=300
+    )
+    assert std_devs[0] > 1e-6 * volumes[0]
+
+
+@pytest.mark.parametrize(
+    "kwargs, error",
+    [
+        ({"samples": 0}, ValueError),
+        ({"samples": 1.5}, TypeError),
+        ({"workers": 0}, ValueError),
+        ({"seed": "a"}, TypeError),
+        ({"rel_error": 0.0}, ValueError),
+        ({"rel_error": "a"}, TypeError),
+        ({"max_samples": 0}, ValueError),
+        ({"max_samples": 1.5}, TypeError),
+        ({"bounds": [0.0, 1.0]}, ValueError),
+        ({"bounds": "hi"}, TypeError),
+        ({"set_volumes": 1}, TypeError),
+    ],
+)
+def test_problem_estimate_volumes_bad(locate_problem, kwargs, error):
+    with pytest.raises(error):
+        locate_problem.estimate_volumes(**kwargs)
+
+
+def test_problem_find_overlaps_gaps_clean(locate_problem):
+    assert locate_problem.find_overlaps(samples=20_000, seed=1) == {}
+    assert locate_problem.find_gaps(samples=20_000, seed=1) == {}
+    assert locate_problem.find_gaps(samples=20_000, seed=1, universe=3) == {}
+
+
+def test_problem_find_overlaps():
+    problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+    bounds = [[-5.0] * 3, [5.0] * 3]
+    problem.cells[11].geometry = -problem.surfaces[11]
+    problem.cells[13].geometry = -problem.surfaces[11]
+    overlaps = problem.find_overlaps(samples=20_000, seed=1, universe=0, bounds=bounds)
+    assert set(overlaps) == {(10, 11), (10, 13), (11, 13)}
+    for (first, second), points in overlaps.items():
+        assert points.shape[1] == 3
+        assert len(points) > 0
+        assert problem.cells[first].contains(points).all()
+        assert problem.cells[second].contains(points).all()
+    np.testing.assert_array_equal(overlaps[(10, 11)], overlaps[(10, 13)])
+    threaded = problem.find_overlaps(
+        samples=20_000, seed=1, universe=0, bounds=bounds, workers=2
+    )
+    assert set(threaded) == set(overlaps)
+    for pair, points in overlaps.items():
+        np.testing.assert_array_equal(points, threaded[pair])
+
+
+def test_problem_find_gaps():
+    problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+    problem.cells[10].geometry &= +problem.surfaces[1]
+    gaps = problem.find_gaps(samples=50_000, seed=2, bounds=[[-5.0] * 3, [5.0] * 3])
+    assert list(gaps) == [0]
+    assert len(gaps[0]) > 0
+    assert (np.hypot(gaps[0][:, 0], gaps[0][:, 1]) <= 0.5).all()
+    cells, _, _ = problem.locate(gaps[0])
+    assert (cells == 0).all()
+
+
+@pytest.mark.parametrize(
+    "kwargs, error",
+    [
+        ({"samples": 0}, ValueError),
+        ({"samples": "a"}, TypeError),
+        ({"workers": 0}, ValueError),
+        ({"seed": 1.5}, TypeError),
+        ({"universe": "a"}, TypeError),
+        ({"universe": 1}, ValueError),
+        ({"bounds": [1.0, 2.0, 3.0]}, ValueError),
+    ],
+)
+def test_problem_find_overlaps_gaps_bad(locate_problem, kwargs, error):
+    with pytest.raises(error):
+        locate_problem.find_overlaps(**kwargs)
+    with pytest.raises(error):
+        locate_problem.find_gaps(**kwargs)
+
+
+def test_problem_slice(locate_problem):
+    image = locate_problem.slice(
+        (1.0, 1.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), 4.0, 4.0, pixels=(8, 6)
+    )
+    assert image.shape == (6, 8)
+    # the top left is in lattice element (0, 1), which is filled with universe 3
+    assert image[0, 0] == 3
+    assert image[-1, 0] == 2
+    assert image[-1, -1] == 3
+    u = ((np.arange(8) + 0.5) / 8 - 0.5) * 4.0 + 1.0
+    v = (0.5 - (np.arange(6) + 0.5) / 6) * 4.0 + 1.0
+    points = np.stack(
+        [np.tile(u, 6), np.repeat(v, 8), np.zeros(48)],
+        axis=1,
+    )
+    cells, materials, _ = locate_problem.locate(points)
+    assert (image.ravel() == materials).all()
+    image = locate_problem.slice(
+        (1.0, 1.0, 0.0),
+        (1.0, 0.0, 0.0),
+        (0.0, 1.0, 0.0),
+        4.0,
+        4.0,
+        pixels=(8, 6),
+        color_by="cell",
+    )
+    assert (image.ravel() == cells).all()
+
+
+def test_problem_slice_tiles(locate_problem, monkeypatch):
+    args = ((0.0, 0.5, 0.0), (1.0, 0.0, 0.0), (0.0, 0.0, 2.0), 12.0, 8.0)
+    expected = locate_problem.slice(*args, pixels=(31, 17), color_by="cell")
+    monkeypatch.setattr(montepy.mcnp_problem, "_TILE_SIZE", 50)
+    tiled = locate_problem.slice(*args, pixels=(31, 17), color_by="cell")
+    assert (tiled == expected).all()
+    threaded = locate_problem.slice(*args, pixels=(31, 17), color_by="cell", workers=2)
+    assert (threaded == expected).all()
+
+
+@pytest.mark.parametrize(
+    "args, kwargs, error",
+    [
+        (([0.0, 0.0], [1, 0, 0], [0, 1, 0], 1.0, 1.0), {}, ValueError),
+        (("hi", [1, 0, 0], [0, 1, 0], 1.0, 1.0), {}, TypeError),
+        (([0, 0, 0], [1, 0, 0], [2, 0, 0], 1.0, 1.0), {}, ValueError),
+        (([0, 0, 0], [0, 0, 0], [0, 1, 0], 1.0, 1.0), {}, ValueError),
+        (([0, 0, 0], [1, 0, 0], [0, 1, 0], "1", 1.0), {}, TypeError),
+        (([0, 0, 0], [1, 0, 0], [0, 1, 0], 1.0, 0.0), {}, ValueError),
+        (([0, 0, 0], [1, 0, 0], [0, 1, 0], 1.0, 1.0), {"pixels": 5}, TypeError),
+        (([0, 0, 0], [1, 0, 0], [0, 1, 0], 1.0, 1.0), {"pixels": (5, 0)}, ValueError),
+        (([0, 0, 0], [1, 0, 0], [0, 1, 0], 1.0, 1.0), {"color_by": "a"}, ValueError),
+        (([0, 0, 0], [1, 0, 0], [0, 1, 0], 1.0, 1.0), {"universe": "a"}, TypeError),
+        (([0, 0, 0], [1, 0, 0], [0, 1, 0], 1.0, 1.0), {"workers": 0}, ValueError),
+    ],
+)
+def test_problem_slice_bad(locate_problem, args, kwargs, error):
+    with pytest.raises(error):
+        locate_problem.slice(*args, **kwargs)
+
+
+def test_problem_remove_duplicate_surfaces_matches_pairwise():
+    rng = np.random.default_rng(5)
+    tolerance = 1e-4
+    bases = np.array([0.0, -3e-7, 1.26, 2.5e5])
+    surfaces = []
+    for number in range(1, 301):
+        values = rng.choice(bases, size=3)
+        # scatter the constants across bucket edges, inside and outside of the tolerance
+        values = values * (1 + rng.uniform(-2, 2, size=3) * tolerance)
+        values += rng.uniform(-2e-8, 2e-8, size=3)
+        surfaces.append(
+            montepy.surfaces.surface_builder.parse_surface(
+                f"{number} C/Z " + " ".join(repr(float(value)) for value in values)
+            )
+        )
+    expected = {}
+    kept = []
+    for surf in surfaces:
+        for leader in kept:
+            if np.all(
+                np.isclose(
+                    leader.surface_constants, surf.surface_constants, rtol=tolerance
+                )
+            ):
+                expected[surf.number] = leader.number
+                break
+        else:
+            kept.append(surf)
+    matches = montepy.mcnp_problem._find_duplicate_surfaces(surfaces, tolerance)
+    assert len(expected) > 10
+    assert {num: new.number for num, (_, new) in matches.items()} == expected
+    assert all(matches[num][0].number == num for num in matches)
+
+
+def test_problem_remove_duplicate_surfaces():
+    problem = montepy.read_input("tests/inputs/test_redundant_surf.imcnp")
+    problem.surfaces[5].is_reflecting = True
+    problem.remove_duplicate_surfaces(1e-4)
+    numbers = list(problem.surfaces.numbers)
+    # boundary conditions must match
+    assert 3 in numbers
+    assert 5 in numbers
+    assert 4 not in numbers
+    assert 16 not in numbers
+    # equivalent transforms are treated as the same
+    assert 25 not in numbers
+    assert list(problem.cells[2].surfaces.numbers) == [1, 5, 6]
+    assert problem.cells[2].surfaces[1] is problem.surfaces[1]
+    with pytest.raises(KeyError):
+        problem.surfaces[4]
+    problem.remove_duplicate_surfaces(1e-4)
+    with pytest.raises(TypeError):
+        problem.remove_duplicate_surfaces("a")
+    with pytest.raises(ValueError):
+        problem.remove_duplicate_surfaces(0.0)
+
+
+def test_problem_simplify_geometry():
+    problem = montepy.read_input("tests/inputs/test_simplify.imcnp")
+    points = np.random.default_rng(3).uniform(-30.0, 30.0, (20_000, 3))
+    expected = {cell.number: cell.contains(points) for cell in problem.cells}
+    assert problem.simplify_geometry(expand_complements=True) == [1, 2, 3, 4, 5, 6]
+    for cell in problem.cells:
+        assert (cell.contains(points) == expected[cell.number]).all()
+    assert problem.simplify_geometry(cells=[problem.cells[1]]) == []
+    with pytest.raises(TypeError):
+        problem.simplify_geometry(expand_complements=1)
+
+
+def _adjacency_sets(problem):
+    numbers, indptr, indices = problem.cell_adjacency()
+    assert (np.diff(numbers) > 0).all()
+    return {
+        int(number): set(numbers[indices[indptr[idx] : indptr[idx + 1]]].tolist())
+        for idx, number in enumerate(numbers)
+    }
+
+
+def test_problem_cell_adjacency():
+    problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+    assert _adjacency_sets(problem) == {
+        1: {2},
+        2: {1},
+        3: set(),
+        4: {5},
+        5: {4},
+        10: {11},
+        11: {10, 12, 13},
+        12: {11},
+        13: {11},
+    }
+    # cells in different universes are never adjacent
+    problem.cells[5].universe = problem.universes[1]
+    assert _adjacency_sets(problem)[5] == set()
+    problem.cells[12].geometry = +problem.surfaces[11] & +problem.surfaces[20]
+    assert _adjacency_sets(problem)[13] == {11, 12}
+    problem.cells[12].geometry.right.side = False
+    assert _adjacency_sets(problem)[13] == {11}
+    del problem.cells[11]
+    adjacency = _adjacency_sets(problem)
+    assert 11 not in adjacency
+    assert adjacency[10] == set()
+    problem.cells[12].number = 14
+    assert _adjacency_sets(problem)[14] == set()
+    problem = problem.clone()
+    problem.cells[10].geometry = -problem.surfaces[10] & +problem.surfaces[20]
+    assert _adjacency_sets(problem)[13] == {10}
+
+
+def test_problem_cell_adjacency_complements():
+    problem = montepy.read_input("tests/inputs/test_simplify.imcnp")
+    adjacency = _adjacency_sets(problem)
+    # 7 is -5 #5, which is outside of 6 but inside of 5
+    assert {5, 10} <= adjacency[7]
+    assert 7 in adjacency[5]
+    assert adjacency[8] >= {1, 2, 3}
+    for number, neighbors in adjacency.items():
+        assert number not in neighbors
+        for other in neighbors:
+            assert number in adjacency[other]
+    # changes are found the same as when starting from scratch
+    problem.cells[4].geometry = -problem.surfaces[5] & +problem.surfaces[7]
+    incremental = _adjacency_sets(problem)
+    problem._adjacency = type(problem._adjacency)()
+    assert incremental == _adjacency_sets(problem)
+    # 7 complements 5
+    problem.cells[5].geometry = ~problem.cells[7]
+    with pytest.raises(montepy.exceptions.IllegalState):
+        problem.cell_adjacency()
+
+
+def _flatten_and_compare(problem, points):
+    """Flattens a problem, and checks the points are in the same materials before and after."""
+    _, materials, _ = problem.locate(points)
+    numbers = list(problem.cells.numbers)
+    stream = io.StringIO()
+    streamed = problem.flatten_universes(destination=stream)
+    # the streamed cells are not added to the problem
+    assert list(problem.cells.numbers) == numbers
+    stream.seek(0)
+    np.testing.assert_array_equal(
+        montepy.read_input(stream).locate(points)[1], materials
+    )
+    replaced = problem.flatten_universes()
+    assert replaced == streamed
+    for cell in problem.cells:
+        assert cell.universe is None or cell.universe.number == 0
+        assert cell.fill.universe is None
+        assert cell.lattice_type is None
+    np.testing.assert_array_equal(problem.locate(points)[1], materials)
+    stream = io.StringIO()
+    problem.write_problem(stream)
+    stream.seek(0)
+    np.testing.assert_array_equal(
+        montepy.read_input(stream).locate(points)[1], materials
+    )
+    return replaced
+
+
+@pytest.mark.filterwarnings("ignore::montepy.exceptions.LineExpansionWarning")
+def test_problem_flatten_universes():
+    problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+    # rotate the fill by 90 degrees around the x axis, so the transforms must be composed
+    rotation = montepy.Transform("*tr7 10 0 0 0 90 90 90 90 0 90 180 90")
+    problem.transforms.append(rotation)
+    problem.cells[13].fill.transform = rotation
+    problem.cells[1].geometry = -problem.surfaces[1] | (
+        -problem.surfaces[1] & +problem.surfaces[2]
+    )
+    points = np.random.default_rng(0).uniform([-5, -5, -6], [25, 10, 6], (5000, 3))
+    replaced = _flatten_and_compare(problem, points)
+    assert sorted(replaced) == [10, 13]
+    # 4 lattice elements, each filled by 2 cells
+    assert len(replaced[10]) == 8
+    assert len(replaced[13]) == 2
+    assert list(problem.universes.numbers) == [0]
+    assert 10 not in problem.cells.numbers
+    assert 6 not in problem.surfaces.numbers
+    assert "(" in str(problem.cells[replaced[13][0]].geometry)
+    # cells of the same universe instance share their moved surfaces
+    inside, outside = (problem.cells[number] for number in replaced[13])
+    assert set(outside.surfaces.numbers) <= set(inside.surfaces.numbers)
+
+
+@pytest.mark.filterwarnings("ignore::montepy.exceptions.LineExpansionWarning")
+def test_problem_flatten_universes_single_fill():
+    problem = montepy.read_input(io.StringIO("""pin lattice
+1 1 -10.0 -1 u=1 imp:n=1
+2 2 -1.0 1 u=1 imp:n=1
+3 0 -3 4 -5 6 lat=1 u=2 fill=1 imp:n=1
+10 0 -10 fill=2 imp:n=1
+11 0 10 imp:n=0
+
+1 CZ 0.4
+3 PX 0.5
+4 PX -0.5
+5 PY 0.5
+6 PY -0.5
+10 RPP -0.5 2.5 -0.5 1.5 -1 1
+
+m1 92235.80c 1
+m2 1001.80c 2 8016.80c 1
+"""))
+    points = np.random.default_rng(0).uniform([-1, -1, -2], [3, 2, 2], (5000, 3))
+    replaced = _flatten_and_compare(problem, points)
+    # only the 3 x 2 elements inside of cell 10 are unrolled
+    assert len(replaced[10]) == 12
+    problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+    problem.cells[3].fill.multiple_universes = False
+    problem.cells[3].fill.universe = problem.universes[1]
+    problem.cells[10].geometry = +problem.surfaces[20]
+    with pytest.raises(ValueError):
+        problem.flatten_universes()
+
+
+@pytest.mark.filterwarnings("ignore::montepy.exceptions.LineExpansionWarning")
+def test_problem_flatten_universes_complements():
+    problem = montepy.read_input(io.StringIO("""complemented cells
+1 1 -10.0 -1 u=1 imp:n=1
+2 2 -1.0 #1 u=1 imp:n=1
+10 0 -10 #13 fill=1 imp:n=1
+11 0 10 -11 #13 #14 imp:n=1
+12 0 11 imp:n=0
+13 0 -20 fill=1 (10 0 0) imp:n=1
+14 0 -30 fill=1 (-10 0 0) imp:n=1
+
+1 CZ 0.5
+10 RPP -1 3 -1 3 -5 5
+11 SO 50
+20 SX 10 1
+30 SX -10 1
+
+m1 92235.80c 1
+m2 1001.80c 2 8016.80c 1
+"""))
+    points = np.random.default_rng(0).uniform([-12, -3, -6], [12, 3, 6], (5000, 3))
+    replaced = _flatten_and_compare(problem, points)
+    assert sorted(replaced) == [10, 13, 14]
+    # the complements of the filled cells are replaced by their geometries
+    assert not any(len(cell.complements) for cell in problem.cells)
+    assert sorted(problem.cells[11].surfaces.numbers) == [10, 11, 20, 30]
+
+
+@pytest.mark.filterwarnings("ignore::montepy.exceptions.LineExpansionWarning")
+def test_problem_flatten_universes_destination(tmp_path):
+    problem = montepy.read_input(io.StringIO("""data block importances
+1 1 -10.0 -1 u=1
+2 0 1 u=1
+10 0 -10 fill=1
+11 0 10
+
+1 SO 1
+10 SO 5
+
+imp:n 1 1 1 0
+m1 92235.80c 1
+"""))
+    out = tmp_path / "flat.imcnp"
+    replaced = problem.flatten_universes(destination=out)
+    assert replaced == {10: [12, 13]}
+    assert list(problem.cells.numbers) == [1, 2, 10, 11]
+    assert problem.print_in_data_block["imp"]
+    flat = montepy.read_input(out)
+    assert list(flat.cells.numbers) == [11, 12, 13]
+    assert [cell.importance.neutron for cell in flat.cells] == [0.0, 1.0, 1.0]
+    with pytest.raises(FileExistsError):
+        problem.flatten_universes(destination=out)
+    problem.flatten_universes(destination=out, overwrite=True)
+
+
+def test_problem_flatten_universes_bad():
+    problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+    with pytest.raises(TypeError):
+        problem.flatten_universes("1")
+    with pytest.raises(ValueError):
+        problem.flatten_universes(0)
+    with pytest.raises(ValueError):
+        problem.flatten_universes(max_instances=9)
+    with pytest.raises(ValueError):
+        problem.flatten_universes(max_instances=9, destination=io.StringIO())
+    with pytest.raises(TypeError):
+        problem.flatten_universes(destination=5)
+    # nothing was changed
+    assert list(problem.cells.numbers) == [1, 2, 3, 4, 5, 10, 11, 12, 13]
+    assert len(problem.flatten_universes(max_instances=10)) == 2
+    problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+    problem.cells[4].fill.universe = problem.universes[2]
+    with pytest.raises(montepy.exceptions.IllegalState):
+        problem.flatten_universes()
+
+
+def _sorted_instances(problem, cell):
+    """Finds the instances of a cell with both methods, in the same order."""
+    records = sorted(
+        problem.iter_instances(cell), key=lambda record: (record[0], str(record[1]))
+    )
+    paths, indices, transforms = problem.instance_arrays(cell)
+    order = sorted(
+        range(len(paths)),
+        key=lambda i: (tuple(paths[i][paths[i] > 0].tolist()), str(indices[i])),
+    )
+    return records, paths[order], indices[order], transforms[order]
+
+
+def test_problem_iter_instances(locate_problem):
+    problem = copy.deepcopy(locate_problem)
+    rotation = montepy.Transform("*tr7 10 0 0 0 90 90 90 90 0 90 180 90")
+    problem.transforms.append(rotation)
+    problem.cells[13].fill.transform = rotation
+    records, paths, indices, transforms = _sorted_instances(problem, problem.cells[1])
+    assert [(path, index) for path, index, _ in records] == [
+        ((10, 3, 1), (None, (0, 0, 0), None)),
+        ((10, 3, 1), (None, (1, 1, 0), None)),
+        ((13, 1), (None, None)),
+    ]
+    np.testing.assert_array_equal(paths, [[10, 3, 1], [10, 3, 1], [13, 1, 0]])
+    np.testing.assert_array_equal(indices[:, 1], [[0, 0, 0], [1, 1, 0], [0, 0, 0]])
+    for (_, _, transform), other in zip(records, transforms):
+        np.testing.assert_allclose(transform, other)
+    np.testing.assert_allclose(transforms[2], rotation.as_matrix())
+    # the center of every instance is in the cell, through the same path
+    cells, _, located = problem.locate(transforms[:, :3, 3])
+    np.testing.assert_array_equal(cells, [1, 1, 1])
+    np.testing.assert_array_equal(located, paths)
+    # a point off of the axis of the pin is moved by the rotation
+    local = transforms @ np.array([0.3, 0.0, 0.2, 1.0])
+    assert problem.locate(local[:, :3])[0].tolist() == [1, 1, 1]
+    # cells in the real world, and cells that are not used, have one or no instances
+    assert [record[:2] for record in problem.iter_instances(problem.cells[12])] == [
+        ((12,), (None,))
+    ]
+    assert len(problem.instance_arrays(problem.cells[12])[0]) == 1
+    problem.cells[10].fill.universe = problem.universes[1]
+    assert list(problem.iter_instances(problem.cells[4])) == []
+    assert problem.instance_arrays(problem.cells[4])[0].shape == (0, 1)
+
+
+def test_problem_iter_instances_lattice(locate_problem):
+    problem = copy.deepcopy(locate_problem)
+    lattice = problem.cells[3]
+    own, pin, other = (problem.universes[number] for number in [2, 1, 3])
+    lattice.fill.universes = np.array([[[own], [pin]], [[other], [own]]])
+    records, paths, indices, transforms = _sorted_instances(problem, lattice)
+    assert [(path, index) for path, index, _ in records] == [
+        ((10, 3), (None, (0, 0, 0))),
+        ((10, 3), (None, (1, 1, 0))),
+    ]
+    np.testing.assert_array_equal(paths, [[10, 3], [10, 3]])
+    np.testing.assert_allclose(transforms[:, :3, 3], [[0, 0, 0], [2, 2, 0]])
+    assert len(list(problem.iter_instances(problem.cells[1]))) == 2
+    assert len(problem.instance_arrays(problem.cells[4])[0]) == 1
+
+
+def test_problem_iter_instances_hexagonal(hex_problem):
+    records, paths, indices, transforms = _sorted_instances(
+        hex_problem, hex_problem.cells[7]
+    )
+    assert [index[1] for _, index, _ in records] == [(-1, 1, 0), (0, 1, 0), (1, 0, 0)]
+    np.testing.assert_allclose(
+        transforms[:, :3, 3], [HEX_STEPS[1] - HEX_STEPS[0], HEX_STEPS[1], HEX_STEPS[0]]
+    )
+    cells, _, _ = hex_problem.locate(transforms[:, :3, 3])
+    assert cells.tolist() == [7, 7, 7]
+
+
+def test_problem_iter_instances_bad(locate_problem):
+    problem = copy.deepcopy(locate_problem)
+    for method in [problem.iter_instances, problem.instance_arrays]:
+        with pytest.raises(TypeError):
+            method(1)
+        with pytest.raises(ValueError):
+            method(montepy.Cell("1 0 -1"))
+    problem.cells[3].fill.multiple_universes = False
+    problem.cells[3].fill.universe = problem.universes[1]
+    with pytest.raises(ValueError):
+        problem.iter_instances(problem.cells[1])
+    with pytest.raises(ValueError):
+        problem.instance_arrays(problem.cells[1])
+    problem = copy.deepcopy(locate_problem)
+    problem.cells[4].fill.universe = problem.universes[2]
+    with pytest.raises(montepy.exceptions.IllegalState):
+        problem.instance_arrays(problem.cells[5])
+
+
+@pytest.mark.filterwarnings("ignore::montepy.exceptions.LineExpansionWarning")
+def test_problem_uniquify_materials(locate_problem):
+    problem = copy.deepcopy(locate_problem)
+    points = np.array([[0.0, 0.0, 0.0], [2.0, 2.0, 0.0], [10.2, 0.0, 0.0]])
+    found = problem.uniquify_materials(problem.universes[1])
+    assert found == {1: [1, 14, 16], 2: [2, 15, 17]}
+    instances = [number for numbers in found.values() for number in numbers]
+    materials = {id(problem.cells[number].material) for number in instances}
+    assert len(materials) == 6
+    numbers = {problem.cells[number].material.number for number in instances}
+    assert numbers == {4, 5, 6, 7, 8, 9}
+    assert len(problem.cells[14].material) == 1
+    # every instance is its own cell now
+    for number in instances:
+        assert len(list(problem.iter_instances(problem.cells[number]))) == 1
+    cells, located_materials, paths = problem.locate(points)
+    assert cells.tolist() == [14, 16, 1]
+    assert located_materials.tolist() == [
+        problem.cells[number].material.number for number in [14, 16, 1]
+    ]
+    assert problem.cells[3].fill.universe_numbers[:, :, 0].tolist() == [[4, 3], [3, 5]]
+    # the copies are written and read back the same
+    stream = io.StringIO()
+    problem.write_problem(stream)
+    stream.seek(0)
+    np.testing.assert_array_equal(
+        montepy.read_input(stream).locate(points)[1], located_materials
+    )
+    problem = copy.deepcopy(locate_problem)
+    assert problem.uniquify_materials(problem.cells[3:5], numbering="compact") == {
+        4: [4, 6]
+    }
+    assert problem.cells[6].universe.number == 4
+    assert problem.cells[6].material.number == 5
+    assert problem.cells[4].material.number == 4
+
+
+def test_problem_uniquify_materials_bad(locate_problem):
+    problem = copy.deepcopy(locate_problem)
+    with pytest.raises(TypeError):
+        problem.uniquify_materials(1)
+    with pytest.raises(TypeError):
+        problem.uniquify_materials([1])
+    with pytest.raises(ValueError):
+        problem.uniquify_materials(problem.universes[1], numbering="foo")
+    with pytest.raises(ValueError):
+        problem.uniquify_materials([montepy.Cell("1 0 -1")])
+    with pytest.raises(ValueError):
+        problem.uniquify_materials(montepy.Universe(7))
+    problem.cells[3].fill.multiple_universes = False
+    problem.cells[3].fill.universe = problem.universes[1]
+    with pytest.raises(ValueError):
+        problem.uniquify_materials(problem.universes[1])
+    # nothing was changed
+    assert list(problem.cells.numbers) == [1, 2, 3, 4, 5, 10, 11, 12, 13]
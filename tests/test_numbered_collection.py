@@ -3,12 +3,14 @@ import hypothesis
 from hypothesis import given, settings, strategies as st
 import copy
 import itertools as it
+import numpy as np
 
 import montepy
 import montepy.cells
 from montepy.exceptions import NumberConflictError
 import pytest
 import os
+import warnings
 
 
 class TestNumberedObjectCollection:
@@ -822,6 +824,237 @@ class TestNumberedObjectCollection:
         with pytest.raises(error):
             surfs.clone(*args)
 
+    def test_cells_to_arrays(_, cp_simple_problem):
+        cells = cp_simple_problem.cells
+        arr = cells.to_arrays()
+        assert len(arr) == len(cells)
+        for row, cell in zip(arr, cells):
+            assert row["number"] == cell.number
+            if cell.material:
+                assert row["material"] == cell.material.number
+                assert row["density"] == pytest.approx(cell._density)
+                assert row["is_atom_density"] == cell.is_atom_dens
+            else:
+                assert row["material"] == 0
+                assert np.isnan(row["density"])
+            assert row["universe"] == cell.universe.number
+            if cell.fill.universe:
+                assert row["fill"] == cell.fill.universe.number
+            else:
+                assert row["fill"] == -1
+            if cell.volume is None:
+                assert np.isnan(row["volume"])
+            else:
+                assert row["volume"] == pytest.approx(cell.volume)
+            for particle in cp_simple_problem.mode:
+                assert row["importance"][particle.name.lower()] == pytest.approx(
+                    cell.importance[particle]
+                )
+        arr = cells.to_arrays([montepy.Particle.NEUTRON])
+        assert arr["importance"].dtype.names == ("neutron",)
+        with pytest.raises(TypeError):
+            cells.to_arrays(["n"])
+
+    def test_cells_set_values(_, cp_simple_problem):
+        cells = cp_simple_problem.cells
+        numbers = np.array([1, 2, 3])
+        cells.set_values(
+            numbers,
+            density=np.array([1.0, 2.0, 3.0]),
+            importance={montepy.Particle.PHOTON: np.array([0.0, 0.25, 0.5])},
+            volume=np.array([4.0, 5.0, 6.0]),
+        )
+        arr = cells.to_arrays()
+        for number, dens, imp, vol in zip(
+            numbers, [1, 2, 3], [0, 0.25, 0.5], [4, 5, 6]
+        ):
+            cell = cells[number]
+            assert cell._density == pytest.approx(dens)
+            assert cell.importance.photon == pytest.approx(imp)
+            assert cell.volume == pytest.approx(vol)
+        # density types are kept
+        assert cells[1].is_atom_dens
+        assert not cells[3].is_atom_dens
+        cells.set_values(
+            [1, 3], density=[5.0, 6.0], is_atom_density=np.array([False, True])
+        )
+        assert cells[1].mass_density == pytest.approx(5.0)
+        assert cells[3].atom_density == pytest.approx(6.0)
+        # round trip
+        arr = cells.to_arrays()
+        arr["volume"][:] = 10.0
+        cells.set_values(arr["number"], volume=arr["volume"])
+        for cell in cells:
+            assert cell.volume == pytest.approx(10.0)
+        cells.set_values([])
+
+    def test_cells_set_values_bad_aggregated(_, cp_simple_problem):
+        cells = cp_simple_problem.cells
+        with pytest.raises(ValueError) as excinfo:
+            cells.set_values(
+                [1, 1000, 99],
+                density=[-1.0, 1.0, 1.0],
+                importance={montepy.Particle.NEUTRON: [np.nan, 1.0, 1.0]},
+            )
+        message = str(excinfo.value)
+        assert message.startswith("4 invalid entries")
+        for expected in [
+            "Cell 1: density",
+            "Cell 1: importance",
+            "Cell 1000",
+            "Cell 99",
+        ]:
+            assert expected in message
+        # nothing was changed
+        assert cells[1]._density == pytest.approx(20.0)
+        assert cells[1].importance.neutron == pytest.approx(1.0)
+
+    def test_cells_set_values_unchanged(_, cp_simple_problem):
+        cells = cp_simple_problem.cells
+        importance = {montepy.Particle.NEUTRON: [2.0]}
+        cells.set_values([1], importance=importance)
+        assert importance == {montepy.Particle.NEUTRON: [2.0]}
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            with pytest.raises(montepy.exceptions.ParticleTypeNotInProblem):
+                cells.set_values(
+                    [1],
+                    density=[9.0],
+                    volume=[9.0],
+                    importance={montepy.Particle.ALPHA_PARTICLE: [2.0]},
+                )
+        # nothing was changed
+        assert cells[1]._density == pytest.approx(20.0)
+        assert cells[1].volume is None
+
+    @pytest.mark.parametrize(
+        "args, kwargs, error",
+        [
+            ((["a"],), {}, TypeError),
+            (([[1]],), {}, ValueError),
+            (([1],), {"density": ["a"]}, TypeError),
+            (([1],), {"density": [1.0, 2.0]}, ValueError),
+            (([1],), {"density": [1.0], "is_atom_density": "a"}, TypeError),
+            (([1],), {"importance": [1.0]}, TypeError),
+            (([1],), {"importance": {"n": [1.0]}}, TypeError),
+            (([1],), {"volume": [[1.0]]}, ValueError),
+        ],
+    )
+    def test_cells_set_values_bad(_, cp_simple_problem, args, kwargs, error):
+        with pytest.raises(error):
+            cp_simple_problem.cells.set_values(*args, **kwargs)
+
+    def test_cells_where(_, cp_simple_problem):
+        cells = cp_simple_problem.cells
+        assert [c.number for c in cells.where(universe=0, material=2)] == [2]
+        assert [c.number for c in cells.where(material=0)] == [99, 5]
+        assert [c.number for c in cells.where()] == list(cells.numbers)
+        assert list(cells.where(universe=1000)) == []
+        material = cp_simple_problem.materials[2]
+        assert [c.number for c in cells.where(material=material)] == [2]
+        universe = cp_simple_problem.universes[0]
+        assert list(cells.where(universe=universe)) == [
+            cell for cell in cells if cell.universe is universe
+        ]
+        # the indexes are updated on changes
+        cells[3].material = material
+        assert [c.number for c in cells.where(material=2)] == [2, 3]
+        del cells[3].material
+        assert [c.number for c in cells.where(material=0)] == [3, 99, 5]
+        material.number = 20
+        assert [c.number for c in cells.where(material=20)] == [2]
+        new_universe = montepy.Universe(5)
+        cells[2].universe = new_universe
+        assert [c.number for c in cells.where(universe=5)] == [2]
+        cell = cells[2].clone()
+        cells.append(cell)
+        assert cell in list(cells.where(universe=5, material=20))
+        cells.remove(cell)
+        assert [c.number for c in cells.where(universe=5)] == [2]
+        cells.clear()
+        assert list(cells.where(material=0)) == []
+
+    def test_cells_where_index_scope(_, cp_simple_problem):
+        cells = cp_simple_problem.cells
+        other = copy.deepcopy(cp_simple_problem)
+        list(cells.where(material=2))
+        list(other.cells.where(material=2))
+        assert "material" in cells._indexes
+        # changing another problem does not drop this problem's indexes
+        other.cells[3].material = other.materials[2]
+        other.cells[2].number = 20
+        assert "material" in cells._indexes
+        assert "material" not in other.cells._indexes
+        assert [c.number for c in other.cells.where(material=2)] == [20, 3]
+        assert [c.number for c in cells.where(material=2)] == [2]
+        # moving objects to another collection drops the old indexes
+        subset = montepy.Cells([cells[1], cells[2]])
+        assert "material" not in cells._indexes
+        assert [c.number for c in cells.where(material=2)] == [2]
+        assert "material" in cells._indexes
+        # a collection that does not own its objects is not told of changes
+        loose = montepy.Cells(cells.objects)
+        subset.append(montepy.Cell(number=50))
+        list(subset.where(material=2))
+        assert "material" not in subset._indexes
+        cells[1].material = cp_simple_problem.materials[2]
+        assert [c.number for c in subset.where(material=2)] == [1, 2]
+        assert [c.number for c in loose.where(material=2)] == [1, 2]
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"universe": "a"}, {"material": 1.0}, {"material": montepy.Cell()}]
+    )
+    def test_cells_where_bad(_, cp_simple_problem, kwargs):
+        with pytest.raises(TypeError):
+            cp_simple_problem.cells.where(**kwargs)
+
+    def test_cells_to_arrays_lattice(_):
+        problem = montepy.read_input(
+            os.path.join("tests", "inputs", "test_universe.imcnp")
+        )
+        arr = problem.cells.to_arrays()
+        for row, cell in zip(arr, problem.cells):
+            assert row["fill_lattice"] == cell.fill.multiple_universes
+        assert len(montepy.Cells().to_arrays()) == 0
+
+    def test_surfaces_to_arrays(_, cp_simple_problem):
+        surfs = cp_simple_problem.surfaces
+        surfs[1000].is_reflecting = True
+        surfs[1005].is_white_boundary = True
+        arr = surfs.to_arrays()
+        width = max(len(surf.surface_constants) for surf in surfs)
+        assert arr["constants"].shape == (len(surfs), width)
+        for row, surf in zip(arr, surfs):
+            assert row["number"] == surf.number
+            assert row["type"] == surf.surface_type.value
+            length = len(surf.surface_constants)
+            assert list(row["constants"][:length]) == surf.surface_constants
+            assert np.all(np.isnan(row["constants"][length:]))
+            assert row["is_reflecting"] == surf.is_reflecting
+            assert row["is_white_boundary"] == surf.is_white_boundary
+            assert row["transform"] == (surf.transform.number if surf.transform else -1)
+        assert len(montepy.Surfaces().to_arrays()) == 0
+
+    def test_materials_to_arrays(_, cp_simple_problem):
+        mats = cp_simple_problem.materials
+        arrays = mats.to_arrays()
+        assert len(arrays["offsets"]) == len(mats) + 1
+        for i, mat in enumerate(mats):
+            assert arrays["number"][i] == mat.number
+            assert arrays["is_atom_fraction"][i] == mat.is_atom_fraction
+            comps = slice(arrays["offsets"][i], arrays["offsets"][i + 1])
+            for zaid, library, fraction, (nuclide, frac) in zip(
+                arrays["zaid"][comps],
+                arrays["library"][comps],
+                arrays["fraction"][comps],
+                mat,
+            ):
+                assert zaid == nuclide.ZAID
+                assert library == str(nuclide.library)
+                assert fraction == pytest.approx(frac)
+        arrays = montepy.Materials().to_arrays()
+        assert list(arrays["offsets"]) == [0]
+
 
 class TestMaterials:
 
@@ -882,6 +1115,126 @@ class TestMaterials:
         with pytest.raises(TypeError):
             next(m0_prob.materials.get_containing_any(m0_prob))
 
+    @pytest.mark.parametrize(
+        "nuclide, threshold, strict",
+        [
+            ("H-1", 0.0, False),
+            ("H-1", 0.0, True),
+            ("H-1.80c", 0.0, True),
+            ("H", 0.0, False),
+            (montepy.Element(92), 0.0, False),
+            (montepy.Nucleus(montepy.Element(92), 235), 0.0, False),
+            ("U-235", 0.5, False),
+            ("B", 0.0, False),
+            (26054, 0.0, False),
+        ],
+    )
+    def test_containing(_, m0_prob, nuclide, threshold, strict):
+        expected = list(
+            m0_prob.materials.get_containing_any(
+                nuclide, threshold=threshold, strict=strict
+            )
+        )
+        actual = list(
+            m0_prob.materials.containing(nuclide, threshold=threshold, strict=strict)
+        )
+        assert actual == expected
+
+    def test_containing_updates(_, cp_m0_prob):
+        mats = cp_m0_prob.materials
+        assert list(mats.containing("Pu-239")) == []
+        mat = mats[1]
+        mat.add_nuclide("Pu-239.80c", 0.1)
+        assert list(mats.containing("Pu-239")) == [mat]
+        assert list(mats.containing("Pu-239", threshold=0.2)) == []
+        del mat[-1]
+        assert list(mats.containing("Pu-239")) == []
+        mat.add_nuclide("Pu-239.80c", 0.1)
+        mat[-1] = (montepy.Nuclide("Pu-240.80c"), 0.1)
+        assert list(mats.containing("Pu-239")) == []
+        assert list(mats.containing("Pu-240")) == [mat]
+        new_mat = montepy.Material(number=1000)
+        new_mat.add_nuclide("Pu-239", 1.0)
+        mats.append(new_mat)
+        assert list(mats.containing("Pu-239")) == [new_mat]
+        mats.remove(new_mat)
+        assert list(mats.containing("Pu-239")) == []
+
+    @pytest.mark.parametrize(
+        "nuclides, threshold, strict",
+        [
+            (("U-235", "H-1"), 0.0, False),
+            (("U-235", "U-238"), 0.0, False),
+            (("U", "H-1.80c"), 0.0, True),
+            (("26054", "Fe"), 0.1, False),
+        ],
+    )
+    def test_get_containing_matches_materials(_, m0_prob, nuclides, threshold, strict):
+        materials = m0_prob.materials
+        for bool_func, func in (
+            ("contains_any", materials.get_containing_any),
+            ("contains_all", materials.get_containing_all),
+        ):
+            expected = [
+                mat
+                for mat in materials
+                if getattr(mat, bool_func)(
+                    *nuclides, threshold=threshold, strict=strict
+                )
+            ]
+            assert list(func(*nuclides, threshold=threshold, strict=strict)) == expected
+        assert list(materials.get_containing_any()) == []
+        assert list(materials.get_containing_all()) == list(materials)
+
+    def test_get_containing_index_updates(_, cp_m0_prob):
+        mats = cp_m0_prob.materials
+        mat = mats[1]
+        assert mat not in list(mats.get_containing_any("Pu-239"))
+        mat.add_nuclide("Pu-239.80c", 0.1)
+        assert list(mats.get_containing_any("Pu-239")) == [mat]
+        mat[-1] = (montepy.Nuclide("Pu-240.80c"), 0.1)
+        assert list(mats.get_containing_any("Pu-239")) == []
+        assert list(mats.get_containing_all("Pu-240", "Pu")) == [mat]
+        del mat[-1]
+        assert list(mats.get_containing_any("Pu")) == []
+        # library changes are found
+        mat.add_nuclide("Pu-239.80c", 0.1)
+        assert list(mats.get_containing_any("Pu-239.80c", strict=True)) == [mat]
+        mat.change_libraries("00c")
+        assert list(mats.get_containing_any("Pu-239.80c", strict=True)) == []
+        assert list(mats.get_containing_any("Pu-239.00c", strict=True)) == [mat]
+        # clones are not added to the original index
+        clone = copy.deepcopy(cp_m0_prob)
+        clone.materials[1].add_nuclide("Am-241.80c", 0.1)
+        assert list(mats.get_containing_any("Am-241")) == []
+        assert list(clone.materials.get_containing_any("Am-241")) == [
+            clone.materials[1]
+        ]
+        # removed materials are not found
+        mats.remove(mat)
+        assert list(mats.get_containing_any("Pu")) == []
+        mat.add_nuclide("Am-241.80c", 0.1)
+        assert list(mats.get_containing_any("Am")) == []
+        mats.append(mat)
+        assert list(mats.get_containing_any("Am")) == [mat]
+        mats &= mats[2:]
+        assert list(mats.get_containing_any("Am")) == []
+        mats.clear()
+        assert list(mats.get_containing_any("H")) == []
+
+    @pytest.mark.parametrize(
+        "args, kwargs, error",
+        [
+            ((1.0,), {}, TypeError),
+            (("H-1",), {"threshold": "a"}, TypeError),
+            (("H-1",), {"threshold": -1.0}, ValueError),
+            (("H-1",), {"strict": 1}, TypeError),
+        ],
+    )
+    def test_containing_bad(_, m0_prob, args, kwargs, error):
+        with pytest.raises(error):
+            m0_prob.materials.containing(*args, **kwargs)
+
     @pytest.fixture
     def h2o(_):
         mat = montepy.Material()
@@ -996,3 +1349,74 @@ class TestMaterials:
             assert new_mat.number == starting_num
         else:
             assert (new_mat.number - starting_num) % step == 0
+
+    @pytest.mark.parametrize(
+        "args, error, use_fixture",
+        [
+            (("hi", [[1]]), TypeError, False),
+            (([], [[1]]), ValueError, False),
+            ((["h2o", "mass_h2o"], [[1, 2]]), ValueError, True),  # mismatch is_atom
+            ((["h2o", "boric_acid"], [[1.0]]), ValueError, True),  # mismatch shape
+            ((["h2o", "boric_acid"], [1.0, 2.0]), ValueError, True),
+            ((["h2o", "boric_acid"], [["hi", "hi"]]), TypeError, True),
+            ((["h2o", "boric_acid"], [[-1.0, 2.0]]), ValueError, True),
+            ((["h2o", "boric_acid"], [[np.nan, 2.0]]), ValueError, True),
+            ((["h2o", "boric_acid"], [[1.0, 2.0]], "hi"), TypeError, True),
+            ((["h2o", "boric_acid"], [[1.0, 2.0]], False, -1), ValueError, True),
+            ((["h2o", "boric_acid"], [[1.0, 2.0]], False, 1, "hi"), TypeError, True),
+        ],
+    )
+    def test_mix_many_bad(_, mats_dict, args, error, use_fixture):
+        if use_fixture:
+            args = ([mats_dict[mat] for mat in args[0]],) + args[1:]
+        mats = montepy.Materials()
+        with pytest.raises(error):
+            mats.mix_many(*args)
+        assert len(mats) == 0
+
+    @pytest.mark.parametrize("atom", [True, False])
+    def test_mix_many(_, h2o, boric_acid, atom):
+        h2o.is_atom_fraction = atom
+        boric_acid.is_atom_fraction = atom
+        parents = [h2o, boric_acid]
+        old_fractions = [mat.fractions.copy() for mat in parents]
+        mats = montepy.Materials(list(parents))
+        boron_conc = np.array([0.0, 10.0, 1000.0]) * 1e-6
+        fraction_matrix = np.column_stack([1 - boron_conc, boron_conc])
+        new_mats = mats.mix_many(parents, fraction_matrix, starting_number=2)
+        assert [mat.number for mat in new_mats] == [3, 4, 5]
+        assert all(mat in mats for mat in new_mats)
+        # the materials to mix are not changed
+        for mat, fractions in zip(parents, old_fractions):
+            np.testing.assert_array_equal(mat.fractions, fractions)
+        # zero fractions are left out
+        assert [str(nuclide) for nuclide in new_mats[0].nuclides] == [
+            str(nuclide) for nuclide in h2o.nuclides
+        ]
+        for row, new_mat in zip(fraction_matrix[1:], new_mats[1:]):
+            assert new_mat.is_atom_fraction == atom
+            # the same nuclides are merged
+            assert len(new_mat) == 4
+            assert new_mat.fractions.sum() == pytest.approx(1.0)
+            expected = mats.mix(parents, row.tolist())
+            for nuclide, fraction in new_mat:
+                assert all(
+                    nuclide is not nuc for par in parents for nuc in par.nuclides
+                )
+                assert fraction == pytest.approx(
+                    sum(frac for nuc, frac in expected if nuc == nuclide)
+                )
+            new_mat.format_for_mcnp_input((6, 3, 0))
+
+    def test_mix_many_libraries(_, h2o):
+        other = montepy.Material(number=2)
+        other.add_nuclide("1001.00c", 1.0)
+        mats = montepy.Materials([h2o, other])
+        new_mat = mats.mix_many([h2o, other], [[1.0, 1.0]])[0]
+        assert len(new_mat) == 3
+        new_mat = mats.mix_many([h2o, other], [[1.0, 1.0]], merge_libraries=True)[0]
+        assert [nuclide.mcnp_str() for nuclide in new_mat.nuclides] == [
+            "1001.80c",
+            "8016.80c",
+        ]
+        assert new_mat.values[0] == pytest.approx(2.0 / 3.0 + 1.0)
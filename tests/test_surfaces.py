@@ -1,5 +1,6 @@
 # Copyright 2024-2025, Battelle Energy Alliance, LLC All Rights Reserved.
 import io
+import numpy as np
 from pathlib import Path
 import pytest
 
@@ -1329,3 +1330,427 @@ def test_find_duplicate_surfaces():
 def test_surface_deprecation(Class):
     with pytest.warns(DeprecationWarning):
         Class(number=5)
+
+
+EVAL_POINTS = [[0.0, 0.0, 0.0], [0.5, 0.5, 0.5], [2.0, 0.0, 0.0], [0.0, 0.0, 3.0]]
+
+
+@pytest.mark.parametrize(
+    "surf_str, expected",
+    [
+        ("1 PZ 1", [-1, -1, -1, 1]),
+        ("1 CZ 1", [-1, -1, 1, -1]),
+        ("1 C/Z 2 0 1", [1, 1, -1, 1]),
+        ("1 SO 1", [-1, -1, 1, 1]),
+        ("1 SX 2 1", [1, 1, -1, 1]),
+        ("1 S 0 0 3 1", [1, 1, 1, -1]),
+        ("1 P 0 0 1 1", [-1, -1, -1, 1]),
+        ("1 P 0 0 1 1 0 1 0 1 1", [-1, -1, -1, 1]),
+        ("1 KZ 0 1", [0, 1, 1, -1]),
+        ("1 KZ 0 1 -1", [0, 1, 1, 1]),
+        ("1 K/Z 0 0 4 0.1 -1", [-1, -1, 1, -1]),
+        ("1 SQ 1 1 1 0 0 0 -1 0 0 3", [1, 1, 1, -1]),
+        ("1 GQ 1 1 1 0 0 0 0 0 0 -1", [-1, -1, 1, 1]),
+        ("1 GQ 0 0 0 0 0 0 0 0 1 -1", [-1, -1, -1, 1]),
+        ("1 Z 1 2", [-1, -1, -1, 1]),
+        ("1 X 1 2 1 5", [-1, -1, 1, -1]),
+        ("1 Z 1 1.5 3 1.5", [-1, -1, 1, -1]),
+        ("1 Z 1 1 2 2", [0, 1, 1, -1]),
+        ("1 Z 1 2 2 1", [-1, -1, -1, 0]),
+        ("1 Y -1.5 0 0 1.5 1.5 0", [-1, -1, 1, 1]),
+        ("1 TZ 0 0 0 2 0.5 0.5", [1, 1, -1, 1]),
+        ("1 TX 0 0 0 2 3 0.5", [1, 1, 1, 1]),
+        ("1 TZ 0 0 3 2 0.5 1.5", [1, 1, 1, 1]),
+        ("1 BOX -1 -1 -1 2 0 0 0 2 0 0 0 2", [-1, -1, 1, 1]),
+        ("1 RPP -1 1 -1 1 -1 1", [-1, -1, 1, 1]),
+        ("1 SPH 0 0 0 1", [-1, -1, 1, 1]),
+        ("1 RCC 0 0 -1 0 0 2 1", [-1, -1, 1, 1]),
+        ("1 RHP 0 0 -1 0 0 2 1 0 0 0 0 0 0 0 0", [-1, -1, 1, 1]),
+        ("1 RHP 0 0 -1 0 0 2 1 0 0 0.5 0.866 0 -0.5 0.866 0", [-1, -1, 1, 1]),
+        ("1 REC 0 0 -1 0 0 2 3 0 0 0 1 0", [-1, -1, -1, 1]),
+        ("1 TRC 0 0 -1 0 0 2 1 0.5", [-1, 1, 1, 1]),
+        ("1 ELL 0 0 -0.5 0 0 0.5 1", [-1, -1, 1, 1]),
+        ("1 ELL 0 0 0 0 0 4 -0.6", [-1, 1, 1, -1]),
+        ("1 WED -1 -1 -1 5 0 0 0 5 0 0 0 2", [-1, -1, -1, 1]),
+        (
+            "1 ARB -1 -1 -1 1 -1 -1 1 1 -1 -1 1 -1 -1 -1 1 1 -1 1 1 1 1 -1 1 1 "
+            "1234 5678 1265 2376 3487 4158",
+            [-1, -1, 1, 1],
+        ),
+    ],
+)
+def test_surface_sense(surf_str, expected):
+    surf = surface_builder(surf_str)
+    sense = surf.sense(EVAL_POINTS)
+    assert sense.dtype == np.int8
+    assert sense.tolist() == expected
+    values = surf.evaluate(EVAL_POINTS)
+    assert values.shape == (len(EVAL_POINTS),)
+    assert np.sign(values).tolist() == expected
+
+
+def test_surface_evaluate_values():
+    surf = surface_builder("1 S 1 2 3 2")
+    assert surf.evaluate([1.0, 2.0, 3.0]).tolist() == [-4.0]
+    np.testing.assert_allclose(
+        surf.evaluate([[3.0, 2.0, 3.0], [1.0, 2.0, 6.0]]), [0.0, 5.0]
+    )
+    # the generic classes use the same equations
+    surf = Surface("1 CZ 2")
+    np.testing.assert_allclose(surf.evaluate([[1.0, 1.0, 5.0]]), [-2.0])
+    surf = Surface("1 SQ 1 2 3 1 1 1 -1 1 2 3")
+    np.testing.assert_allclose(surf.evaluate([[2.0, 3.0, 4.0]]), [11.0])
+    surf = Surface("1 GQ 1 2 3 4 5 6 7 8 9 10")
+    np.testing.assert_allclose(surf.evaluate([[1.0, 1.0, 1.0]]), [55.0])
+
+
+ROTATED_POINTS = [[0.0, 0.5, 5.0], [0.5, 0.0, 5.0], [0.0, -0.5, 5.0]]
+
+
+@pytest.mark.parametrize(
+    "surf_str, tr_str, points, expected",
+    [
+        ("1 1 SO 1", "TR1 0 0 5", [[0.0, 0.0, 5.5], [0.0, 0.0, 0.0]], [-1, 1]),
+        ("1 1 PX 0.25", "TR1 0 0 5 0 1 0 -1 0 0 0 0 1", ROTATED_POINTS, [1, -1, -1]),
+        (
+            "1 1 PX 0.25",
+            "*TR1 0 0 5 90 0 90 180 90 90 90 90 0",
+            ROTATED_POINTS,
+            [1, -1, -1],
+        ),
+        ("1 1 PX 0.25", "TR1 0 0 5 0 1 0 -1 0 0", ROTATED_POINTS, [1, -1, -1]),
+        ("1 1 PX 0.25", "TR1 0 0 5 0 1 0 -1 0", ROTATED_POINTS, [1, -1, -1]),
+        ("1 1 PX 0.25", "TR1 0 0 5 0 1 0", ROTATED_POINTS, [1, -1, -1]),
+        ("1 1 X 0.25 1", "TR1 0 0 5 0 1 0", ROTATED_POINTS, [1, -1, -1]),
+        (
+            "1 1 SO 1",
+            "TR1 0 0 5 1 0 0 0 1 0 0 0 1 -1",
+            [[0.0, 0.0, -5.0], [0.0, 0.0, 0.0]],
+            [-1, 1],
+        ),
+    ],
+)
+def test_surface_evaluate_transform(surf_str, tr_str, points, expected):
+    surf = surface_builder(surf_str)
+    surf.update_pointers([], [montepy.data_inputs.data_parser.parse_data(tr_str)])
+    assert surf.sense(points).tolist() == expected
+
+
+def test_surface_evaluate_bad():
+    surf = surface_builder("1 SO 1")
+    with pytest.raises(TypeError):
+        surf.evaluate("hi")
+    with pytest.raises(TypeError):
+        surf.evaluate([["a", "b", "c"]])
+    with pytest.raises(ValueError):
+        surf.evaluate([[1.0, 2.0]])
+    with pytest.raises(ValueError):
+        surf.evaluate(np.zeros((2, 3, 3)))
+    with pytest.raises(IllegalState):
+        surface_builder("1 X 1 2 1 3 2 4").evaluate([0.0, 0.0, 0.0])
+    with pytest.raises(IllegalState):
+        surface_builder("1 X 1 2 3").evaluate([0.0, 0.0, 0.0])
+    with pytest.raises(IllegalState):
+        ZPlane(number=1).evaluate([0.0, 0.0, 0.0])
+    with pytest.raises(IllegalState):
+        Surface(number=1).evaluate([0.0, 0.0, 0.0])
+
+
+INF = np.inf
+
+
+@pytest.mark.parametrize(
+    "surf_str, side, expected",
+    [
+        ("1 PZ 1", False, [[-INF, -INF, -INF], [INF, INF, 1.0]]),
+        ("1 PZ 1", True, [[-INF, -INF, 1.0], [INF, INF, INF]]),
+        ("1 P 0 -2 0 1", False, [[-INF, -0.5, -INF], [INF, INF, INF]]),
+        ("1 P 1 1 0 1", False, [[-INF] * 3, [INF] * 3]),
+        ("1 C/Y 1 2 3", False, [[-2.0, -INF, -1.0], [4.0, INF, 5.0]]),
+        ("1 C/Y 1 2 3", True, [[-INF] * 3, [INF] * 3]),
+        ("1 SY 2 1", False, [[-1.0, 1.0, -1.0], [1.0, 3.0, 1.0]]),
+        ("1 KZ 0 1", False, [[-INF] * 3, [INF] * 3]),
+        ("1 SQ 1 4 1 0 0 0 -4 1 0 0", False, [[-1.0, -1.0, -2.0], [3.0, 1.0, 2.0]]),
+        ("1 SQ 1 4 1 0 0 0 4 1 0 0", False, [[INF] * 3, [-INF] * 3]),
+        ("1 TX 1 0 0 2 0.5 1", False, [[0.5, -3.0, -3.0], [1.5, 3.0, 3.0]]),
+        ("1 RPP -1 1 -2 2 -3 3", False, [[-1.0, -2.0, -3.0], [1.0, 2.0, 3.0]]),
+        ("1 RPP -1 1 -2 2 -3 3", True, [[-INF] * 3, [INF] * 3]),
+        ("1 BOX 0 0 0 1 1 0 -1 1 0 0 0 2", False, [[-1.0, 0.0, 0.0], [1.0, 2.0, 2.0]]),
+        ("1 RCC 0 0 0 0 0 2 1", False, [[-1.0, -1.0, 0.0], [1.0, 1.0, 2.0]]),
+        ("1 TRC 0 0 0 0 0 2 1 0.5", False, [[-1.0, -1.0, 0.0], [1.0, 1.0, 2.0]]),
+        ("1 ELL 0 0 0 0 0 4 -1", False, [[-1.0, -1.0, -4.0], [1.0, 1.0, 4.0]]),
+        ("1 ELL 0 0 -3 0 0 3 5", False, [[-4.0, -4.0, -5.0], [4.0, 4.0, 5.0]]),
+        ("1 WED 0 0 0 2 0 0 0 3 0 0 0 1", False, [[0.0, 0.0, 0.0], [2.0, 3.0, 1.0]]),
+        ("1 X 1 2", False, [[-INF] * 3, [1.0, INF, INF]]),
+        ("1 Y 1 2 3 2", False, [[-2.0, -INF, -2.0], [2.0, INF, 2.0]]),
+        ("1 Z 0 0 2 2", False, [[-INF] * 3, [INF] * 3]),
+        ("1 Z -1 0 1 1 3 0", False, [[-1.0, -1.0, -1.0], [1.0, 1.0, 3.0]]),
+        ("1 Z -1 0 1 1 3 0", True, [[-INF] * 3, [INF] * 3]),
+    ],
+)
+def test_surface_bounding_box(surf_str, side, expected):
+    box = surface_builder(surf_str).bounding_box(side)
+    assert box.shape == (2, 3)
+    np.testing.assert_allclose(box, expected)
+
+
+@pytest.mark.parametrize(
+    "surf_str",
+    [
+        "1 C/Z 2 0 1",
+        "1 S 0 0 3 1",
+        "1 SQ 1 2 3 0.5 0 -1 -1 0 0 3",
+        "1 SQ -1 -2 -3 0.5 0 -1 1 0 0 3",
+        "1 TY 0 0 3 2 0.5 1.5",
+        "1 BOX -1 -1 -1 2 1 0 -1 2 0 0 0 2",
+        "1 SPH 0 1 0 1",
+        "1 RCC 0 0 -1 1 1 2 1",
+        "1 RHP 0 0 -1 0 0 2 1 0 0 0 0 0 0 0 0",
+        "1 RHP 0 0 -1 0 0 2 1 0 0 0.5 0.866 0 -0.5 0.866 0",
+        "1 REC 0 0 -1 0 0 2 3 0 0 0 1 0",
+        "1 TRC 0 0 -1 1 0 2 1 0.5",
+        "1 ELL 0 0 -0.5 0 1 0.5 2",
+        "1 ELL 0 0 0 1 0 4 -0.6",
+        "1 WED -1 -1 -1 5 0 1 0 5 0 0 0 2",
+        "1 ARB -1 -1 -1 1 -1 -1 1 1 -1 -1 1 -1 -1 -1 1 1 -1 1 1 1 1 -1 1 1 "
+        "1234 5678 1265 2376 3487 4158",
+    ],
+)
+@pytest.mark.parametrize(
+    "tr_str", [None, "*TR1 1 2 3 30 60 90 120 30 90", "TR1 1 2 3 0 1 0 -1 0 0 0 0 1 -1"]
+)
+def test_surface_bounding_box_contains(surf_str, tr_str):
+    surf = surface_builder(surf_str)
+    if tr_str:
+        surf.transform = montepy.data_inputs.data_parser.parse_data(tr_str)
+    points = np.random.default_rng(0).uniform(-8.0, 8.0, (20000, 3))
+    values = surf.evaluate(points)
+    for side, inside in [(False, values < 0.0), (True, values > 0.0)]:
+        low, high = surf.bounding_box(side)
+        assert np.all((points[inside] >= low - 1e-9) & (points[inside] <= high + 1e-9))
+
+
+def test_surface_bounding_box_transform():
+    surf = surface_builder("1 1 RPP -1 1 -2 2 -3 3")
+    surf.update_pointers(
+        [], [montepy.data_inputs.data_parser.parse_data("TR1 0 0 5 0 1 0 -1 0 0")]
+    )
+    np.testing.assert_allclose(
+        surf.bounding_box(), [[-2.0, -1.0, 2.0], [2.0, 1.0, 8.0]], atol=1e-12
+    )
+    # infinite bounds are only spread along the axes they are rotated onto
+    surf = surface_builder("1 1 PX 1")
+    surf.update_pointers(
+        [], [montepy.data_inputs.data_parser.parse_data("TR1 0 0 5 0 1 0 -1 0 0")]
+    )
+    np.testing.assert_allclose(
+        surf.bounding_box(), [[-INF, -INF, -INF], [INF, 1.0, INF]], atol=1e-12
+    )
+
+
+def test_surface_bounding_box_cache():
+    surf = surface_builder("1 SO 1")
+    box = surf.bounding_box()
+    box[0] = 0.0
+    np.testing.assert_allclose(surf.bounding_box(), [[-1.0] * 3, [1.0] * 3])
+    surf.radius = 2.0
+    np.testing.assert_allclose(surf.bounding_box(), [[-2.0] * 3, [2.0] * 3])
+    cached = surf._bounding_boxes[False]
+    surface_builder("2 SO 1").radius = 5.0
+    assert surf._bounding_boxes[False] is cached
+    surf.surface_constants = [3.0]
+    np.testing.assert_allclose(surf.bounding_box(), [[-3.0] * 3, [3.0] * 3])
+    transform = montepy.data_inputs.data_parser.parse_data("TR1 0 0 5")
+    surf.transform = transform
+    np.testing.assert_allclose(
+        surf.bounding_box(), [[-3.0, -3.0, 2.0], [3.0, 3.0, 8.0]]
+    )
+    transform.displacement_vector = np.array([1.0, 0.0, 0.0])
+    np.testing.assert_allclose(
+        surf.bounding_box(), [[-2.0, -3.0, -3.0], [4.0, 3.0, 3.0]]
+    )
+    del surf.transform
+    np.testing.assert_allclose(surf.bounding_box(), [[-3.0] * 3, [3.0] * 3])
+    surf = surface_builder("1 S 0 0 0 1")
+    surf.center = (1.0, 0.0, 0.0)
+    np.testing.assert_allclose(
+        surf.bounding_box(), [[0.0, -1.0, -1.0], [2.0, 1.0, 1.0]]
+    )
+
+
+def test_surface_bounding_box_bad():
+    surf = surface_builder("1 SO 1")
+    with pytest.raises(TypeError):
+        surf.bounding_box(1)
+    with pytest.raises(IllegalState):
+        ZPlane(number=1).bounding_box()
+    with pytest.raises(IllegalState):
+        Surface(number=1).bounding_box()
+
+
+@pytest.mark.filterwarnings("ignore::montepy.exceptions.LineExpansionWarning")
+@pytest.mark.parametrize(
+    "tr_str",
+    [
+        "tr1 1 -2 3",
+        "tr1 0 0 5",
+        "*tr1 1 -2 3 30 60 90 120 30 90 90 90 0",
+        "*tr1 0 0 0 90 0 90 180 90 90 90 90 0 -1",
+        # moves the origin across the planes through three points
+        "tr1 -2 0 0",
+    ],
+)
+@pytest.mark.parametrize(
+    "surf_str",
+    [
+        "PX 1.5",
+        "PY -2",
+        "PZ 3",
+        "P 1 2 3 4",
+        "P 0 0 0 1 0 0 0 1 0",
+        "P 1 0 0 0 1 0 0 0 1",
+        "P 0 0 1 1 0 1 0 1 1",
+        "SO 2",
+        "S 1 2 3 4",
+        "SX 1 2",
+        "SY 2 3",
+        "SZ -1 3",
+        "C/X 1 -1 2",
+        "C/Y 0.5 0.5 1",
+        "C/Z -1 2 3",
+        "CX 1",
+        "CY 2",
+        "CZ 1.5",
+        "K/X 1 2 3 0.5",
+        "K/Y 1 2 3 0.25",
+        "K/Z 0 0 1 1",
+        "KX 1 0.5",
+        "KY 1 0.25",
+        "KZ -1 1",
+        "X 1 2",
+        "Y -1 2 -1 3",
+        "Z 1 2 3 2",
+        "X -1 0.5 1 2 2 1",
+        "Y -2 0 0 2 2 0",
+        "SQ 1 2 3 0.5 -0.2 0.1 -4 1 2 3",
+        "GQ 1 2 3 0.1 0.2 0.3 1 2 3 -10",
+        "RPP -1 2 -3 4 -5 6",
+        "BOX 0 0 0 1 0 0 0 2 0 0 0 3",
+        "SPH 1 2 3 2",
+        "RCC 0 0 0 0 0 3 1",
+        "RHP 0 0 -1 0 0 3 1.5 0 0 -0.75 1.3 0 -0.75 -1.3 0",
+        "HEX 0 0 -1 0 0 3 0 1.5 0 1.3 0.75 0 1.3 -0.75 0",
+        "REC 0 0 -1 0 0 3 2 0 0 0 1 0",
+        "TRC 0 0 -1 0 0 3 2 1",
+        "ELL 0 0 -2 0 0 2 3",
+        "ELL 1 1 1 0 0 2 1",
+        "WED 0 0 0 1 0 0 0 1 0 0 0 1",
+        "ARB 0 0 0 2 0 0 2 2 0 0 2 0 0 0 2 2 0 2 2 2 2 0 2 2 1234 5678 1265 2376 3487 1485",
+    ],
+)
+def test_surfaces_apply_transform(surf_str, tr_str):
+    _check_apply_transform(surf_str, tr_str)
+
+
+@pytest.mark.filterwarnings("ignore::montepy.exceptions.LineExpansionWarning")
+@pytest.mark.parametrize(
+    "surf_str, tr_str",
+    [
+        ("TX 1 2 3 4 1 1", "tr1 1 -2 3"),
+        ("TY 1 2 3 4 1 1", "tr1 1 -2 3"),
+        ("TZ 1 2 3 4 1 1", "tr1 1 -2 3"),
+        ("KX 1 0.5 1", "tr1 3 0 0"),
+        ("KY 1 0.5 -1", "tr1 0 -3 0"),
+        ("K/Z 0 0 1 1 -1", "tr1 0 0 -3"),
+        ("X 1 1 3 3", "tr1 3 0 0"),
+        ("Y 1 3 3 1", "tr1 1 -2 3"),
+    ],
+)
+def test_surfaces_apply_transform_translations(surf_str, tr_str):
+    # these surfaces can only be moved along their axes, or translated
+    _check_apply_transform(surf_str, tr_str)
+
+
+def _check_apply_transform(surf_str, tr_str):
+    """Checks that moving a surface gives the same senses as giving it the transform."""
+    problem = montepy.read_input(
+        io.StringIO(f"title\n1 0 -1 imp:n=1\n2 0 1 imp:n=0\n\n1 {surf_str}\n\n")
+    )
+    transform = montepy.data_inputs.data_parser.parse_data(tr_str)
+    surf = problem.surfaces[1]
+    points = np.random.default_rng(0).uniform(-8.0, 8.0, (5000, 3))
+    surf.transform = transform
+    expected = surf.sense(points)
+    del surf.transform
+    problem.surfaces.apply_transform(transform)
+    new_surf = problem.surfaces[1]
+    assert new_surf.transform is None
+    assert np.mean(new_surf.sense(points) != expected) < 1e-3
+    # replaced surfaces are used everywhere
+    for cell in problem.cells:
+        assert cell.surfaces[1] is new_surf
+        assert all(leaf.divider is new_surf for leaf in cell.geometry._iter_leaves())
+    stream = io.StringIO()
+    problem.write_problem(stream)
+    stream.seek(0)
+    reread = montepy.read_input(stream).surfaces[1]
+    assert reread.surface_type == new_surf.surface_type
+    # the constants are rounded when they are written
+    assert np.mean(reread.sense(points) != expected) < 2e-2
+
+
+def test_surfaces_apply_transform_types():
+    problem = montepy.read_input("tests/inputs/test.imcnp")
+    old = problem.surfaces[1010]
+    transform = montepy.Transform("tr1 0 0 10")
+    problem.surfaces[1000:1025].apply_transform(transform)
+    # the RCC keeps its type
+    assert problem.surfaces[1005].surface_constants[:3] == [0.0, 1.5, 9.5]
+    assert problem.surfaces[1015].surface_type == SurfaceType.CZ
+    assert problem.surfaces[1010].surface_type == SurfaceType.S
+    assert problem.surfaces[1010] is not old
+    assert list(problem.surfaces.numbers)[:7] == [
+        1000,
+        1005,
+        1010,
+        1015,
+        1020,
+        1025,
+        2000,
+    ]
+    assert problem.surfaces[2000].location == 1.0
+    for cell in problem.cells:
+        for surf in cell.surfaces:
+            assert surf is problem.surfaces[surf.number]
+    # surfaces with a transform are moved by both
+    surf = surface_builder("1 1 PZ 0")
+    surf.update_pointers([], [montepy.data_inputs.data_parser.parse_data("TR1 0 0 5")])
+    surfaces = montepy.Surfaces([surf])
+    surfaces.apply_transform(transform)
+    assert surf.transform is None
+    assert surf.location == 15.0
+
+
+def test_surfaces_apply_transform_bad():
+    surfaces = montepy.Surfaces(
+        [surface_builder("1 PX 1"), surface_builder("2 KZ 1 0.5 1")]
+    )
+    with pytest.raises(TypeError):
+        surfaces.apply_transform("tr1 0 0 1")
+    # cones of one nappe can't be rotated
+    with pytest.raises(NotImplementedError):
+        surfaces.apply_transform(
+            montepy.Transform("*tr1 0 0 0 90 0 90 180 90 90 90 90 0")
+        )
+    # nothing was changed
+    assert surfaces[1].surface_type == SurfaceType.PX
+    assert surfaces[1].location == 1.0
+    # nor can cones through two points
+    with pytest.raises(NotImplementedError):
+        montepy.Surfaces([surface_builder("1 X 1 2 3 4")]).apply_transform(
+            montepy.Transform("*tr1 0 0 0 90 0 90 180 90 90 90 90 0")
+        )
+    with pytest.raises(IllegalState):
+        montepy.Surfaces([ZPlane(number=1)]).apply_transform(
+            montepy.Transform("tr1 0 1 0")
+        )
@@ -1,5 +1,7 @@
 # Copyright 2024, Battelle Energy Alliance, LLC All Rights Reserved.
 import copy
+import io
+import os
 import numpy as np
 import pytest
 import montepy
@@ -204,3 +206,154 @@ def test_transform_update_values():
     assert len(test.data) == 13
     assert test.data[-1].is_negative
     # test partial rotation matrix start
+
+
+@pytest.mark.parametrize(
+    "in_str, points, expected",
+    [
+        ("tr1 1 2 3", [[0.0, 0.0, 0.0]], [[1.0, 2.0, 3.0]]),
+        (
+            "*tr1 1 2 3 90 0 90 180 90 90 90 90 0",
+            [[1.0, 0.0, 0.0]],
+            [[1.0, 3.0, 3.0]],
+        ),
+        (
+            "tr1 1 2 3 0 1 0 -1 0 0 0 0 1 -1",
+            [[0.0, 0.0, 0.0]],
+            [[2.0, -1.0, -3.0]],
+        ),
+        ("tr1 1 2 3 0 1 0 -1 0 0", [[0.0, 0.0, 1.0]], [[1.0, 2.0, 4.0]]),
+    ],
+)
+def test_transform_as_matrix(in_str, points, expected):
+    transform = Transform(in_str)
+    matrix = transform.as_matrix()
+    points = np.array(points)
+    moved = points @ matrix[:3, :3].T + matrix[:3, 3]
+    np.testing.assert_allclose(moved, expected, atol=1e-12)
+    # the matrix undoes moving points into the auxiliary coordinate system
+    np.testing.assert_allclose(
+        transform._to_local_coordinates(moved), points, atol=1e-12
+    )
+
+
+def test_transform_compose_inverse():
+    outer = Transform("*tr1 1 2 3 90 0 90 180 90 90 90 90 0")
+    inner = Transform("tr2 0 5 0 0 0 1 0 1 0 -1 0 0 -1")
+    composed = outer.compose(inner)
+    assert composed.number == 1
+    assert composed is not outer
+    assert not composed.is_in_degrees
+    assert composed.is_main_to_aux
+    np.testing.assert_allclose(
+        composed.as_matrix(), outer.as_matrix() @ inner.as_matrix(), atol=1e-12
+    )
+    inverse = composed.inverse()
+    assert inverse.number == 1
+    np.testing.assert_allclose(
+        inverse.compose(composed).as_matrix(), np.identity(4), atol=1e-12
+    )
+    # the original transforms are not changed
+    assert outer.is_in_degrees
+    np.testing.assert_allclose(inner.displacement_vector, [0.0, 5.0, 0.0])
+    with pytest.raises(TypeError):
+        outer.compose("tr1")
+
+
+@pytest.mark.parametrize(
+    "partial_str, full_str",
+    [
+        ("tr1 0 0 0 0 1 0", "tr1 0 0 0 0 1 0 1 0 0 0 0 -1"),
+        ("tr1 0 0 0 0 0 1", "tr1 0 0 0 0 0 1 1 0 0 0 1 0"),
+        ("tr1 0 0 0 0 1 0 -1 0", "tr1 0 0 0 0 1 0 -1 0 0 0 0 1"),
+        ("tr1 0 0 0 0.6 0.8 0 -0.8 0", "tr1 0 0 0 0.6 0.8 0 -0.8 0.6 0 0 0 1"),
+        ("tr1 0 0 0 -1 0 0 0 0", "tr1 0 0 0 -1 0 0 0 1 0 0 0 -1"),
+        ("*tr1 0 0 0 90 0 90 180 90", "*tr1 0 0 0 90 0 90 180 90 90 90 90 0"),
+    ],
+)
+def test_transform_partial_rotation(partial_str, full_str):
+    # as in MCNP the rotation is finished from the x' axis, and the x axis
+    partial = Transform(partial_str)
+    full = Transform(full_str)
+    np.testing.assert_allclose(partial.as_matrix(), full.as_matrix(), atol=1e-12)
+    np.testing.assert_allclose(
+        partial.as_matrix()[:3, :3] @ partial.as_matrix()[:3, :3].T,
+        np.identity(3),
+        atol=1e-12,
+    )
+
+
+def test_transform_partial_rotation_bad():
+    transform = Transform("tr1 0 0 0 1 0 0 0 1 0")
+    transform.rotation_matrix = np.ones(7)
+    with pytest.raises(IllegalState):
+        transform.as_matrix()
+
+
+def test_transforms_find_duplicates():
+    transforms = montepy.Transforms()
+    for trans_str in [
+        "tr1 0 0 1",
+        "*tr2 0 0 1 0 90 90 90 0 90 90 90 0",
+        "tr3 0 0 1.0000001",
+        "tr4 0 0 -1 1 0 0 0 1 0 0 0 1 -1",
+        "tr5 0 0 2",
+        "tr6 0 0 1 0 1 0 -1 0 0 0 0 1",
+        "tr7 0 0 -1 0 1 0 -1 0 0 0 0 1 -1",
+        "tr8 0 0 1 1 0 0 0 1 0",
+        "tr9 0 0 1 1 0 0",
+        "tr10 0 0 1 0 1 0 0 -1",
+        "tr11 0 0 1 0 1 0 -1 0",
+    ]:
+        transforms.append(Transform(trans_str))
+    duplicates = transforms.find_duplicates(1e-6)
+    assert {num: trans.number for num, trans in duplicates.items()} == {
+        2: 1,
+        3: 1,
+        4: 1,
+        7: 6,
+        8: 1,
+        9: 1,
+        11: 6,
+    }
+    assert list(transforms.find_duplicates(1e-9)) == [2, 4, 7, 8, 9, 11]
+    assert transforms.find_duplicates(2) == {num: transforms[1] for num in range(2, 12)}
+    for bad, error in [("1", TypeError), (0, ValueError), (-1e-6, ValueError)]:
+        with pytest.raises(error):
+            transforms.find_duplicates(bad)
+        with pytest.raises(error):
+            transforms.remove_duplicates(bad)
+
+
+def test_transforms_remove_duplicates():
+    problem = montepy.read_input(os.path.join("tests", "inputs", "test_universe.imcnp"))
+    original = problem.transforms[5]
+    duplicate = Transform("*tr6 0 0 1 0 90 90 90 0 90 90 90 0")
+    other = Transform("tr7 0 0 2")
+    problem.transforms.append(duplicate)
+    problem.transforms.append(other)
+    problem.surfaces[1000].transform = duplicate
+    problem.surfaces[1010].transform = other
+    filled = [
+        cell
+        for cell in problem.cells
+        if cell.fill.transform is not None and not cell.fill.hidden_transform
+    ]
+    assert filled
+    for cell in filled:
+        cell.fill.transform = duplicate
+    # slices are not linked to the problem, but must still update it
+    problem.transforms[5:6].remove_duplicates(1e-6)
+    assert list(problem.transforms.numbers) == [5, 7]
+    problem.transforms.remove_duplicates(1e-6)
+    assert list(problem.transforms.numbers) == [5, 7]
+    assert duplicate not in problem.data_inputs
+    assert problem.surfaces[1000].transform is original
+    assert problem.surfaces[1010].transform is other
+    for cell in filled:
+        assert cell.fill.transform is original
+    output = io.StringIO()
+    problem.write_problem(output)
+    output = output.getvalue()
+    assert "tr6" not in output.lower()
+    assert "1000 5 SO" in output
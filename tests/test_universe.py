@@ -1,5 +1,6 @@
 # Copyright 2024 - 2025, Battelle Energy Alliance, LLC All Rights Reserved.
 import copy
+import io
 import os
 from hypothesis import given, strategies as st
 import numpy as np
@@ -474,6 +475,52 @@ class TestFill:
         with pytest.raises(ValueError):
             fill.universes = np.zeros((2, 2, 2, 2))
 
+    def test_fill_universe_numbers(self):
+        problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+        fill = problem.cells[3].fill
+        assert fill.universe_numbers.dtype == np.int32
+        assert fill.universe_numbers[:, :, 0].tolist() == [[1, 3], [3, 1]]
+        # the objects are only found when they are asked for
+        assert fill._universes is None
+        problem.universes[3].number = 5
+        assert fill.universe_numbers[:, :, 0].tolist() == [[1, 5], [5, 1]]
+        assert "1 5 5 1" in "\n".join(fill.format_for_mcnp_input(DEFAULT_VERSION))
+        assert fill.universes[0, 1, 0] is problem.universes[5]
+        assert fill._universes is not None
+        # changes to the objects are kept
+        fill.universes[0, 0, 0] = problem.universes[5]
+        assert fill.universe_numbers[:, :, 0].tolist() == [[5, 5], [5, 1]]
+        assert list(problem.universes[5].filled_cells) == [problem.cells[3]]
+        fill.universes = np.array([[[1, 0]]])
+        assert fill._universes is None
+        assert fill.universe_numbers.tolist() == [[[1, 0]]]
+        assert fill.universes[0, 0, 1] is None
+        assert self.simple_fill.universe_numbers is None
+
+    def test_fill_compress_universes(self):
+        problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+        fill = problem.cells[3].fill
+        assert not fill.compress_universes
+        with pytest.raises(TypeError):
+            fill.compress_universes = 1
+        fill.universes = np.array([[[1, 1, 1, 1, 3, 3, 1, 1, 1]]]).T
+        fill.compress_universes = True
+        output = "\n".join(fill.format_for_mcnp_input(DEFAULT_VERSION))
+        assert "fill=0:8 0:0 0:0 1 3R 3 3 1 2R" in output
+        problem.universes[3].number = 7
+        stream = io.StringIO()
+        problem.write_problem(stream)
+        stream.seek(0)
+        new_fill = montepy.read_input(stream).cells[3].fill
+        assert new_fill.universe_numbers.ravel().tolist() == [1, 1, 1, 1, 7, 7, 1, 1, 1]
+
+    def test_big_lattice_fill_round_trip(self):
+        numbers = np.random.default_rng(0).integers(1, 4, (17, 13, 3))
+        universes = " ".join(map(str, numbers.ravel(order="F")))
+        cell = montepy.Cell(f"1 0 -1 lat=1 u=4 fill=0:16 -6:6 2:4 {universes}")
+        assert (cell.fill.old_universe_numbers == numbers).all()
+        assert cell.fill.min_index.tolist() == [0, -6, 2]
+
     def test_fill_str(self, complicated_fill):
         fill = copy.deepcopy(complicated_fill)
         output = str(fill)
@@ -595,3 +642,52 @@ def test_cell_universe_setter_type_error():
     c = montepy.Cell()
     with pytest.raises(TypeError):
         c.universe = 5
+
+
+def test_universe_graph():
+    problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+    graph = problem.universes.graph()
+    assert graph.children == {0: {1: 1, 2: 1}, 1: {}, 2: {1: 2, 3: 2}, 3: {}}
+    assert graph.cycles == []
+    order = graph.order
+    for parent, children in graph.children.items():
+        for child in children:
+            assert order.index(parent) < order.index(child)
+    assert graph.depths == {0: 0, 1: 2, 2: 1, 3: 2}
+    assert graph.instances == {0: 1, 1: 3, 2: 1, 3: 2}
+    # the graph is cached until something changes
+    assert problem.universes.graph() is graph
+    problem.cells[13].fill.universe = problem.universes[3]
+    graph = problem.universes.graph()
+    assert graph.instances == {0: 1, 1: 2, 2: 1, 3: 3}
+    problem.cells[4].universe = problem.universes[1]
+    assert problem.universes.graph().children[1] == {}
+    with pytest.raises(IllegalState):
+        montepy.Universes().graph()
+
+
+def test_universe_graph_live_fill():
+    problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+    graph = problem.universes.graph()
+    assert graph.children[2] == {1: 2, 3: 2}
+    fill = next(cell.fill for cell in problem.cells if cell.fill.multiple_universes)
+    universes = fill.universes
+    # the graph is kept while the array is not changed
+    assert problem.universes.graph() is graph
+    universes[0, 0, 0] = None
+    graph = problem.universes.graph()
+    assert graph.children[2] == {1: 1, 3: 2}
+    assert problem.universes.graph() is graph
+
+
+def test_universe_graph_cycles():
+    problem = montepy.read_input("tests/inputs/test_locate.imcnp")
+    problem.cells[4].fill.universe = problem.universes[2]
+    graph = problem.universes.graph()
+    assert graph.cycles == [[2, 3]]
+    assert graph.children[3] == {2: 1}
+    for attr in ["order", "depths", "instances"]:
+        with pytest.raises(IllegalState):
+            getattr(graph, attr)
+    problem.cells[4].fill.universe = problem.universes[3]
+    assert problem.universes.graph().cycles == [[3]]
@@ -1,7 +1,8 @@
 # Copyright 2024, Battelle Energy Alliance, LLC All Rights Reserved.
 import pytest
-from montepy.utilities import fortran_float
+from montepy.utilities import fortran_float, _relaxed_gc
 
+import gc
 import math
 
 
@@ -33,3 +34,33 @@ def test_stupid_float_parse(test_string, expected):
 def test_raise_error():
     with pytest.raises(ValueError):
         fortran_float("Dog")
+
+
+def test_relaxed_gc():
+    threshold = gc.get_threshold()
+    assert gc.get_freeze_count() == 0
+    with _relaxed_gc():
+        assert gc.isenabled()
+        assert gc.get_threshold()[0] > threshold[0]
+        assert gc.get_threshold()[1:] == threshold[1:]
+        assert gc.get_freeze_count() > 0
+        with _relaxed_gc():
+            pass
+        # only the last call restores it
+        assert gc.get_freeze_count() > 0
+        assert gc.get_threshold()[0] > threshold[0]
+    assert gc.get_threshold() == threshold
+    assert gc.get_freeze_count() == 0
+    with pytest.raises(ValueError):
+        with _relaxed_gc():
+            raise ValueError()
+    assert gc.get_threshold() == threshold
+    assert gc.get_freeze_count() == 0
+    gc.freeze()
+    try:
+        with _relaxed_gc():
+            pass
+        # objects frozen by someone else are left frozen
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()